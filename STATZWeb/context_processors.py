@@ -3,10 +3,8 @@ Context processors for STATZ Corporation application.
 Provides global context variables to all templates.
 """
 
-import os
-
 from django.conf import settings
-from .version_utils import get_version_info, get_display_version, get_detailed_version
+from .version_utils import get_cache_version, get_version_info, get_display_version, get_detailed_version
 
 
 def version_context(request):
@@ -27,11 +25,8 @@ def version_context(request):
 
 
 def cache_version_context(request):
-    version_info = get_version_info()
-    short_hash = version_info.get('short_hash', '')
-    cache_version = os.environ.get('WEBSITE_DEPLOYMENT_ID', '')
-
-    if not cache_version and short_hash and short_hash != 'unknown':
-        cache_version = short_hash
-
-    return {'cache_version': cache_version or '1'}
+    """
+    Deploy-level ``cache_version`` for hand-built asset URLs. Prefer
+    ``{% asset %}`` / ``{% static %}``, which resolve content-hashed names.
+    """
+    return {'cache_version': get_cache_version()}
@@ -13,8 +13,9 @@ RELEASE_NOTES_ACK_PATH = "/users/release-notes/acknowledge/"
 class NoCacheStaticFilesMiddleware:
     """Force no-cache headers on all static file responses.
 
-    Must be placed BEFORE WhiteNoise in MIDDLEWARE so it wraps the
-    WhiteNoise response on the way back out through the middleware chain.
+    Development only (runserver serves unhashed files that change while you
+    edit). Production relies on WhiteNoise's headers: content-hashed files
+    are immutable, so never add this in front of WhiteNoise.
     """
 
     def __init__(self, get_response):
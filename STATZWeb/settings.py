@@ -8,6 +8,7 @@ Handles both development and production environments.
 
 from pathlib import Path
 import os
+import tempfile
 import warnings
 from datetime import date
 from django.core.exceptions import ImproperlyConfigured
@@ -140,13 +141,10 @@ MIDDLEWARE = [
 
 if IS_PRODUCTION:
     # Production middleware
-    # NoCacheStaticFilesMiddleware must be BEFORE WhiteNoise so it wraps
-    # WhiteNoise responses and can override Cache-Control headers.
+    # WhiteNoise sets Cache-Control itself: immutable for content-hashed
+    # names, WHITENOISE_MAX_AGE for anything else (see static settings below).
     MIDDLEWARE.insert(
-        1, "STATZWeb.middleware.NoCacheStaticFilesMiddleware"
-    )  # Override cache headers on static files
-    MIDDLEWARE.insert(
-        2, "whitenoise.middleware.WhiteNoiseMiddleware"
+        1, "whitenoise.middleware.WhiteNoiseMiddleware"
     )  # Azure static file serving
 else:
     # Development middleware
@@ -326,14 +324,15 @@ except Exception:
 STATICFILES_DIRS = [BASE_DIR / "static"]
 
 if IS_PRODUCTION:
-    # Production: Azure App Service static file serving with WhiteNoise
-    # Using CompressedStaticFilesStorage (no manifest hashing) to avoid
-    # long-lived cache headers on hashed filenames. All static files served
-    # with max-age=0 to prevent browser caching entirely.
-    STATICFILES_STORAGE = "whitenoise.storage.CompressedStaticFilesStorage"
+    # Production: Azure App Service static file serving with WhiteNoise.
+    # collectstatic (startup.sh) writes content-hashed copies, a
+    # staticfiles.json manifest and .gz/.br variants (STATZWeb/storage.py).
+    # {% static %} / {% asset %} resolve hashed names, which WhiteNoise serves
+    # with "max-age=315360000, public, immutable"; a changed file gets a new
+    # name, so no cache-busting query string is needed.
+    STATICFILES_STORAGE = "STATZWeb.storage.FingerprintedStaticFilesStorage"
     WHITENOISE_USE_FINDERS = True
-    WHITENOISE_AUTOREFRESH = True   # Always check for new/changed files
-    WHITENOISE_MAX_AGE = 0          # No browser caching of static files
+    WHITENOISE_MAX_AGE = 0          # Unhashed URLs (not in the manifest) revalidate on every use
     WHITENOISE_MANIFEST_STRICT = False  # Fall back to unhashed path instead of raising ValueError for files not in manifest
 else:
     # Development: Standard static files storage
@@ -395,6 +394,26 @@ GRAPH_MAIL_ENABLED = (
     os.environ.get("GRAPH_MAIL_ENABLED", "False").strip().lower() == "true"
 )
 
+# Shared Graph client (core/graph_client.py): retries of a throttled call, the
+# cap on one Retry-After / backoff sleep (seconds), and the keep-alive pool size.
+GRAPH_MAX_RETRIES = int(os.environ.get("GRAPH_MAX_RETRIES", "3") or "3")
+GRAPH_RETRY_MAX_WAIT_SECONDS = float(os.environ.get("GRAPH_RETRY_MAX_WAIT_SECONDS", "60") or "60")
+GRAPH_POOL_SIZE = int(os.environ.get("GRAPH_POOL_SIZE", "10") or "10")
+
+# Campaign dispatch (mailer/tasks/dispatch_campaigns.py). Sends run on a small
+# thread pool, paced per sender mailbox (Exchange Online allows ~30 messages
+# a minute per mailbox); a tick stops starting sends once its budget is spent
+# and the next tick resumes with the remaining PENDING recipients.
+MAILER_DISPATCH_WORKERS = int(os.environ.get("MAILER_DISPATCH_WORKERS", "4") or "4")
+MAILER_SEND_RATE_PER_MINUTE = int(os.environ.get("MAILER_SEND_RATE_PER_MINUTE", "30") or "30")
+MAILER_DISPATCH_TIME_BUDGET_SECONDS = int(
+    os.environ.get("MAILER_DISPATCH_TIME_BUDGET_SECONDS", "480") or "480"
+)
+MAILER_DISPATCH_BATCH_SIZE = int(os.environ.get("MAILER_DISPATCH_BATCH_SIZE", "50") or "50")
+# Finished sends are written back in bulk_updates of this many recipients (and
+# at the end of every batch), bounding how many re-send after a crash.
+MAILER_STATUS_FLUSH_SIZE = int(os.environ.get("MAILER_STATUS_FLUSH_SIZE", "10") or "10")
+
 # ---------------------------------------------------------------------------
 # SharePoint / Graph API — Service Principal (STATZ Web App Mail registration)
 # Used for app-only (client credentials) access to SharePoint calendar
@@ -449,6 +468,14 @@ try:
 except (TypeError, ValueError):
     SHAREPOINT_CALENDAR_BACKFILL_SINCE_DAYS = 30
 
+# Calendar pull uses the Graph list-item delta query: only changed / deleted items
+# are fetched, from the delta link saved in SharePointSyncState. An expired link
+# (HTTP 410) triggers one full re-enumeration. False = page the whole list
+# every run (the pre-delta behavior).
+SHAREPOINT_CALENDAR_DELTA_ENABLED = (
+    os.environ.get("SHAREPOINT_CALENDAR_DELTA_ENABLED", "True").strip().lower() == "true"
+)
+
 # Canonical SharePoint documents root when Company.sharepoint_documents_path is unset.
 SHAREPOINT_PATH_PREFIX = "Statz-Public/data/V87/aFed-DOD"
 
@@ -733,25 +760,53 @@ AUTHENTICATION_BACKENDS = [
     "users.azure_auth.MicrosoftAuthBackend",  # Microsoft Azure AD backend
 ]
 
+# Shared cache — every gunicorn worker and webjob must see the same entries so
+# core.cache namespace invalidations from imports reach all of them.
+# CACHE_BACKEND: redis (default when REDIS_URL is set), db (default in
+# production; table created by core migration 0005 / `createcachetable`),
+# file (CACHE_FILE_DIR, e.g. under /home on App Service) or locmem (default in
+# development; per process). Tests always use locmem.
+CACHE_BACKEND = (
+    os.environ.get("CACHE_BACKEND")
+    or ("redis" if os.environ.get("REDIS_URL") else "db" if IS_PRODUCTION else "locmem")
+).strip().lower()
+if IS_TESTING:
+    CACHE_BACKEND = "locmem"
+    # Invalidation runs on commit, which TestCase never reaches: start each test clean.
+    TEST_RUNNER = "core.test_runner.CacheClearingRunner"
+_CACHE_BACKENDS = {
+    "redis": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("REDIS_URL", "redis://127.0.0.1:6379/0"),
+    },
+    "db": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "django_cache",
+        "OPTIONS": {"MAX_ENTRIES": int(os.environ.get("CACHE_MAX_ENTRIES", "20000") or "20000")},
+    },
+    "file": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("CACHE_FILE_DIR") or str(BASE_DIR / ".cache" / "django"),
+        "OPTIONS": {"MAX_ENTRIES": int(os.environ.get("CACHE_MAX_ENTRIES", "20000") or "20000")},
+    },
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "unique-snowflake-dev",
+    },
+}
+if CACHE_BACKEND not in _CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        f"CACHE_BACKEND={CACHE_BACKEND!r}; expected one of {', '.join(_CACHE_BACKENDS)}."
+    )
+CACHES = {"default": {**_CACHE_BACKENDS[CACHE_BACKEND], "KEY_PREFIX": "statz"}}
+
 # Performance optimizations - Environment aware
 if IS_PRODUCTION:
     # Production performance optimizations
-    CACHES = {
-        "default": {
-            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-            "LOCATION": "unique-snowflake",
-        }
-    }
     DATABASES["default"]["CONN_MAX_AGE"] = 60
     SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
 else:
     # Development performance settings
-    CACHES = {
-        "default": {
-            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-            "LOCATION": "unique-snowflake-dev",
-        }
-    }
     SESSION_ENGINE = "django.contrib.sessions.backends.db"
 
 # SAM.gov API integration
@@ -760,6 +815,73 @@ SAM_OUR_CAGE = os.environ.get(
     "SAM_OUR_CAGE", ""
 )  # e.g. '1ABC2' — used to detect we_won
 
+# DIBBS supplier match index — process-level in-memory tier lookups used by the
+# workbench and import-time matching (sales/services/match_index.py).
+# Off under tests so cached tiers never leak between test cases.
+MATCH_INDEX_ENABLED = (
+    os.environ.get("MATCH_INDEX_ENABLED", "True").strip().lower() == "true"
+    and not IS_TESTING
+)
+# How often (seconds) a process re-reads the index segment versions from the DB.
+MATCH_INDEX_CHECK_SECONDS = int(os.environ.get("MATCH_INDEX_CHECK_SECONDS", "30") or "30")
+# Segments older than this are rebuilt regardless (tier-1 score decay, contract history).
+MATCH_INDEX_MAX_AGE_SECONDS = int(os.environ.get("MATCH_INDEX_MAX_AGE_SECONDS", "3600") or "3600")
+
+# Review Workbench prev/next (sales/services/workbench_nav.py): how long a list's
+# ordered ids stay cached (0 disables the cache), and the largest list cached;
+# bigger lists use keyset queries.
+WORKBENCH_NAV_CACHE_SECONDS = int(os.environ.get("WORKBENCH_NAV_CACHE_SECONDS", "60") or "60")
+WORKBENCH_NAV_CACHE_MAX_IDS = int(os.environ.get("WORKBENCH_NAV_CACHE_MAX_IDS", "20000") or "20000")
+
+# Solicitation PDF blob store (sales/services/blob_store.py): content-addressed by
+# SHA-256, referenced from Solicitation.pdf_blob_key. Backend is a dotted class path.
+SOLICITATION_BLOB_STORE = os.environ.get(
+    "SOLICITATION_BLOB_STORE", "sales.services.blob_store.LocalBlobStore"
+)
+if IS_TESTING:
+    SOLICITATION_BLOB_ROOT = Path(tempfile.gettempdir()) / "statz_test_sol_pdfs"
+else:
+    SOLICITATION_BLOB_ROOT = Path(
+        os.environ.get("SOLICITATION_BLOB_ROOT", Path(MEDIA_ROOT) / "sol_pdfs")
+    )
+# Persist extracted PDF text (dibbs_pdf_text_extract) so every worker extracts a
+# PDF once; the in-process LRU (sales/services/pdf_text.py) is always on.
+PDF_TEXT_PERSIST = os.environ.get("PDF_TEXT_PERSIST", "False").strip().lower() == "true"
+# Entries in that per-process LRU (0 disables it).
+PDF_TEXT_CACHE_SIZE = int(os.environ.get("PDF_TEXT_CACHE_SIZE", "64") or "64")
+
+# Archived-solicitation PDF purge (sales/services/blob_purge.py): rows per UPDATE,
+# sleep between batches, and the per-run budget after which no new batch starts.
+BLOB_PURGE_BATCH_SIZE = int(os.environ.get("BLOB_PURGE_BATCH_SIZE", "50") or "50")
+BLOB_PURGE_PAUSE_SECONDS = float(os.environ.get("BLOB_PURGE_PAUSE_SECONDS", "0.5") or "0.5")
+BLOB_PURGE_TIME_BUDGET_SECONDS = float(
+    os.environ.get("BLOB_PURGE_TIME_BUDGET_SECONDS", "240") or "240"
+)
+
+# Worker processes for parse_ca_zip (sales/services/ca_parser.py) when the caller
+# passes none; 1 parses serially in the calling process.
+CA_PARSE_WORKERS = int(os.environ.get("CA_PARSE_WORKERS", "1") or "1")
+
+# PDF parse backlog (sales/services/pdf_backlog.py): ids read per query, budget
+# after which no new PDF starts (0 = none), and parallel worker processes.
+PDF_BACKLOG_BATCH_SIZE = int(os.environ.get("PDF_BACKLOG_BATCH_SIZE", "50") or "50")
+PDF_BACKLOG_TIME_BUDGET_SECONDS = float(
+    os.environ.get("PDF_BACKLOG_TIME_BUDGET_SECONDS", "0") or "0"
+)
+PDF_BACKLOG_WORKERS = int(os.environ.get("PDF_BACKLOG_WORKERS", "1") or "1")
+
+# Concurrent dibbs2 PDF harvester (sales/services/pdf_harvest.py): requests in
+# flight, floor / ceiling of the adaptive spacing between request starts
+# (seconds), and retries per PDF after a throttle or reset. PDF_HARVEST_FAST_PATH
+# False sends every PDF through the Playwright path.
+PDF_HARVEST_CONCURRENCY = int(os.environ.get("PDF_HARVEST_CONCURRENCY", "4") or "4")
+PDF_HARVEST_MIN_INTERVAL = float(os.environ.get("PDF_HARVEST_MIN_INTERVAL", "0.2") or "0.2")
+PDF_HARVEST_MAX_INTERVAL = float(os.environ.get("PDF_HARVEST_MAX_INTERVAL", "30") or "30")
+PDF_HARVEST_MAX_RETRIES = int(os.environ.get("PDF_HARVEST_MAX_RETRIES", "3") or "3")
+PDF_HARVEST_FAST_PATH = (
+    os.environ.get("PDF_HARVEST_FAST_PATH", "True").strip().lower() != "false"
+)
+
 # Speed up password hashing in tests (reduces test duration dramatically)
 if IS_TESTING:
     PASSWORD_HASHERS = [
@@ -0,0 +1,33 @@
+"""
+Static files storage for production.
+
+collectstatic writes every file under a content-hashed name
+(``css/app-core.3f9a1c2b7d4e.css``), a ``staticfiles.json`` manifest, and
+gzip / brotli siblings (brotli when the ``Brotli`` package is installed).
+WhiteNoise serves the hashed names with ``Cache-Control: max-age=315360000,
+public, immutable``; a changed file gets a new name, so browsers never need
+to revalidate. Templates resolve names through ``{% static %}`` or
+``{% asset %}`` (core/templatetags/assets.py).
+"""
+import logging
+
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+logger = logging.getLogger(__name__)
+
+
+class FingerprintedStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """
+    CompressedManifestStaticFilesStorage that tolerates references to files
+    we do not ship (vendor bundles pointing at ``.map`` files, for example):
+    the reference is left unhashed instead of failing collectstatic.
+    """
+
+    def hashed_name(self, name, content=None, filename=None):
+        try:
+            return super().hashed_name(name, content, filename)
+        except ValueError:
+            if content is not None:
+                raise
+            logger.warning("static: %s is referenced but not collected; leaving it unhashed", name)
+            return name
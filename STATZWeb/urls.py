@@ -23,7 +23,7 @@ from django.http import HttpResponse
 from django.views.static import serve
 import os
 from . import views
-from STATZWeb.version_utils import get_version_info
+from STATZWeb.version_utils import get_cache_version
 from users import views as user_views
 from users.ms_views import MicrosoftAuthView, MicrosoftCallbackView
 from core import views as core_views
@@ -66,17 +66,7 @@ def service_worker(request):
     """Serve service worker as a Django template so cache_version is injected."""
     from django.template.loader import render_to_string as render_template
 
-    version_info = get_version_info()
-    short_hash = version_info.get("short_hash", "")
-    cache_version = os.environ.get("WEBSITE_DEPLOYMENT_ID", "")
-    if not cache_version and short_hash and short_hash != "unknown":
-        cache_version = short_hash
-    cache_version = cache_version or "1"
-    cache_version = (
-        cache_version.strip().replace("'", "").replace('"', "").replace(" ", "-")
-    )
-
-    content = render_template("sw.js", {"cache_version": cache_version})
+    content = render_template("sw.js", {"cache_version": get_cache_version()})
     response = HttpResponse(content, content_type="application/javascript")
     response["Service-Worker-Allowed"] = "/"
     response["Access-Control-Allow-Origin"] = "*"
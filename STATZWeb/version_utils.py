@@ -3,6 +3,7 @@ Version management utilities for STATZ Corporation application.
 Provides version information for display on the landing page with multiple fallback methods.
 """
 
+import functools
 import subprocess
 import os
 import json
@@ -276,3 +277,20 @@ def get_display_version() -> str:
 def get_detailed_version() -> str:
     """Convenience function to get detailed version."""
     return version_manager.get_detailed_version()
+
+
+@functools.lru_cache(maxsize=None)
+def get_cache_version() -> str:
+    """
+    Deploy-level cache-busting token: WEBSITE_DEPLOYMENT_ID on Azure, else the
+    short commit hash, else "1". Used for ?v= on static URLs that have no
+    content hash and for the service worker. Computed once per process: the
+    commit-hash fallback runs git.
+    """
+    cache_version = os.environ.get("WEBSITE_DEPLOYMENT_ID", "")
+    if not cache_version:
+        short_hash = get_version_info().get("short_hash", "")
+        if short_hash and short_hash != "unknown":
+            cache_version = short_hash
+    cache_version = cache_version or "1"
+    return cache_version.strip().replace("'", "").replace('"', "").replace(" ", "-")
@@ -0,0 +1,23 @@
+"""
+Management command: backfill_contract_number_normalized
+
+Sets Contract.contract_number_normalized (the dash/space-free, uppercased
+contract number the DFAS matcher looks up) on every contract whose stored
+value is missing or stale. Contract.save() keeps the column current; run this
+after writes that bypass save() (QuerySet.update(), raw SQL, data loads).
+Safe to re-run.
+"""
+from django.core.management.base import BaseCommand
+
+from contracts.services.dfas_matcher import backfill_contract_number_normalized
+
+
+class Command(BaseCommand):
+    help = "Backfill Contract.contract_number_normalized for DFAS contract matching."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Contracts read and updated per batch.")
+
+    def handle(self, *args, **options):
+        updated = backfill_contract_number_normalized(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Updated contract_number_normalized on {updated} contract(s)."))
@@ -0,0 +1,196 @@
+"""
+Management command: benchmark_dfas_match
+
+Builds a synthetic company (default 3,000 contracts, two CLINs each, shipments
+on a third of the CLINs, 500 previously imported DFAS rows) and a DFAS payment
+file of --rows rows (default 5,000) inside a transaction, then rolls
+everything back.
+
+The file mixes the cases the matcher handles: dash-free contract numbers,
+Call Nos. with a P-suffix, blank and unknown CLINs, unknown contracts,
+malformed numbers and prior-import duplicates.
+
+Reports:
+  per-row   match_dfas_row() called once per parsed row (ms, queries). This
+            is the current one-row wrapper around the batch matcher, using the
+            indexed contract_number_normalized lookup; it is not the old
+            Upper(Replace(...)) annotation path, so the speedup shown is
+            batching alone.
+  batch     match_dfas_rows() over the whole file (ms, queries)
+  import    create_import_batch() on the file: parse, match, shipment
+            auto-assignment and row inserts (ms, queries)
+plus the status histogram, which is identical for both matching paths.
+"""
+import csv
+import io
+import random
+import time
+from collections import Counter
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from contracts.models import Clin, ClinShipment, Company, Contract, DfasImportBatch, DfasImportRow
+from contracts.services.dfas_import import create_import_batch
+from contracts.services.dfas_matcher import match_dfas_row, match_dfas_rows
+from contracts.services.dfas_parser import REQUIRED_HEADERS, parse_dfas_file
+from contracts.utils.contract_numbers import contract_number_match_key
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _contract_number(i):
+    return f"SPE7L{i % 10}-26-P-{i:04d}"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DFAS row matching on a synthetic file: match_dfas_row() once per row "
+        "vs one match_dfas_rows() call (both on the indexed normalized column)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=5000, help="Rows in the DFAS file.")
+        parser.add_argument("--contracts", type=int, default=3000, help="Contracts to generate.")
+        parser.add_argument("--seed", type=int, default=7)
+
+    def handle(self, *args, **options):
+        if options["contracts"] > 10000:
+            raise CommandError("--contracts is limited to 10,000 (four-digit serials).")
+        rng = random.Random(options["seed"])
+        try:
+            with transaction.atomic():
+                company, user = self._seed(options["contracts"])
+                content = self._dfas_file(rng, options["rows"], options["contracts"])
+                results = self._measure(company, user, content)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        notes = {
+            "per-row": "match_dfas_row() per row (indexed lookups, not the old annotation path)",
+            "batch": "match_dfas_rows() over the file",
+            "import": "create_import_batch() end to end",
+        }
+        for label, note in notes.items():
+            r = results[label]
+            self.stdout.write(f"{label:<8} {r['ms']:>9.1f}ms  queries={r['queries']:<7} {note}")
+        statuses = ", ".join(f"{k}={v}" for k, v in sorted(results["statuses"].items()))
+        self.stdout.write(f"statuses {statuses}")
+        speedup = results["per-row"]["ms"] / max(results["batch"]["ms"], 1e-9)
+        self.stdout.write(self.style.SUCCESS(f"Batching speedup over per-row calls: {speedup:.1f}x"))
+
+    def _seed(self, n_contracts):
+        user = get_user_model().objects.create(username="dfas-benchmark")
+        company = Company.objects.create(name="DFAS Benchmark Co", slug="dfas-benchmark")
+        # bulk_create skips Contract.save(), so set the normalized number here.
+        contracts = Contract.objects.bulk_create(
+            [
+                Contract(
+                    company=company,
+                    contract_number=_contract_number(i),
+                    contract_number_normalized=contract_number_match_key(_contract_number(i)),
+                )
+                for i in range(n_contracts)
+            ],
+            batch_size=500,
+        )
+        clins = Clin.objects.bulk_create(
+            [
+                Clin(company=company, contract=contract, item_number=item, item_type=item_type)
+                for contract in contracts
+                for item, item_type in (("0001", "P"), ("0002", "G"))
+            ],
+            batch_size=500,
+        )
+        ClinShipment.objects.bulk_create(
+            [
+                ClinShipment(clin=clin, item_value=Decimal(100 + n))
+                for clin in clins[::3]
+                for n in range(2)
+            ],
+            batch_size=500,
+        )
+        prior = DfasImportBatch.objects.create(company=company, filename="prior.csv", uploaded_by=user)
+        DfasImportRow.objects.bulk_create(
+            [
+                DfasImportRow(batch=prior, raw_voucher_no=f"V{i:06d}", raw_invoice_no=f"I{i:06d}",
+                              raw_clin="0001", status="imported")
+                for i in range(500)
+            ],
+            batch_size=500,
+        )
+        return company, user
+
+    def _dfas_file(self, rng, n_rows, n_contracts):
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(REQUIRED_HEADERS)
+        for i in range(n_rows):
+            number = _contract_number(rng.randrange(n_contracts)).replace("-", "")
+            contract_no, call_no, clin = number, "", "0001"
+            kind = rng.random()
+            if kind < 0.2:
+                # Delivery order: the IDIQ is on Contract No., the order (with modifier) on Call No.
+                contract_no, call_no = "SPE7L026D0001", number + "P00001"
+            elif kind < 0.3:
+                clin = ""
+            elif kind < 0.35:
+                clin = "9999"
+            elif kind < 0.4:
+                contract_no = "SPE9Z926P" + f"{i % 10000:04d}"
+            elif kind < 0.42:
+                contract_no = "NOT-A-CONTRACT"
+            row = dict.fromkeys(REQUIRED_HEADERS, "")
+            row.update({
+                "Contract No.": contract_no,
+                "Call No.": call_no,
+                "CLIN": clin,
+                "Voucher No.": f"V{i:06d}",
+                "Invoice No.": f"I{i:06d}",
+                "Payment Date": "15-JAN-26",
+                "Check EFT Amount": f"{100 + i % 3}.00",
+            })
+            writer.writerow([row[h] for h in REQUIRED_HEADERS])
+        return out.getvalue().encode()
+
+    def _timed(self, func):
+        """(func(), {"ms", "queries"}); counted with an execute wrapper, since
+        connection.queries keeps only the last 9,000 statements."""
+        queries = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            started = time.perf_counter()
+            value = func()
+            elapsed = (time.perf_counter() - started) * 1000
+        return value, {"ms": elapsed, "queries": queries}
+
+    def _measure(self, company, user, content):
+        parsed = parse_dfas_file(io.BytesIO(content)).rows
+        results = {}
+
+        per_row, results["per-row"] = self._timed(
+            lambda: [match_dfas_row(row, company=company) for row in parsed]
+        )
+        batch, results["batch"] = self._timed(lambda: match_dfas_rows(parsed, company=company))
+
+        def outcomes(matches):
+            return [(m.status, m.clin and m.clin.pk, m.notes) for m in matches]
+
+        if outcomes(per_row) != outcomes(batch):
+            raise CommandError("Per-row and batch matching disagree.")
+        results["statuses"] = Counter(m.status for m in batch)
+
+        _, results["import"] = self._timed(lambda: create_import_batch(
+            file_obj=io.BytesIO(content), filename="benchmark.csv", user=user, company=company,
+        ))
+        return results
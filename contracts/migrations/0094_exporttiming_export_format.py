@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0093_remove_stale_late_flags"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exporttiming",
+            name="export_format",
+            field=models.CharField(blank=True, default="", max_length=10),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:02
+
+import re
+
+from django.db import migrations, models
+
+CHUNK_SIZE = 1000
+
+
+def _match_key(value):
+    # Frozen copy of contracts.utils.contract_numbers.contract_number_match_key() as of this migration.
+    if not value:
+        return None
+    return re.sub(r"[\s\-]", "", str(value).upper()) or None
+
+
+def backfill(apps, schema_editor):
+    Contract = apps.get_model("contracts", "Contract")
+    # Materialize each chunk before writing: pyodbc cannot hold an open
+    # cursor while executing other commands on the same connection.
+    pks = list(Contract.objects.order_by("pk").values_list("pk", flat=True))
+    for start in range(0, len(pks), CHUNK_SIZE):
+        rows = list(
+            Contract.objects.filter(pk__in=pks[start:start + CHUNK_SIZE]).only(
+                "pk", "contract_number"
+            )
+        )
+        for contract in rows:
+            contract.contract_number_normalized = _match_key(contract.contract_number)
+        Contract.objects.bulk_update(rows, ["contract_number_normalized"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0094_exporttiming_export_format"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contract",
+            name="contract_number_normalized",
+            field=models.CharField(
+                blank=True, editable=False, max_length=25, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="contract",
+            index=models.Index(
+                fields=["company", "contract_number_normalized"],
+                name="contract_number_norm_idx",
+            ),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
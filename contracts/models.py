@@ -12,6 +12,7 @@ from django.core.validators import MinValueValidator
 from decimal import Decimal
 from django.conf import settings
 
+from contracts.utils.contract_numbers import contract_number_match_key
 from products.models import Nsn
 from suppliers.models import Supplier
 
@@ -95,6 +96,10 @@ class Contract(AuditModel):
     company = models.ForeignKey('Company', on_delete=models.PROTECT, related_name='contracts', null=False, blank=True)
     idiq_contract = models.ForeignKey('IdiqContract', on_delete=models.CASCADE, null=True, blank=True)
     contract_number = models.CharField(max_length=25, null=True, blank=True, unique=True)
+    # contract_number uppercased with dashes/whitespace removed, the form DFAS
+    # files use. Maintained by save(); backfill with
+    # `manage.py backfill_contract_number_normalized`.
+    contract_number_normalized = models.CharField(max_length=25, null=True, blank=True, editable=False)
     pr_number = models.CharField(max_length=50, null=True, blank=True, verbose_name="PR Number")
     status = models.ForeignKey('ContractStatus', on_delete=models.CASCADE, null=True, blank=True)
     solicitation_type = models.CharField(max_length=10, null=True, blank=True, default='SDVOSB')
@@ -161,6 +166,7 @@ class Contract(AuditModel):
             
             # Common search/filter fields
             models.Index(fields=['contract_number'], name='contract_number_idx'),
+            models.Index(fields=['company', 'contract_number_normalized'], name='contract_number_norm_idx'),
             models.Index(fields=['prime'], name='contract_prime_idx'),
             models.Index(fields=['prime_po_number'], name='contract_prime_po_number_idx'),
             models.Index(fields=['po_number'], name='contract_po_number_idx'),
@@ -180,6 +186,10 @@ class Contract(AuditModel):
     def save(self, *args, **kwargs):
         if not self.company_id:
             self.company = Company.get_default_company()
+        self.contract_number_normalized = contract_number_match_key(self.contract_number)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'contract_number' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'contract_number_normalized'}
         super().save(*args, **kwargs)
     
     @property
@@ -1721,22 +1731,29 @@ class ExportTiming(models.Model):
     row_count = models.IntegerField()
     export_time = models.FloatField()
     timestamp = models.DateTimeField(auto_now_add=True)
+    # 'csv' / 'xlsx'; blank for rows recorded before formats were tracked.
+    export_format = models.CharField(max_length=10, blank=True, default='')
     filters_applied = models.JSONField(default=dict)
 
     @classmethod
-    def get_estimated_time(cls, row_count):
+    def get_estimated_time(cls, row_count, export_format=''):
         """
         Get estimated export time based on historical data.
         Uses weighted average of recent exports, giving more weight to:
         1. More recent exports
         2. Exports with similar row counts
         3. Exports with similar filters
+        When export_format is given, only exports of that format are used
+        (XLSX rows cost several times more than CSV rows).
         """
         if row_count <= 0:
             return 1  # Minimum 1 second for empty exports
             
         # Get the last 10 export timings, ordered by most recent
-        recent_timings = cls.objects.order_by('-timestamp')[:10]
+        recent_timings = cls.objects.order_by('-timestamp')
+        if export_format:
+            recent_timings = recent_timings.filter(export_format=export_format)
+        recent_timings = recent_timings[:10]
         
         if not recent_timings:
             # If no historical data, use a conservative estimate
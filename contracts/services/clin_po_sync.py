@@ -15,9 +15,10 @@ Field landmines (do not confuse):
   - Contract.prime_po_number — unrelated
   - contracts.PurchaseOrder.po_number — PO Generator feature; unrelated
 
-Each propagated write uses its own `.save(update_fields=[...])` so
-transactions.signals creates a separate Transaction row. Never use
-QuerySet.update().
+The Contract write uses `.save(update_fields=[...])`; CLIN writes go through
+`transactions.signals.bulk_update_with_audit` (one UPDATE for all CLINs), so
+every changed row still gets its own Transaction. Never use
+QuerySet.update() or a bare bulk_update(), which skip the audit.
 
 Returns a dict of what was actually updated (equality-guard skipped writes
 are omitted):
@@ -27,7 +28,24 @@ are omitted):
   }
 """
 
+from django.utils import timezone
+
 from contracts.models import Clin
+from transactions.signals import bulk_update_with_audit
+
+
+def _propagate_to_clins(clins, new_value, request_user):
+    changed = []
+    now = timezone.now()
+    for clin in clins:
+        if clin.clin_po_num == new_value:
+            continue
+        clin.clin_po_num = new_value
+        clin.modified_by = request_user
+        clin.modified_on = now
+        changed.append(clin)
+    bulk_update_with_audit(changed, ["clin_po_num", "modified_by", "modified_on"])
+    return [{"clin_id": clin.pk, "clin_po_num": new_value} for clin in changed]
 
 
 def sync_po_number(instance, new_value, request_user) -> dict:
@@ -52,25 +70,11 @@ def sync_po_number(instance, new_value, request_user) -> dict:
         siblings = Clin.objects.filter(contract_id=instance.contract_id).exclude(
             pk=instance.pk
         )
-        for sibling in siblings:
-            if sibling.clin_po_num == new_value:
-                continue
-            sibling.clin_po_num = new_value
-            sibling.modified_by = request_user
-            sibling.save(update_fields=["clin_po_num", "modified_by", "modified_on"])
-            updated["clins"].append(
-                {"clin_id": sibling.pk, "clin_po_num": new_value}
-            )
+        updated["clins"] = _propagate_to_clins(siblings, new_value, request_user)
 
     elif kind == "Contract":
-        for clin in Clin.objects.filter(contract_id=instance.pk):
-            if clin.clin_po_num == new_value:
-                continue
-            clin.clin_po_num = new_value
-            clin.modified_by = request_user
-            clin.save(update_fields=["clin_po_num", "modified_by", "modified_on"])
-            updated["clins"].append(
-                {"clin_id": clin.pk, "clin_po_num": new_value}
-            )
+        updated["clins"] = _propagate_to_clins(
+            Clin.objects.filter(contract_id=instance.pk), new_value, request_user
+        )
 
     return updated
@@ -0,0 +1,145 @@
+"""Chunked row source for the contract log CSV / XLSX exports.
+
+The exports used to iterate the whole filtered CLIN queryset, calling
+``clinacknowledgment_set.first()`` and ``notes.count()`` per row and two
+``ClinSplit`` aggregates per contract. ``ContractLogExport`` reads the
+ordered CLIN ids once, then loads rows ``chunk_size`` at a time with their
+acknowledgments, note counts and PPI/STATZ split totals fetched by one
+grouped query each per chunk, so memory and query count grow with the
+number of chunks rather than rows.
+"""
+
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Optional
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Upper
+
+from ..models import Clin, ClinAcknowledgment, ClinSplit, ExportTiming, Note
+
+# Each chunk becomes ``pk IN (...)`` lists; SQL Server allows 2100 parameters.
+EXPORT_CHUNK_SIZE = 1000
+
+EXPORT_RELATED = (
+    'contract',
+    'contract__buyer',
+    'contract__contract_type',
+    'contract__status',
+    'contract__idiq_contract',
+    'contract__special_payment_terms',
+    'supplier',
+    'nsn',
+)
+
+EXPORT_HEADERS = [
+    'Open', 'PO #', 'IDIQ Contract #', 'Contract', 'Buyer', 'Type', 'CLIN #',
+    'Supplier', 'Cage Code', 'Award Date', 'Contract Status', 'NSN', 'Item Description',
+    'I&A', 'PO to Sub', 'Sub Reply', 'PO to QAR', 'FOB', 'QDD', 'CDD', 'Qty / UOM',
+    'Ship Date', 'Ship Qty', 'Sub PO $', 'Sub Paid $', 'Item Value', 'Terms', 'Contract $',
+    'Customer Payment $', 'Date Pay Recv', 'Plan Gross $', 'Actual Paid PPI $', 'Actual STATZ $',
+    'Notes'
+]
+
+
+@dataclass
+class LogExportRow:
+    clin: Clin
+    acknowledgment: Optional[ClinAcknowledgment]
+    first_for_contract: bool
+    ppi_split_paid: Decimal
+    statz_split_paid: Decimal
+    notes_count: int
+
+
+def first_acknowledgments(clin_ids):
+    """{clin_id: its first ClinAcknowledgment (lowest pk)}, as ``clinacknowledgment_set.first()``."""
+    firsts = {}
+    for ack in ClinAcknowledgment.objects.filter(clin_id__in=clin_ids).order_by('-pk'):
+        firsts[ack.clin_id] = ack
+    return firsts
+
+
+def _note_counts(clin_ids):
+    content_type = ContentType.objects.get_for_model(Clin)
+    return dict(
+        Note.objects.filter(content_type=content_type, object_id__in=clin_ids)
+        .values('object_id')
+        .annotate(n=Count('pk'))
+        .values_list('object_id', 'n')
+    )
+
+
+def _split_totals(contract_ids):
+    """{(contract_id, 'PPI' | 'STATZ'): Sum(split_paid)} for the given contracts."""
+    if not contract_ids:
+        return {}
+    rows = (
+        ClinSplit.objects.filter(clin__contract_id__in=contract_ids)
+        .filter(Q(company_name__iexact='PPI') | Q(company_name__iexact='STATZ'))
+        .annotate(company=Upper('company_name'))
+        .values('clin__contract_id', 'company')
+        .annotate(total=Sum('split_paid'))
+        .order_by()
+    )
+    return {(row['clin__contract_id'], row['company']): row['total'] for row in rows}
+
+
+class ContractLogExport:
+    """
+    Rows of a filtered, ordered contract-log CLIN queryset, loaded in chunks.
+
+    ``row_count`` is known up front (the ordered id list); ``finish()``
+    records the elapsed time in ExportTiming for get_export_estimate.
+    """
+
+    def __init__(self, clins, export_format, filters_applied=None, chunk_size=EXPORT_CHUNK_SIZE):
+        self.started = time.time()
+        self.export_format = export_format
+        self.filters_applied = filters_applied or {}
+        self.chunk_size = chunk_size
+        # Only ids are held for the whole export; the ordering and filters
+        # (including any .distinct()) are applied once, here.
+        self.clin_ids = list(clins.values_list('pk', flat=True))
+        self.row_count = len(self.clin_ids)
+
+    def __iter__(self):
+        seen_contracts = set()
+        for start in range(0, self.row_count, self.chunk_size):
+            chunk_ids = self.clin_ids[start:start + self.chunk_size]
+            by_id = Clin.objects.select_related(*EXPORT_RELATED).in_bulk(chunk_ids)
+            clins = [by_id[pk] for pk in chunk_ids if pk in by_id]
+
+            new_contracts = []
+            for clin in clins:
+                if clin.contract_id and clin.contract_id not in seen_contracts:
+                    seen_contracts.add(clin.contract_id)
+                    new_contracts.append(clin.contract_id)
+            first_ids = set(new_contracts)
+
+            acknowledgments = first_acknowledgments(chunk_ids)
+            notes = _note_counts(chunk_ids)
+            splits = _split_totals(new_contracts)
+
+            for clin in clins:
+                first_for_contract = clin.contract_id in first_ids
+                if first_for_contract:
+                    first_ids.discard(clin.contract_id)
+                yield LogExportRow(
+                    clin=clin,
+                    acknowledgment=acknowledgments.get(clin.pk),
+                    first_for_contract=first_for_contract,
+                    ppi_split_paid=(splits.get((clin.contract_id, 'PPI')) or Decimal('0')) if first_for_contract else Decimal('0'),
+                    statz_split_paid=(splits.get((clin.contract_id, 'STATZ')) or Decimal('0')) if first_for_contract else Decimal('0'),
+                    notes_count=notes.get(clin.pk, 0),
+                )
+
+    def finish(self):
+        ExportTiming.objects.create(
+            row_count=self.row_count,
+            export_time=time.time() - self.started,
+            export_format=self.export_format,
+            filters_applied=self.filters_applied,
+        )
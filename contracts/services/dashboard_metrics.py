@@ -0,0 +1,373 @@
+"""
+Contract lifecycle dashboard metrics, computed once per company and cached.
+
+ContractLifecycleDashboardView used to run get_period_stats for eight
+periods (a late-status partition, a Sum and a distinct count each) and then
+about a dozen count() / distinct().count() queries over the same company's
+contracts; DashboardMetricDetailView ran two queries per bucket of its value
+series. build_dashboard_metrics() loads the same numbers with a few grouped
+queries:
+
+- award count and Sum(contract_value) per award day, for every day the
+  period table and value series can reach. Award-date period totals and
+  series buckets are sums over a slice of those days (award_totals).
+- one pass over the contracts due inside the period window, with the
+  canonical late-status prefetch from services.due_status, bucketed into
+  the due-date periods.
+- one conditional aggregate over Contract for the open / active counts and
+  one over Contract x Clin x ClinAcknowledgment for the stage counts.
+- the buyer breakdown and the active-supplier ranking.
+
+get_dashboard_metrics(company) caches the snapshot in the
+``contracts.dashboard`` namespace as ``(version, snapshot)`` next to a
+per-company version counter, like core.page_chrome. contracts/signals.py
+bumps the counter on Contract / Clin / Company writes and the whole
+namespace on ClinShipment / ClinAcknowledgment writes (those rows do not
+carry a company). Keys carry the date, so the day rollover needs no
+invalidation; DASHBOARD_METRICS_CACHE_SECONDS bounds staleness for writes
+that skip signals (QuerySet.update(), renamed buyers or suppliers).
+"""
+import bisect
+import calendar
+import logging
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import CharField, Count, Func, IntegerField, Q, Sum, Value
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+from core.cache import invalidate as invalidate_namespace
+from core.cache import namespace
+from core.commit_hooks import on_commit_batch
+
+from .due_status import contract_is_late, contract_past_due_q, late_status_clin_prefetch, today
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_METRICS_CACHE_SECONDS = 600
+DASHBOARD_METRICS_NAMESPACE = "contracts.dashboard"
+
+# The value series reaches back this many years from the start of last year
+# (DashboardMetricDetailView.SERIES_CONFIG: 10 yearly buckets).
+SERIES_YEARS = 10
+
+_cache = namespace(DASHBOARD_METRICS_NAMESPACE, timeout=DASHBOARD_METRICS_CACHE_SECONDS)
+
+
+class TryCastInteger(Func):
+    """
+    SQL Server's TRY_CAST returns NULL on failed conversion instead of
+    raising a DataError, unlike CAST. Use this for any varchar->int
+    annotation on fields known to contain non-numeric values (e.g.
+    Clin.item_number, which can hold values like '0001AA').
+
+    SQLite (used in CI) does not support TRY_CAST and does not need it,
+    since SQLite's CAST silently coerces invalid strings rather than
+    raising — see `numeric_item_annotation()` below for the vendor guard.
+    """
+    function = 'TRY_CAST'
+    template = '%(function)s(%(expressions)s AS int)'
+    output_field = IntegerField()
+
+
+def numeric_item_annotation():
+    """
+    Returns the correct Cast/TryCast expression for converting
+    Clin.item_number (CharField) to an integer, depending on DB vendor.
+
+    SQL Server: uses TRY_CAST, which returns NULL instead of raising
+    DataError 22018 on non-numeric values like '0001AA'.
+    SQLite (CI): falls back to standard Cast, since TRY_CAST is not
+    a SQLite function and SQLite's CAST does not raise on bad input.
+    """
+    if connection.vendor == 'microsoft':
+        return TryCastInteger('item_number')
+    return Cast('item_number', output_field=IntegerField())
+
+
+PERIOD_KEYS = [
+    'this_week',
+    'last_week',
+    'this_month',
+    'last_month',
+    'this_quarter',
+    'last_quarter',
+    'this_year',
+    'last_year',
+]
+
+
+def get_period_boundaries(now):
+    """Return start/end datetimes for all dashboard periods."""
+    now = timezone.localtime(now)
+    this_week_start = now - timedelta(days=now.weekday())
+    this_week_end = this_week_start + timedelta(days=6)
+    last_week_start = this_week_start - timedelta(weeks=1)
+    last_week_end = last_week_start + timedelta(days=6)
+
+    this_month_start = now.replace(day=1)
+    this_month_end = now.replace(day=calendar.monthrange(now.year, now.month)[1])
+
+    if now.month == 1:
+        last_month_start = now.replace(year=now.year-1, month=12, day=1)
+        last_month_end = now.replace(year=now.year-1, month=12, day=31)
+    else:
+        last_month_start = now.replace(month=now.month-1, day=1)
+        last_month_end = now.replace(month=now.month-1, day=calendar.monthrange(now.year, now.month-1)[1])
+
+    current_quarter = (now.month - 1) // 3
+    this_quarter_start = now.replace(month=current_quarter * 3 + 1, day=1)
+    this_quarter_end = now.replace(
+        month=min(12, (current_quarter + 1) * 3),
+        day=calendar.monthrange(now.year, min(12, (current_quarter + 1) * 3))[1]
+    )
+
+    if current_quarter == 0:
+        last_quarter_start = now.replace(year=now.year - 1, month=10, day=1)
+        last_quarter_end = now.replace(year=now.year - 1, month=12, day=31)
+    else:
+        last_quarter_start = now.replace(month=((current_quarter - 1) * 3) + 1, day=1)
+        last_quarter_month = min(12, current_quarter * 3)
+        last_quarter_end = now.replace(
+            month=last_quarter_month,
+            day=calendar.monthrange(now.year, last_quarter_month)[1]
+        )
+
+    this_year_start = now.replace(month=1, day=1)
+    this_year_end = now.replace(month=12, day=31)
+    last_year_start = this_year_start.replace(year=this_year_start.year-1)
+    last_year_end = last_year_start.replace(month=12, day=31)
+
+    return {
+        'this_week': (this_week_start, this_week_end),
+        'last_week': (last_week_start, last_week_end),
+        'this_month': (this_month_start, this_month_end),
+        'last_month': (last_month_start, last_month_end),
+        'this_quarter': (this_quarter_start, this_quarter_end),
+        'last_quarter': (last_quarter_start, last_quarter_end),
+        'this_year': (this_year_start, this_year_end),
+        'last_year': (last_year_start, last_year_end),
+    }
+
+
+def period_date_ranges(now):
+    """{period: (start_date, end_date)}, whole days, for the dashboard periods."""
+    return {
+        key: (start.date(), end.date())
+        for key, (start, end) in get_period_boundaries(now).items()
+    }
+
+
+def _open_q():
+    return Q(status__description='Open', date_canceled__isnull=True)
+
+
+def _active_q():
+    return ~Q(status__description='Canceled') & ~Q(status__description='Closed')
+
+
+def _load_award_days(contracts, start, end):
+    rows = (
+        contracts.filter(award_date__range=(start, end))
+        .values('award_date')
+        .annotate(count=Count('pk'), total=Sum('contract_value'))
+        .order_by('award_date')
+    )
+    days, counts, totals = [], [], []
+    for row in rows:
+        days.append(row['award_date'].toordinal())
+        counts.append(row['count'])
+        totals.append(row['total'] or 0)
+    return {'days': days, 'counts': counts, 'totals': totals}
+
+
+def _load_due_periods(contracts, ranges):
+    """Due / late / on-time counts per period, from one late-status pass."""
+    start = min(first for first, _ in ranges.values())
+    end = max(last for _, last in ranges.values())
+    counts = {key: {'contracts_due': 0, 'contracts_due_late': 0, 'contracts_due_ontime': 0} for key in ranges}
+    due = (
+        contracts.filter(due_date__range=(start, end))
+        .only('id', 'due_date')
+        .prefetch_related(late_status_clin_prefetch())
+    )
+    for contract in due:
+        late = contract_is_late(contract)
+        for key, (first, last) in ranges.items():
+            if first <= contract.due_date <= last:
+                row = counts[key]
+                row['contracts_due'] += 1
+                row['contracts_due_late' if late else 'contracts_due_ontime'] += 1
+    return counts
+
+
+def _load_counts(company, today_date):
+    from contracts.models import Contract
+
+    soon = (today_date, today_date + timedelta(days=14))
+    return Contract.objects.filter(company=company).aggregate(
+        total_contracts=Count('pk', filter=_open_q()),
+        all_contracts=Count('pk', filter=Q(date_canceled__isnull=True)),
+        new_contracts=Count('pk', filter=_active_q() & Q(award_date__gte=today_date - timedelta(days=30))),
+        due_soon=Count('pk', filter=_active_q() & Q(due_date__range=soon)),
+        past_due=Count('pk', filter=_active_q() & contract_past_due_q(today_date)),
+        open_contracts=Count('pk', filter=_open_q()),
+        overdue_contracts=Count('pk', filter=_open_q() & Q(due_date__lt=today_date)),
+        on_time_contracts=Count(
+            'pk', filter=_open_q() & (Q(due_date__gte=today_date) | Q(due_date__isnull=True))
+        ),
+        upcoming_due_dates=Count('pk', filter=_open_q() & Q(due_date__range=soon)),
+    )
+
+
+def _load_stage_counts(company):
+    """Contracts per lifecycle stage, from their CLINs and acknowledgments."""
+    from contracts.models import Contract
+
+    # The joins fan out one row per acknowledgment; count distinct contracts.
+    counts = Contract.objects.filter(company=company).aggregate(
+        pending_acknowledgment=Count('pk', distinct=True, filter=Q(
+            clin__clinacknowledgment__po_to_supplier_bool=True,
+            clin__clinacknowledgment__clin_reply_bool=False,
+        )),
+        in_production=Count('pk', distinct=True, filter=Q(
+            clin__clinacknowledgment__clin_reply_bool=True,
+            clin__ship_date__isnull=True,
+        )),
+        shipped_not_paid=Count('pk', distinct=True, filter=Q(
+            clin__ship_date__isnull=False,
+            clin__paid_date__isnull=True,
+        )),
+        with_clins=Count('pk', distinct=True, filter=Q(clin__id__isnull=False)),
+        with_unpaid_clins=Count('pk', distinct=True, filter=Q(
+            clin__id__isnull=False,
+            clin__paid_date__isnull=True,
+        )),
+    )
+    # Fully paid: has CLINs and none of them is unpaid.
+    counts['fully_paid'] = counts.pop('with_clins') - counts.pop('with_unpaid_clins')
+    return counts
+
+
+def _load_buyer_breakdown(open_contracts):
+    rows = (
+        open_contracts.annotate(
+            buyer_name=Coalesce('buyer__description', Value('Unassigned'), output_field=CharField())
+        )
+        .values('buyer_name')
+        .annotate(total=Count('id'))
+        .order_by('-total', 'buyer_name')[:6]
+    )
+    return {row['buyer_name']: row['total'] for row in rows}
+
+
+def _load_active_suppliers(company):
+    from contracts.models import Clin
+
+    # NOTE: numeric_item__lt=99, not 990 as the dashboard card says; the
+    # threshold predates this module and is kept pending confirmation.
+    # Non-numeric item numbers ('0001AA') need TRY_CAST on SQL Server.
+    return list(
+        Clin.objects.filter(
+            contract__status__description='Open',
+            contract__date_canceled__isnull=True,
+            company=company,
+        ).annotate(
+            numeric_item=numeric_item_annotation()
+        ).filter(
+            numeric_item__isnull=False,
+            numeric_item__lt=99,
+        ).values(
+            'supplier_id',
+            'supplier__name',
+        ).annotate(
+            contract_count=Count('contract_id', distinct=True)
+        ).order_by('-contract_count')
+    )
+
+
+def build_dashboard_metrics(company, now=None):
+    """Compute the dashboard snapshot for ``company`` (uncached)."""
+    from contracts.models import Contract
+
+    now = now or timezone.now()
+    today_date = timezone.localtime(now).date()
+    ranges = period_date_ranges(now)
+
+    contracts = Contract.objects.filter(company=company).exclude(status__description='Canceled')
+    series_start = ranges['last_year'][0].replace(year=ranges['last_year'][0].year - SERIES_YEARS)
+    series_end = max(last for _, last in ranges.values())
+    awards = _load_award_days(contracts, series_start, series_end)
+
+    due = _load_due_periods(contracts, ranges)
+    periods = {}
+    for key in PERIOD_KEYS:
+        start, end = ranges[key]
+        count, total = award_totals({'awards': awards}, start, end)
+        periods[key] = {
+            **due[key],
+            'new_contract_value': total,
+            'new_contracts': count,
+            'start': start,
+            'end': end,
+        }
+
+    open_contracts = Contract.objects.filter(_open_q(), company=company)
+    suppliers = _load_active_suppliers(company)
+    return {
+        'today': today_date,
+        'periods': periods,
+        'awards': awards,
+        'counts': _load_counts(company, today_date),
+        'stages': _load_stage_counts(company),
+        'buyer_breakdown': _load_buyer_breakdown(open_contracts),
+        'active_supplier_count': len(suppliers),
+        'top_suppliers': suppliers[:5],
+    }
+
+
+def award_totals(metrics, start, end):
+    """(contract count, total value) awarded between two dates, inclusive."""
+    awards = metrics['awards']
+    days = awards['days']
+    lo = bisect.bisect_left(days, start.toordinal())
+    hi = bisect.bisect_right(days, end.toordinal())
+    return sum(awards['counts'][lo:hi]), sum(awards['totals'][lo:hi]) or 0
+
+
+def get_dashboard_metrics(company):
+    """The cached dashboard snapshot for ``company`` (built on a miss)."""
+    _, metrics = _cache.get_or_set_versioned(
+        f"snapshot:{company.pk}:{today().isoformat()}",
+        f"version:{company.pk}",
+        lambda: build_dashboard_metrics(company),
+    )
+    return metrics
+
+
+def _bump_dashboards(company_ids):
+    """
+    on_commit_batch flush: bump each collected company version once (None
+    stands for every company).
+
+    Cache writes wait for the commit: with the DatabaseCache backend a bump
+    inside the writer's transaction would lock the version row until an import
+    commits and every dashboard read would queue behind it.
+    """
+    company_ids = set(company_ids)
+    if None in company_ids:
+        invalidate_namespace(DASHBOARD_METRICS_NAMESPACE)
+        return
+    for company_id in company_ids:
+        _cache.bump_version(f"version:{company_id}")
+
+
+def invalidate_company_dashboard(company_id):
+    """Retire company_id's cached snapshot once the write commits."""
+    on_commit_batch(_bump_dashboards, company_id)
+
+
+def invalidate_all_dashboards():
+    """Retire every company's snapshot once the write commits."""
+    on_commit_batch(_bump_dashboards, None)
@@ -11,7 +11,7 @@ from django.db.models import Count, Sum
 from django.utils import timezone
 
 from contracts.models import Clin, ClinShipment, Contract, DfasImportBatch, DfasImportRow, PaymentHistory
-from contracts.services.dfas_matcher import MatchResult, match_dfas_row
+from contracts.services.dfas_matcher import LOOKUP_CHUNK_SIZE, MatchResult, match_dfas_rows
 from contracts.services.dfas_parser import parse_dfas_file
 
 
@@ -47,7 +47,7 @@ def _batch_status_counts(batch: DfasImportBatch) -> dict[str, int]:
     )
 
 
-def auto_assign_shipment(clin, check_eft_amount):
+def auto_assign_shipment(clin, check_eft_amount, shipments=None):
     """
     Attempt to auto-assign a ClinShipment to a matched DFAS row.
 
@@ -59,8 +59,11 @@ def auto_assign_shipment(clin, check_eft_amount):
     Args:
         clin: the matched Clin instance
         check_eft_amount: Decimal or None from the parsed DFAS row
+        shipments: the CLIN's shipments ordered by id, when already loaded
+            (see _match_rows); queried otherwise
     """
-    shipments = list(ClinShipment.objects.filter(clin=clin).order_by('id'))
+    if shipments is None:
+        shipments = list(ClinShipment.objects.filter(clin=clin).order_by('id'))
 
     if not shipments:
         return None, None  # Legacy CLIN  pay directly on CLIN
@@ -83,6 +86,42 @@ def auto_assign_shipment(clin, check_eft_amount):
     return None, 'shipment_missing'
 
 
+def _match_rows(parsed_rows, company) -> list[tuple[MatchResult, ClinShipment | None]]:
+    """
+    match_dfas_rows() plus shipment auto-assignment for the matched rows, with
+    the matched CLINs' shipments loaded in one query per chunk.
+    """
+    results = match_dfas_rows(parsed_rows, company=company)
+
+    clin_ids = list({m.clin.pk for m in results if m.status == 'matched' and m.clin is not None})
+    shipments_by_clin: dict[int, list[ClinShipment]] = {}
+    for start in range(0, len(clin_ids), LOOKUP_CHUNK_SIZE):
+        chunk = clin_ids[start:start + LOOKUP_CHUNK_SIZE]
+        for shipment in ClinShipment.objects.filter(clin_id__in=chunk).order_by('id'):
+            shipments_by_clin.setdefault(shipment.clin_id, []).append(shipment)
+
+    matched = []
+    for parsed, m in zip(parsed_rows, results):
+        matched_shipment = None
+        if m.status == 'matched' and m.clin is not None:
+            matched_shipment, shipment_status = auto_assign_shipment(
+                m.clin, parsed.check_eft_amount, shipments_by_clin.get(m.clin.pk, []),
+            )
+            if shipment_status == 'shipment_missing':
+                m = MatchResult(
+                    status='shipment_missing',
+                    idiq=m.idiq,
+                    contract=m.contract,
+                    clin=m.clin,
+                    notes=(
+                        m.notes + '\nMultiple shipments on CLIN; user must select one.'
+                    ).strip(),
+                    error=m.error,
+                )
+        matched.append((m, matched_shipment))
+    return matched
+
+
 def _resolve_row_contract_clin_shipment(
     *,
     row: DfasImportRow,
@@ -285,26 +324,8 @@ def create_import_batch(
             status='uploaded',
         )
         to_create: list[DfasImportRow] = []
-        for parsed in parse_result.rows:
-            m = match_dfas_row(parsed, company=company)
-
-            matched_shipment = None
-            if m.status == 'matched' and m.clin is not None:
-                matched_shipment, shipment_status = auto_assign_shipment(
-                    m.clin, parsed.check_eft_amount
-                )
-                if shipment_status == 'shipment_missing':
-                    m = MatchResult(
-                        status='shipment_missing',
-                        idiq=m.idiq,
-                        contract=m.contract,
-                        clin=m.clin,
-                        notes=(
-                            m.notes + '\nMultiple shipments on CLIN; user must select one.'
-                        ).strip(),
-                        error=m.error,
-                    )
-
+        matches = _match_rows(parse_result.rows, company)
+        for parsed, (m, matched_shipment) in zip(parse_result.rows, matches):
             to_create.append(
                 DfasImportRow(
                     batch=batch,
@@ -502,14 +523,10 @@ def rematch_import_batch(*, batch, company):
     REMATCH_STATUSES = [
         'contract_missing', 'clin_missing', 'shipment_missing', 'pending', 'error',
     ]
-    rows = list(
-        batch.rows.filter(status__in=REMATCH_STATUSES)
-        .select_related('matched_contract', 'matched_clin', 'matched_shipment')
-    )
+    rows = list(batch.rows.filter(status__in=REMATCH_STATUSES).order_by('id'))
 
-    updated = 0
-    for row in rows:
-        parsed = ParsedDfasRow(
+    parsed_rows = [
+        ParsedDfasRow(
             line_number=0,
             contract_no=row.raw_contract_no or '',
             call_no=row.raw_call_no or '',
@@ -520,25 +537,10 @@ def rematch_import_batch(*, batch, company):
             check_eft_amount=row.raw_check_eft_amount,
             raw=row.raw_data or {},
         )
-        m = match_dfas_row(parsed, company=company)
-
-        matched_shipment = None
-        if m.status == 'matched' and m.clin is not None:
-            matched_shipment, shipment_status = auto_assign_shipment(
-                m.clin, parsed.check_eft_amount
-            )
-            if shipment_status == 'shipment_missing':
-                m = MatchResult(
-                    status='shipment_missing',
-                    idiq=m.idiq,
-                    contract=m.contract,
-                    clin=m.clin,
-                    notes=(
-                        m.notes + '\nMultiple shipments on CLIN; user must select one.'
-                    ).strip(),
-                    error=m.error,
-                )
+        for row in rows
+    ]
 
+    for row, (m, matched_shipment) in zip(rows, _match_rows(parsed_rows, company)):
         row.status = m.status
         row.matched_idiq = m.idiq
         row.matched_contract = m.contract
@@ -546,12 +548,16 @@ def rematch_import_batch(*, batch, company):
         row.matched_shipment = matched_shipment
         row.match_notes = m.notes
         row.error_message = m.error or ''
-        row.save(update_fields=[
+    DfasImportRow.objects.bulk_update(
+        rows,
+        [
             'status', 'matched_idiq', 'matched_contract',
             'matched_clin', 'matched_shipment',
             'match_notes', 'error_message',
-        ])
-        updated += 1
+        ],
+        batch_size=500,
+    )
+    updated = len(rows)
 
     _refresh_batch_counts(batch)
     batch.save(update_fields=[
@@ -1,5 +1,6 @@
 """
-DFAS parsed row → Contract / IdiqContract / Clin matching. Read-only ORM use.
+DFAS parsed row → Contract / IdiqContract / Clin matching. Read-only ORM use,
+apart from the contract_number_normalized backfill.
 """
 from __future__ import annotations
 
@@ -8,14 +9,15 @@ import re
 from dataclasses import dataclass
 from typing import Optional
 
-from django.db.models import F, Value
-from django.db.models.functions import Replace, Upper
-
 from contracts.models import Clin, Contract, DfasImportRow, IdiqContract
 from contracts.services.dfas_parser import ParsedDfasRow
+from contracts.utils.contract_numbers import contract_number_match_key
 
 logger = logging.getLogger(__name__)
 
+# Lookups become ``IN (...)`` lists; SQL Server allows 2100 parameters.
+LOOKUP_CHUNK_SIZE = 1000
+
 _PSUFFIX_RE = re.compile(r'^P\d{5}$')
 # PIID structure: 6-char activity code, 2-digit FY, 1-letter type, 4-char serial.
 # The activity code is deliberately NOT restricted to SPE* - STATZ books COTS and
@@ -24,7 +26,7 @@ _RE_STRIPPED_13 = re.compile(r"^[A-Z0-9]{6}\d{2}[A-Z][A-Z0-9]{4}$")
 _RE_STRIPPED_19_PSUFFIX = re.compile(r"^[A-Z0-9]{6}\d{2}[A-Z][A-Z0-9]{4}P\d{5}$")
 
 
-# NOTE: This is the only function that does this. Before adding another contract-number normalizer anywhere in this codebase, check here first.
+# NOTE: This and contract_number_match_key (contracts/utils/contract_numbers.py), which it builds on, are the only contract-number normalizers. Before adding another anywhere in this codebase, check here first.
 def strip_contract_number_dashes(value: Optional[str]) -> Optional[str]:
     """
     Strip dashes/spaces and uppercase a contract or delivery-order number
@@ -46,9 +48,7 @@ def strip_contract_number_dashes(value: Optional[str]) -> Optional[str]:
     and should not be used as a comparison key. Callers MUST treat a None
     return as "no match attempt", not as an empty string.
     """
-    if not value:
-        return None
-    stripped = re.sub(r'[\s\-]', '', str(value).upper().strip())
+    stripped = contract_number_match_key(value)
     if not stripped:
         return None
     if _RE_STRIPPED_13.match(stripped) or _RE_STRIPPED_19_PSUFFIX.match(stripped):
@@ -61,23 +61,31 @@ def strip_contract_number_dashes(value: Optional[str]) -> Optional[str]:
     return None
 
 
-def _norm_qs(qs, field: str = 'contract_number'):
+def backfill_contract_number_normalized(model=None, chunk_size: int = 1000) -> int:
     """
-    Annotate a queryset with `norm_num`: the contract_number field with
-    dashes and spaces removed, uppercased — matching strip_contract_number_dashes().
-
-    Uses Django ORM Replace + Upper so the normalization runs in SQL,
-    not Python. Compatible with Microsoft SQL Server via mssql-django.
+    Set contract_number_normalized on every Contract whose stored key is stale.
+    ``model`` is the Contract class to use (defaults to
+    contracts.models.Contract). Returns the number of rows updated.
     """
-    col = F(field)
-    return qs.annotate(
-        norm_num=Upper(
-            Replace(
-                Replace(col, Value('-'), Value('')),
-                Value(' '), Value(''),
-            )
+    model = model or Contract
+    # Materialize each chunk before writing: pyodbc cannot hold an open
+    # cursor while executing other commands on the same connection.
+    pks = list(model.objects.order_by('pk').values_list('pk', flat=True))
+    updated = 0
+    for start in range(0, len(pks), chunk_size):
+        stale = []
+        rows = model.objects.filter(pk__in=pks[start:start + chunk_size]).only(
+            'pk', 'contract_number', 'contract_number_normalized',
         )
-    )
+        for contract in list(rows):
+            key = contract_number_match_key(contract.contract_number)
+            if contract.contract_number_normalized != key:
+                contract.contract_number_normalized = key
+                stale.append(contract)
+        if stale:
+            model.objects.bulk_update(stale, ['contract_number_normalized'])
+            updated += len(stale)
+    return updated
 
 
 def strip_delivery_order_suffix(call_no: str) -> str:
@@ -109,145 +117,128 @@ class MatchResult:
     error: str = ''
 
 
-def match_dfas_row(
-    parsed_row: ParsedDfasRow,
-    *,
-    company,
-) -> MatchResult:
+def _chunks(values):
+    values = list(values)
+    for start in range(0, len(values), LOOKUP_CHUNK_SIZE):
+        yield values[start:start + LOOKUP_CHUNK_SIZE]
+
+
+def _fold(value: Optional[str]) -> str:
+    # SQL Server compares these columns case-insensitively; key dicts the same way.
+    return (value or '').upper()
+
+
+def _duplicate_key(voucher_no, invoice_no, clin) -> tuple[Optional[str], ...]:
+    # Case-folded like _fold, but None stays distinct from '': the per-row
+    # duplicate filter compared None with IS NULL, which never matches ''.
+    return tuple(None if value is None else value.upper() for value in (voucher_no, invoice_no, clin))
+
+
+def _contract_candidates(parsed_row: ParsedDfasRow) -> tuple[list[str], str]:
     """
-    Resolve a parsed DFAS row to STATZ contract + CLIN.
+    Normalized contract numbers to try for a row, in order, and the note to
+    use when none of them matches.
 
-    Contract/delivery-order lookups normalize both sides (strip dashes +
-    spaces, uppercase) so DFAS dash-free numbers match STATZ dash-included
-    stored values.
+    With a Call No. the delivery order is looked up by the suffix-stripped
+    number, then the raw one. Without one, the Contract No. is used the same
+    way (it can carry a P-suffix too, e.g. SPE4A624PAR82P00003).
     """
-    if parsed_row.parse_errors:
-        return MatchResult(
-            status='error',
-            error='\n'.join(parsed_row.parse_errors),
+    norm_call_no = strip_contract_number_dashes(parsed_row.call_no or '')
+    if norm_call_no:
+        stripped = strip_delivery_order_suffix(norm_call_no)
+        return (
+            list(dict.fromkeys([stripped, norm_call_no])),
+            f'No contract found for Call No. "{parsed_row.call_no}"',
         )
 
-    # --- Duplicate check (unchanged) ---
-    dup = (
-        DfasImportRow.objects.filter(
-            batch__company=company,
-            status='imported',
-            raw_voucher_no=parsed_row.voucher_no,
-            raw_invoice_no=parsed_row.invoice_no,
-            raw_clin=parsed_row.clin,
+    norm_contract_no = strip_contract_number_dashes(parsed_row.contract_no)
+    if norm_contract_no is None:
+        return [], (
+            f'Contract No. "{parsed_row.contract_no}" is not a recognized '
+            f'DLA contract number format.'
         )
-        .select_related('batch')
-        .order_by('-batch__uploaded_at', '-id')
-        .first()
+    stripped = strip_delivery_order_suffix(norm_contract_no)
+    return (
+        list(dict.fromkeys([stripped, norm_contract_no])),
+        f'No contract found for Contract No. "{parsed_row.contract_no}"',
     )
-    if dup is not None:
-        b = dup.batch
-        day = b.uploaded_at.strftime('%Y-%m-%d') if b.uploaded_at else '?'
-        return MatchResult(
-            status='duplicate',
-            notes=f'Previously imported in batch #{b.pk} on {day}',
-        )
 
-    # --- Normalize incoming DFAS values ---
-    norm_contract_no = strip_contract_number_dashes(parsed_row.contract_no)
-    norm_call_no_raw = strip_contract_number_dashes(parsed_row.call_no or '')
-    norm_do_number = (
-        strip_delivery_order_suffix(norm_call_no_raw)
-        if norm_call_no_raw
-        else ''
-    )
 
-    matched_contract: Optional[Contract] = None
-    idiq: Optional[IdiqContract] = None
+def _imported_duplicates(parsed_rows, company) -> dict:
+    """{(voucher, invoice, clin): the most recently imported DfasImportRow with that triple}."""
+    latest = {}
+    vouchers = {row.voucher_no for row in parsed_rows if row.voucher_no is not None}
+    for chunk in _chunks(vouchers):
+        imported = DfasImportRow.objects.filter(
+            batch__company=company,
+            status='imported',
+            raw_voucher_no__in=chunk,
+        ).select_related('batch')
+        for row in imported:
+            key = _duplicate_key(row.raw_voucher_no, row.raw_invoice_no, row.raw_clin)
+            best = latest.get(key)
+            if best is None or (row.batch.uploaded_at, row.pk) > (best.batch.uploaded_at, best.pk):
+                latest[key] = row
+    return latest
 
-    call_nonempty = bool(norm_call_no_raw)
 
-    if call_nonempty:
-        # Direct Contract lookup by stripped Call No.
-        matched_contract = (
-            _norm_qs(Contract.objects.filter(company=company))
-            .filter(norm_num=norm_do_number)
-            .first()
-        )
-        # If suffix-stripping changed the value and first lookup failed, try raw
-        if not matched_contract and norm_do_number != norm_call_no_raw:
-            matched_contract = (
-                _norm_qs(Contract.objects.filter(company=company))
-                .filter(norm_num=norm_call_no_raw)
-                .first()
-            )
-        if not matched_contract:
-            return MatchResult(
-                status='contract_missing',
-                notes=f'No contract found for Call No. "{parsed_row.call_no}"',
-            )
-    else:
-        # No Call No.  match by Contract No. directly.
-        # Also apply P-suffix stripping in case the DFAS contract number
-        # carries a delivery-order modifier (e.g. SPE4A624PAR82P00003  SPE4A624PAR82).
-        if norm_contract_no is None:
-            return MatchResult(
-                status='contract_missing',
-                notes=(
-                    f'Contract No. "{parsed_row.contract_no}" is not a recognized '
-                    f'DLA contract number format.'
-                ),
-            )
-        norm_contract_no_stripped = strip_delivery_order_suffix(norm_contract_no)
-
-        matched_contract = (
-            _norm_qs(Contract.objects.filter(company=company))
-            .filter(norm_num=norm_contract_no_stripped)
-            .first()
+def _contracts_by_key(keys, company) -> dict:
+    """{contract_number_normalized: lowest-pk Contract of the company with that key}."""
+    found = {}
+    for chunk in _chunks(keys):
+        contracts = (
+            Contract.objects.filter(company=company, contract_number_normalized__in=chunk)
+            .select_related('idiq_contract')
+            .order_by('pk')
         )
-        # If suffix-stripping changed the number and still no match, try the raw value
-        if not matched_contract and norm_contract_no_stripped != norm_contract_no:
-            matched_contract = (
-                _norm_qs(Contract.objects.filter(company=company))
-                .filter(norm_num=norm_contract_no)
-                .first()
-            )
-        if not matched_contract:
-            return MatchResult(
-                status='contract_missing',
-                notes=f'No contract found for Contract No. "{parsed_row.contract_no}"',
-            )
-
-    # Populate IDIQ from matched contract (informational only)
-    idiq = getattr(matched_contract, 'idiq_contract', None)
-
-    # --- CLIN matching (unchanged logic) ---
-    clin: Optional[Clin] = None
+        for contract in contracts:
+            found.setdefault(contract.contract_number_normalized, contract)
+    return found
+
+
+def _item_order(clin):
+    return clin.item_number is not None, _fold(clin.item_number), clin.pk
+
+
+def _clins_by_contract(contract_ids) -> tuple[dict, dict]:
+    """
+    ({(contract_id, item_number): Clin}, {contract_id: first production Clin})
+    for the given contracts. "First" is by item_number, NULL first, as
+    ORDER BY item_number sorts it.
+    """
+    by_item, production = {}, {}
+    for chunk in _chunks(contract_ids):
+        for clin in Clin.objects.filter(contract_id__in=chunk).order_by('pk'):
+            if clin.item_number:
+                by_item.setdefault((clin.contract_id, _fold(clin.item_number)), clin)
+            if clin.item_type == 'P':
+                best = production.get(clin.contract_id)
+                if best is None or _item_order(clin) < _item_order(best):
+                    production[clin.contract_id] = clin
+    return by_item, production
+
+
+def _match_clin(parsed_row, contract, by_item, production) -> MatchResult:
+    # The IDIQ is informational only.
+    idiq = contract.idiq_contract
     clin_key = (parsed_row.clin or '').strip()
     if clin_key:
-        clin = Clin.objects.filter(
-            contract=matched_contract,
-            item_number=clin_key,
-        ).first()
+        clin = by_item.get((contract.pk, _fold(clin_key)))
         if clin:
-            return MatchResult(
-                status='matched',
-                idiq=idiq,
-                contract=matched_contract,
-                clin=clin,
-            )
+            return MatchResult(status='matched', idiq=idiq, contract=contract, clin=clin)
         return MatchResult(
             status='clin_missing',
             idiq=idiq,
-            contract=matched_contract,
-            notes=f'CLIN "{parsed_row.clin}" not found on contract {matched_contract.contract_number}',
+            contract=contract,
+            notes=f'CLIN "{parsed_row.clin}" not found on contract {contract.contract_number}',
         )
 
-    clin = (
-        Clin.objects.filter(contract=matched_contract, item_type='P')
-        .order_by('item_number')
-        .first()
-    )
+    clin = production.get(contract.pk)
     if clin:
         return MatchResult(
             status='matched',
             idiq=idiq,
-            contract=matched_contract,
+            contract=contract,
             clin=clin,
             notes=(
                 f'CLIN was blank in DFAS file; auto-selected first production CLIN: '
@@ -257,9 +248,74 @@ def match_dfas_row(
     return MatchResult(
         status='error',
         idiq=idiq,
-        contract=matched_contract,
+        contract=contract,
         error=(
-            f'Contract {matched_contract.contract_number} has no production CLINs — '
+            f'Contract {contract.contract_number} has no production CLINs — '
             f'DFAS row cannot be auto-matched and indicates a data problem on this contract.'
         ),
     )
+
+
+def match_dfas_rows(parsed_rows: list[ParsedDfasRow], *, company) -> list[MatchResult]:
+    """
+    Resolve parsed DFAS rows to STATZ contract + CLIN; one MatchResult per row,
+    in order.
+
+    Contract/delivery-order numbers are compared in normalized form (dashes
+    and spaces stripped, uppercased) against the indexed
+    Contract.contract_number_normalized column, so DFAS dash-free numbers match
+    STATZ dash-included stored values.
+
+    The prior-import duplicate check, contract, and CLIN lookups are each one
+    set-based query (per LOOKUP_CHUNK_SIZE values) for the whole list, resolved
+    in memory, so the query count does not grow with the number of rows.
+    """
+    parsed_rows = list(parsed_rows)
+    candidates = [
+        None if row.parse_errors else _contract_candidates(row)
+        for row in parsed_rows
+    ]
+    valid_rows = [row for row in parsed_rows if not row.parse_errors]
+
+    duplicates = _imported_duplicates(valid_rows, company) if valid_rows else {}
+    keys = {key for found in candidates if found for key in found[0]}
+    contracts = _contracts_by_key(keys, company) if keys else {}
+    contract_ids = {contract.pk for contract in contracts.values()}
+    by_item, production = _clins_by_contract(contract_ids) if contract_ids else ({}, {})
+
+    results = []
+    for row, found in zip(parsed_rows, candidates):
+        if found is None:
+            results.append(MatchResult(status='error', error='\n'.join(row.parse_errors)))
+            continue
+
+        dup = duplicates.get(_duplicate_key(row.voucher_no, row.invoice_no, row.clin))
+        if dup is not None:
+            b = dup.batch
+            day = b.uploaded_at.strftime('%Y-%m-%d') if b.uploaded_at else '?'
+            results.append(MatchResult(
+                status='duplicate',
+                notes=f'Previously imported in batch #{b.pk} on {day}',
+            ))
+            continue
+
+        keys, missing_note = found
+        contract = next((contracts[key] for key in keys if key in contracts), None)
+        if contract is None:
+            results.append(MatchResult(status='contract_missing', notes=missing_note))
+            continue
+        results.append(_match_clin(row, contract, by_item, production))
+    return results
+
+
+def match_dfas_row(
+    parsed_row: ParsedDfasRow,
+    *,
+    company,
+) -> MatchResult:
+    """
+    Resolve a single parsed DFAS row (see match_dfas_rows). Matching many rows
+    should go through match_dfas_rows, which costs the same few queries for
+    the whole list.
+    """
+    return match_dfas_rows([parsed_row], company=company)[0]
@@ -7,12 +7,12 @@ from pathlib import PurePosixPath
 from typing import Any, Dict, Iterable, Optional
 from urllib.parse import quote
 
-import requests
 from django.conf import settings
 
+from core.graph_client import GraphAuthError, get_app_token, graph_request
+
 logger = logging.getLogger("contracts.sharepoint_service")
 
-GRAPH_TOKEN_URL_TEMPLATE = "https://login.microsoftonline.us/{tenant_id}/oauth2/v2.0/token"
 GRAPH_BASE = "https://graph.microsoft.us/v1.0"
 GRAPH_SCOPE = "https://graph.microsoft.us/.default"
 DEFAULT_DOCUMENTS_PATH = "Statz-Public/data/V87/aFed-DOD"
@@ -34,39 +34,15 @@ class SharePointNotFound(SharePointError):
 
 
 def get_graph_access_token() -> str:
-    """Acquire an app-only Graph token using the configured service principal."""
-    tenant_id = (getattr(settings, "GRAPH_MAIL_TENANT_ID", None) or "").strip()
-    client_id = (getattr(settings, "GRAPH_MAIL_CLIENT_ID", None) or "").strip()
-    client_secret = (getattr(settings, "GRAPH_MAIL_CLIENT_SECRET", None) or "").strip()
-    if not tenant_id or not client_id or not client_secret:
+    """Acquire an app-only Graph token (cached by core.graph_client until near expiry)."""
+    try:
+        return get_app_token(scope=GRAPH_SCOPE)
+    except GraphAuthError as exc:
+        if exc.status_code is not None:
+            logger.error("Graph token request failed: HTTP %s %s", exc.status_code, exc.details)
         raise SharePointError(
-            "Graph service credentials are not configured.",
-            details="Missing GRAPH_MAIL_TENANT_ID, GRAPH_MAIL_CLIENT_ID, or GRAPH_MAIL_CLIENT_SECRET.",
-        )
-
-    response = requests.post(
-        GRAPH_TOKEN_URL_TEMPLATE.format(tenant_id=tenant_id),
-        data={
-            "grant_type": "client_credentials",
-            "client_id": client_id,
-            "client_secret": client_secret,
-            "scope": GRAPH_SCOPE,
-        },
-        timeout=60,
-    )
-    if response.status_code != 200:
-        logger.error("Graph token request failed: HTTP %s %s", response.status_code, response.text)
-        raise SharePointError(
-            "Could not connect to Microsoft Graph. Please try again.",
-            status_code=response.status_code,
-            details=response.text,
-        )
-
-    token = response.json().get("access_token")
-    if not token:
-        logger.error("Graph token response missing access_token: %s", response.text)
-        raise SharePointError("Microsoft Graph returned an invalid token response.")
-    return str(token)
+            exc.message, status_code=exc.status_code or 500, details=exc.details
+        ) from exc
 
 
 def get_contract_documents_root(contract) -> str:
@@ -159,7 +135,7 @@ def list_folder_contents(folder_path: str) -> Dict[str, Any]:
 
     # First request — use the children URL for the given path
     url = _children_url(path)
-    response = requests.get(url, headers=headers, timeout=120)
+    response = graph_request("GET", url, headers=headers, timeout=120)
 
     if response.status_code == 404:
         raise SharePointNotFound(
@@ -186,7 +162,7 @@ def list_folder_contents(folder_path: str) -> Dict[str, Any]:
         logger.debug(
             "list_folder_contents: fetching page %d for path %r", page_count, path
         )
-        response = requests.get(next_url, headers=headers, timeout=120)
+        response = graph_request("GET", next_url, headers=headers, timeout=120)
         _raise_for_graph_error(
             response, "Could not load the SharePoint folder (page %d)." % page_count
         )
@@ -264,7 +240,8 @@ def create_folder(parent_path: str, folder_name: str) -> Dict[str, Any]:
         "@microsoft.graph.conflictBehavior": "fail",
     }
 
-    response = requests.post(
+    response = graph_request(
+        "POST",
         url,
         headers={**_auth_headers(token), "Content-Type": "application/json"},
         json=payload,
@@ -306,7 +283,8 @@ def upload_file_to_folder(folder_path: str, uploaded_file) -> Dict[str, Any]:
 
     file_bytes = b"".join(uploaded_file.chunks())
     token = get_graph_access_token()
-    response = requests.put(
+    response = graph_request(
+        "PUT",
         _content_url(target_path),
         headers={**_auth_headers(token), "Content-Type": "application/octet-stream"},
         data=file_bytes,
@@ -329,7 +307,8 @@ def upload_bytes_to_folder(
     """
     path = normalize_folder_path(f"{folder_path}/{_safe_filename(filename)}")
     token = get_graph_access_token()
-    response = requests.put(
+    response = graph_request(
+        "PUT",
         _content_url(path),
         headers={**_auth_headers(token), "Content-Type": content_type},
         data=file_bytes,
@@ -352,7 +331,8 @@ def send_pdf_bytes_to_folder(
     path = normalize_folder_path(f"{folder_path}/{filename}")
     token = get_graph_access_token()
     url = _content_url(path)
-    response = requests.put(
+    response = graph_request(
+        "PUT",
         url,
         headers={
             **_auth_headers(token),
@@ -376,7 +356,7 @@ def convert_file_to_pdf_bytes(file_id: str) -> bytes:
         f"{quote(file_id, safe='')}/content?format=pdf"
     )
     token = get_graph_access_token()
-    response = requests.get(url, headers=_auth_headers(token), timeout=120)
+    response = graph_request("GET", url, headers=_auth_headers(token), timeout=120)
     _raise_for_graph_error(response, "Could not convert file to PDF.")
     return response.content
 
@@ -390,7 +370,7 @@ def delete_item_by_id(item_id: str) -> None:
     drive_id = quote(_get_drive_id(), safe="!_")
     url = f"{GRAPH_BASE}/drives/{drive_id}/items/{quote(item_id, safe='')}"
     token = get_graph_access_token()
-    response = requests.delete(url, headers=_auth_headers(token), timeout=60)
+    response = graph_request("DELETE", url, headers=_auth_headers(token), timeout=60)
     if response.status_code not in (200, 204):
         _raise_for_graph_error(response, "Could not delete the file from SharePoint.")
 
@@ -411,7 +391,7 @@ def delete_file_by_id(file_id: str) -> None:
     drive_id = quote(_get_drive_id(), safe="!_")
     url = f"{GRAPH_BASE}/drives/{drive_id}/items/{quote(file_id, safe='')}"
     token = get_graph_access_token()
-    response = requests.delete(url, headers=_auth_headers(token), timeout=60)
+    response = graph_request("DELETE", url, headers=_auth_headers(token), timeout=60)
     if response.status_code not in (200, 204):
         logger.warning(
             "delete_file_by_id: unexpected status %s for file_id=%s",
@@ -427,7 +407,7 @@ def download_file_bytes_by_id(file_id: str) -> bytes:
         f"{quote(file_id, safe='')}/content"
     )
     token = get_graph_access_token()
-    response = requests.get(url, headers=_auth_headers(token), timeout=120)
+    response = graph_request("GET", url, headers=_auth_headers(token), timeout=120)
     _raise_for_graph_error(response, "Could not download file from SharePoint.")
     return response.content
 
@@ -477,7 +457,7 @@ def _drive_item_by_id_url(file_id: str) -> str:
 
 def _get_drive_item(item_path: str) -> Optional[Dict[str, Any]]:
     token = get_graph_access_token()
-    response = requests.get(_drive_item_url(normalize_folder_path(item_path)), headers=_auth_headers(token), timeout=60)
+    response = graph_request("GET", _drive_item_url(normalize_folder_path(item_path)), headers=_auth_headers(token), timeout=60)
     if response.status_code == 200:
         return response.json()
     if response.status_code in (400, 404):
@@ -488,7 +468,7 @@ def _get_drive_item(item_path: str) -> Optional[Dict[str, Any]]:
 
 def _get_drive_item_by_id(file_id: str) -> Dict[str, Any]:
     token = get_graph_access_token()
-    response = requests.get(_drive_item_by_id_url(file_id), headers=_auth_headers(token), timeout=60)
+    response = graph_request("GET", _drive_item_by_id_url(file_id), headers=_auth_headers(token), timeout=60)
     _raise_for_graph_error(response, "Could not open the SharePoint file.")
     return response.json()
 
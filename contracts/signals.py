@@ -1,5 +1,34 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
 
-# Signal removed as it's now handled in users/signals.py 
\ No newline at end of file
+from contracts.services import dashboard_metrics
+
+# Signal removed as it's now handled in users/signals.py 
+
+# Dashboard metrics (services/dashboard_metrics.py) are cached per company;
+# drop the snapshot when the rows it counts change.
+
+
+@receiver(post_save, sender='contracts.Contract')
+@receiver(post_delete, sender='contracts.Contract')
+@receiver(post_save, sender='contracts.Clin')
+@receiver(post_delete, sender='contracts.Clin')
+def contract_metrics_changed(sender, instance, **kwargs):
+    if instance.company_id:
+        dashboard_metrics.invalidate_company_dashboard(instance.company_id)
+
+
+@receiver(post_save, sender='contracts.Company')
+@receiver(post_delete, sender='contracts.Company')
+def company_metrics_changed(sender, instance, **kwargs):
+    dashboard_metrics.invalidate_company_dashboard(instance.pk)
+
+
+@receiver(post_save, sender='contracts.ClinShipment')
+@receiver(post_delete, sender='contracts.ClinShipment')
+@receiver(post_save, sender='contracts.ClinAcknowledgment')
+@receiver(post_delete, sender='contracts.ClinAcknowledgment')
+def clin_detail_metrics_changed(sender, instance, **kwargs):
+    # These rows carry no company; looking one up would cost a query per save.
+    dashboard_metrics.invalidate_all_dashboards()
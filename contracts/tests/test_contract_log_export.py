@@ -0,0 +1,141 @@
+"""
+Tests for the streamed contract log exports.
+
+Run with:
+    python manage.py test contracts.tests.test_contract_log_export
+"""
+import csv
+import datetime
+import io
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from contracts.models import (
+    Clin, ClinAcknowledgment, ClinSplit, Company, Contract, ContractStatus, ExportTiming, Note,
+)
+from contracts.services.contract_log_export import EXPORT_HEADERS, ContractLogExport
+from products.models import Nsn
+from suppliers.models import Supplier
+from users.models import UserCompanyMembership
+
+
+@override_settings(REQUIRE_LOGIN=False)
+class ContractLogExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(name='Export Co', slug='export-co')
+        cls.user = User.objects.create_user('exporter', 'exporter@x.com', 'pw')
+        UserCompanyMembership.objects.create(user=cls.user, company=cls.company, is_default=True)
+        status = ContractStatus.objects.create(description='Open')
+        clin_type = ContentType.objects.get_for_model(Clin)
+        supplier = Supplier.objects.create(name='Export Supplier')
+        nsn = Nsn.objects.create(nsn_code='5305-00-000-0001')
+
+        for n in range(3):
+            contract = Contract.objects.create(
+                company=cls.company,
+                contract_number=f'SPE7L1-26-C-EXP{n}',
+                status=status,
+                award_date=datetime.date(2026, 1, 1 + n),
+                contract_value=1000.0 * (n + 1),
+            )
+            for item in ('0001', '0002'):
+                clin = Clin.objects.create(
+                    company=cls.company, contract=contract, item_number=item, supplier=supplier, nsn=nsn,
+                )
+                ClinSplit.objects.create(clin=clin, company_name='ppi', split_paid=Decimal('10.00'))
+                ClinSplit.objects.create(clin=clin, company_name='STATZ', split_paid=Decimal('2.50'))
+                Note.objects.create(content_type=clin_type, object_id=clin.pk, note='n')
+            first = contract.clin_set.get(item_number='0001')
+            ClinAcknowledgment.objects.create(clin=first, po_to_supplier_bool=True, clin_reply_bool=True)
+            ClinAcknowledgment.objects.create(clin=first, po_to_supplier_bool=False)
+
+    def setUp(self):
+        self.client = Client()
+        self.client.login(username='exporter', password='pw')
+        session = self.client.session
+        session['active_company_id'] = self.company.id
+        session.save()
+
+    def _clins(self):
+        return Clin.objects.filter(company=self.company).order_by(
+            'contract__award_date', 'contract__po_number', 'item_number'
+        )
+
+    def test_rows_match_per_row_lookups_across_chunks(self):
+        export = ContractLogExport(self._clins(), 'csv', chunk_size=4)
+        rows = list(export)
+
+        self.assertEqual(export.row_count, 6)
+        self.assertEqual([row.clin.item_number for row in rows], ['0001', '0002'] * 3)
+        self.assertEqual([row.first_for_contract for row in rows], [True, False] * 3)
+        for row in rows:
+            self.assertEqual(row.acknowledgment, row.clin.clinacknowledgment_set.first())
+            self.assertEqual(row.notes_count, 1)
+        # Split totals (case-insensitive company name) land on the first CLIN only.
+        self.assertEqual([row.ppi_split_paid for row in rows], [Decimal('20.00'), 0] * 3)
+        self.assertEqual([row.statz_split_paid for row in rows], [Decimal('5.00'), 0] * 3)
+
+    def test_queries_grow_with_chunks_not_rows(self):
+        with CaptureQueriesContext(connection) as ctx:
+            list(ContractLogExport(self._clins(), 'csv', chunk_size=1000))
+        # ids, then one query each for rows, acknowledgments, notes and splits.
+        self.assertEqual(len(ctx.captured_queries), 5)
+
+    def test_csv_export_streams_and_records_timing(self):
+        response = self.client.get(reverse('contracts:export_contract_log'), {'contract': 'EXP1'})
+
+        self.assertTrue(response.streaming)
+        self.assertFalse(ExportTiming.objects.exists())
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+
+        self.assertEqual(rows[0], EXPORT_HEADERS)
+        self.assertEqual([row[3] for row in rows[1:]], ['SPE7L1-26-C-EXP1'] * 2)
+        first, second = rows[1], rows[2]
+        self.assertEqual(first[10], 'Open PO TO QAR NEEDED;')
+        self.assertEqual(first[27:34], ['$2,000.00', '', '', '$0.00', '$20.00', '$5.00', '1'])
+        self.assertEqual(second[27], '$0.00')
+        timing = ExportTiming.objects.get()
+        self.assertEqual((timing.row_count, timing.export_format), (2, 'csv'))
+        self.assertEqual(timing.filters_applied, {'contract': 'EXP1'})
+
+    def test_xlsx_export(self):
+        from openpyxl import load_workbook
+
+        response = self.client.get(reverse('contracts:export_contract_log_xlsx'))
+        self.assertEqual(response.status_code, 200)
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)))
+        sheet = workbook['MASTER CONTRACT LOG Export']
+
+        self.assertEqual([c.value for c in sheet[4]], EXPORT_HEADERS)
+        self.assertEqual(sheet.max_row, 10)
+        self.assertEqual(sheet.freeze_panes, 'A5')
+        self.assertEqual(sheet.cell(row=5, column=28).value, 1000)
+        self.assertEqual(sheet.cell(row=5, column=28).number_format, '[$$-409]#,##0.00')
+        self.assertEqual(sheet.cell(row=5, column=32).value, 20)
+        self.assertEqual(ExportTiming.objects.get().export_format, 'xlsx')
+
+    def test_estimate_uses_matching_format(self):
+        ExportTiming.objects.create(row_count=100, export_time=1.0, export_format='csv')
+        ExportTiming.objects.create(row_count=100, export_time=10.0, export_format='xlsx')
+
+        response = self.client.get(reverse('contracts:get_export_estimate'), {'rows': 100, 'format': 'xlsx'})
+
+        data = response.json()
+        self.assertAlmostEqual(data['estimated_seconds'], 11.0)
+        self.assertEqual([t['export_time'] for t in data['recent_timings']], [10.0])
+
+    def test_log_page_loads_acknowledgments_once(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('contracts:contract_log_view'), {'page': 1})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'PO TO QAR NEEDED;')
+        acks = [q for q in ctx.captured_queries if 'contracts_clinacknowledgment' in q['sql']]
+        self.assertEqual(len(acks), 1)
@@ -4,13 +4,24 @@ Regression tests for contracts dashboard query safety.
 Run with:
     python manage.py test contracts.tests.test_dashboard_views
 """
+import datetime
+
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db import connection
+from django.db.models import Count, F, Q, Sum
 from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
-from contracts.models import Clin, Company, Contract, ContractStatus
-from contracts.views.dashboard_views import numeric_item_annotation
+from contracts.models import Clin, ClinAcknowledgment, ClinShipment, Company, Contract, ContractStatus
+from contracts.services.dashboard_metrics import (
+    get_dashboard_metrics,
+    numeric_item_annotation,
+    period_date_ranges,
+)
+from contracts.services.due_status import partition_contract_late_status, today
 from suppliers.models import Supplier
 from users.models import UserCompanyMembership
 
@@ -77,3 +88,138 @@ class ActiveSuppliersNonNumericItemNumberTests(TestCase):
             # SQLite CAST coerces leading digits from '0001AA' to 1 (< 99);
             # CI verifies the annotation path does not raise.
             self.assertIn('0001AA', item_numbers)
+
+
+@override_settings(REQUIRE_LOGIN=False)
+class DashboardMetricsTests(TestCase):
+    """The cached per-company snapshot matches the per-period queries it replaced."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(name='Metrics Co', slug='metrics-co')
+        cls.user = User.objects.create_user('metrics', 'metrics@x.com', 'pw')
+        UserCompanyMembership.objects.create(user=cls.user, company=cls.company, is_default=True)
+        cls.open = ContractStatus.objects.create(description='Open')
+        cls.canceled = ContractStatus.objects.create(description='Canceled')
+        cls.today = today()
+        last_year = datetime.date(cls.today.year - 1, 6, 15)
+
+        cls.late = cls._contract('LATE', award_date=cls.today, due_date=cls.today, contract_value=100.0)
+        cls._clin(cls.late, ship_date=cls.today + datetime.timedelta(days=3))
+        cls.ontime = cls._contract('ONTIME', award_date=cls.today, due_date=cls.today, contract_value=250.5)
+        clin = cls._clin(cls.ontime, ship_date=cls.today - datetime.timedelta(days=1))
+        ClinAcknowledgment.objects.create(clin=clin, po_to_supplier_bool=True, clin_reply_bool=False)
+        cls.old = cls._contract('OLD', award_date=last_year, due_date=last_year, contract_value=40.0)
+        clin = cls._clin(cls.old, ship_date=last_year)
+        Clin.objects.filter(pk=clin.pk).update(paid_date=last_year)
+        cls._contract('CANCELED', status=cls.canceled, award_date=cls.today, due_date=cls.today, contract_value=999.0)
+
+    @classmethod
+    def _contract(cls, suffix, status=None, **kwargs):
+        return Contract.objects.create(
+            company=cls.company,
+            contract_number=f'SPE7L1-26-C-{suffix}',
+            status=status or cls.open,
+            **kwargs,
+        )
+
+    @classmethod
+    def _clin(cls, contract, ship_date):
+        clin = Clin.objects.create(
+            company=cls.company, contract=contract, item_number='0001', item_type='P', order_qty=10,
+        )
+        ClinShipment.objects.create(clin=clin, ship_date=ship_date, ship_qty=10)
+        return clin
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = Client()
+        self.client.login(username='metrics', password='pw')
+        session = self.client.session
+        session['active_company_id'] = self.company.id
+        session.save()
+
+    def _legacy_period(self, start, end):
+        base = Contract.objects.filter(company=self.company).exclude(status__description='Canceled')
+        late_ids, not_late_ids = partition_contract_late_status(base.filter(due_date__range=(start, end)))
+        awarded = base.filter(award_date__range=(start, end))
+        return {
+            'contracts_due': len(late_ids | not_late_ids),
+            'contracts_due_late': len(late_ids),
+            'contracts_due_ontime': len(not_late_ids),
+            'new_contract_value': awarded.aggregate(total=Sum('contract_value'))['total'] or 0,
+            'new_contracts': awarded.count(),
+        }
+
+    def test_snapshot_matches_per_period_queries(self):
+        metrics = get_dashboard_metrics(self.company)
+
+        for key, (start, end) in period_date_ranges(timezone.now()).items():
+            period = metrics['periods'][key]
+            legacy = self._legacy_period(start, end)
+            self.assertEqual({name: period[name] for name in legacy if name != 'new_contract_value'},
+                             {name: legacy[name] for name in legacy if name != 'new_contract_value'}, key)
+            self.assertAlmostEqual(period['new_contract_value'], legacy['new_contract_value'], msg=key)
+        self.assertEqual(metrics['periods']['this_week']['contracts_due_late'], 1)
+        self.assertEqual(metrics['periods']['last_year']['new_contracts'], 1)
+
+        company = Contract.objects.filter(company=self.company)
+        self.assertEqual(metrics['stages'], {
+            'pending_acknowledgment': company.filter(
+                clin__clinacknowledgment__po_to_supplier_bool=True,
+                clin__clinacknowledgment__clin_reply_bool=False,
+            ).distinct().count(),
+            'in_production': company.filter(
+                clin__clinacknowledgment__clin_reply_bool=True, clin__ship_date=None,
+            ).distinct().count(),
+            'shipped_not_paid': company.filter(
+                clin__ship_date__isnull=False, clin__paid_date=None,
+            ).distinct().count(),
+            'fully_paid': company.annotate(
+                total_clins=Count('clin'), paid_clins=Count('clin', filter=Q(clin__paid_date__isnull=False)),
+            ).filter(total_clins=F('paid_clins'), total_clins__gt=0).count(),
+        })
+        self.assertEqual(metrics['stages']['pending_acknowledgment'], 1)
+        self.assertEqual(metrics['stages']['fully_paid'], 1)
+
+    def test_warm_dashboard_skips_metric_queries(self):
+        url = reverse('contracts:contracts_dashboard')
+        with CaptureQueriesContext(connection) as cold:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        with CaptureQueriesContext(connection) as warm:
+            response = self.client.get(url)
+
+        self.assertEqual(response.context['periods']['this_week']['contracts_due'], 2)
+        self.assertEqual(response.context['metrics']['open_contracts'], 3)
+        self.assertTrue(any('contracts_clinshipment' in q['sql'] for q in cold.captured_queries))
+        self.assertFalse(any('contracts_clinshipment' in q['sql'] for q in warm.captured_queries))
+        self.assertLessEqual(len(warm.captured_queries), len(cold.captured_queries) - 6)
+
+    def test_contract_save_invalidates_snapshot(self):
+        self.assertEqual(get_dashboard_metrics(self.company)['periods']['this_week']['new_contracts'], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._contract('NEW', award_date=self.today, contract_value=5.0)
+            # The version bump waits for the commit so the cache row is never
+            # locked by the writer's transaction.
+            self.assertEqual(
+                get_dashboard_metrics(self.company)['periods']['this_week']['new_contracts'], 2
+            )
+
+        self.assertEqual(get_dashboard_metrics(self.company)['periods']['this_week']['new_contracts'], 3)
+
+    def test_value_series_served_from_snapshot(self):
+        url = reverse('contracts:dashboard_metric_detail')
+        params = {'metric': 'new_contract_value', 'period': 'this_year'}
+        self.client.get(url, params)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params)
+
+        series = response.context['value_series']
+        self.assertEqual(len(series), 10)
+        self.assertEqual(series[0]['contract_count'], 2)
+        self.assertAlmostEqual(series[0]['total_value'], 350.5)
+        self.assertEqual((series[1]['contract_count'], series[1]['total_value']), (1, 40.0))
+        self.assertFalse(any('GROUP BY' in q['sql'] for q in ctx.captured_queries))
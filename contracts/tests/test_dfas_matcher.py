@@ -0,0 +1,186 @@
+"""
+Tests for the normalized contract-number column and the batch DFAS matcher.
+
+Run with:
+    python manage.py test contracts.tests.test_dfas_matcher
+"""
+import io
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from contracts.models import Clin, ClinShipment, Company, Contract, DfasImportBatch, DfasImportRow
+from contracts.services.dfas_import import rematch_import_batch
+from contracts.services.dfas_matcher import match_dfas_row, match_dfas_rows
+from contracts.services.dfas_parser import ParsedDfasRow
+
+
+def _row(contract_no='', call_no='', clin='0001', voucher='V1', invoice='I1', amount=None, errors=None):
+    return ParsedDfasRow(
+        line_number=1,
+        contract_no=contract_no,
+        call_no=call_no,
+        clin=clin,
+        voucher_no=voucher,
+        invoice_no=invoice,
+        payment_date=None,
+        check_eft_amount=amount,
+        parse_errors=errors or [],
+    )
+
+
+class ContractNumberNormalizedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(name='Norm Co', slug='norm-co')
+
+    def test_save_maintains_column(self):
+        contract = Contract.objects.create(company=self.company, contract_number='spe7l1-26-p 7653')
+        self.assertEqual(contract.contract_number_normalized, 'SPE7L126P7653')
+
+        contract.contract_number = 'W912PB-24-C-0001'
+        contract.save(update_fields=['contract_number'])
+        contract.refresh_from_db()
+        self.assertEqual(contract.contract_number_normalized, 'W912PB24C0001')
+
+    def test_backfill_command_fixes_stale_rows(self):
+        contract = Contract.objects.create(company=self.company, contract_number='SPE7L1-26-P-7653')
+        blank = Contract.objects.create(company=self.company, contract_number=None)
+        Contract.objects.filter(pk=contract.pk).update(contract_number_normalized=None)
+
+        out = io.StringIO()
+        call_command('backfill_contract_number_normalized', stdout=out)
+
+        contract.refresh_from_db()
+        blank.refresh_from_db()
+        self.assertEqual(contract.contract_number_normalized, 'SPE7L126P7653')
+        self.assertIsNone(blank.contract_number_normalized)
+        self.assertIn('1 contract(s)', out.getvalue())
+
+    def test_migration_backfill_matches_match_key(self):
+        from importlib import import_module
+
+        from django.apps import apps
+
+        from contracts.utils.contract_numbers import contract_number_match_key
+
+        migration = import_module('contracts.migrations.0095_contract_contract_number_normalized')
+        numbers = ['SPE7L1-26-P-7653', ' w912pb 24 c-0001 ', None, '---']
+        contracts = [Contract.objects.create(company=self.company, contract_number=n) for n in numbers]
+        Contract.objects.update(contract_number_normalized='stale')
+
+        migration.backfill(apps, None)
+
+        for contract, number in zip(contracts, numbers):
+            contract.refresh_from_db()
+            self.assertEqual(contract.contract_number_normalized, contract_number_match_key(number))
+
+
+class MatchDfasRowsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(name='Batch Match Co', slug='batch-match')
+        other = Company.objects.create(name='Other Co', slug='other-co')
+        cls.user = User.objects.create_user('dfas', 'dfas@x.com', 'pw')
+
+        cls.contract = Contract.objects.create(company=cls.company, contract_number='SPE7L1-26-P-7653')
+        cls.order = Contract.objects.create(company=cls.company, contract_number='SPE4A6-24-F-AR82')
+        cls.no_production = Contract.objects.create(company=cls.company, contract_number='SPE7L1-26-P-0002')
+        Contract.objects.create(company=other, contract_number='SPE7L1-26-P-0003')
+
+        cls.clin = Clin.objects.create(contract=cls.contract, item_number='0001', item_type='P')
+        cls.first_production = Clin.objects.create(contract=cls.order, item_number='0001AA', item_type='P')
+        Clin.objects.create(contract=cls.order, item_number='0002', item_type='P')
+        Clin.objects.create(contract=cls.no_production, item_number='0001', item_type='G')
+
+        older = DfasImportBatch.objects.create(company=cls.company, filename='a.csv', uploaded_by=cls.user)
+        cls.latest = DfasImportBatch.objects.create(company=cls.company, filename='b.csv', uploaded_by=cls.user)
+        for batch in (older, cls.latest):
+            DfasImportRow.objects.create(
+                batch=batch, raw_voucher_no='V9', raw_invoice_no='I9', raw_clin='0001', status='imported',
+            )
+
+    def test_statuses_and_notes(self):
+        rows = [
+            _row(contract_no='SPE7L126P7653'),
+            _row(contract_no='SPE7L126P7653P00001'),
+            _row(contract_no='SPE4A624DAR80', call_no='SPE4A624FAR82P00003', clin=''),
+            _row(contract_no='SPE7L126P7653', clin='0009'),
+            _row(contract_no='SPE7L126P0002', clin=''),
+            _row(contract_no='SPE7L126P0003'),
+            _row(call_no='SPE7L126P9999'),
+            _row(contract_no='SPE7L126P7653', voucher='V9', invoice='I9'),
+            _row(errors=['Payment Date: invalid date']),
+        ]
+        with self.assertLogs('contracts.services.dfas_matcher', level='WARNING'):
+            results = match_dfas_rows(rows + [_row(contract_no='NOT-A-CONTRACT')], company=self.company)
+
+        self.assertEqual(
+            [r.status for r in results],
+            ['matched', 'matched', 'matched', 'clin_missing', 'error', 'contract_missing',
+             'contract_missing', 'duplicate', 'error', 'contract_missing'],
+        )
+        self.assertEqual(results[0].clin, self.clin)
+        self.assertEqual(results[1].contract, self.contract)
+        self.assertEqual(results[2].clin, self.first_production)
+        self.assertIn('auto-selected first production CLIN: 0001AA', results[2].notes)
+        self.assertEqual(results[3].notes, 'CLIN "0009" not found on contract SPE7L1-26-P-7653')
+        self.assertIn('has no production CLINs', results[4].error)
+        self.assertEqual(results[6].notes, 'No contract found for Call No. "SPE7L126P9999"')
+        self.assertEqual(results[7].notes, f'Previously imported in batch #{self.latest.pk} on '
+                                           f'{self.latest.uploaded_at:%Y-%m-%d}')
+        self.assertEqual(results[8].error, 'Payment Date: invalid date')
+        self.assertIn('not a recognized DLA contract number format', results[9].notes)
+
+        for row, result in zip(rows, results):
+            self.assertEqual(match_dfas_row(row, company=self.company), result)
+
+    def test_duplicate_check_keeps_none_apart_from_blank(self):
+        DfasImportRow.objects.create(
+            batch=self.latest, raw_voucher_no='V8', raw_invoice_no='', raw_clin='0001', status='imported',
+        )
+        rows = [
+            _row(contract_no='SPE7L126P7653', voucher='V8', invoice=''),
+            _row(contract_no='SPE7L126P7653', voucher='V8', invoice=None),
+        ]
+
+        results = match_dfas_rows(rows, company=self.company)
+
+        # A None invoice is looked up as NULL, which no stored row holds.
+        self.assertEqual([r.status for r in results], ['duplicate', 'matched'])
+        for row, result in zip(rows, results):
+            self.assertEqual(match_dfas_row(row, company=self.company), result)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        rows = [_row(contract_no='SPE7L126P7653', voucher=f'V{n}') for n in range(50)]
+        rows += [_row(contract_no='SPE4A624FAR82', clin='') for _ in range(50)]
+
+        with CaptureQueriesContext(connection) as ctx:
+            results = match_dfas_rows(rows, company=self.company)
+
+        # Duplicates, contracts, CLINs.
+        self.assertEqual(len(ctx.captured_queries), 3)
+        self.assertEqual({r.status for r in results}, {'matched'})
+
+    def test_rematch_assigns_shipments_in_one_pass(self):
+        ClinShipment.objects.create(clin=self.clin, item_value=Decimal('100.00'))
+        ClinShipment.objects.create(clin=self.clin, item_value=Decimal('250.00'))
+        batch = DfasImportBatch.objects.create(company=self.company, filename='c.csv', uploaded_by=self.user)
+        for voucher, amount in (('V1', Decimal('250.00')), ('V2', Decimal('75.00'))):
+            DfasImportRow.objects.create(
+                batch=batch, raw_contract_no='SPE7L126P7653', raw_clin='0001', raw_voucher_no=voucher,
+                raw_check_eft_amount=amount, status='contract_missing',
+            )
+
+        self.assertEqual(rematch_import_batch(batch=batch, company=self.company), {'updated': 2})
+
+        assigned, ambiguous = batch.rows.order_by('raw_voucher_no')
+        self.assertEqual(assigned.status, 'matched')
+        self.assertEqual(assigned.matched_shipment.item_value, Decimal('250.00'))
+        self.assertEqual(ambiguous.status, 'shipment_missing')
+        self.assertIsNone(ambiguous.matched_shipment)
+        self.assertEqual(batch.unmatched_count, 1)
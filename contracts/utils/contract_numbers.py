@@ -0,0 +1,20 @@
+"""
+Contract-number comparison key, shared by Contract.save() and the DFAS matcher.
+"""
+import re
+from typing import Optional
+
+
+def contract_number_match_key(value: Optional[str]) -> Optional[str]:
+    """
+    The stored comparison form of a contract number
+    (Contract.contract_number_normalized): uppercased, dashes and whitespace
+    removed, without a PIID shape check — every stored value gets a key.
+
+    dfas_matcher.strip_contract_number_dashes() is this key plus the shape
+    check, so the matcher's normalized DFAS values can be looked up against
+    the column directly.
+    """
+    if not value:
+        return None
+    return re.sub(r'[\s\-]', '', str(value).upper()) or None
@@ -1,7 +1,7 @@
 from django.shortcuts import render, redirect
 from django.views.generic import ListView
 from django.utils.decorators import method_decorator
-from django.http import HttpResponse, JsonResponse
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.db.models import Q, F, Value, CharField, Case, When, BooleanField, Exists, OuterRef, Subquery, Max, Count, Sum
 from django.db.models.functions import Concat
 from django.utils import timezone
@@ -10,12 +10,12 @@ import os
 import subprocess
 from django.conf import settings
 import sys
-from decimal import Decimal
-import time
+import tempfile
 from datetime import date as _date_cls
 
 from STATZWeb.decorators import conditional_login_required
-from ..models import Clin, ClinAcknowledgment, ClinSplit, Supplier, ExportTiming, Buyer, ContractType
+from ..models import Clin, ClinSplit, Supplier, ExportTiming, Buyer, ContractType
+from ..services.contract_log_export import EXPORT_HEADERS, ContractLogExport, first_acknowledgments
 
 
 def _apply_log_filters(clins, params, active_company):
@@ -163,8 +163,6 @@ class ContractLogView(ListView):
             'contract__idiq_contract',
             'supplier',
             'nsn'
-        ).prefetch_related(
-            'clinacknowledgment_set',
         ).annotate(
             ppi_split_paid=Subquery(
                 ClinSplit.objects
@@ -238,26 +236,11 @@ class ContractLogView(ListView):
         # Build derived status text for each CLIN (used by UI Contract Status column)
         page_obj = context.get('page_obj')
         if page_obj:
-            def build_status_text(clin):
-                parts = []
-                if getattr(clin.contract, 'status', None) and getattr(clin.contract.status, 'description', ''):
-                    parts.append(clin.contract.status.description)
-                ack = None
-                try:
-                    ack = clin.clinacknowledgment_set.first()
-                except Exception:
-                    ack = None
-                if not (ack and ack.po_to_supplier_bool):
-                    parts.append('PO NOT SENT YET;')
-                if not (ack and ack.clin_reply_bool):
-                    parts.append('SUB REPLY NEEDED;')
-                if not (ack and ack.po_to_qar_bool):
-                    parts.append('PO TO QAR NEEDED;')
-                return ' '.join(parts).strip()
-
+            acknowledgments = first_acknowledgments([clin.pk for clin in page_obj.object_list])
             for clin in page_obj.object_list:
+                clin.first_acknowledgment = acknowledgments.get(clin.pk)
                 try:
-                    clin.contract_status_text = build_status_text(clin)
+                    clin.contract_status_text = _contract_status_text(clin, clin.first_acknowledgment)
                 except Exception:
                     clin.contract_status_text = getattr(clin.contract.status, 'description', '') if getattr(clin, 'contract', None) and getattr(clin.contract, 'status', None) else ''
 
@@ -272,145 +255,162 @@ class ContractLogView(ListView):
         return context
 
 
-@conditional_login_required
-def export_contract_log(request):
-    """Export contract log to CSV with all relevant fields."""
-    start_time = time.time()
-
-    clins = Clin.objects.filter(company=request.active_company).select_related(
-        'contract',
-        'contract__buyer',
-        'contract__contract_type',
-        'contract__status',
-        'contract__idiq_contract',
-        'supplier',
-        'nsn'
-    ).prefetch_related(
-        'clinacknowledgment_set',
-    ).order_by('contract__award_date', 'contract__po_number', 'item_number')
+class _Echo:
+    """File-like object whose write() returns the line, for streaming csv.writer output."""
 
+    def write(self, value):
+        return value
+
+
+def _export_source(request, export_format):
+    clins = Clin.objects.filter(company=request.active_company).order_by(
+        'contract__award_date', 'contract__po_number', 'item_number'
+    )
     clins = _apply_log_filters(clins, request.GET, request.active_company)
     filters_applied = {k: v for k, v in request.GET.items() if k not in ('page', 'per_page') and v}
+    return ContractLogExport(clins, export_format, filters_applied)
+
+
+def _contract_status_text(clin, acknowledgment):
+    parts = []
+    if clin.contract and getattr(clin.contract, 'status', None) and getattr(clin.contract.status, 'description', ''):
+        parts.append(clin.contract.status.description)
+    if not (acknowledgment and acknowledgment.po_to_supplier_bool):
+        parts.append('PO NOT SENT YET;')
+    if not (acknowledgment and acknowledgment.clin_reply_bool):
+        parts.append('SUB REPLY NEEDED;')
+    if not (acknowledgment and acknowledgment.po_to_qar_bool):
+        parts.append('PO TO QAR NEEDED;')
+    return ' '.join(parts).strip()
+
+
+def _open_status_char(clin):
+    if clin.contract and clin.contract.status and getattr(clin.contract.status, 'description', '') == 'Canceled':
+        return 'X'
+    if clin.contract and clin.contract.date_closed:
+        return 'C'
+    return 'O'
+
+
+def _terms_text(clin):
+    terms = getattr(clin.contract, 'special_payment_terms', None) if getattr(clin, 'contract', None) else None
+    if terms is None:
+        return ''
+    return getattr(terms, 'terms', None) or getattr(terms, 'code', '') or ''
+
+
+def _csv_row(row):
+    clin = row.clin
+    acknowledgment = row.acknowledgment
+    first_for_contract = row.first_for_contract
+    qty_uom = f"{clin.order_qty:g} {clin.uom or 'ea'}" if clin.order_qty not in (None, '') else ''
+    return [
+        _open_status_char(clin),
+        clin.po_number or clin.clin_po_num or (clin.contract.po_number if clin.contract else ''),
+        (clin.contract.idiq_contract.contract_number if clin.contract and clin.contract.idiq_contract else ''),
+        clin.contract.contract_number if clin.contract else '',
+        clin.contract.buyer.description if clin.contract and clin.contract.buyer else '',
+        clin.contract.contract_type.description if clin.contract and clin.contract.contract_type else '',
+        clin.item_number or '',
+        clin.supplier.name if clin.supplier else '',
+        clin.supplier.cage_code if clin.supplier else '',
+        clin.contract.award_date.strftime('%m/%d/%Y') if clin.contract and clin.contract.award_date else '',
+        _contract_status_text(clin, acknowledgment),
+        clin.nsn.nsn_code if clin.nsn else '',
+        clin.nsn.description if clin.nsn else '',
+        clin.ia or '',
+        '1' if acknowledgment and acknowledgment.po_to_supplier_bool else '0',
+        '1' if acknowledgment and acknowledgment.clin_reply_bool else '0',
+        '1' if acknowledgment and acknowledgment.po_to_qar_bool else '0',
+        clin.fob or '',
+        clin.supplier_due_date.strftime('%m/%d/%Y') if clin.supplier_due_date else '',
+        clin.due_date.strftime('%m/%d/%Y') if clin.due_date else '',
+        qty_uom,
+        clin.ship_date.strftime('%m/%d/%Y') if clin.ship_date else '',
+        f"{clin.ship_qty:g}" if clin.ship_qty not in (None, '') else '',
+        f"${clin.quote_value:,.2f}" if clin.quote_value else '',
+        f"${clin.paid_amount:,.2f}" if clin.paid_amount else '',
+        f"${clin.item_value:,.2f}" if clin.item_value else '',
+        _terms_text(clin),
+        f"${clin.contract.contract_value:,.2f}" if (first_for_contract and clin.contract and clin.contract.contract_value) else '$0.00',
+        f"${clin.wawf_payment:,.2f}" if clin.wawf_payment else '',
+        clin.wawf_recieved.strftime('%m/%d/%Y') if clin.wawf_recieved else '',
+        f"${clin.contract.plan_gross:,.2f}" if (first_for_contract and clin.contract and clin.contract.plan_gross is not None) else '$0.00',
+        f"${row.ppi_split_paid:,.2f}" if (first_for_contract and row.ppi_split_paid) else '$0.00',
+        f"${row.statz_split_paid:,.2f}" if (first_for_contract and row.statz_split_paid) else '$0.00',
+        row.notes_count,
+    ]
 
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="contract_log.csv"'
 
-    writer = csv.writer(response)
-    writer.writerow([
-        'Open', 'PO #', 'IDIQ Contract #', 'Contract', 'Buyer', 'Type', 'CLIN #',
-        'Supplier', 'Cage Code', 'Award Date', 'Contract Status', 'NSN', 'Item Description',
-        'I&A', 'PO to Sub', 'Sub Reply', 'PO to QAR', 'FOB', 'QDD', 'CDD', 'Qty / UOM',
-        'Ship Date', 'Ship Qty', 'Sub PO $', 'Sub Paid $', 'Item Value', 'Terms', 'Contract $',
-        'Customer Payment $', 'Date Pay Recv', 'Plan Gross $', 'Actual Paid PPI $', 'Actual STATZ $',
-        'Notes'
-    ])
-
-    total_rows = clins.count()
-    seen_contracts = set()
-
-    for clin in clins:
-        acknowledgment = clin.clinacknowledgment_set.first()
-        first_for_contract = clin.contract_id not in seen_contracts
-        if first_for_contract:
-            seen_contracts.add(clin.contract_id)
-
-        if clin.contract and clin.contract.status and getattr(clin.contract.status, 'description', '') == 'Canceled':
-            first_col_status = 'X'
-        elif clin.contract and clin.contract.date_closed:
-            first_col_status = 'C'
-        else:
-            first_col_status = 'O'
-
-        po_num = clin.po_number or clin.clin_po_num or (clin.contract.po_number if clin.contract else '')
-
-        terms_text = ''
-        c_terms = getattr(clin.contract, 'special_payment_terms', None) if getattr(clin, 'contract', None) else None
-        if c_terms is not None:
-            terms_text = getattr(c_terms, 'terms', None) or getattr(c_terms, 'code', '') or ''
-
-        status_parts = []
-        if clin.contract and getattr(clin.contract, 'status', None) and getattr(clin.contract.status, 'description', ''):
-            status_parts.append(clin.contract.status.description)
-        if not (acknowledgment and acknowledgment.po_to_supplier_bool):
-            status_parts.append('PO NOT SENT YET;')
-        if not (acknowledgment and acknowledgment.clin_reply_bool):
-            status_parts.append('SUB REPLY NEEDED;')
-        if not (acknowledgment and acknowledgment.po_to_qar_bool):
-            status_parts.append('PO TO QAR NEEDED;')
-        contract_status_text = ' '.join(status_parts).strip()
-
-        ppi_split_paid = Decimal('0')
-        statz_split_paid = Decimal('0')
-        if clin.contract_id and first_for_contract:
-            ppi_split_paid = (
-                ClinSplit.objects.filter(
-                    clin__contract_id=clin.contract_id,
-                    company_name__iexact='PPI',
-                ).aggregate(t=Sum('split_paid'))['t'] or Decimal('0')
-            )
-            statz_split_paid = (
-                ClinSplit.objects.filter(
-                    clin__contract_id=clin.contract_id,
-                    company_name__iexact='STATZ',
-                ).aggregate(t=Sum('split_paid'))['t'] or Decimal('0')
-            )
-
-        qty_uom = f"{clin.order_qty:g} {clin.uom or 'ea'}" if clin.order_qty not in (None, '') else ''
-
-        writer.writerow([
-            first_col_status,
-            po_num,
-            (clin.contract.idiq_contract.contract_number if clin.contract and clin.contract.idiq_contract else ''),
-            clin.contract.contract_number if clin.contract else '',
-            clin.contract.buyer.description if clin.contract and clin.contract.buyer else '',
-            clin.contract.contract_type.description if clin.contract and clin.contract.contract_type else '',
-            clin.item_number or '',
-            clin.supplier.name if clin.supplier else '',
-            clin.supplier.cage_code if clin.supplier else '',
-            clin.contract.award_date.strftime('%m/%d/%Y') if clin.contract and clin.contract.award_date else '',
-            contract_status_text,
-            clin.nsn.nsn_code if clin.nsn else '',
-            clin.nsn.description if clin.nsn else '',
-            clin.ia or '',
-            '1' if acknowledgment and acknowledgment.po_to_supplier_bool else '0',
-            '1' if acknowledgment and acknowledgment.clin_reply_bool else '0',
-            '1' if acknowledgment and acknowledgment.po_to_qar_bool else '0',
-            clin.fob or '',
-            clin.supplier_due_date.strftime('%m/%d/%Y') if clin.supplier_due_date else '',
-            clin.due_date.strftime('%m/%d/%Y') if clin.due_date else '',
-            qty_uom,
-            clin.ship_date.strftime('%m/%d/%Y') if clin.ship_date else '',
-            f"{clin.ship_qty:g}" if clin.ship_qty not in (None, '') else '',
-            f"${clin.quote_value:,.2f}" if clin.quote_value else '',
-            f"${clin.paid_amount:,.2f}" if clin.paid_amount else '',
-            f"${clin.item_value:,.2f}" if clin.item_value else '',
-            terms_text,
-            f"${clin.contract.contract_value:,.2f}" if (first_for_contract and clin.contract and clin.contract.contract_value) else '$0.00',
-            f"${clin.wawf_payment:,.2f}" if clin.wawf_payment else '',
-            clin.wawf_recieved.strftime('%m/%d/%Y') if clin.wawf_recieved else '',
-            f"${clin.contract.plan_gross:,.2f}" if (first_for_contract and clin.contract and clin.contract.plan_gross is not None) else '$0.00',
-            f"${ppi_split_paid:,.2f}" if (first_for_contract and ppi_split_paid) else '$0.00',
-            f"${statz_split_paid:,.2f}" if (first_for_contract and statz_split_paid) else '$0.00',
-            clin.notes.count()
-        ])
-
-    end_time = time.time()
-    ExportTiming.objects.create(
-        row_count=total_rows,
-        export_time=(end_time - start_time),
-        filters_applied=filters_applied
-    )
+def _xlsx_row(row):
+    clin = row.clin
+    ack = row.acknowledgment
+    first_for_contract = row.first_for_contract
+    qty_uom = f"{float(clin.order_qty):g} {clin.uom or 'ea'}" if clin.order_qty not in (None, '') else ''
+    return [
+        _open_status_char(clin),
+        (clin.po_number or clin.clin_po_num or (clin.contract.po_number if clin.contract else '')),
+        (clin.contract.idiq_contract.contract_number if clin.contract and clin.contract.idiq_contract else ''),
+        clin.contract.contract_number if clin.contract else '',
+        clin.contract.buyer.description if clin.contract and clin.contract.buyer else '',
+        clin.contract.contract_type.description if clin.contract and clin.contract.contract_type else '',
+        clin.item_number or '',
+        clin.supplier.name if clin.supplier else '',
+        clin.supplier.cage_code if clin.supplier else '',
+        clin.contract.award_date.strftime('%m/%d/%Y') if clin.contract and clin.contract.award_date else '',
+        _contract_status_text(clin, ack),
+        clin.nsn.nsn_code if clin.nsn else '',
+        clin.nsn.description if clin.nsn else '',
+        clin.ia or '',
+        1 if (ack and ack.po_to_supplier_bool) else 0,
+        1 if (ack and ack.clin_reply_bool) else 0,
+        1 if (ack and ack.po_to_qar_bool) else 0,
+        clin.fob or '',
+        clin.supplier_due_date.strftime('%m/%d/%Y') if clin.supplier_due_date else '',
+        clin.due_date.strftime('%m/%d/%Y') if clin.due_date else '',
+        qty_uom,
+        clin.ship_date.strftime('%m/%d/%Y') if clin.ship_date else '',
+        float(clin.ship_qty) if clin.ship_qty not in (None, '') else '',
+        float(clin.quote_value) if clin.quote_value else '',
+        float(clin.paid_amount) if clin.paid_amount else '',
+        float(clin.item_value) if clin.item_value else '',
+        _terms_text(clin),
+        float(clin.contract.contract_value) if (first_for_contract and clin.contract and clin.contract.contract_value) else 0.0,
+        float(clin.wawf_payment) if clin.wawf_payment else '',
+        clin.wawf_recieved.strftime('%m/%d/%Y') if clin.wawf_recieved else '',
+        float(clin.contract.plan_gross) if (first_for_contract and clin.contract and clin.contract.plan_gross is not None) else 0.0,
+        float(row.ppi_split_paid) if (first_for_contract and row.ppi_split_paid) else 0.0,
+        float(row.statz_split_paid) if (first_for_contract and row.statz_split_paid) else 0.0,
+        int(row.notes_count),
+    ]
+
 
+@conditional_login_required
+def export_contract_log(request):
+    """Export contract log to CSV with all relevant fields, streamed chunk by chunk."""
+    export = _export_source(request, 'csv')
+    writer = csv.writer(_Echo())
+
+    def lines():
+        yield writer.writerow(EXPORT_HEADERS)
+        for row in export:
+            yield writer.writerow(_csv_row(row))
+        # Timed when the last row is written, not when the response starts.
+        export.finish()
+
+    response = StreamingHttpResponse(lines(), content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="contract_log.csv"'
     return response
 
 
 @conditional_login_required
 def export_contract_log_xlsx(request):
     """Export contract log to XLSX with workbook-like structure."""
-    start_time = time.time()
     try:
         from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+        from openpyxl.utils import get_column_letter
     except Exception as e:
         return HttpResponse(
             f"Missing dependency for XLSX export: {e}. Please install 'openpyxl'.",
@@ -418,31 +418,26 @@ def export_contract_log_xlsx(request):
             content_type='text/plain'
         )
 
-    clins = Clin.objects.filter(company=request.active_company).select_related(
-        'contract',
-        'contract__buyer',
-        'contract__contract_type',
-        'contract__status',
-        'contract__idiq_contract',
-        'contract__special_payment_terms',
-        'supplier',
-        'nsn'
-    ).prefetch_related(
-        'clinacknowledgment_set',
-    ).order_by('contract__award_date', 'contract__po_number', 'item_number')
-
-    clins = _apply_log_filters(clins, request.GET, request.active_company)
-    filters_applied = {k: v for k, v in request.GET.items() if k not in ('page', 'per_page') and v}
+    export = _export_source(request, 'xlsx')
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = 'MASTER CONTRACT LOG Export'
+    # Write-only mode streams rows to a temporary file instead of holding
+    # every cell in memory; column widths and panes must be set up front.
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('MASTER CONTRACT LOG Export')
 
     bold = Font(bold=True)
     header_fill = PatternFill('solid', fgColor='F2F2F2')
     center = Alignment(horizontal='center', vertical='center')
     thin = Side(border_style='thin', color='DDDDDD')
     border = Border(top=thin, left=thin, right=thin, bottom=thin)
+    currency_fmt = '[$$-409]#,##0.00'
+
+    headers = EXPORT_HEADERS
+    widths = [6, 10, 18, 18, 14, 12, 8, 24, 10, 12, 26, 12, 24, 8, 10, 10, 10, 8, 10, 10, 10, 10, 10, 12, 12, 12, 12, 14, 14, 14, 14, 14, 14, 30]
+    for i in range(1, len(headers) + 1):
+        w = widths[i - 1] if i - 1 < len(widths) else 12
+        ws.column_dimensions[get_column_letter(i)].width = w
+    ws.freeze_panes = 'A5'
 
     company_name = getattr(getattr(request, 'active_company', None), 'name', 'STATZ Corporation')
     ws.append([company_name])
@@ -451,162 +446,57 @@ def export_contract_log_xlsx(request):
     ws.append([f"Government Contracting Log - Master List", '', '', f"Export @ {now.strftime('%I:%M:%S %p')}"])
     ws.append([])
 
-    headers = [
-        'Open', 'PO #', 'IDIQ Contract #', 'Contract', 'Buyer', 'Type', 'CLIN #',
-        'Supplier', 'Cage Code', 'Award Date', 'Contract Status', 'NSN', 'Item Description',
-        'I&A', 'PO to Sub', 'Sub Reply', 'PO to QAR', 'FOB', 'QDD', 'CDD', 'Qty / UOM',
-        'Ship Date', 'Ship Qty', 'Sub PO $', 'Sub Paid $', 'Item Value', 'Terms', 'Contract $',
-        'Customer Payment $', 'Date Pay Recv', 'Plan Gross $', 'Actual Paid PPI $', 'Actual STATZ $',
-        'Notes'
-    ]
-    ws.append(headers)
-    for col in range(1, len(headers) + 1):
-        c = ws.cell(row=4, column=col)
+    header_cells = []
+    for title in headers:
+        c = WriteOnlyCell(ws, value=title)
         c.font = bold
         c.fill = header_fill
         c.alignment = center
         c.border = border
+        header_cells.append(c)
+    ws.append(header_cells)
 
-    seen_contracts = set()
     # 1-indexed columns for currency formatting:
     # Sub PO$(24), Sub Paid$(25), Item Value(26), Contract$(28), Customer Pay$(29),
     # Plan Gross$(31), PPI$(32), STATZ$(33)
     money_cols = {24, 25, 26, 28, 29, 31, 32, 33}
 
-    for clin in clins:
-        ack = clin.clinacknowledgment_set.first()
-        first_for_contract = clin.contract_id not in seen_contracts
-        if first_for_contract:
-            seen_contracts.add(clin.contract_id)
-
-        ppi_split_paid = Decimal('0')
-        statz_split_paid = Decimal('0')
-        if clin.contract_id and first_for_contract:
-            ppi_split_paid = (
-                ClinSplit.objects.filter(
-                    clin__contract_id=clin.contract_id,
-                    company_name__iexact='PPI',
-                ).aggregate(t=Sum('split_paid'))['t'] or Decimal('0')
-            )
-            statz_split_paid = (
-                ClinSplit.objects.filter(
-                    clin__contract_id=clin.contract_id,
-                    company_name__iexact='STATZ',
-                ).aggregate(t=Sum('split_paid'))['t'] or Decimal('0')
-            )
-
-        if clin.contract and clin.contract.status and getattr(clin.contract.status, 'description', '') == 'Canceled':
-            status_char = 'X'
-        elif clin.contract and clin.contract.date_closed:
-            status_char = 'C'
-        else:
-            status_char = 'O'
-
-        parts = []
-        if clin.contract and getattr(clin.contract, 'status', None) and getattr(clin.contract.status, 'description', ''):
-            parts.append(clin.contract.status.description)
-        if not (ack and ack.po_to_supplier_bool):
-            parts.append('PO NOT SENT YET;')
-        if not (ack and ack.clin_reply_bool):
-            parts.append('SUB REPLY NEEDED;')
-        if not (ack and ack.po_to_qar_bool):
-            parts.append('PO TO QAR NEEDED;')
-        status_text = ' '.join(parts).strip()
-
-        terms = ''
-        if clin.contract and getattr(clin.contract, 'special_payment_terms', None):
-            spt = clin.contract.special_payment_terms
-            terms = getattr(spt, 'terms', None) or getattr(spt, 'code', '') or ''
-
-        qty_uom = f"{float(clin.order_qty):g} {clin.uom or 'ea'}" if clin.order_qty not in (None, '') else ''
-
-        row = [
-            status_char,
-            (clin.po_number or clin.clin_po_num or (clin.contract.po_number if clin.contract else '')),
-            (clin.contract.idiq_contract.contract_number if clin.contract and clin.contract.idiq_contract else ''),
-            clin.contract.contract_number if clin.contract else '',
-            clin.contract.buyer.description if clin.contract and clin.contract.buyer else '',
-            clin.contract.contract_type.description if clin.contract and clin.contract.contract_type else '',
-            clin.item_number or '',
-            clin.supplier.name if clin.supplier else '',
-            clin.supplier.cage_code if clin.supplier else '',
-            clin.contract.award_date.strftime('%m/%d/%Y') if clin.contract and clin.contract.award_date else '',
-            status_text,
-            clin.nsn.nsn_code if clin.nsn else '',
-            clin.nsn.description if clin.nsn else '',
-            clin.ia or '',
-            1 if (ack and ack.po_to_supplier_bool) else 0,
-            1 if (ack and ack.clin_reply_bool) else 0,
-            1 if (ack and ack.po_to_qar_bool) else 0,
-            clin.fob or '',
-            clin.supplier_due_date.strftime('%m/%d/%Y') if clin.supplier_due_date else '',
-            clin.due_date.strftime('%m/%d/%Y') if clin.due_date else '',
-            qty_uom,
-            clin.ship_date.strftime('%m/%d/%Y') if clin.ship_date else '',
-            float(clin.ship_qty) if clin.ship_qty not in (None, '') else '',
-            float(clin.quote_value) if clin.quote_value else '',
-            float(clin.paid_amount) if clin.paid_amount else '',
-            float(clin.item_value) if clin.item_value else '',
-            terms,
-            float(clin.contract.contract_value) if (first_for_contract and clin.contract and clin.contract.contract_value) else 0.0,
-            float(clin.wawf_payment) if clin.wawf_payment else '',
-            clin.wawf_recieved.strftime('%m/%d/%Y') if clin.wawf_recieved else '',
-            float(clin.contract.plan_gross) if (first_for_contract and clin.contract and clin.contract.plan_gross is not None) else 0.0,
-            float(ppi_split_paid) if (first_for_contract and ppi_split_paid) else 0.0,
-            float(statz_split_paid) if (first_for_contract and statz_split_paid) else 0.0,
-            int(clin.notes.count())
-        ]
-        ws.append(row)
-        r = ws.max_row
-        for c in range(1, len(headers) + 1):
-            ws.cell(row=r, column=c).border = border
-
-    from openpyxl.utils import get_column_letter
-    widths = [6, 10, 18, 18, 14, 12, 8, 24, 10, 12, 26, 12, 24, 8, 10, 10, 10, 8, 10, 10, 10, 10, 10, 12, 12, 12, 12, 14, 14, 14, 14, 14, 14, 30]
-    for i in range(1, len(headers) + 1):
-        try:
-            w = widths[i - 1] if i - 1 < len(widths) else 12
-            ws.column_dimensions[get_column_letter(i)].width = w
-        except Exception:
-            pass
-
-    currency_fmt = '[$$-409]#,##0.00'
-    for row in ws.iter_rows(min_row=5, min_col=1, max_col=len(headers), max_row=ws.max_row):
-        for idx, cell in enumerate(row, start=1):
-            if idx in money_cols and isinstance(cell.value, (int, float)):
-                cell.number_format = currency_fmt
-
-    ws.freeze_panes = 'A5'
-
-    from io import BytesIO
-    buff = BytesIO()
+    for row in export:
+        cells = []
+        for idx, value in enumerate(_xlsx_row(row), start=1):
+            c = WriteOnlyCell(ws, value=value)
+            c.border = border
+            if idx in money_cols and isinstance(value, (int, float)):
+                c.number_format = currency_fmt
+            cells.append(c)
+        ws.append(cells)
+
+    # The zip is written to a temporary file and streamed from there.
+    buff = tempfile.TemporaryFile()
     wb.save(buff)
     buff.seek(0)
+    export.finish()
 
-    response = HttpResponse(
-        buff.getvalue(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    return FileResponse(
+        buff,
+        as_attachment=True,
+        filename='contract_log.xlsx',
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
     )
-    response['Content-Disposition'] = 'attachment; filename="contract_log.xlsx"'
-
-    end_time = time.time()
-    ExportTiming.objects.create(
-        row_count=clins.count(),
-        export_time=(end_time - start_time),
-        filters_applied=filters_applied
-    )
-
-    return response
 
 
 @conditional_login_required
 def get_export_estimate(request):
     """Get estimated export time based on row count."""
     row_count = int(request.GET.get('rows', 0))
-    estimated_time = ExportTiming.get_estimated_time(row_count)
+    export_format = request.GET.get('format', '')
+    estimated_time = ExportTiming.get_estimated_time(row_count, export_format)
+    recent = ExportTiming.objects.order_by('-timestamp')
+    if export_format:
+        recent = recent.filter(export_format=export_format)
     return JsonResponse({
         'estimated_seconds': estimated_time,
-        'recent_timings': list(ExportTiming.objects.values('row_count', 'export_time', 'timestamp')[:5])
+        'recent_timings': list(recent.values('row_count', 'export_time', 'timestamp')[:5])
     })
 
 
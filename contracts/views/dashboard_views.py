@@ -2,9 +2,7 @@ from django.shortcuts import render
 from django.views.generic import TemplateView
 from django.utils.decorators import method_decorator
 from django.utils import timezone
-from django.db import connection
-from django.db.models import Q, Count, Sum, F, Value, CharField, IntegerField, OuterRef, Subquery, Func
-from django.db.models.functions import Cast, Coalesce
+from django.db.models import Sum, OuterRef, Prefetch, Subquery
 from django.utils.safestring import mark_safe
 from datetime import timedelta, datetime
 import calendar
@@ -12,8 +10,13 @@ from django.http import Http404
 
 from STATZWeb.decorators import conditional_login_required
 from ..models import Contract, Clin, Reminder, CanceledReason
+from ..services.dashboard_metrics import (
+    PERIOD_KEYS,
+    award_totals,
+    get_dashboard_metrics,
+    get_period_boundaries,
+)
 from ..services.due_status import (
-    contract_past_due_q,
     partition_contract_late_status,
     today,
 )
@@ -22,90 +25,6 @@ import csv
 from django.http import HttpResponse
 
 
-class TryCastInteger(Func):
-    """
-    SQL Server's TRY_CAST returns NULL on failed conversion instead of
-    raising a DataError, unlike CAST. Use this for any varchar->int
-    annotation on fields known to contain non-numeric values (e.g.
-    Clin.item_number, which can hold values like '0001AA').
-
-    SQLite (used in CI) does not support TRY_CAST and does not need it,
-    since SQLite's CAST silently coerces invalid strings rather than
-    raising — see `numeric_item_annotation()` below for the vendor guard.
-    """
-    function = 'TRY_CAST'
-    template = '%(function)s(%(expressions)s AS int)'
-    output_field = IntegerField()
-
-
-def numeric_item_annotation():
-    """
-    Returns the correct Cast/TryCast expression for converting
-    Clin.item_number (CharField) to an integer, depending on DB vendor.
-
-    SQL Server: uses TRY_CAST, which returns NULL instead of raising
-    DataError 22018 on non-numeric values like '0001AA'.
-    SQLite (CI): falls back to standard Cast, since TRY_CAST is not
-    a SQLite function and SQLite's CAST does not raise on bad input.
-    """
-    if connection.vendor == 'microsoft':
-        return TryCastInteger('item_number')
-    return Cast('item_number', output_field=IntegerField())
-
-
-def get_period_boundaries(now):
-    """Return start/end datetimes for all dashboard periods."""
-    now = timezone.localtime(now)
-    this_week_start = now - timedelta(days=now.weekday())
-    this_week_end = this_week_start + timedelta(days=6)
-    last_week_start = this_week_start - timedelta(weeks=1)
-    last_week_end = last_week_start + timedelta(days=6)
-
-    this_month_start = now.replace(day=1)
-    this_month_end = now.replace(day=calendar.monthrange(now.year, now.month)[1])
-
-    if now.month == 1:
-        last_month_start = now.replace(year=now.year-1, month=12, day=1)
-        last_month_end = now.replace(year=now.year-1, month=12, day=31)
-    else:
-        last_month_start = now.replace(month=now.month-1, day=1)
-        last_month_end = now.replace(month=now.month-1, day=calendar.monthrange(now.year, now.month-1)[1])
-
-    current_quarter = (now.month - 1) // 3
-    this_quarter_start = now.replace(month=current_quarter * 3 + 1, day=1)
-    this_quarter_end = now.replace(
-        month=min(12, (current_quarter + 1) * 3),
-        day=calendar.monthrange(now.year, min(12, (current_quarter + 1) * 3))[1]
-    )
-
-    if current_quarter == 0:
-        last_quarter_start = now.replace(year=now.year - 1, month=10, day=1)
-        last_quarter_end = now.replace(year=now.year - 1, month=12, day=31)
-    else:
-        last_quarter_start = now.replace(month=((current_quarter - 1) * 3) + 1, day=1)
-        last_quarter_month = min(12, current_quarter * 3)
-        last_quarter_end = now.replace(
-            month=last_quarter_month,
-            day=calendar.monthrange(now.year, last_quarter_month)[1]
-        )
-
-    this_year_start = now.replace(month=1, day=1)
-    this_year_end = now.replace(month=12, day=31)
-    last_year_start = this_year_start.replace(year=this_year_start.year-1)
-    last_year_end = last_year_start.replace(month=12, day=31)
-
-    return {
-        'this_week': (this_week_start, this_week_end),
-        'last_week': (last_week_start, last_week_end),
-        'this_month': (this_month_start, this_month_end),
-        'last_month': (last_month_start, last_month_end),
-        'this_quarter': (this_quarter_start, this_quarter_end),
-        'last_quarter': (last_quarter_start, last_quarter_end),
-        'this_year': (this_year_start, this_year_end),
-        'last_year': (last_year_start, last_year_end),
-    }
-
-
 def get_dashboard_metric_queryset(request, metric, period):
     """
     Shared utility to build the filtered contract queryset and ranges for a metric/period.
@@ -181,15 +100,15 @@ class ContractLifecycleDashboardView(TemplateView):
                 status__description__in=['Open'],
                 company=self.request.active_company,
             ).select_related('idiq_contract', 'status').prefetch_related(
-                'clin_set',
-                'clin_set__supplier',
+                Prefetch('clin_set', queryset=Clin.objects.select_related('supplier').order_by('id')),
             ).order_by('-award_date')[:20]
         
         # Prepare the data for rendering or serialization
         contracts_data = []
         for contract in last_20_contracts:
             # Get the first CLIN with clin_type_id=1 for this contract
-            first_clin = contract.clin_set.select_related('supplier').first()
+            clins = contract.clin_set.all()
+            first_clin = clins[0] if clins else None
             
             contract_data = {
                 'id': contract.id,
@@ -221,7 +140,6 @@ class ContractLifecycleDashboardView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['cancel_reasons'] = CanceledReason.objects.all()
-        now = timezone.now()
         today_date = today()
 
         # Get user's dashboard view preference
@@ -232,114 +150,36 @@ class ContractLifecycleDashboardView(TemplateView):
         )
         context['dashboard_view'] = dashboard_view
 
-        # Get total contracts
-        total_contracts = Contract.objects.filter(date_canceled__isnull=True, status__description='Open', company=self.request.active_company).count()
-        context['total_contracts'] = total_contracts
-        
-        period_boundaries = get_period_boundaries(now)
-
-        # Helper function to get stats for a time period
-        def get_period_stats(start_date, end_date=None):
-            if not end_date:
-                end_date = now
-
-            # Normalize to full-day boundaries so dashboard counts
-            # match the metric-detail view (which also uses full days).
-            start_date = DashboardMetricDetailView._start_end_of_day(start_date)[0]
-            end_date = DashboardMetricDetailView._start_end_of_day(end_date)[1]
-
-            past_contracts = Contract.objects.filter(
-                company=self.request.active_company,
-                due_date__range=(start_date, end_date),
-            ).exclude(status__description='Canceled')
-            contracts = Contract.objects.filter(
-                company=self.request.active_company,
-                award_date__range=(start_date, end_date),
-            ).exclude(status__description='Canceled')
-            clins = Clin.objects.filter(
-                company=self.request.active_company,
-                contract__award_date__range=(start_date, end_date),
-            ).exclude(contract__status__description='Canceled')
-
-            late_ids, not_late_ids = partition_contract_late_status(past_contracts)
-            return {
-                'contracts_due': len(late_ids | not_late_ids),
-                'contracts_due_late': len(late_ids),
-                'contracts_due_ontime': len(not_late_ids),
-                'new_contract_value': contracts.aggregate(total=Sum('contract_value'))['total'] or 0,
-                'new_contracts': contracts.distinct().count(),
-                'date_range': mark_safe(f"{start_date.strftime('%Y/%m/%d')} to<br>{end_date.strftime('%Y/%m/%d')}"),
+        # Period buckets, stage counts and breakdowns come from one cached
+        # snapshot per company (services/dashboard_metrics.py).
+        metrics = get_dashboard_metrics(self.request.active_company)
+        counts = metrics['counts']
+        context['total_contracts'] = counts['total_contracts']
+
+        periods = {}
+        for key in PERIOD_KEYS:
+            stats = metrics['periods'][key]
+            periods[key] = {
+                'contracts_due': stats['contracts_due'],
+                'contracts_due_late': stats['contracts_due_late'],
+                'contracts_due_ontime': stats['contracts_due_ontime'],
+                'new_contract_value': stats['new_contract_value'],
+                'new_contracts': stats['new_contracts'],
+                'date_range': mark_safe(f"{stats['start'].strftime('%Y/%m/%d')} to<br>{stats['end'].strftime('%Y/%m/%d')}"),
             }
-        
-        # Get stats for each time period
-        periods = {
-            key: get_period_stats(*period_boundaries[key])
-            for key in [
-                'this_week',
-                'last_week',
-                'this_month',
-                'last_month',
-                'this_quarter',
-                'last_quarter',
-                'this_year',
-                'last_year',
-            ]
-        }
 
         context['periods'] = periods
         context['contracts'] = self.get_contracts()
-        
-        # Get all active contracts (not cancelled and not closed)
-        active_contracts = Contract.objects.filter(
-            ~Q(status__description='Canceled') & ~Q(status__description='Closed'), company=self.request.active_company)
-        
+
         # Contracts by stage
-        context['new_contracts'] = active_contracts.filter(
-            award_date__gte=timezone.now() - timedelta(days=30)
-        ).count()
-        
-        # Contracts with CLINs that have acknowledgments pending
-        contracts_with_pending_acks = Contract.objects.filter(
-            clin__clinacknowledgment__po_to_supplier_bool=True,
-            clin__clinacknowledgment__clin_reply_bool=False,
-            company=self.request.active_company
-        ).distinct().count()
-        context['pending_acknowledgment'] = contracts_with_pending_acks
-        
-        # Contracts with CLINs that are in production (acknowledged but not shipped)
-        contracts_in_production = Contract.objects.filter(
-            clin__clinacknowledgment__clin_reply_bool=True,
-            clin__ship_date=None,
-            company=self.request.active_company
-        ).distinct().count()
-        context['in_production'] = contracts_in_production
-        
-        # Contracts with CLINs that are shipped but not paid
-        contracts_shipped_not_paid = Contract.objects.filter(
-            clin__ship_date__isnull=False,
-            clin__paid_date=None,
-            company=self.request.active_company
-        ).distinct().count()
-        context['shipped_not_paid'] = contracts_shipped_not_paid
-        
-        # Contracts with all CLINs paid
-        contracts_all_paid = Contract.objects.filter(company=self.request.active_company).annotate(
-            total_clins=Count('clin'),
-            paid_clins=Count('clin', filter=Q(clin__paid_date__isnull=False))
-        ).filter(
-            total_clins=F('paid_clins'),
-            total_clins__gt=0
-        ).count()
-        context['fully_paid'] = contracts_all_paid
-        
-        # Contracts with upcoming due dates
-        context['due_soon'] = active_contracts.filter(
-            due_date__range=[today_date, today_date + timedelta(days=14)]
-        ).count()
-        
-        # Contracts that are past due
-        context['past_due'] = active_contracts.filter(contract_past_due_q(today_date)).count()
-        
+        context['new_contracts'] = counts['new_contracts']
+        context['pending_acknowledgment'] = metrics['stages']['pending_acknowledgment']
+        context['in_production'] = metrics['stages']['in_production']
+        context['shipped_not_paid'] = metrics['stages']['shipped_not_paid']
+        context['fully_paid'] = metrics['stages']['fully_paid']
+        context['due_soon'] = counts['due_soon']
+        context['past_due'] = counts['past_due']
+
         # User's reminders
         context['pending_reminders'] = Reminder.objects.filter(
             reminder_user=self.request.user,
@@ -348,91 +188,32 @@ class ContractLifecycleDashboardView(TemplateView):
         ).order_by('reminder_date')[:5]
 
         # Metrics for contract lifecycle dashboard
-        # Get open contracts
-        open_contracts = Contract.objects.filter(
-            status__description='Open',  # Using the status relation with description='Open'
-            date_canceled__isnull=True,  # Ensure we exclude cancelled contracts
-            company=self.request.active_company
-        )
-
-        # Count total open contracts
-        open_contracts_count = open_contracts.count()
-
-        # Find overdue contracts (due_date is in the past)
-        overdue_contracts = open_contracts.filter(
-            due_date__lt=today_date
-        )
-        overdue_contracts_count = overdue_contracts.count()
-
-        # Find on-time contracts (due_date is in the future or null)
-        on_time_contracts = open_contracts.filter(
-            Q(due_date__gte=today_date) | Q(due_date__isnull=True)
-        )
-        on_time_contracts_count = on_time_contracts.count()
+        open_contracts_count = counts['open_contracts']
+        on_time_contracts_count = counts['on_time_contracts']
 
         # Calculate percentage of on-time contracts
         on_time_percentage = round((on_time_contracts_count / open_contracts_count * 100) if open_contracts_count > 0 else 0)
 
         # Get upcoming contracts (due within next 14 days)
-        upcoming_contracts = open_contracts.filter(
-            due_date__range=[today_date, today_date + timedelta(days=14)]
+        upcoming_contracts = Contract.objects.filter(
+            status__description='Open',
+            date_canceled__isnull=True,
+            company=self.request.active_company,
+            due_date__range=[today_date, today_date + timedelta(days=14)],
         ).order_by('due_date')
-        
-        upcoming_due_dates = upcoming_contracts.count()
-        
-        # Get buyer breakdown directly from the Buyer field for open contracts
-        buyer_breakdown_qs = (
-            open_contracts.annotate(
-                buyer_name=Coalesce('buyer__description', Value('Unassigned'), output_field=CharField())
-            )
-            .values('buyer_name')
-            .annotate(total=Count('id'))
-            .order_by('-total', 'buyer_name')[:6]
-        )
-        buyer_breakdown = {row['buyer_name']: row['total'] for row in buyer_breakdown_qs}
-        
-        # Get active suppliers (suppliers with open contracts and CLINs with item_number < 0990)
-        # NOTE: filter below uses numeric_item__lt=99, not 990, as the comment states.
-        # This predates this fix and is left unchanged pending confirmation of intended threshold.
-        # First convert item_number to a numeric value for comparison.
-        # Some item_number values are non-numeric (e.g. '0001AA') and must not crash
-        # the query on SQL Server, which raises DataError 22018 on CAST failure
-        # (unlike SQLite, which silently coerces). Use TRY_CAST on SQL Server and
-        # exclude rows that fail conversion via numeric_item__isnull=False.
-        active_suppliers = Clin.objects.filter(
-            contract__status__description='Open',
-            contract__date_canceled__isnull=True,
-            company=self.request.active_company
-        ).annotate(
-            numeric_item=numeric_item_annotation()
-        ).filter(
-            numeric_item__isnull=False,
-            numeric_item__lt=99  # Only include CLINs with item_number < 0990
-        ).values(
-            'supplier_id',
-            'supplier__name'
-        ).annotate(
-            contract_count=Count('contract_id', distinct=True)  # distinct=True ensures each contract is counted only once
-        ).order_by('-contract_count')
-        
-        # Count total unique suppliers
-        active_supplier_count = active_suppliers.count()
-        
-        # Get top 5 suppliers
-        top_suppliers = active_suppliers[:5]
-        
+
         # Create metrics dictionary for template
         context['metrics'] = {
             'open_contracts': open_contracts_count,
-            'overdue_contracts': overdue_contracts_count,
+            'overdue_contracts': counts['overdue_contracts'],
             'on_time_contracts': on_time_contracts_count,
             'on_time_percentage': on_time_percentage,
-            'upcoming_due_dates': upcoming_due_dates,
+            'upcoming_due_dates': counts['upcoming_due_dates'],
             'upcoming_contracts': upcoming_contracts[:5],  # Limit to 5 for display
-            'contract_types': buyer_breakdown,  # Renamed for template compatibility
-            'total_contracts': Contract.objects.filter(date_canceled__isnull=True, company=self.request.active_company).count(),
-            'active_supplier_count': active_supplier_count,
-            'top_suppliers': top_suppliers
+            'contract_types': metrics['buyer_breakdown'],  # Renamed for template compatibility
+            'total_contracts': counts['all_contracts'],
+            'active_supplier_count': metrics['active_supplier_count'],
+            'top_suppliers': metrics['top_suppliers'],
         }
 
         return context
@@ -518,12 +299,14 @@ class DashboardMetricDetailView(TemplateView):
 
     def _build_value_series(self, period, base_start):
         """
-        Build a trailing series of periods for the new_contract_value metric.
+        Build a trailing series of periods for the new_contract_value metric,
+        from the award totals in the cached dashboard snapshot.
         """
         if period not in self.SERIES_CONFIG:
             return []
 
         granularity, count = self.SERIES_CONFIG[period]
+        metrics = get_dashboard_metrics(self.request.active_company)
         series = []
 
         for idx in range(count):
@@ -546,17 +329,13 @@ class DashboardMetricDetailView(TemplateView):
             else:
                 continue
 
-            qs = Contract.objects.filter(
-                company=self.request.active_company,
-                award_date__range=(start, end),
-            ).exclude(status__description='Canceled')
-
+            contract_count, total_value = award_totals(metrics, start.date(), end.date())
             series.append({
                 'label': label,
                 'start': start,
                 'end': end,
-                'contract_count': qs.count(),
-                'total_value': qs.aggregate(total=Sum('contract_value'))['total'] or 0,
+                'contract_count': contract_count,
+                'total_value': total_value,
             })
 
         # Keep most recent first
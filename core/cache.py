@@ -0,0 +1,216 @@
+"""
+Namespaced, versioned access to the shared Django cache.
+
+settings.CACHES points at a backend every process shares (Redis when
+REDIS_URL is set, otherwise the database-table cache; see CACHE_BACKEND),
+so a value computed by one gunicorn worker or webjob is reused by the
+others and can be invalidated from background jobs.
+
+- namespace(name, timeout): a CacheNamespace whose keys are stored as
+  ``<name>:<key>`` under the namespace's current version (Django's cache
+  ``version`` argument). The version lives in the cache itself, so
+  invalidate() is one increment and every process stops reading the old
+  entries at once; they expire on their own TTL. A version key that is
+  missing (never set, or evicted by DatabaseCache culling) is seeded from the
+  clock (fresh_version()), never a small constant, so entries stored under an
+  older version can never match it again.
+- CacheNamespace.get_or_set_versioned() / bump_version(): finer-grained
+  invalidation inside a namespace. A value is stored as ``(version, value)``
+  next to a counter key (e.g. one per user) and is only served while the
+  counter still holds that version; bumping the counter retires every value
+  stored against it, read together with the counter in one get_many.
+- invalidate(*names): bump namespaces by name. The import and matching
+  pipelines call this after they write the rows a namespace mirrors.
+- stats(): per-process hits / misses / sets / invalidations per namespace.
+
+Namespaces in use: ``sales.awards`` (competitor_stats, bumped by the award
+file imports), ``sales.workbench_nav`` (bumped by DIBBS imports and match
+writes), ``users.state`` / ``contracts.company`` (users.user_cache), the
+page-chrome namespaces in core.page_chrome and ``contracts.dashboard``
+(contracts.services.dashboard_metrics).
+"""
+import logging
+import threading
+import time
+
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+_lock = threading.Lock()
+_namespaces: dict[str, "CacheNamespace"] = {}
+_stats: dict[str, dict] = {}
+
+
+def fresh_version() -> int:
+    """
+    Seed for a missing version key: microseconds since the epoch. Larger than
+    any version reached before (increments are +1 per invalidation), so a
+    re-seeded namespace cannot collide with entries that are still in TTL.
+    """
+    return time.time_ns() // 1000
+
+
+def _count(name: str, field: str) -> None:
+    with _lock:
+        row = _stats.setdefault(name, {"hits": 0, "misses": 0, "sets": 0, "invalidations": 0})
+        row[field] += 1
+
+
+class CacheNamespace:
+    """A group of cache keys that is invalidated together."""
+
+    def __init__(self, name: str, timeout: int | None = 300, alias: str = "default"):
+        self.name = name
+        self.timeout = timeout
+        self.alias = alias
+        self._version_key = f"core.cache:version:{name}"
+
+    @property
+    def _cache(self):
+        return caches[self.alias]
+
+    def version(self) -> int:
+        version = self._cache.get(self._version_key)
+        if version is None:
+            seed = fresh_version()
+            self._cache.add(self._version_key, seed, timeout=None)
+            version = self._cache.get(self._version_key) or seed
+        return version
+
+    def _key(self, key: str) -> str:
+        return f"{self.name}:{key}"
+
+    def get(self, key: str, default=None):
+        value = self._cache.get(self._key(key), _MISSING, version=self.version())
+        if value is _MISSING:
+            _count(self.name, "misses")
+            return default
+        _count(self.name, "hits")
+        return value
+
+    def set(self, key: str, value, timeout=_MISSING) -> None:
+        self._cache.set(
+            self._key(key),
+            value,
+            timeout=self.timeout if timeout is _MISSING else timeout,
+            version=self.version(),
+        )
+        _count(self.name, "sets")
+
+    def get_many(self, keys) -> dict:
+        """{key: value} for the keys present, in one backend round trip."""
+        keys = list(keys)
+        found = self._cache.get_many([self._key(k) for k in keys], version=self.version())
+        out = {}
+        for key in keys:
+            if self._key(key) in found:
+                out[key] = found[self._key(key)]
+                _count(self.name, "hits")
+            else:
+                _count(self.name, "misses")
+        return out
+
+    def add(self, key: str, value, timeout=_MISSING) -> bool:
+        """Set ``key`` only if it is absent; True when this call stored it."""
+        added = self._cache.add(
+            self._key(key),
+            value,
+            timeout=self.timeout if timeout is _MISSING else timeout,
+            version=self.version(),
+        )
+        if added:
+            _count(self.name, "sets")
+        return added
+
+    def bump_version(self, version_key: str) -> int:
+        """
+        Increment a version counter (never expires), retiring the values
+        get_or_set_versioned() stored against it. A missing counter is
+        re-seeded with fresh_version(), above any value a reader may still hold.
+        """
+        try:
+            return self._cache.incr(self._key(version_key), version=self.version())
+        except ValueError:
+            value = fresh_version()
+            self._cache.set(self._key(version_key), value, timeout=None, version=self.version())
+            return value
+
+    def get_or_set(self, key: str, factory, timeout=_MISSING):
+        """Cached value for ``key``, computing and storing ``factory()`` on a miss (None included)."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value, timeout)
+        return value
+
+    def get_or_set_versioned(self, key: str, version_key: str, factory, version=None, timeout=_MISSING):
+        """
+        ``(version, value)``: the value stored under ``key`` while counter
+        ``version_key`` still holds the version it was stored with, else
+        ``factory()`` stored with the current version. A missing counter is
+        seeded with fresh_version(). Pass ``version`` (from an earlier call in
+        the same request) to skip reading the counter again.
+        """
+        if version is None:
+            found = self.get_many([version_key, key])
+            version = found.get(version_key)
+            if version is None:
+                version = fresh_version()
+                self._cache.add(self._key(version_key), version, timeout=None, version=self.version())
+            entry = found.get(key)
+        else:
+            entry = self.get(key)
+        if entry is not None and entry[0] == version:
+            return version, entry[1]
+        value = factory()
+        self.set(key, (version, value), timeout)
+        return version, value
+
+    def delete(self, key: str) -> None:
+        self._cache.delete(self._key(key), version=self.version())
+
+    def invalidate(self) -> None:
+        """Retire every key in the namespace, in every process."""
+        try:
+            self._cache.incr(self._version_key)
+        except ValueError:
+            # Version key evicted or never set: start above any version a reader may hold.
+            self._cache.set(self._version_key, fresh_version(), timeout=None)
+        _count(self.name, "invalidations")
+        logger.debug("core.cache: invalidated namespace %s", self.name)
+
+
+def namespace(name: str, timeout: int | None = 300, alias: str = "default") -> CacheNamespace:
+    """The process-wide CacheNamespace for ``name`` (created on first use)."""
+    with _lock:
+        ns = _namespaces.get(name)
+        if ns is None:
+            ns = _namespaces[name] = CacheNamespace(name, timeout, alias)
+        return ns
+
+
+def invalidate(*names: str) -> None:
+    """Bump the version of each named namespace; failures are logged, never raised."""
+    for name in names:
+        try:
+            namespace(name).invalidate()
+        except Exception:
+            logger.exception("core.cache: could not invalidate namespace %s", name)
+
+
+def stats() -> dict:
+    """Per-namespace counters for this process, with hit_rate (None before any read)."""
+    with _lock:
+        out = {}
+        for name, row in _stats.items():
+            reads = row["hits"] + row["misses"]
+            out[name] = {**row, "hit_rate": round(row["hits"] / reads, 3) if reads else None}
+        return out
+
+
+def clear_stats() -> None:
+    with _lock:
+        _stats.clear()
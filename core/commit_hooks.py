@@ -0,0 +1,67 @@
+"""
+Coalesce per-write transaction.on_commit work into one call per transaction.
+
+Signal handlers that defer work to the commit (audit rows, cache bumps) used
+to register one callback per saved row, so an import saving a thousand rows
+ran a thousand INSERTs or cache writes after it committed.
+on_commit_batch(flush, item) collects ``item`` instead and calls
+``flush(items)`` once, when the transaction commits.
+
+Each write still registers its own small on_commit callback, so Django's
+rules decide which writes count: the callbacks of a savepoint that rolls back
+are dropped (and freed), and the batch only holds them by weak reference.
+The first surviving callback to run flushes every item still held and marks
+the batch flushed (the per-transaction flag); the rest do nothing. The next
+write on the connection starts a new batch.
+"""
+import weakref
+
+from django.db import transaction
+
+_BATCHES_ATTR = "_core_commit_batches"
+
+
+class _Batch:
+    def __init__(self, flush):
+        self.flush = flush
+        self.writes = []  # weakrefs to _Write
+        self.flushed = False
+
+    def run(self):
+        if self.flushed:
+            return
+        self.flushed = True
+        writes = (ref() for ref in self.writes)
+        self.flush([write.item for write in writes if write is not None])
+
+
+class _Write:
+    """The on_commit callback of one write; dropped with its savepoint."""
+
+    def __init__(self, batch, item):
+        self.batch = batch
+        self.item = item
+
+    def __call__(self):
+        self.batch.run()
+
+
+def on_commit_batch(flush, item, using=None):
+    """
+    Queue ``item`` for ``flush(items)``, called once when the current
+    transaction on ``using`` commits with the items of every write that
+    committed. Outside a transaction, ``flush([item])`` runs now.
+    """
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        flush([item])
+        return
+    batches = connection.__dict__.setdefault(_BATCHES_ATTR, {})
+    ref = batches.get(flush)
+    batch = ref() if ref is not None else None
+    if batch is None or batch.flushed:
+        batch = _Batch(flush)
+        batches[flush] = weakref.ref(batch)
+    write = _Write(batch, item)
+    batch.writes.append(weakref.ref(write))
+    transaction.on_commit(write, using=using)
@@ -1,12 +1,11 @@
+from core.page_chrome import get_page_chrome, lazy_count, lazy_value
+
+
 def api_budget(request):
     if not request.user.is_authenticated:
         return {}
-    from core.models import APIBudget, APIUsageLog
-    from django.utils import timezone
-    budget = APIBudget.get()
-    today = timezone.now().date()
-    calls_today = APIUsageLog.objects.filter(timestamp__date=today).count()
+    chrome = get_page_chrome(request)
     return {
-        "api_budget": budget,
-        "api_budget_calls_today": calls_today,
+        "api_budget": lazy_value(chrome.api_budget),
+        "api_budget_calls_today": lazy_count(chrome.api_calls_today),
     }
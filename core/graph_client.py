@@ -0,0 +1,288 @@
+"""
+Shared Microsoft Graph (GCC High) client for app-only callers.
+
+mailer.services.graph_mail, sales.services.graph_inbox,
+contracts.services.sharepoint_service and users.sharepoint_services all use
+the client-credentials flow with the GRAPH_MAIL_* service principal. Each
+used to fetch a new token per call (a 2,000-recipient campaign meant 2,000
+token round trips) and open a new connection per request. This module keeps:
+
+- get_app_token(): one token per (tenant, client, scope), reused until
+  TOKEN_REFRESH_MARGIN_SECONDS before its expires_in; concurrent callers
+  share a single refresh.
+- graph_request(): every call goes through one pooled keep-alive
+  requests.Session; 429 / 503 / 504 are retried up to settings.GRAPH_MAX_RETRIES
+  times, sleeping for Retry-After (capped at GRAPH_RETRY_MAX_WAIT_SECONDS) or
+  an exponential backoff. A 401 drops the cached token so the next call
+  refreshes.
+- stats(): per-process token hits/fetches and per-metric call counts,
+  retries and latency (total / max seconds).
+
+Graph endpoints are GCC High only: login.microsoftonline.us / graph.microsoft.us.
+"""
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+GRAPH_AUTHORITY = "https://login.microsoftonline.us"
+GRAPH_TOKEN_URL_TEMPLATE = GRAPH_AUTHORITY + "/{tenant_id}/oauth2/v2.0/token"
+GRAPH_BASE = "https://graph.microsoft.us/v1.0"
+GRAPH_SCOPE = "https://graph.microsoft.us/.default"
+
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+RETRY_STATUSES = {429, 503, 504}
+# A 503/504 to a POST (sendMail) may come after Graph already acted on it;
+# non-idempotent requests are only retried when Graph explicitly refused them.
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+_BACKOFF_BASE_SECONDS = 1.0
+
+
+class GraphAuthError(Exception):
+    """Token acquisition failed; status_code is None when credentials are missing."""
+
+    def __init__(self, message: str, *, status_code: int | None = None, details: str = ""):
+        self.message = message
+        self.status_code = status_code
+        self.details = details
+        super().__init__(message)
+
+
+_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+_session: requests.Session | None = None
+_tokens: dict[tuple[str, str, str], tuple[str, float]] = {}
+_token_stats = {"hits": 0, "fetches": 0}
+_call_stats: dict[str, dict] = {}
+
+
+def get_session() -> requests.Session:
+    """The process-wide keep-alive session used for token and Graph calls."""
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(settings.GRAPH_POOL_SIZE, 1))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def _credentials(tenant_id, client_id, client_secret) -> tuple[str, str, str]:
+    tenant_id = (tenant_id or getattr(settings, "GRAPH_MAIL_TENANT_ID", None) or "").strip()
+    client_id = (client_id or getattr(settings, "GRAPH_MAIL_CLIENT_ID", None) or "").strip()
+    client_secret = (
+        client_secret or getattr(settings, "GRAPH_MAIL_CLIENT_SECRET", None) or ""
+    ).strip()
+    if not tenant_id or not client_id or not client_secret:
+        raise GraphAuthError(
+            "Graph service credentials are not configured.",
+            details="Missing GRAPH_MAIL_TENANT_ID, GRAPH_MAIL_CLIENT_ID, or GRAPH_MAIL_CLIENT_SECRET.",
+        )
+    return tenant_id, client_id, client_secret
+
+
+def _cached_token(key) -> str | None:
+    with _lock:
+        entry = _tokens.get(key)
+        if entry and entry[1] - TOKEN_REFRESH_MARGIN_SECONDS > time.monotonic():
+            _token_stats["hits"] += 1
+            return entry[0]
+    return None
+
+
+def get_app_token(
+    *,
+    tenant_id: str | None = None,
+    client_id: str | None = None,
+    client_secret: str | None = None,
+    scope: str = GRAPH_SCOPE,
+    force_refresh: bool = False,
+) -> str:
+    """
+    Client-credentials access token for ``scope`` (GRAPH_MAIL_* settings by
+    default), served from the in-process cache while it has more than
+    TOKEN_REFRESH_MARGIN_SECONDS left. Raises GraphAuthError for missing
+    credentials or a rejected token request; transport failures raise
+    requests.RequestException.
+    """
+    tenant_id, client_id, client_secret = _credentials(tenant_id, client_id, client_secret)
+    key = (tenant_id, client_id, scope)
+    if not force_refresh:
+        token = _cached_token(key)
+        if token:
+            return token
+
+    with _refresh_lock:
+        # Another thread may have refreshed while this one waited.
+        if not force_refresh:
+            token = _cached_token(key)
+            if token:
+                return token
+        started = time.monotonic()
+        response = get_session().post(
+            GRAPH_TOKEN_URL_TEMPLATE.format(tenant_id=tenant_id),
+            data={
+                "grant_type": "client_credentials",
+                "client_id": client_id,
+                "client_secret": client_secret,
+                "scope": scope,
+            },
+            timeout=60,
+        )
+        _record("token", time.monotonic() - started, response.status_code, retries=0)
+        if response.status_code != 200:
+            raise GraphAuthError(
+                "Could not connect to Microsoft Graph. Please try again.",
+                status_code=response.status_code,
+                details=response.text,
+            )
+        data = response.json()
+        token = data.get("access_token")
+        if not token:
+            raise GraphAuthError(
+                "Microsoft Graph returned an invalid token response.",
+                status_code=response.status_code,
+                details=response.text,
+            )
+        try:
+            expires_in = float(data.get("expires_in") or 3600)
+        except (TypeError, ValueError):
+            expires_in = 3600.0
+        with _lock:
+            _tokens[key] = (str(token), started + expires_in)
+            _token_stats["fetches"] += 1
+        return str(token)
+
+
+def invalidate_token(token: str | None = None) -> None:
+    """Drop cached tokens (only the entry holding ``token`` when given)."""
+    with _lock:
+        for key in [k for k, (t, _) in _tokens.items() if token is None or t == token]:
+            del _tokens[key]
+
+
+def _retry_delay(response: requests.Response, attempt: int) -> float:
+    value = (response.headers.get("Retry-After") or "").strip()
+    delay = None
+    if value:
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                delay = None
+    if delay is None:
+        delay = _BACKOFF_BASE_SECONDS * (2 ** attempt)
+    return min(max(delay, 0.0), settings.GRAPH_RETRY_MAX_WAIT_SECONDS)
+
+
+def _should_retry(method: str, response: requests.Response) -> bool:
+    status = response.status_code
+    if method.upper() in _IDEMPOTENT_METHODS:
+        return status in RETRY_STATUSES
+    return status == 429 or (status == 503 and bool(response.headers.get("Retry-After")))
+
+
+def _record(metric: str, seconds: float, status_code, retries: int) -> None:
+    with _lock:
+        row = _call_stats.setdefault(
+            metric,
+            {"calls": 0, "errors": 0, "retries": 0, "total_seconds": 0.0, "max_seconds": 0.0},
+        )
+        row["calls"] += 1
+        row["retries"] += retries
+        row["total_seconds"] += seconds
+        row["max_seconds"] = max(row["max_seconds"], seconds)
+        if status_code is None or status_code >= 400:
+            row["errors"] += 1
+
+
+def graph_request(
+    method: str,
+    url: str,
+    *,
+    token: str | None = None,
+    metric: str | None = None,
+    max_retries: int | None = None,
+    **kwargs,
+) -> requests.Response:
+    """
+    Send one Graph request on the pooled session and return the final
+    response (callers keep their own status handling). ``token`` adds a
+    Bearer header; otherwise headers are passed through unchanged. Throttled
+    responses are retried (POST / PATCH only on 429, or 503 with
+    Retry-After, so a send is never repeated after a gateway timeout);
+    transport errors raise requests.RequestException
+    as before. ``metric`` names the latency bucket (default: method + path
+    segment after the API version).
+    """
+    if token:
+        kwargs["headers"] = {**(kwargs.get("headers") or {}), "Authorization": f"Bearer {token}"}
+    if max_retries is None:
+        max_retries = settings.GRAPH_MAX_RETRIES
+    if metric is None:
+        parts = [p for p in urlsplit(url).path.split("/") if p]
+        metric = f"{method.upper()} {parts[1] if len(parts) > 1 else (parts[0] if parts else '/')}"
+
+    session = get_session()
+    started = time.monotonic()
+    retries = 0
+    response = None
+    try:
+        while True:
+            response = session.request(method, url, **kwargs)
+            if not _should_retry(method, response) or retries >= max_retries:
+                break
+            delay = _retry_delay(response, retries)
+            retries += 1
+            logger.warning(
+                "graph_client: %s returned HTTP %s; retry %d/%d in %.1fs",
+                metric, response.status_code, retries, max_retries, delay,
+            )
+            time.sleep(delay)
+    finally:
+        _record(
+            metric,
+            time.monotonic() - started,
+            response.status_code if response is not None else None,
+            retries,
+        )
+
+    if response.status_code == 401:
+        auth = (kwargs.get("headers") or {}).get("Authorization", "")
+        if auth.startswith("Bearer "):
+            invalidate_token(auth[len("Bearer "):])
+    return response
+
+
+def stats() -> dict:
+    """Token cache counters and per-metric call counts / latency for this process."""
+    with _lock:
+        calls = {
+            name: {
+                **row,
+                "total_seconds": round(row["total_seconds"], 3),
+                "max_seconds": round(row["max_seconds"], 3),
+                "avg_seconds": round(row["total_seconds"] / row["calls"], 3) if row["calls"] else 0.0,
+            }
+            for name, row in _call_stats.items()
+        }
+        return {"tokens": {**_token_stats, "cached": len(_tokens)}, "calls": calls}
+
+
+def clear() -> None:
+    """Forget cached tokens and reset counters (tests, credential rotation)."""
+    with _lock:
+        _tokens.clear()
+        _token_stats.update(hits=0, fetches=0)
+        _call_stats.clear()
@@ -14,6 +14,8 @@ from mailer.tasks.generate_ai import process_ai_snippets
 from mailer.tasks.dispatch_followups import dispatch_followups
 from sales.tasks.check_dibbs_notices import run as check_dibbs_notices_task
 from intake.tasks.reconcile_award_ledger import reconcile_award_ledger_task
+from sales.tasks.purge_archived_blobs import run as purge_archived_blobs_task
+from products.tasks.refresh_observatory_stats import run as refresh_observatory_stats_task
 
 logger = logging.getLogger("core.background_tasks")
 
@@ -26,6 +28,8 @@ TASK_FUNCTIONS = {
     "dispatch_followups": dispatch_followups,
     "check_dibbs_notices": check_dibbs_notices_task,
     "reconcile_award_ledger": reconcile_award_ledger_task,
+    "purge_archived_blobs": purge_archived_blobs_task,
+    "refresh_observatory_stats": refresh_observatory_stats_task,
 }
 
 
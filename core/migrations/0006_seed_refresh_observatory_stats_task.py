@@ -0,0 +1,36 @@
+from django.db import migrations
+
+
+def add_refresh_observatory_stats_task(apps, schema_editor):
+    ScheduledTask = apps.get_model("core", "ScheduledTask")
+    ScheduledTask.objects.get_or_create(
+        name="refresh_observatory_stats",
+        defaults={
+            "interval_minutes": 60,
+            "run_order": 11,
+            "is_enabled": True,
+            "is_running": False,
+            "freeze_count": 0,
+            "last_run_at": None,
+        },
+    )
+
+
+def remove_refresh_observatory_stats_task(apps, schema_editor):
+    ScheduledTask = apps.get_model("core", "ScheduledTask")
+    ScheduledTask.objects.filter(name="refresh_observatory_stats").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_create_cache_table"),
+        ("products", "0005_observatory_stats"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            add_refresh_observatory_stats_task,
+            remove_refresh_observatory_stats_task,
+        ),
+    ]
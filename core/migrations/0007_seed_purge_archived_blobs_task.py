@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def add_purge_archived_blobs_task(apps, schema_editor):
+    ScheduledTask = apps.get_model("core", "ScheduledTask")
+    ScheduledTask.objects.get_or_create(
+        name="purge_archived_blobs",
+        defaults={
+            "interval_minutes": 60,
+            "run_order": 10,
+            "is_enabled": True,
+            "is_running": False,
+            "freeze_count": 0,
+            "last_run_at": None,
+        },
+    )
+
+
+def remove_purge_archived_blobs_task(apps, schema_editor):
+    ScheduledTask = apps.get_model("core", "ScheduledTask")
+    ScheduledTask.objects.filter(name="purge_archived_blobs").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_seed_refresh_observatory_stats_task"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_purge_archived_blobs_task, remove_purge_archived_blobs_task),
+    ]
@@ -0,0 +1,251 @@
+"""
+Page chrome: the values the base templates can show on every page (reminder
+sidebar and footer pills, unread messages, company selector, overdue RFQ
+badge, note/reminder user picker, API budget card).
+
+The context processors used to compute all of it on every HTML render,
+whether or not the template showed it. They now return lazy values
+(``lazy_value``, or ``lazy_count`` for numbers) backed by the request's
+PageChrome, so a value costs nothing unless a template reads it, and then:
+
+- per-user sections (reminders, unread messages) are cached in the
+  ``core.page_chrome`` namespace as ``(version, value)`` next to a per-user
+  version counter, like users.user_cache. core/signals.py bumps the counter
+  when the user's Reminder or SystemMessage rows change.
+- shared values (overdue RFQ count, active users) are cached in their own
+  namespaces, dropped on SupplierRFQ / User writes.
+- reminder buckets come from one conditional-aggregate query.
+
+Keys carry the date (and active company), so the day rollover needs no
+invalidation. Entries expire after PAGE_CHROME_CACHE_SECONDS, which bounds
+staleness for writes that skip signals (QuerySet.update(), a reminder
+reassigned to another user, a solicitation's return-by date moving).
+"""
+import json
+import logging
+import operator
+from datetime import timedelta
+
+from django.db import ProgrammingError, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject, new_method_proxy
+
+from core.cache import invalidate as invalidate_namespace
+from core.cache import namespace
+
+logger = logging.getLogger(__name__)
+
+PAGE_CHROME_CACHE_SECONDS = 300
+PAGE_CHROME_NAMESPACE = "core.page_chrome"
+OVERDUE_RFQ_NAMESPACE = "sales.overdue_rfqs"
+ACTIVE_USERS_NAMESPACE = "core.active_users"
+
+_user_cache = namespace(PAGE_CHROME_NAMESPACE, timeout=PAGE_CHROME_CACHE_SECONDS)
+_rfq_cache = namespace(OVERDUE_RFQ_NAMESPACE, timeout=PAGE_CHROME_CACHE_SECONDS)
+_users_cache = namespace(ACTIVE_USERS_NAMESPACE, timeout=PAGE_CHROME_CACHE_SECONDS)
+
+_REQUEST_ATTR = "_page_chrome"
+
+EMPTY_REMINDERS = {
+    "reminders": [],
+    "total_reminders_count": 0,
+    "pending_count": 0,
+    "due_count": 0,
+    "overdue_count": 0,
+    "footer_overdue_count": 0,
+    "footer_due_today_count": 0,
+}
+
+
+def lazy_value(func):
+    """A template value computed on first use (truthiness, iteration, rendering...)."""
+    return SimpleLazyObject(func)
+
+
+class LazyCount(SimpleLazyObject):
+    """
+    SimpleLazyObject for an integer: also proxies int()/float() and <=, >=,
+    which filters such as pluralize, add and widthratio rely on.
+    """
+
+    __int__ = new_method_proxy(int)
+    __float__ = new_method_proxy(float)
+    __index__ = new_method_proxy(operator.index)
+    __le__ = new_method_proxy(operator.le)
+    __ge__ = new_method_proxy(operator.ge)
+
+
+def lazy_count(func):
+    """Like lazy_value, for counts shown with numeric filters."""
+    return LazyCount(func)
+
+
+def _load_reminders(user, company_id, today, upcoming_days):
+    from contracts.models import Reminder
+
+    seven_days_ago = today - timedelta(days=7)
+    active = Reminder.objects.filter(reminder_user=user, reminder_completed=False)
+    # Reminders do not cross companies.
+    if company_id:
+        active = active.filter(company_id=company_id)
+
+    # Pending: future. Due: today and the past 7 days. Overdue: older than that.
+    # Footer pills: strictly before today / exactly today.
+    counts = active.aggregate(
+        total_reminders_count=Count("pk"),
+        pending_count=Count("pk", filter=Q(reminder_date__gt=today)),
+        due_count=Count("pk", filter=Q(reminder_date__lte=today, reminder_date__gt=seven_days_ago)),
+        overdue_count=Count("pk", filter=Q(reminder_date__lte=seven_days_ago)),
+        footer_overdue_count=Count("pk", filter=Q(reminder_date__lt=today)),
+        footer_due_today_count=Count("pk", filter=Q(reminder_date=today)),
+    )
+
+    # Sidebar: due, overdue and up to ``upcoming_days`` ahead.
+    sidebar = list(
+        active.filter(reminder_date__lte=today + timedelta(days=upcoming_days)).order_by("reminder_date")[:30]
+    )
+    for reminder in sidebar:
+        reminder.is_overdue = reminder.reminder_date <= seven_days_ago
+        reminder.is_upcoming = reminder.reminder_date > today
+        reminder.title = reminder.reminder_title
+        reminder.description = reminder.reminder_text
+        reminder.completed = reminder.reminder_completed
+    return {**counts, "reminders": sidebar}
+
+
+def _load_active_users():
+    from django.contrib.auth import get_user_model
+
+    users = get_user_model().objects.filter(is_active=True).order_by("username").values("id", "username")
+    return json.dumps(list(users))
+
+
+class PageChrome:
+    """Chrome sections for one request, each loaded on first access."""
+
+    def __init__(self, request):
+        self.request = request
+        self.user = request.user
+        self.today = timezone.now().date()
+        self._sections = {}
+        self._version = None
+
+    def _memo(self, name, loader):
+        if name not in self._sections:
+            self._sections[name] = loader()
+        return self._sections[name]
+
+    def _user_section(self, name, scope, loader):
+        """Per-user cached value, valid while the user's chrome version is unchanged."""
+        self._version, value = _user_cache.get_or_set_versioned(
+            f"{name}:{self.user.pk}:{scope}", f"version:{self.user.pk}", loader, version=self._version
+        )
+        return value
+
+    @property
+    def upcoming_days(self):
+        """User preference: how many days ahead the reminder sidebar shows (0-7)."""
+        from users.models import UserSettingState
+        from users.user_cache import get_user_snapshot
+
+        # Read from the cached snapshot: UserSettings.get_setting would create
+        # the setting row on first read, a write on every new user's first page.
+        stored = get_user_snapshot(self.user)["settings"].get("reminder_sidebar_upcoming_days")
+        try:
+            days = int(UserSettingState.coerce_value(*stored) or 0) if stored else 0
+        except (TypeError, ValueError):
+            days = 0
+        return max(0, min(7, days))
+
+    def reminders(self):
+        def load():
+            company = getattr(self.request, "active_company", None)
+            company_id = company.pk if company else None
+            days = self.upcoming_days
+            scope = f"{company_id}:{self.today.isoformat()}:{days}"
+            try:
+                return self._user_section(
+                    "reminders", scope, lambda: _load_reminders(self.user, company_id, self.today, days)
+                )
+            except ProgrammingError:
+                # Database schema mismatch: show an empty sidebar rather than fail the page.
+                logger.exception("page_chrome: could not load reminders")
+                return dict(EMPTY_REMINDERS)
+
+        return self._memo("reminders", load)
+
+    def unread_messages_count(self):
+        from users.models import SystemMessage
+
+        return self._memo("unread_messages", lambda: self._user_section(
+            "unread_messages", "", lambda: SystemMessage.get_unread_count(self.user)
+        ))
+
+    def available_companies(self):
+        """Companies for the selector: every active company for superusers, else memberships."""
+        from users.user_cache import get_active_companies, get_company, get_user_snapshot
+
+        def load():
+            if self.user.is_superuser:
+                return get_active_companies()
+            companies = [get_company(cid) for cid, _ in get_user_snapshot(self.user)["memberships"]]
+            return sorted((c for c in companies if c is not None), key=lambda c: c.name)
+
+        return self._memo("available_companies", load)
+
+    def overdue_rfq_count(self):
+        from sales.models import SupplierRFQ
+
+        return self._memo("overdue_rfqs", lambda: _rfq_cache.get_or_set(
+            self.today.isoformat(),
+            lambda: SupplierRFQ.objects.filter(
+                status="SENT", line__solicitation__return_by_date__lt=self.today
+            ).count(),
+        ))
+
+    def active_users_json(self):
+        return self._memo("active_users", lambda: _users_cache.get_or_set("json", _load_active_users))
+
+    def api_budget(self):
+        from core.models import APIBudget
+
+        return self._memo("api_budget", APIBudget.get)
+
+    def api_calls_today(self):
+        from core.models import APIUsageLog
+
+        return self._memo(
+            "api_calls_today", lambda: APIUsageLog.objects.filter(timestamp__date=self.today).count()
+        )
+
+    def ai_model_info(self):
+        from suppliers.openrouter_config import get_openrouter_model_info
+
+        return self._memo("ai_model_info", get_openrouter_model_info)
+
+
+def get_page_chrome(request):
+    """The request's PageChrome (created on first use)."""
+    chrome = getattr(request, _REQUEST_ATTR, None)
+    if chrome is None:
+        chrome = PageChrome(request)
+        setattr(request, _REQUEST_ATTR, chrome)
+    return chrome
+
+
+def invalidate_user_chrome(user_id):
+    """
+    Retire user_id's cached chrome once the write commits (immediately in
+    autocommit); bumping inside the transaction would hold the DatabaseCache
+    row lock until commit.
+    """
+    transaction.on_commit(lambda: _user_cache.bump_version(f"version:{user_id}"))
+
+
+def invalidate_overdue_rfqs():
+    invalidate_namespace(OVERDUE_RFQ_NAMESPACE)
+
+
+def invalidate_active_users():
+    invalidate_namespace(ACTIVE_USERS_NAMESPACE)
@@ -0,0 +1,37 @@
+"""
+Invalidate the cached page chrome (core/page_chrome.py) from the writes it
+mirrors: a user's reminders and system messages, supplier RFQs (overdue
+badge) and user accounts (note/reminder user picker).
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core import page_chrome
+
+
+@receiver(post_save, sender='contracts.Reminder')
+@receiver(post_delete, sender='contracts.Reminder')
+def reminder_changed(sender, instance, **kwargs):
+    if instance.reminder_user_id:
+        page_chrome.invalidate_user_chrome(instance.reminder_user_id)
+
+
+@receiver(post_save, sender='users.SystemMessage')
+@receiver(post_delete, sender='users.SystemMessage')
+def system_message_changed(sender, instance, **kwargs):
+    page_chrome.invalidate_user_chrome(instance.user_id)
+
+
+@receiver(post_save, sender='sales.SupplierRFQ')
+@receiver(post_delete, sender='sales.SupplierRFQ')
+def supplier_rfq_changed(sender, instance, **kwargs):
+    page_chrome.invalidate_overdue_rfqs()
+
+
+@receiver(post_save, sender='auth.User')
+@receiver(post_delete, sender='auth.User')
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login; the picker shows id and username.
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    page_chrome.invalidate_active_users()
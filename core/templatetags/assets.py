@@ -0,0 +1,33 @@
+"""
+{% asset 'css/app-core.css' %}: the URL of a static file, fingerprinted.
+
+With the manifest storage (production, STATZWeb/storage.py) this is the
+content-hashed name from staticfiles.json, which WhiteNoise serves as
+immutable. Files missing from the manifest, and the plain development
+storage, fall back to ``?v=<deploy cache version>`` so a deploy still busts
+browser caches.
+"""
+from urllib.parse import quote
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+
+from STATZWeb.version_utils import get_cache_version
+
+register = template.Library()
+
+
+def _in_manifest(path):
+    hashed_files = getattr(staticfiles_storage, "hashed_files", None)
+    if not hashed_files:
+        return False
+    return staticfiles_storage.hash_key(staticfiles_storage.clean_name(path)) in hashed_files
+
+
+@register.simple_tag
+def asset(path):
+    if _in_manifest(path):
+        return static(path)
+    return f"{settings.STATIC_URL}{quote(path)}?v={get_cache_version()}"
@@ -0,0 +1,32 @@
+"""
+Test runner that starts every test with empty caches.
+
+Cache invalidation (core.cache bumps, users.user_cache, core.page_chrome,
+contracts.services.dashboard_metrics) runs in transaction.on_commit, and a
+TestCase never commits: without a reset, values cached by one test would be
+served to the next, which reuses the same primary keys after its rollback.
+"""
+from django.core.cache import caches
+from django.core.cache.backends.db import DatabaseCache
+from django.test.runner import DiscoverRunner
+
+
+def _clear_caches():
+    # DatabaseCache rows roll back with the test's transaction already.
+    for cache in caches.all(initialized_only=True):
+        if not isinstance(cache, DatabaseCache):
+            cache.clear()
+
+
+class CacheClearingRunner(DiscoverRunner):
+    def get_resultclass(self):
+        base = super().get_resultclass()
+        if base is None:
+            base = self.test_runner.resultclass
+
+        class CacheClearingResult(base):
+            def startTest(self, test):
+                _clear_caches()
+                super().startTest(test)
+
+        return CacheClearingResult
@@ -46,3 +46,491 @@ class AzureHealthEndpointTests(TestCase):
     def test_health_plain_not_redirected_to_login(self):
         response = self.client.get("/health/")
         self.assertNotEqual(response.status_code, 302)
+
+
+class _FakeResponse:
+    def __init__(self, status_code=200, payload=None, headers=None, text=""):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.headers = headers or {}
+        self.text = text
+
+    def json(self):
+        return self._payload
+
+
+@override_settings(
+    GRAPH_MAIL_TENANT_ID="tenant",
+    GRAPH_MAIL_CLIENT_ID="client",
+    GRAPH_MAIL_CLIENT_SECRET="secret",
+    GRAPH_MAIL_ENABLED=True,
+    GRAPH_MAIL_SENDER_RFQ="quotes@example.com",
+)
+class GraphClientTests(TestCase):
+    def setUp(self):
+        from core import graph_client
+
+        self.graph_client = graph_client
+        graph_client.clear()
+        self.addCleanup(graph_client.clear)
+        patcher = patch.object(graph_client, "get_session")
+        self.session = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.session.post.return_value = _FakeResponse(
+            payload={"access_token": "tok-1", "expires_in": 3599}
+        )
+
+    def test_token_is_fetched_once_per_tenant_and_scope(self):
+        from mailer.services.graph_mail import send_mail_via_graph
+
+        self.session.request.return_value = _FakeResponse(status_code=202)
+        for n in range(5):
+            self.assertTrue(send_mail_via_graph(f"buyer{n}@example.com", "RFQ", "body"))
+
+        self.assertEqual(self.session.post.call_count, 1)
+        self.assertEqual(self.session.request.call_count, 5)
+        headers = self.session.request.call_args.kwargs["headers"]
+        self.assertEqual(headers["Authorization"], "Bearer tok-1")
+        stats = self.graph_client.stats()
+        self.assertEqual(stats["tokens"], {"hits": 4, "fetches": 1, "cached": 1})
+        self.assertEqual(stats["calls"]["sendMail"]["calls"], 5)
+
+        self.graph_client.get_app_token(scope="https://example.invalid/.default")
+        self.assertEqual(self.session.post.call_count, 2)
+
+    def test_token_refreshes_near_expiry(self):
+        self.session.post.return_value = _FakeResponse(
+            payload={"access_token": "short", "expires_in": 60}
+        )
+        self.graph_client.get_app_token()
+        self.graph_client.get_app_token()
+        self.assertEqual(self.session.post.call_count, 2)
+
+    @patch("core.graph_client.time.sleep")
+    def test_throttled_request_honours_retry_after(self, sleep):
+        self.session.request.side_effect = [
+            _FakeResponse(status_code=429, headers={"Retry-After": "7"}),
+            _FakeResponse(status_code=503),
+            _FakeResponse(status_code=200, payload={"value": []}),
+        ]
+
+        resp = self.graph_client.graph_request("GET", "https://graph.microsoft.us/v1.0/users/x/messages")
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [7.0, 2.0])
+        row = self.graph_client.stats()["calls"]["GET users"]
+        self.assertEqual((row["calls"], row["retries"], row["errors"]), (1, 2, 0))
+
+    @patch("core.graph_client.time.sleep")
+    def test_post_is_not_retried_after_gateway_timeout(self, sleep):
+        url = "https://graph.microsoft.us/v1.0/users/x/sendMail"
+        self.session.request.side_effect = [_FakeResponse(status_code=504)]
+        self.assertEqual(self.graph_client.graph_request("POST", url).status_code, 504)
+
+        self.session.request.side_effect = [
+            _FakeResponse(status_code=503),
+            _FakeResponse(status_code=503, headers={"Retry-After": "1"}),
+            _FakeResponse(status_code=429, headers={"Retry-After": "1"}),
+            _FakeResponse(status_code=202),
+        ]
+        self.assertEqual(self.graph_client.graph_request("POST", url).status_code, 503)
+        self.assertEqual(self.graph_client.graph_request("POST", url).status_code, 202)
+
+        self.assertEqual(self.session.request.call_count, 5)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_unauthorized_response_drops_cached_token(self):
+        token = self.graph_client.get_app_token()
+        self.session.request.return_value = _FakeResponse(status_code=401)
+
+        self.graph_client.graph_request("GET", "https://graph.microsoft.us/v1.0/sites", token=token)
+        self.graph_client.get_app_token()
+
+        self.assertEqual(self.session.post.call_count, 2)
+
+    @override_settings(GRAPH_MAIL_CLIENT_SECRET="")
+    def test_missing_credentials_map_to_caller_errors(self):
+        from contracts.services.sharepoint_service import SharePointError, get_graph_access_token
+        from users.sharepoint_services import get_graph_service_token
+
+        with self.assertRaises(SharePointError):
+            get_graph_access_token()
+        with self.assertRaisesRegex(RuntimeError, "not configured"):
+            get_graph_service_token()
+        self.session.post.assert_not_called()
+
+
+_SHARED_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "core-cache-tests"},
+    "shared": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "core_cache_tests"},
+    # A second backend instance on the same table stands in for another worker process.
+    "peer": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "core_cache_tests"},
+}
+
+
+@override_settings(CACHES=_SHARED_CACHES)
+class CacheNamespaceTests(TestCase):
+    def setUp(self):
+        from django.core.management import call_command
+
+        from core import cache as core_cache
+
+        self.core_cache = core_cache
+        call_command("createcachetable", verbosity=0)
+        core_cache.clear_stats()
+        self.addCleanup(core_cache.clear_stats)
+
+    def _peer_get(self, name):
+        return self.core_cache.CacheNamespace(name, alias="peer").get("k", "miss")
+
+    def test_invalidation_reaches_other_handles_on_shared_backend(self):
+        ns = self.core_cache.CacheNamespace("tests.shared", alias="shared")
+        ns.set("k", {"rows": 3})
+        before = ns.version()
+        self.assertEqual(self._peer_get("tests.shared"), {"rows": 3})
+
+        ns.invalidate()
+
+        self.assertEqual(self._peer_get("tests.shared"), "miss")
+        self.assertEqual(ns.get("k", "miss"), "miss")
+        ns.set("k", {"rows": 4})
+        self.assertEqual(ns.version(), before + 1)
+        self.assertEqual(ns.get("k"), {"rows": 4})
+
+    def test_evicted_version_key_does_not_resurrect_old_entries(self):
+        from django.core.cache import caches
+
+        ns = self.core_cache.CacheNamespace("tests.evicted", alias="shared")
+        ns.set("k", "v1")
+        ns.invalidate()
+        ns.set("k", "v2")
+
+        # Culling drops the version key while both entries are still in TTL.
+        caches["shared"].delete(ns._version_key)
+        self.assertEqual(ns.get("k", "miss"), "miss")
+
+        ns.set("k", "v3")
+        caches["shared"].delete(ns._version_key)
+        ns.invalidate()
+        self.assertEqual(ns.get("k", "miss"), "miss")
+
+    def test_missing_counter_is_seeded_above_small_versions(self):
+        ns = self.core_cache.CacheNamespace("tests.counter", alias="shared")
+        seeded = ns.bump_version("version:1")
+        self.assertGreater(seeded, 2)
+        self.assertEqual(ns.bump_version("version:1"), seeded + 1)
+
+    def test_versioned_values_follow_their_counter(self):
+        ns = self.core_cache.CacheNamespace("tests.versioned", alias="shared")
+        calls = []
+
+        def load():
+            calls.append(1)
+            return {"n": len(calls)}
+
+        version, value = ns.get_or_set_versioned("snap:1", "version:1", load)
+        self.assertEqual(value, {"n": 1})
+        self.assertEqual(ns.get_or_set_versioned("snap:1", "version:1", load), (version, {"n": 1}))
+
+        ns.bump_version("version:1")
+        self.assertEqual(ns.get_or_set_versioned("snap:1", "version:1", load)[1], {"n": 2})
+        # A version the caller already holds skips the counter read.
+        self.assertEqual(ns.get_or_set_versioned("snap:1", "version:1", load, version=version)[1], {"n": 3})
+        self.assertEqual(len(calls), 3)
+
+    def test_get_or_set_caches_none_and_counts_hits(self):
+        ns = self.core_cache.namespace("tests.counts")
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return None
+
+        self.assertIsNone(ns.get_or_set("earliest", factory))
+        self.assertIsNone(ns.get_or_set("earliest", factory))
+        self.assertEqual(len(calls), 1)
+        self.core_cache.invalidate("tests.counts")
+        ns.get_or_set("earliest", factory)
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(
+            self.core_cache.stats()["tests.counts"],
+            {"hits": 1, "misses": 2, "sets": 2, "invalidations": 1, "hit_rate": 0.333},
+        )
+
+    def test_award_import_invalidation_refreshes_earliest_award_date(self):
+        from datetime import date
+
+        from sales.models import DibbsAward
+        from sales.services.competitor_stats import AWARDS_CACHE_NAMESPACE, get_earliest_award_date
+
+        self.core_cache.invalidate(AWARDS_CACHE_NAMESPACE)
+        self.assertIsNone(get_earliest_award_date())
+        DibbsAward.objects.create(
+            award_basic_number="SPE7L726P0001", award_date=date(2026, 1, 2), aw_file_date=date(2026, 1, 5)
+        )
+        self.assertIsNone(get_earliest_award_date())
+
+        self.core_cache.invalidate(AWARDS_CACHE_NAMESPACE)
+
+        self.assertEqual(get_earliest_award_date(), date(2026, 1, 5))
+
+
+class OnCommitBatchTests(TestCase):
+    def test_one_flush_per_transaction_without_rolled_back_writes(self):
+        from django.db import transaction
+
+        from core.commit_hooks import on_commit_batch
+
+        flushed = []
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                on_commit_batch(flushed.append, 1)
+                try:
+                    with transaction.atomic():
+                        on_commit_batch(flushed.append, 2)
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+                on_commit_batch(flushed.append, 3)
+                self.assertEqual(flushed, [])
+
+        self.assertEqual(len(callbacks), 2)
+        self.assertEqual(flushed, [[1, 3]])
+
+        # The next transaction starts a new batch; outside one, flush runs now.
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                on_commit_batch(flushed.append, 4)
+        on_commit_batch(flushed.append, 5)
+        self.assertEqual(flushed, [[1, 3], [4]])
+
+
+class PageChromeTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from django.core.cache import cache
+
+        from contracts.models import Company
+        from users.models import UserCompanyMembership
+
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.company = Company.objects.create(name="Chrome Co", slug="chrome-co", is_active=True)
+        self.user = User.objects.create_user(username="chrome", password="pw")
+        UserCompanyMembership.objects.create(user=self.user, company=self.company, is_default=True)
+        self.client.login(username="chrome", password="pw")
+
+    def _reminder(self, days_from_today, **kwargs):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from contracts.models import Reminder
+
+        fields = {
+            "reminder_title": f"R{days_from_today}",
+            "reminder_date": timezone.now().date() + timedelta(days=days_from_today),
+            "reminder_user": self.user,
+            "reminder_completed": False,
+            "company": self.company,
+            **kwargs,
+        }
+        return Reminder.objects.create(**fields)
+
+    def _render(self, source):
+        from django.template import RequestContext, Template
+        from django.test import RequestFactory
+
+        request = RequestFactory().get("/")
+        request.user = self.user
+        request.session = {}
+        request.active_company = self.company
+        return Template(source).render(RequestContext(request, {})), request
+
+    def test_bare_authenticated_page_skips_unused_chrome(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self._reminder(-1)
+        for _ in range(2):  # warm the session, user and chrome caches
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.get("/about/")
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/about/")
+
+        self.assertEqual(response.status_code, 200)
+        tables = {"django_session", "auth_user"}
+        stray = [q["sql"] for q in ctx.captured_queries if not any(t in q["sql"] for t in tables) and "SAVEPOINT" not in q["sql"]]
+        self.assertEqual(stray, [])
+        # Session read, user read, and the SESSION_SAVE_EVERY_REQUEST session write.
+        self.assertEqual(len(ctx.captured_queries), 5)
+
+    def test_reminder_buckets_in_one_aggregate_and_cached_until_reminder_saved(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for days in (3, 0, -2, -10):
+                self._reminder(days)
+            self._reminder(-1, reminder_completed=True)
+        source = (
+            "{{ pending_count }}/{{ due_count }}/{{ overdue_count }}/"
+            "{{ footer_overdue_count|add:footer_due_today_count }}/{{ total_reminders_count }}/"
+            "{% for r in reminders %}{{ r.title }}{% if r.is_overdue %}!{% endif %},{% endfor %}"
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            html, _ = self._render(source)
+        self.assertEqual(html, "1/2/1/3/4/R-10!,R-2,R0,")
+        reminder_queries = [q for q in ctx.captured_queries if "contracts_reminder" in q["sql"]]
+        self.assertEqual(len(reminder_queries), 2)  # aggregate + sidebar list
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self._render(source)[0], html)
+        self.assertEqual(ctx.captured_queries, [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._reminder(-3)
+        self.assertTrue(self._render(source)[0].startswith("1/3/1/4/5/"))
+
+    def test_unread_messages_count_follows_message_writes(self):
+        from users.models import SystemMessage
+
+        self.assertEqual(self._render("{{ unread_messages_count }}")[0], "0")
+        with self.captureOnCommitCallbacks(execute=True):
+            message = SystemMessage.create_message(self.user, "Hi", "Body", source_app="core", source_model="t", source_id="1")
+        self.assertEqual(self._render("{{ unread_messages_count }}")[0], "1")
+        with self.captureOnCommitCallbacks(execute=True):
+            message.mark_as_read()
+        self.assertEqual(self._render("{{ unread_messages_count }}")[0], "0")
+
+    def test_lazy_counts_work_with_numeric_filters(self):
+        for days in (0, -2):
+            self._reminder(days)
+        source = (
+            "{{ due_count }} reminder{{ due_count|pluralize }}/"
+            "{{ pending_count }} pending{{ pending_count|pluralize }}/"
+            "{% if due_count >= 2 %}many{% endif %}/{{ due_count|add:1 }}/"
+            "{% widthratio due_count 4 100 %}"
+        )
+
+        self.assertEqual(self._render(source)[0], "2 reminders/0 pendings/many/3/50")
+
+
+class FingerprintedStaticFilesTests(TestCase):
+    """collectstatic + WhiteNoise as production runs them, on a two-file tree."""
+
+    def setUp(self):
+        import shutil
+        import tempfile
+        from pathlib import Path
+
+        from django.conf import settings
+        from django.core.management import call_command
+
+        source = Path(tempfile.mkdtemp())
+        self.static_root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, source, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, self.static_root, ignore_errors=True)
+        (source / "css").mkdir()
+        (source / "js").mkdir()
+        (source / "css" / "site.css").write_text("body { color: #1a1a1a; }\n" * 400)
+        (source / "js" / "site.js").write_text("window.site = function () { return 1; };\n" * 400)
+
+        overrides = override_settings(
+            STATICFILES_DIRS=[source],
+            STATICFILES_FINDERS=["django.contrib.staticfiles.finders.FileSystemFinder"],
+            STATIC_ROOT=self.static_root,
+            STORAGES={**settings.STORAGES, "staticfiles": {"BACKEND": "STATZWeb.storage.FingerprintedStaticFilesStorage"}},
+            WHITENOISE_MAX_AGE=0,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        call_command("collectstatic", interactive=False, verbosity=0)
+
+    def _page(self):
+        from django.template import Context, Template
+
+        return Template(
+            "{% load assets %}<link rel='stylesheet' href='{% asset \"css/site.css\" %}'>"
+            "<script src='{% asset \"js/site.js\" %}'></script>"
+        ).render(Context())
+
+    def _browser_load(self, app, page, browser_cache):
+        """Bytes a browser downloads for ``page``, honouring and updating ``browser_cache``."""
+        import re
+
+        from django.test import RequestFactory
+
+        transferred = len(page.encode())
+        for url in re.findall(r"(?:href|src)='([^']+)'", page):
+            cached = browser_cache.get(url)
+            if cached and "immutable" in cached["Cache-Control"]:
+                continue
+            headers = {"HTTP_ACCEPT_ENCODING": "gzip, br"}
+            if cached:
+                headers["HTTP_IF_NONE_MATCH"] = cached["ETag"]
+            response = app(RequestFactory().get(url.split("?")[0], **headers))
+            transferred += sum(len(chunk) for chunk in response.streaming_content) if response.status_code == 200 else 0
+            response.close()
+            browser_cache[url] = response
+        return transferred
+
+    def test_hashed_assets_are_immutable_and_not_refetched(self):
+        from django.http import HttpResponse
+        from whitenoise.middleware import WhiteNoiseMiddleware
+
+        app = WhiteNoiseMiddleware(lambda request: HttpResponse(status=404))
+        page = self._page()
+        self.assertRegex(page, r"/static/css/site\.[0-9a-f]{12}\.css'")
+        self.assertTrue(any(self.static_root.glob("css/site.*.css.gz")))
+
+        browser_cache = {}
+        cold = self._browser_load(app, page, browser_cache)
+        warm = self._browser_load(app, self._page(), browser_cache)
+
+        for response in browser_cache.values():
+            self.assertIn("immutable", response["Cache-Control"])
+            self.assertIn(response["Content-Encoding"], ("gzip", "br"))
+        self.assertEqual(warm, len(page.encode()))  # only the HTML
+        self.assertGreater(cold - warm, 0)
+
+    def test_unmanifested_asset_falls_back_to_deploy_version(self):
+        from django.template import Context, Template
+
+        from STATZWeb.version_utils import get_cache_version
+
+        html = Template("{% load assets %}{% asset 'css/missing.css' %}").render(Context())
+
+        self.assertEqual(html, f"/static/css/missing.css?v={get_cache_version()}")
+
+    def test_cache_version_is_computed_once_and_prefers_deployment_id(self):
+        import os
+
+        from STATZWeb import version_utils
+
+        version_utils.get_cache_version.cache_clear()
+        self.addCleanup(version_utils.get_cache_version.cache_clear)
+        with patch.dict(os.environ, {"WEBSITE_DEPLOYMENT_ID": "deploy 42"}), \
+                patch.object(version_utils, "get_version_info") as version_info:
+            self.assertEqual(version_utils.get_cache_version(), "deploy-42")
+            self.assertEqual(version_utils.get_cache_version(), "deploy-42")
+        version_info.assert_not_called()
+
+    def test_no_template_appends_per_request_cache_busters(self):
+        import re
+        from pathlib import Path
+
+        from django.conf import settings
+
+        base = Path(settings.BASE_DIR)
+        templates = [*base.glob("templates/**/*.html"), *base.glob("*/templates/**/*.html")]
+        offenders = [
+            str(path.relative_to(base))
+            for path in templates
+            if re.search(r"\?v=\{%\s*now\b", path.read_text(encoding="utf-8", errors="ignore"))
+        ]
+
+        self.assertEqual(offenders, [])
@@ -19,10 +19,11 @@ When False, the queue send view falls back to mailto: links.
 
 import logging
 
-import msal
 import requests
 from django.conf import settings
 
+from core.graph_client import GraphAuthError, get_app_token, graph_request
+
 logger = logging.getLogger(__name__)
 
 # Graph API endpoint for sending mail
@@ -35,43 +36,21 @@ GRAPH_SEND_URL = "https://graph.microsoft.us/v1.0/users/{sender}/sendMail"
 def _get_access_token() -> str | None:
     """
     Obtain an access token using the client credentials (app-only) flow.
+    Served from the shared core.graph_client cache until shortly before expiry.
     Returns the token string on success, None on failure.
     Logs errors but does not raise — callers check for None.
     """
-    tenant_id = settings.GRAPH_MAIL_TENANT_ID
-    client_id = settings.GRAPH_MAIL_CLIENT_ID
-    client_secret = settings.GRAPH_MAIL_CLIENT_SECRET
-
-    if not all([tenant_id, client_id, client_secret]):
+    try:
+        return get_app_token()
+    except (GraphAuthError, requests.RequestException) as exc:
         logger.error(
-            "graph_mail: One or more GRAPH_MAIL_* settings are missing. "
-            "Check GRAPH_MAIL_TENANT_ID, GRAPH_MAIL_CLIENT_ID, GRAPH_MAIL_CLIENT_SECRET."
+            "graph_mail: Failed to acquire access token. "
+            "Error: %s — Description: %s",
+            getattr(exc, "message", exc),
+            getattr(exc, "details", "")[:500],
         )
         return None
 
-    authority = f"https://login.microsoftonline.us/{tenant_id}"
-
-    app = msal.ConfidentialClientApplication(
-        client_id=client_id,
-        client_credential=client_secret,
-        authority=authority,
-    )
-
-    result = app.acquire_token_for_client(
-        scopes=["https://graph.microsoft.us/.default"]
-    )
-
-    if "access_token" in result:
-        return result["access_token"]
-
-    logger.error(
-        "graph_mail: Failed to acquire access token. "
-        "Error: %s — Description: %s",
-        result.get("error"),
-        result.get("error_description"),
-    )
-    return None
-
 
 def send_mail_via_graph(
     to_address: str,
@@ -94,7 +73,9 @@ def send_mail_via_graph(
         attachments:  Optional list of attachment dicts, each with keys:
                         'name'         (str)  — filename shown to recipient
                         'content_type' (str)  — MIME type e.g. 'application/pdf'
-                        'data'         (bytes) — raw file bytes
+                        'data'         (bytes) — raw file bytes, or
+                        'content_bytes' (str) — the same bytes already
+                                         base64-encoded (encode once per campaign)
         cc_addresses: Optional list of CC email address strings.
 
     Returns:
@@ -146,7 +127,7 @@ def send_mail_via_graph(
         message["attachments"] = []
         for att in attachments:
             try:
-                encoded = base64.b64encode(att["data"]).decode("utf-8")
+                encoded = att.get("content_bytes") or base64.b64encode(att["data"]).decode("utf-8")
                 message["attachments"].append({
                     "@odata.type": "#microsoft.graph.fileAttachment",
                     "name": att["name"],
@@ -169,7 +150,9 @@ def send_mail_via_graph(
     }
 
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
+        response = graph_request(
+            "POST", url, json=payload, headers=headers, timeout=30, metric="sendMail"
+        )
     except requests.RequestException as exc:
         logger.error(
             "graph_mail: HTTP request to Graph failed for %s: %s",
@@ -1,92 +1,211 @@
+import base64
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
 from django.utils import timezone
-from mailer.models import Campaign
+from mailer.models import Campaign, CampaignRecipient
 from mailer.services.graph_mail import send_mail_via_graph
 from django.utils.html import linebreaks, urlize
 
 logger = logging.getLogger("mailer.background_tasks")
 
+GRAPH_ERROR_MESSAGE = "Microsoft Graph API returned an error. Check server logs."
+SEND_ERROR_MESSAGE = "Could not render or send this email. Check server logs."
+
+
+class MailboxRateLimiter:
+    """
+    Spaces sends from one mailbox at least 60 / per_minute seconds apart,
+    shared by every worker thread. acquire() returns False instead of waiting
+    past the tick deadline.
+    """
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline=None):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_at)
+            if deadline is not None and start >= deadline:
+                return False
+            self._next_at = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+        return True
+
+
+def _load_attachments(campaign):
+    """Read and base64-encode the campaign's attachments once for all recipients."""
+    attachment_list = []
+    for att in campaign.attachments.all():
+        try:
+            att.file.open('rb')
+            file_bytes = att.file.read()
+            att.file.close()
+            attachment_list.append({
+                'name': att.original_name,
+                'content_type': att.content_type,
+                'content_bytes': base64.b64encode(file_bytes).decode('utf-8'),
+            })
+        except Exception as e:
+            logger.error(f"Failed to read attachment '{att.original_name}' for campaign '{campaign.name}': {e}")
+    return attachment_list
+
+
+def _render(campaign, recipient):
+    """Return (subject, html_body) for one recipient."""
+    # 1. Build context for formatting
+    context = {
+        'first_name': recipient.first_name or '',
+        'last_name': recipient.last_name or '',
+        'company_name': recipient.company_name or '',
+        'email': recipient.email or '',
+        **recipient.custom_data
+    }
+
+    # 2. Format subject and body using safe dictionary formatting
+    try:
+        subject = campaign.subject_template.format(**context)
+    except KeyError as e:
+        subject = campaign.subject_template.replace('{' + str(e.args[0]) + '}', '')
+
+    try:
+        body = campaign.body_template.format(**context)
+    except KeyError as e:
+        body = campaign.body_template.replace('{' + str(e.args[0]) + '}', '')
+
+    # 3. Convert to HTML if needed
+    if campaign.is_html_body:
+        # Body is already HTML from Quill editor — send as-is
+        return subject, body
+    # Legacy plain text — auto-link URLs and convert linebreaks
+    return subject, linebreaks(urlize(body))
+
+
+def _send_one(campaign, recipient, attachment_list, limiter, deadline):
+    """
+    Worker-thread body (no ORM). Returns True/False for the Graph result, or
+    None when the tick ran out of time before this recipient's slot.
+    """
+    subject, html_body = _render(campaign, recipient)
+    if not limiter.acquire(deadline):
+        return None
+    return send_mail_via_graph(
+        to_address=recipient.email,
+        subject=subject,
+        body=html_body,
+        sender=campaign.sender_email,
+        is_html=True,
+        attachments=attachment_list or None,
+    )
+
+
+def _flush(done):
+    """Write finished recipients' statuses in one query and empty ``done``."""
+    if done:
+        CampaignRecipient.objects.bulk_update(done, ['status', 'sent_at', 'error_message'])
+        done.clear()
+
+
+def _dispatch_campaign(campaign, pool, limiter, deadline):
+    """
+    Send PENDING recipients in pk batches; returns False if the tick ran out of time.
+
+    Finished recipients are written back with one bulk_update per
+    MAILER_STATUS_FLUSH_SIZE completions and at the end of every batch (also
+    when it is cut short), so a crash re-sends at most one unflushed group.
+    A send that raises (e.g. a malformed template) is recorded as FAILED.
+    """
+    attachment_list = _load_attachments(campaign)
+    batch_size = max(settings.MAILER_DISPATCH_BATCH_SIZE, 1)
+    flush_size = max(settings.MAILER_STATUS_FLUSH_SIZE, 1)
+    last_pk = 0
+    sent = failed = 0
+
+    while time.monotonic() < deadline:
+        batch = list(
+            campaign.recipients.filter(status='PENDING', pk__gt=last_pk)
+            .order_by('pk')[:batch_size]
+        )
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+
+        futures = {
+            pool.submit(_send_one, campaign, r, attachment_list, limiter, deadline): r
+            for r in batch
+        }
+        skipped = 0
+        done = []
+        try:
+            for future in as_completed(futures):
+                recipient = futures[future]
+                try:
+                    success = future.result()
+                except Exception:
+                    logger.exception(f"Sending to {recipient.email} in campaign '{campaign.name}' failed")
+                    success, error = False, SEND_ERROR_MESSAGE
+                else:
+                    error = GRAPH_ERROR_MESSAGE
+                if success is None:
+                    skipped += 1
+                    continue
+                if success:
+                    recipient.status = 'SENT'
+                    recipient.sent_at = timezone.now()
+                    sent += 1
+                else:
+                    recipient.status = 'FAILED'
+                    recipient.error_message = error
+                    failed += 1
+                done.append(recipient)
+                if len(done) >= flush_size:
+                    _flush(done)
+        finally:
+            _flush(done)
+        if skipped:
+            break
+
+    logger.info(f"Campaign '{campaign.name}': {sent} sent, {failed} failed this tick")
+    return time.monotonic() < deadline
+
+
 def dispatch_campaigns():
     """
     Finds campaigns that are SCHEDULED or SENDING and dispatches their pending recipients.
     Changes campaign status to COMPLETED when all recipients are processed.
+
+    Sends run on MAILER_DISPATCH_WORKERS threads, paced per sender mailbox at
+    MAILER_SEND_RATE_PER_MINUTE; after MAILER_DISPATCH_TIME_BUDGET_SECONDS no
+    new sends start and the next tick picks up the remaining PENDING rows.
     """
+    deadline = time.monotonic() + settings.MAILER_DISPATCH_TIME_BUDGET_SECONDS
     campaigns = Campaign.objects.filter(status__in=['SCHEDULED', 'SENDING'])
-    
-    for campaign in campaigns:
-        if campaign.status == 'SCHEDULED':
-            campaign.status = 'SENDING'
-            campaign.save(update_fields=['status'])
-            logger.info(f"Started sending campaign '{campaign.name}'")
-
-        # Pre-load attachments once for the campaign (initial email only)
-        attachment_list = []
-        for att in campaign.attachments.all():
-            try:
-                att.file.open('rb')
-                file_bytes = att.file.read()
-                att.file.close()
-                attachment_list.append({
-                    'name': att.original_name,
-                    'content_type': att.content_type,
-                    'data': file_bytes,
-                })
-            except Exception as e:
-                logger.error(f"Failed to read attachment '{att.original_name}' for campaign '{campaign.name}': {e}")
-
-        pending_recipients = campaign.recipients.filter(status='PENDING')
-        
-        for recipient in pending_recipients:
-            # 1. Build context for formatting
-            context = {
-                'first_name': recipient.first_name or '',
-                'last_name': recipient.last_name or '',
-                'company_name': recipient.company_name or '',
-                'email': recipient.email or '',
-                **recipient.custom_data
-            }
-            
-            # 2. Format subject and body using safe dictionary formatting
-            try:
-                subject = campaign.subject_template.format(**context)
-            except KeyError as e:
-                subject = campaign.subject_template.replace('{' + str(e.args[0]) + '}', '')
-                
-            try:
-                body = campaign.body_template.format(**context)
-            except KeyError as e:
-                body = campaign.body_template.replace('{' + str(e.args[0]) + '}', '')
-                
-            # 3. Convert to HTML if needed
-            if campaign.is_html_body:
-                # Body is already HTML from Quill editor — send as-is
-                html_body = body
-            else:
-                # Legacy plain text — auto-link URLs and convert linebreaks
-                html_body = linebreaks(urlize(body))
-
-            # 4. Send email via Graph API
-            success = send_mail_via_graph(
-                to_address=recipient.email,
-                subject=subject,
-                body=html_body,
-                sender=campaign.sender_email,
-                is_html=True,
-                attachments=attachment_list if attachment_list else None,
-            )
-            
-            # 5. Update recipient status
-            if success:
-                recipient.status = 'SENT'
-                recipient.sent_at = timezone.now()
-            else:
-                recipient.status = 'FAILED'
-                recipient.error_message = "Microsoft Graph API returned an error. Check server logs."
-                
-            recipient.save(update_fields=['status', 'sent_at', 'error_message'])
-
-        # Check if all done
-        if not campaign.recipients.filter(status='PENDING').exists():
-            campaign.status = 'COMPLETED'
-            campaign.save(update_fields=['status'])
-            logger.info(f"Finished campaign '{campaign.name}'")
+    limiters = {}
+
+    with ThreadPoolExecutor(max_workers=max(settings.MAILER_DISPATCH_WORKERS, 1)) as pool:
+        for campaign in campaigns:
+            if campaign.status == 'SCHEDULED':
+                campaign.status = 'SENDING'
+                campaign.save(update_fields=['status'])
+                logger.info(f"Started sending campaign '{campaign.name}'")
+
+            mailbox = (campaign.sender_email or '').lower()
+            if mailbox not in limiters:
+                limiters[mailbox] = MailboxRateLimiter(settings.MAILER_SEND_RATE_PER_MINUTE)
+            in_time = _dispatch_campaign(campaign, pool, limiters[mailbox], deadline)
+
+            # Check if all done
+            if not campaign.recipients.filter(status='PENDING').exists():
+                campaign.status = 'COMPLETED'
+                campaign.save(update_fields=['status'])
+                logger.info(f"Finished campaign '{campaign.name}'")
+            if not in_time:
+                logger.info("dispatch_campaigns: time budget spent; resuming next tick")
+                break
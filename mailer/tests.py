@@ -1,3 +1,138 @@
-from django.test import TestCase
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from mailer.models import Campaign, CampaignAttachment, CampaignRecipient
+from mailer.tasks import dispatch_campaigns as dispatch_module
+from mailer.tasks.dispatch_campaigns import MailboxRateLimiter, dispatch_campaigns
+
+
+@override_settings(
+    MAILER_DISPATCH_WORKERS=4,
+    MAILER_SEND_RATE_PER_MINUTE=0,
+    MAILER_DISPATCH_TIME_BUDGET_SECONDS=60,
+    MAILER_DISPATCH_BATCH_SIZE=50,
+    MAILER_STATUS_FLUSH_SIZE=4,
+)
+class DispatchCampaignsTests(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp(prefix="mailer_media_")
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.campaign = Campaign.objects.create(
+            name="Spring outreach",
+            subject_template="Hello {first_name}",
+            body_template="<p>Hi {first_name} at {company_name}</p>",
+            sender_email="sales@example.com",
+            status="SCHEDULED",
+        )
+        CampaignAttachment.objects.create(
+            campaign=self.campaign,
+            file=SimpleUploadedFile("capabilities.pdf", b"%PDF-1.4 brochure"),
+            original_name="capabilities.pdf",
+            content_type="application/pdf",
+            file_size=17,
+        )
+        for n in range(10):
+            CampaignRecipient.objects.create(
+                campaign=self.campaign,
+                email=f"buyer{n}@example.com",
+                first_name=f"Buyer{n}",
+                company_name="Acme",
+            )
+
+    def test_sends_every_recipient_with_batched_status_updates(self):
+        with patch.object(dispatch_module, "send_mail_via_graph", return_value=True) as send, \
+                patch.object(dispatch_module.base64, "b64encode", wraps=dispatch_module.base64.b64encode) as enc, \
+                CaptureQueriesContext(connection) as ctx:
+            dispatch_campaigns()
+
+        self.assertEqual(send.call_count, 10)
+        self.assertEqual(enc.call_count, 1)
+        attachments = send.call_args.kwargs["attachments"]
+        self.assertEqual(attachments[0]["content_bytes"], "JVBERi0xLjQgYnJvY2h1cmU=")
+        self.assertEqual(
+            sorted(c.kwargs["subject"] for c in send.call_args_list),
+            sorted(f"Hello Buyer{n}" for n in range(10)),
+        )
+        recipient_updates = [
+            q for q in ctx.captured_queries
+            if q["sql"].startswith('UPDATE "mailer_campaignrecipient"')
+        ]
+        self.assertEqual(len(recipient_updates), 3)  # 4 + 4 + the batch's last 2
+        self.assertEqual(CampaignRecipient.objects.filter(status="SENT").count(), 10)
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.status, "COMPLETED")
+
+    def test_raising_send_is_marked_failed_with_the_rest_of_the_batch(self):
+        self.campaign.body_template = "<p>Hi {0}</p>"  # IndexError under .format(**context)
+        self.campaign.save(update_fields=["body_template"])
+
+        with patch.object(dispatch_module, "send_mail_via_graph", return_value=True) as send:
+            dispatch_campaigns()
+
+        send.assert_not_called()
+        failed = CampaignRecipient.objects.filter(status="FAILED")
+        self.assertEqual(failed.count(), 10)
+        self.assertTrue(all(r.error_message == dispatch_module.SEND_ERROR_MESSAGE for r in failed))
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.status, "COMPLETED")
+
+    def test_crash_mid_batch_keeps_finished_recipients_sent(self):
+        def send(to_address, **kwargs):
+            if to_address == "buyer9@example.com":
+                time.sleep(0.5)
+                raise KeyboardInterrupt  # stands in for the worker process dying
+            return True
+
+        with patch.object(dispatch_module, "send_mail_via_graph", side_effect=send), \
+                self.assertRaises(KeyboardInterrupt):
+            dispatch_campaigns()
+
+        self.assertEqual(CampaignRecipient.objects.filter(status="SENT").count(), 9)
+        self.assertEqual(
+            list(CampaignRecipient.objects.filter(status="PENDING").values_list("email", flat=True)),
+            ["buyer9@example.com"],
+        )
+
+    def test_failed_sends_are_marked_and_campaign_completes(self):
+        with patch.object(dispatch_module, "send_mail_via_graph", return_value=False):
+            dispatch_campaigns()
+
+        failed = CampaignRecipient.objects.filter(status="FAILED")
+        self.assertEqual(failed.count(), 10)
+        self.assertTrue(all(r.error_message for r in failed))
+        self.assertTrue(all(r.sent_at is None for r in failed))
+
+    @override_settings(MAILER_DISPATCH_TIME_BUDGET_SECONDS=0)
+    def test_spent_time_budget_leaves_recipients_for_next_tick(self):
+        with patch.object(dispatch_module, "send_mail_via_graph", return_value=True) as send:
+            dispatch_campaigns()
+
+        send.assert_not_called()
+        self.assertEqual(CampaignRecipient.objects.filter(status="PENDING").count(), 10)
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.status, "SENDING")
+
+        with patch.object(dispatch_module, "send_mail_via_graph", return_value=True), \
+                override_settings(MAILER_DISPATCH_TIME_BUDGET_SECONDS=60):
+            dispatch_campaigns()
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.status, "COMPLETED")
+
+    def test_mailbox_rate_limiter_spaces_sends_and_respects_deadline(self):
+        limiter = MailboxRateLimiter(per_minute=600)  # one send per 0.1s
+        started = time.monotonic()
+        self.assertTrue(limiter.acquire())
+        self.assertTrue(limiter.acquire())
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+        self.assertFalse(limiter.acquire(deadline=time.monotonic()))
@@ -0,0 +1,20 @@
+"""
+Management command: rebuild_observatory_stats
+
+Recompute the materialized Observatory counters (products.ObservatoryStats)
+from the source tables. The scheduled refresh_observatory_stats task does the
+same hourly; run this after bulk SQL loads that bypass the ORM.
+"""
+from django.core.management.base import BaseCommand
+
+from products.observatory_stats import rebuild_observatory_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the materialized Observatory portfolio counters.'
+
+    def handle(self, *args, **options):
+        row = rebuild_observatory_stats()
+        for name, value in row.as_dict().items():
+            self.stdout.write(f'{name}: {value}')
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt at {row.rebuilt_at:%Y-%m-%d %H:%M:%S}.'))
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0004_backfill_nsn_normalized"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ObservatoryStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("total_nsns", models.IntegerField(default=0)),
+                ("nsns_with_history", models.IntegerField(default=0)),
+                ("total_procurement_records", models.IntegerField(default=0)),
+                ("awards_won", models.IntegerField(default=0)),
+                ("active_approved_cages", models.IntegerField(default=0)),
+                ("rebuilt_at", models.DateTimeField(blank=True, null=True)),
+                ("refreshed_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name_plural": "observatory stats",
+                "db_table": "products_observatory_stats",
+            },
+        ),
+    ]
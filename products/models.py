@@ -93,3 +93,40 @@ class SupplierNSNCapability(models.Model):
 
     class Meta:
         db_table = 'supplier_nsn_capability'
+
+
+class ObservatoryStats(models.Model):
+    """
+    Single-row materialization of the Observatory portfolio counters.
+
+    Kept current by products.observatory_stats: NSN / contract saves and
+    procurement-history imports apply increments, the scheduled
+    ``refresh_observatory_stats`` task (and the ``rebuild_observatory_stats``
+    command) recompute every counter set-based.
+    """
+
+    SINGLETON_PK = 1
+
+    total_nsns = models.IntegerField(default=0)
+    nsns_with_history = models.IntegerField(default=0)
+    total_procurement_records = models.IntegerField(default=0)
+    awards_won = models.IntegerField(default=0)
+    active_approved_cages = models.IntegerField(default=0)
+    rebuilt_at = models.DateTimeField(null=True, blank=True)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'products_observatory_stats'
+        verbose_name_plural = 'observatory stats'
+
+    def as_dict(self):
+        return {
+            'total_nsns': self.total_nsns,
+            'nsns_with_history': self.nsns_with_history,
+            'total_procurement_records': self.total_procurement_records,
+            'awards_won': self.awards_won,
+            'active_approved_cages': self.active_approved_cages,
+        }
+
+    def __str__(self):
+        return f"Observatory stats (rebuilt {self.rebuilt_at})"
@@ -0,0 +1,150 @@
+"""
+Materialized Observatory portfolio counters (products.ObservatoryStats).
+
+ObservatoryView used to rebuild these on every cache miss by pulling every
+catalog NSN and every distinct procurement-history NSN into Python sets.
+The counters now live in one row:
+
+- rebuild_observatory_stats(): set-based recompute (COUNTs plus one
+  semi-join of nsn_normalized against procurement history). Run by the
+  ``refresh_observatory_stats`` scheduled task and the
+  ``rebuild_observatory_stats`` management command; also the fallback
+  when the row does not exist yet.
+- apply_* helpers: increments computed by the write paths (products.signals)
+  and applied with transaction.on_commit, so the stats row is only locked by
+  a short UPDATE after the writer commits (never for the length of an
+  import), and a rolled-back import never applies its increment. Paths that
+  bypass the ORM (raw MERGE into contracts_nsn, approved-source imports), and
+  any drift from concurrent importers, are corrected by the next scheduled
+  rebuild.
+
+Procurement history stores NSNs as 13 digits (save_procurement_history),
+so coverage is ``nsn_normalized IN (history.nsn)``; catalog rows with a
+blank nsn_normalized are not counted (see backfill_nsn_normalized).
+"""
+import logging
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from products.models import Nsn, ObservatoryStats
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = (
+    'total_nsns',
+    'nsns_with_history',
+    'total_procurement_records',
+    'awards_won',
+    'active_approved_cages',
+)
+
+
+def compute_observatory_stats():
+    """Recompute every counter from the source tables; returns a dict."""
+    from contracts.models import Contract
+    from sales.models.approved_sources import ApprovedSource
+    from sales.models.solicitations import NsnProcurementHistory
+
+    return {
+        'total_nsns': Nsn.objects.count(),
+        'nsns_with_history': (
+            Nsn.objects.exclude(nsn_normalized='')
+            .filter(nsn_normalized__in=NsnProcurementHistory.objects.values('nsn'))
+            .values('nsn_normalized')
+            .distinct()
+            .count()
+        ),
+        # Plain unfiltered table count — verified 2026-07-07; gap vs physical rows is data drift.
+        'total_procurement_records': NsnProcurementHistory.objects.count(),
+        # Contract rows are canonical post-award wins (Open/Closed/Canceled); not DIBBS scrape noise.
+        'awards_won': Contract.objects.count(),
+        'active_approved_cages': (
+            ApprovedSource.objects.exclude(approved_cage='')
+            .values('approved_cage')
+            .distinct()
+            .count()
+        ),
+    }
+
+
+def rebuild_observatory_stats():
+    """Recompute and store the stats row; returns the saved ObservatoryStats."""
+    values = compute_observatory_stats()
+    now = timezone.now()
+    row, _ = ObservatoryStats.objects.update_or_create(
+        pk=ObservatoryStats.SINGLETON_PK,
+        defaults={**values, 'rebuilt_at': now, 'refreshed_at': now},
+    )
+    logger.info('rebuild_observatory_stats: %s', values)
+    return row
+
+
+def get_observatory_stats():
+    """The Observatory counters as a dict — one primary-key read in steady state."""
+    row = ObservatoryStats.objects.filter(pk=ObservatoryStats.SINGLETON_PK).first()
+    if row is None:
+        row = rebuild_observatory_stats()
+    return row.as_dict()
+
+
+def _apply_deltas(deltas):
+    # No row yet means the next read rebuilds from scratch; nothing to bump.
+    ObservatoryStats.objects.filter(pk=ObservatoryStats.SINGLETON_PK).update(
+        refreshed_at=timezone.now(),
+        **{name: F(name) + delta for name, delta in deltas.items()},
+    )
+
+
+def _increment(**deltas):
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return
+    # Deferred until commit (immediate outside a transaction) so the singleton
+    # row is not held locked for the rest of the writer's transaction.
+    transaction.on_commit(lambda: _apply_deltas(deltas))
+
+
+def _has_history(normalized):
+    from sales.models.solicitations import NsnProcurementHistory
+
+    return NsnProcurementHistory.objects.filter(nsn=normalized).exists()
+
+
+def _only_catalog_row(nsn):
+    return not Nsn.objects.filter(nsn_normalized=nsn.nsn_normalized).exclude(pk=nsn.pk).exists()
+
+
+def apply_nsn_created(nsn):
+    covered = bool(nsn.nsn_normalized) and _has_history(nsn.nsn_normalized) and _only_catalog_row(nsn)
+    _increment(total_nsns=1, nsns_with_history=1 if covered else 0)
+
+
+def apply_nsn_deleted(nsn):
+    covered = bool(nsn.nsn_normalized) and _has_history(nsn.nsn_normalized) and _only_catalog_row(nsn)
+    _increment(total_nsns=-1, nsns_with_history=-1 if covered else 0)
+
+
+def apply_contract_created():
+    _increment(awards_won=1)
+
+
+def apply_contract_deleted():
+    _increment(awards_won=-1)
+
+
+def apply_procurement_history_saved(inserted, first_seen_nsns):
+    """
+    ``inserted`` new history rows were written; ``first_seen_nsns`` are the
+    NSNs that had no history before this save.
+    """
+    covered = 0
+    if first_seen_nsns:
+        covered = (
+            Nsn.objects.filter(nsn_normalized__in=list(first_seen_nsns))
+            .values('nsn_normalized')
+            .distinct()
+            .count()
+        )
+    _increment(total_procurement_records=inserted, nsns_with_history=covered)
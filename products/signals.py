@@ -0,0 +1,38 @@
+"""
+Keep the materialized Observatory counters (products/observatory_stats.py)
+current from the write paths: NSN and contract creates/deletes, and
+procurement-history imports (sales.signals.procurement_history_saved).
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from products import observatory_stats
+from products.models import Nsn
+from sales.signals import procurement_history_saved
+
+
+@receiver(post_save, sender=Nsn)
+def nsn_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        observatory_stats.apply_nsn_created(instance)
+
+
+@receiver(post_delete, sender=Nsn)
+def nsn_deleted(sender, instance, **kwargs):
+    observatory_stats.apply_nsn_deleted(instance)
+
+
+@receiver(post_save, sender='contracts.Contract')
+def contract_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        observatory_stats.apply_contract_created()
+
+
+@receiver(post_delete, sender='contracts.Contract')
+def contract_deleted(sender, instance, **kwargs):
+    observatory_stats.apply_contract_deleted()
+
+
+@receiver(procurement_history_saved)
+def procurement_history_imported(sender, inserted, first_seen_nsns, **kwargs):
+    observatory_stats.apply_procurement_history_saved(inserted, first_seen_nsns)
@@ -0,0 +1,11 @@
+import logging
+
+from products.observatory_stats import rebuild_observatory_stats
+
+logger = logging.getLogger(__name__)
+
+
+def run():
+    """Recompute the Observatory counters, correcting drift from non-ORM writes."""
+    row = rebuild_observatory_stats()
+    logger.info("refresh_observatory_stats: finished. %s", row.as_dict())
@@ -0,0 +1,118 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from contracts.models import Company, Contract
+from products.models import Nsn, ObservatoryStats
+from products.observatory_stats import compute_observatory_stats, get_observatory_stats
+from sales.models.approved_sources import ApprovedSource
+from sales.services.dibbs_pdf import save_procurement_history
+
+User = get_user_model()
+
+
+def _history_row(nsn, contract_number, sol='SPE7L726Q0001'):
+    return {
+        'nsn': nsn,
+        'fsc': nsn[:4],
+        'cage_code': '1ABC2',
+        'contract_number': contract_number,
+        'quantity': Decimal('5'),
+        'unit_cost': Decimal('12.50'),
+        'award_date': date(2026, 3, 1),
+        'surplus_material': False,
+        'sol_number': sol,
+    }
+
+
+class ObservatoryStatsTests(TestCase):
+    def setUp(self):
+        self.company = Company.objects.create(name='Stats Co', slug='stats-co', is_active=True)
+        Nsn.objects.create(nsn_code='5935-01-129-9512')
+        Nsn.objects.create(nsn_code='5935011299512')  # duplicate catalog row
+        Nsn.objects.create(nsn_code='5340-00-000-0001')
+        Contract.objects.create(company=self.company, contract_number='SPE4A6-26-P-0001')
+        ApprovedSource.objects.create(nsn='5935011299512', approved_cage='2BBB2')
+        ApprovedSource.objects.create(nsn='5340000000001', approved_cage='2BBB2')
+        save_procurement_history([
+            _history_row('5935011299512', 'SPE7L7-20-P-0001'),
+            _history_row('5935011299512', 'SPE7L7-21-P-0002'),
+            _history_row('6105000000009', 'SPE7L7-22-P-0003'),
+        ])
+
+    def test_rebuild_matches_source_tables(self):
+        stats = get_observatory_stats()
+
+        self.assertEqual(stats, {
+            'total_nsns': 3,
+            'nsns_with_history': 1,
+            'total_procurement_records': 3,
+            'awards_won': 1,
+            'active_approved_cages': 1,
+        })
+        self.assertIsNotNone(ObservatoryStats.objects.get().rebuilt_at)
+
+    def test_write_paths_keep_row_in_step_without_rebuild(self):
+        get_observatory_stats()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Nsn.objects.create(nsn_code='6105-00-000-0009')  # already has history
+            Nsn.objects.create(nsn_code='5340-00-000-0001')  # duplicate, no history
+            save_procurement_history([
+                _history_row('5340000000001', 'SPE7L7-23-P-0004'),
+                _history_row('5340000000001', 'SPE7L7-23-P-0005'),
+                _history_row('5935011299512', 'SPE7L7-20-P-0001'),  # existing row
+            ])
+            Contract.objects.create(company=self.company, contract_number='SPE4A6-26-P-0002')
+            Nsn.objects.filter(nsn_code='6105-00-000-0009').get().delete()
+
+        stats = get_observatory_stats()
+        expected = compute_observatory_stats()
+        expected.pop('active_approved_cages')
+        self.assertEqual({k: stats[k] for k in expected}, expected)
+        self.assertEqual(stats['nsns_with_history'], 2)
+        self.assertEqual(stats['total_procurement_records'], 5)
+
+    def test_increments_wait_for_the_writer_to_commit(self):
+        get_observatory_stats()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            with CaptureQueriesContext(connection) as ctx:
+                Contract.objects.create(company=self.company, contract_number='SPE4A6-26-P-0003')
+
+        touched = [q['sql'] for q in ctx.captured_queries if 'observatory' in q['sql'].lower()]
+        self.assertEqual(touched, [])
+        self.assertEqual(ObservatoryStats.objects.get().awards_won, 1)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(ObservatoryStats.objects.get().awards_won, 2)
+
+    def test_view_reads_one_row(self):
+        User.objects.create_user(username='portal', password='test')
+        self.client.login(username='portal', password='test')
+        get_observatory_stats()
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse('products:observatory'))
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.context['stats']['total_procurement_records'], 3)
+        touched = [q['sql'] for q in ctx.captured_queries if 'dibbs_nsn_procurement_history' in q['sql']]
+        self.assertEqual(touched, [])
+
+    def test_rebuild_command_corrects_drift(self):
+        get_observatory_stats()
+        ObservatoryStats.objects.update(total_nsns=0, active_approved_cages=0)
+
+        out = StringIO()
+        call_command('rebuild_observatory_stats', stdout=out)
+
+        self.assertIn('total_nsns: 3', out.getvalue())
+        self.assertEqual(get_observatory_stats()['active_approved_cages'], 1)
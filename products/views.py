@@ -8,7 +8,6 @@ import re
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.cache import cache
 from django.core.paginator import Paginator
 from django.db.models import Count, F, Q
 from django.shortcuts import get_object_or_404, redirect, render
@@ -28,9 +27,6 @@ from products.nsn_utils import (
     nsn_query_variants,
 )
 
-_OBSERVATORY_STATS_CACHE_KEY = 'products:observatory_stats'
-_OBSERVATORY_STATS_TTL = 600
-
 _ALNUM_13_RE = re.compile(r'^[A-Za-z0-9]{13}$')
 _DIGITS_9_RE = re.compile(r'^\d{9}$')
 _ALNUM_5_RE = re.compile(r'^[A-Za-z0-9]{5}$')
@@ -212,46 +208,9 @@ class ObservatoryView(LoginRequiredMixin, TemplateView):
         return recent
 
     def _get_stats(self):
-        cached = cache.get(_OBSERVATORY_STATS_CACHE_KEY)
-        if cached is not None:
-            return cached
+        from products.observatory_stats import get_observatory_stats
 
-        from contracts.models import Contract
-        from sales.models.solicitations import NsnProcurementHistory
-        from sales.models.approved_sources import ApprovedSource
-
-        total_nsns = Nsn.objects.count()
-        catalog_normalized = set()
-        for normalized, nsn_code in Nsn.objects.values_list('nsn_normalized', 'nsn_code'):
-            norm = normalized or normalize_nsn(nsn_code or '')
-            if norm:
-                catalog_normalized.add(norm)
-        procurement_normalized = {
-            normalize_nsn(nsn_val)
-            for nsn_val in NsnProcurementHistory.objects.values_list('nsn', flat=True).distinct()
-            if normalize_nsn(nsn_val)
-        }
-        nsns_with_history = len(catalog_normalized & procurement_normalized)
-        # Plain unfiltered table count — verified 2026-07-07; gap vs physical rows is data drift.
-        total_procurement_records = NsnProcurementHistory.objects.count()
-        # Contract rows are canonical post-award wins (Open/Closed/Canceled); not DIBBS scrape noise.
-        awards_won = Contract.objects.count()
-        active_approved_cages = (
-            ApprovedSource.objects.exclude(approved_cage='')
-            .values('approved_cage')
-            .distinct()
-            .count()
-        )
-
-        stats = {
-            'total_nsns': total_nsns,
-            'nsns_with_history': nsns_with_history,
-            'total_procurement_records': total_procurement_records,
-            'awards_won': awards_won,
-            'active_approved_cages': active_approved_cages,
-        }
-        cache.set(_OBSERVATORY_STATS_CACHE_KEY, stats, _OBSERVATORY_STATS_TTL)
-        return stats
+        return get_observatory_stats()
 
     def _get_recent_awards(self):
         from sales.models.awards import DibbsAward
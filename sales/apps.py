@@ -5,3 +5,6 @@ class SalesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'sales'
     verbose_name = 'Sales (DIBBS Bidding)'
+
+    def ready(self):
+        import sales.signals  # noqa: F401
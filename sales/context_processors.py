@@ -1,6 +1,4 @@
-from sales.models import SupplierRFQ
-from django.utils import timezone
-
+from core.page_chrome import get_page_chrome, lazy_count
 from sales.views.solicitations import COST_OF_MONEY_DAILY_RATE
 
 
@@ -17,8 +15,5 @@ def solicitation_nav_tools(request):
 def rfq_counts(request):
     if not request.user.is_authenticated:
         return {}
-    overdue = SupplierRFQ.objects.filter(
-        status='SENT',
-        line__solicitation__return_by_date__lt=timezone.now().date(),
-    ).count()
-    return {'overdue_rfq_count': overdue}
+    chrome = get_page_chrome(request)
+    return {'overdue_rfq_count': lazy_count(chrome.overdue_rfq_count)}
@@ -192,8 +192,7 @@ class Command(BaseCommand):
             self.style.SUCCESS(
                 "Lifecycle sweep complete — "
                 f"{sweep.get('new_to_active', 0)} activated, "
-                f"{sweep.get('expired_to_archived', 0)} archived, "
-                f"{sweep.get('blob_purged', 0)} blobs purged."
+                f"{sweep.get('expired_to_archived', 0)} archived."
             )
         )
 
@@ -237,17 +236,24 @@ class Command(BaseCommand):
         Returns (total_fetched, total_failed, total_parsed).
         """
         from sales.models import Solicitation
+        from sales.services.blob_store import (
+            get_blob_store,
+            has_pdf_q,
+            load_pdf_bytes,
+            no_pdf_q,
+            pdf_update_fields,
+        )
         from sales.services.dibbs_fetch import DibbsFetchError, fetch_ca_zip
         from sales.services.dibbs_pdf import persist_pdf_procurement_extract
 
+        store = get_blob_store()
         pending_filter = {
-            "pdf_blob__isnull": True,
             "pdf_fetch_attempts__lt": 5,
             "pdf_data_pulled__isnull": True,
         }
 
         pending_base = (
-            Solicitation.objects.filter(**pending_filter)
+            Solicitation.objects.filter(no_pdf_q(), **pending_filter)
             .exclude(small_business_set_aside="N")
             .exclude(status="Archived")
         )
@@ -362,7 +368,7 @@ class Command(BaseCommand):
                             Solicitation.objects.filter(
                                 solicitation_number=sol_number
                             ).update(
-                                pdf_blob=pdf_bytes,
+                                **pdf_update_fields(pdf_bytes, store),
                                 pdf_fetched_at=now,
                                 pdf_fetch_status="DONE",
                             )
@@ -409,18 +415,19 @@ class Command(BaseCommand):
                 blob_qs = (
                     Solicitation.objects
                     .filter(
+                        has_pdf_q(),
                         solicitation_number__in=fetched_sol_numbers,
-                        pdf_blob__isnull=False,
                         pdf_data_pulled__isnull=True,
                     )
-                    .values_list("solicitation_number", "pdf_blob")
+                    .values_list("solicitation_number", "pdf_blob_key")
                 )
-                for sol_number, blob in list(blob_qs):
+                for sol_number, blob_key in list(blob_qs):
+                    blob = load_pdf_bytes(blob_key, store=store)
                     if not blob:
                         continue
                     key = (sol_number or "").strip().upper()
                     try:
-                        persist_pdf_procurement_extract(key, bytes(blob))
+                        persist_pdf_procurement_extract(key, blob, blob_key=blob_key)
                         parsed += 1
                         self.stdout.write(f"    parsed: {key}")
                     except Exception as e:
@@ -0,0 +1,97 @@
+"""
+Management command: benchmark_dibbs_import
+
+Generates synthetic DIBBS IN/BQ/AS files, runs the full run_import() pipeline
+(lifecycle sweep → batch → solicitations → lines/AS → matching) inside a
+rolled-back transaction, and writes per-stage wall time, query counts and peak
+memory to a JSON report (sales/services/import_benchmark.py).
+
+Runs against SQLite only; --allow-non-sqlite overrides that for a scratch
+SQL Server database (never production: the run locks live tables).
+
+    python manage.py benchmark_dibbs_import --sizes 500,2500,10000 --output bench.json
+    python manage.py benchmark_dibbs_import --sizes 2500 --compare bench.json
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sales.services.import_benchmark import (
+    compare_reports,
+    load_report,
+    run_import_benchmark,
+)
+
+
+class Command(BaseCommand):
+    help = "Benchmark the DIBBS daily import on synthetic files; report per-stage time/queries/memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="1000",
+            help="Comma-separated solicitation counts, one run each (default 1000).",
+        )
+        parser.add_argument("--lines-per-sol", type=int, default=2)
+        parser.add_argument("--sources-per-nsn", type=int, default=2)
+        parser.add_argument(
+            "--no-trace-memory",
+            action="store_true",
+            help="Skip tracemalloc (faster, timing-only; peak_traced_mb is null).",
+        )
+        parser.add_argument("--seed", type=int, default=7)
+        parser.add_argument(
+            "--allow-non-sqlite",
+            action="store_true",
+            help="Run against a non-SQLite database (scratch databases only).",
+        )
+        parser.add_argument("--output", help="Write the JSON report to this path.")
+        parser.add_argument("--compare", help="Baseline JSON report to diff against.")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(s) for s in options["sizes"].split(",") if s.strip()]
+        except ValueError:
+            raise CommandError("--sizes must be comma-separated integers")
+        if not sizes or min(sizes) < 1:
+            raise CommandError("--sizes must contain positive integers")
+
+        try:
+            report = run_import_benchmark(
+                sizes=sizes,
+                lines_per_sol=options["lines_per_sol"],
+                sources_per_nsn=options["sources_per_nsn"],
+                trace_memory=not options["no_trace_memory"],
+                seed=options["seed"],
+                allow_non_sqlite=options["allow_non_sqlite"],
+            )
+        except RuntimeError as e:
+            raise CommandError(f"{e} Pass --allow-non-sqlite to override.")
+
+        for run in report["runs"]:
+            self.stdout.write(
+                f"{run['solicitations']} sols ({run['in_rows']} IN / {run['bq_rows']} BQ / "
+                f"{run['as_rows']} AS): {run['total_seconds']:.2f}s, "
+                f"{run['total_queries']} queries, {run['rows_per_sec']} rows/s, "
+                f"peak traced {run['peak_traced_mb']} MB, peak RSS {run['peak_rss_mb']} MB"
+            )
+            for name, stage in run["stages"].items():
+                self.stdout.write(
+                    f"    {name:<17} {stage['seconds']:>9.3f}s {stage['queries']:>6} queries"
+                    + (f" {stage['peak_mb']:>7.1f} MB" if "peak_mb" in stage else "")
+                )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+
+        if options["compare"]:
+            for row in compare_reports(load_report(options["compare"]), report):
+                pct = row["seconds_change_pct"]
+                self.stdout.write(
+                    f"{row['solicitations']:>7} {row['stage']:<17} "
+                    f"{row['seconds_before']:>9.3f}s → {row['seconds_after']:>9.3f}s "
+                    f"({'n/a' if pct is None else f'{pct:+.1f}%'}) "
+                    f"queries {row['queries_before']} → {row['queries_after']}"
+                )
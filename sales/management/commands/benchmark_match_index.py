@@ -0,0 +1,155 @@
+"""
+Management command: benchmark_match_index
+
+Builds a synthetic supplier-capability dataset (default 50,000 NSNs) inside a
+transaction, times per-line tier resolution with live queries vs the in-memory
+match index (sales/services/match_index.py), then rolls everything back.
+
+Reports, for both paths:
+  workbench   get_live_workbench_matches() per line (mean / p95 ms, queries/line)
+  import      _load_match_inputs() for one batch of --lines lines (ms, queries)
+plus the index's cold build time.
+
+Where dibbs_supplier_nsn_scored does not exist (SQLite dev DB) a stand-in table
+is created for the run; otherwise SupplierNSN rows feed the view.
+"""
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from sales.models import ApprovedSource, SolicitationLine, SupplierFSC, SupplierNSN
+from sales.services import match_index
+from sales.services.matching import _load_match_inputs, get_live_workbench_matches
+from suppliers.models import Supplier
+
+_SCORED_TABLE = "dibbs_supplier_nsn_scored"
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Compare per-line supplier match latency: live queries vs in-memory match index."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--nsns", type=int, default=50000, help="Distinct NSNs to generate.")
+        parser.add_argument("--suppliers", type=int, default=2000, help="Suppliers to generate.")
+        parser.add_argument("--lines", type=int, default=500, help="Solicitation lines to time.")
+        parser.add_argument("--seed", type=int, default=7)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        try:
+            with transaction.atomic():
+                lines = self._seed(rng, options["nsns"], options["suppliers"], options["lines"])
+                results = {
+                    "live": self._measure(lines, enabled=False),
+                    "index": self._measure(lines, enabled=True),
+                }
+                raise _Rollback
+        except _Rollback:
+            pass
+        finally:
+            match_index.reset()
+
+        for label, r in results.items():
+            self.stdout.write(
+                f"{label:<6} workbench mean={r['mean_ms']:.3f}ms p95={r['p95_ms']:.3f}ms "
+                f"queries/line={r['queries_per_line']:.1f} | "
+                f"import batch={r['batch_ms']:.1f}ms queries={r['batch_queries']}"
+                + (f" | build={r['build_ms']:.0f}ms" if "build_ms" in r else "")
+            )
+        speedup = results["live"]["mean_ms"] / max(results["index"]["mean_ms"], 1e-9)
+        self.stdout.write(self.style.SUCCESS(f"Workbench per-line speedup: {speedup:.1f}x"))
+
+    def _seed(self, rng, n_nsns, n_suppliers, n_lines):
+        suppliers = Supplier.objects.bulk_create(
+            [
+                Supplier(name=f"Bench Supplier {i}", cage_code=f"B{i:04d}"[:5])
+                for i in range(n_suppliers)
+            ],
+            batch_size=500,
+        )
+        supplier_ids = [s.pk for s in suppliers]
+        cages = [s.cage_code for s in suppliers]
+        fscs = [f"{5900 + i}" for i in range(100)]
+        nsns = [f"{rng.choice(fscs)}01{i:07d}" for i in range(n_nsns)]
+
+        scored_rows = [
+            (sid, nsn, rng.randint(1, 100) / 10)
+            for nsn in nsns
+            for sid in rng.sample(supplier_ids, 3)
+        ]
+        tables = connection.introspection.table_names(include_views=True)
+        if _SCORED_TABLE in tables:
+            SupplierNSN.objects.bulk_create(
+                [SupplierNSN(supplier_id=sid, nsn=nsn) for sid, nsn, _ in scored_rows],
+                batch_size=500,
+            )
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"CREATE TABLE {_SCORED_TABLE} (id INTEGER PRIMARY KEY, "
+                    "supplier_id INTEGER, nsn VARCHAR(46), match_score DECIMAL(10, 2))"
+                )
+                cursor.execute(f"CREATE INDEX {_SCORED_TABLE}_nsn ON {_SCORED_TABLE} (nsn)")
+                cursor.executemany(
+                    f"INSERT INTO {_SCORED_TABLE} (supplier_id, nsn, match_score) "
+                    "VALUES (%s, %s, %s)",
+                    scored_rows,
+                )
+
+        ApprovedSource.objects.bulk_create(
+            [
+                ApprovedSource(nsn=nsn, approved_cage=cage)
+                for nsn in nsns
+                for cage in rng.sample(cages, 2)
+            ],
+            batch_size=400,
+        )
+        SupplierFSC.objects.bulk_create(
+            [
+                SupplierFSC(supplier_id=sid, fsc_code=fsc)
+                for sid in supplier_ids
+                for fsc in rng.sample(fscs, 3)
+            ],
+            batch_size=500,
+        )
+        return [
+            SolicitationLine(nsn=nsn, fsc=nsn[:4])
+            for nsn in rng.sample(nsns, min(n_lines, len(nsns)))
+        ]
+
+    def _measure(self, lines, enabled):
+        result = {}
+        with override_settings(MATCH_INDEX_ENABLED=enabled):
+            match_index.reset()
+            if enabled:
+                started = time.perf_counter()
+                match_index.get_match_index()
+                result["build_ms"] = (time.perf_counter() - started) * 1000
+
+            timings = []
+            with CaptureQueriesContext(connection) as ctx:
+                for line in lines:
+                    started = time.perf_counter()
+                    get_live_workbench_matches(line)
+                    timings.append((time.perf_counter() - started) * 1000)
+            workbench_queries = len(ctx.captured_queries)
+
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                _load_match_inputs(lines)
+                result["batch_ms"] = (time.perf_counter() - started) * 1000
+            result["batch_queries"] = len(ctx.captured_queries)
+
+        timings.sort()
+        result["mean_ms"] = statistics.fmean(timings)
+        result["p95_ms"] = timings[int(len(timings) * 0.95) - 1] if timings else 0.0
+        result["queries_per_line"] = workbench_queries / max(len(lines), 1)
+        return result
@@ -1,32 +1,42 @@
 # RFQ queue: paperclip / warning icons in `sales/templates/sales/rfq/queue.html` use
-# `sol.pdf_blob`. This command fills blobs for queue-driven PENDING/FAILED rows.
+# `sol.has_pdf`. This command fetches PDFs for queue-driven PENDING/FAILED rows.
 #
 # Deprecated as a frequent scheduled WebJob: nightly `auto_import_dibbs` now runs
 # set-aside harvest (batches of 10) + a shared parse backlog. Keep this command
 # for manual runs or optional schedules (e.g. queue PDFs for non-set-aside sols).
+import logging
+
 from django.core.management.base import BaseCommand
 from django.db.models import Q
 from django.utils import timezone
 
+logger = logging.getLogger(__name__)
+
 MAX_ATTEMPTS = 5
 BATCH_SIZE = 10
 
 
 class Command(BaseCommand):
     help = (
-        "Fetch pending DIBBS solicitation PDFs in Playwright batches of 10, then run "
+        "Fetch pending DIBBS solicitation PDFs in batches of 10, then run "
         "the local parse backlog (procurement history + packaging)."
     )
 
     def handle(self, *args, **options):
         from sales.models import Solicitation
-        from sales.services.dibbs_pdf import fetch_pdfs_for_sols, parse_pdf_data_backlog
+        from sales.services.blob_store import get_blob_store, pdf_update_fields
+        from sales.services.dibbs_pdf import parse_pdf_data_backlog
+        from sales.services.pdf_harvest import harvest_pdfs
 
         now = timezone.now()
+        store = get_blob_store()
 
         total_done = 0
         total_failed = 0
         batches = 0
+        fetch_seconds = 0.0
+        fetch_bytes = 0
+        throttled = 0
 
         while True:
             pending_sols = list(
@@ -56,28 +66,39 @@ class Command(BaseCommand):
                 pdf_fetch_status="FETCHING"
             )
 
-            results = fetch_pdfs_for_sols(sol_numbers)
+            try:
+                results, metrics = harvest_pdfs(sol_numbers)
+            except Exception as e:
+                # Never leave the batch parked in FETCHING: fail it like any other miss.
+                logger.exception("fetch_pending_pdfs: harvest failed: %s", e)
+                results, metrics = {}, {"seconds": 0.0, "bytes": 0, "throttled": 0}
+            fetch_seconds += metrics["seconds"]
+            fetch_bytes += metrics["bytes"]
+            throttled += metrics["throttled"]
 
             for sn in sol_numbers:
                 body = results.get(sn)
                 if body:
-                    Solicitation.objects.filter(solicitation_number=sn).update(
-                        pdf_blob=body,
-                        pdf_fetched_at=now,
-                        pdf_fetch_status="DONE",
-                    )
-                    total_done += 1
-                else:
-                    prev = attempts_map.get(sn, 0)
-                    new_att = prev + 1
-                    upd = {
-                        "pdf_fetch_status": "FAILED",
-                        "pdf_fetch_attempts": new_att,
-                    }
-                    if new_att >= MAX_ATTEMPTS:
-                        upd["pdf_data_pulled"] = now
-                    Solicitation.objects.filter(solicitation_number=sn).update(**upd)
-                    total_failed += 1
+                    try:
+                        Solicitation.objects.filter(solicitation_number=sn).update(
+                            **pdf_update_fields(body, store),
+                            pdf_fetched_at=now,
+                            pdf_fetch_status="DONE",
+                        )
+                        total_done += 1
+                        continue
+                    except Exception as e:
+                        logger.exception("fetch_pending_pdfs: saving %s failed: %s", sn, e)
+                prev = attempts_map.get(sn, 0)
+                new_att = prev + 1
+                upd = {
+                    "pdf_fetch_status": "FAILED",
+                    "pdf_fetch_attempts": new_att,
+                }
+                if new_att >= MAX_ATTEMPTS:
+                    upd["pdf_data_pulled"] = now
+                Solicitation.objects.filter(solicitation_number=sn).update(**upd)
+                total_failed += 1
 
         skipped_max = Solicitation.objects.filter(
             pdf_fetch_status="FAILED",
@@ -91,8 +112,11 @@ class Command(BaseCommand):
             )
         else:
             self.stdout.write(
-                f"Fetch phase: {batches} Playwright batch(es), "
-                f"{total_done} downloaded, {total_failed} failed this run."
+                f"Fetch phase: {batches} batch(es), "
+                f"{total_done} downloaded, {total_failed} failed this run "
+                f"({fetch_bytes} bytes in {fetch_seconds:.1f}s, "
+                f"{total_done / fetch_seconds if fetch_seconds else 0:.2f} PDF/s, "
+                f"{throttled} throttle(s))."
             )
 
         self.stdout.write("Running parse backlog (all sols with blob, no pdf_data_pulled)...")
@@ -0,0 +1,39 @@
+"""
+Management command: migrate_pdf_blobs
+
+Moves legacy Solicitation.pdf_blob bytes into the content-addressed blob store
+(sales/services/blob_store.py), sets pdf_blob_key and nulls the column. Safe to
+interrupt and re-run; rows already moved are skipped.
+
+    python manage.py migrate_pdf_blobs
+    python manage.py migrate_pdf_blobs --batch-size 20 --limit 1000
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from sales.services.blob_store import migrate_legacy_blobs
+
+
+class Command(BaseCommand):
+    help = "Move Solicitation.pdf_blob contents into the SHA-256 blob store."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=50, help="Ids read per query (default 50)."
+        )
+        parser.add_argument("--limit", type=int, help="Stop after moving this many rows.")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+        if options["limit"] is not None and options["limit"] < 1:
+            raise CommandError("--limit must be positive")
+
+        result = migrate_legacy_blobs(
+            batch_size=options["batch_size"], limit=options["limit"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Moved {result['moved']} PDF(s), {result['bytes'] / (1024 * 1024):.1f} MB "
+                f"({result['deduplicated']} already in the store)."
+            )
+        )
@@ -0,0 +1,56 @@
+"""
+Management command: parse_pdf_backlog
+
+Runs the PDF parse backlog (procurement history + packaging for solicitations
+with a stored PDF and no pdf_data_pulled) on its own, streaming one PDF at a
+time (sales/services/pdf_backlog.py).
+
+    python manage.py parse_pdf_backlog
+    python manage.py parse_pdf_backlog --workers 4 --time-budget 1800
+    python manage.py parse_pdf_backlog --id-range 100000:150000
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from sales.services.pdf_backlog import run_pdf_backlog
+
+
+class Command(BaseCommand):
+    help = "Parse stored solicitation PDFs that have no extract yet (resumable, optional workers)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, help="Parallel processes over disjoint id ranges.")
+        parser.add_argument("--batch-size", type=int, help="Ids read per query.")
+        parser.add_argument(
+            "--time-budget", type=float, help="Seconds after which no new PDF is started (0 = none)."
+        )
+        parser.add_argument(
+            "--id-range", help="Only solicitation ids LO:HI (inclusive), e.g. for one of several hosts."
+        )
+
+    def handle(self, *args, **options):
+        id_range = None
+        if options["id_range"]:
+            try:
+                lo, hi = (int(x) for x in options["id_range"].split(":", 1))
+            except ValueError:
+                raise CommandError("--id-range must be LO:HI integers")
+            if lo > hi:
+                raise CommandError("--id-range LO must not exceed HI")
+            id_range = (lo, hi)
+        if options["workers"] is not None and options["workers"] < 1:
+            raise CommandError("--workers must be positive")
+
+        result = run_pdf_backlog(
+            workers=options["workers"],
+            batch_size=options["batch_size"],
+            time_budget_seconds=options["time_budget"],
+            id_range=id_range,
+            log=lambda m: self.stdout.write(m),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Parsed {result['parsed']} PDF(s), skipped {result['skipped']} "
+                f"in {result['seconds']:.1f}s with {result['workers']} worker(s); "
+                f"{'backlog complete' if result['complete'] else 'stopped on time budget'}."
+            )
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sales", "0063_dibbs_award_url_default_constraints"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="solicitation",
+            name="pdf_file_name",
+            field=models.CharField(blank=True, db_index=True, max_length=50, null=True),
+        ),
+    ]
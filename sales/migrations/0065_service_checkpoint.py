@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sales", "0064_solicitation_pdf_file_name_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ServiceCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("checkpoint_at", models.DateTimeField(blank=True, null=True)),
+                ("cursor", models.TextField(blank=True, default="")),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Service checkpoint",
+                "db_table": "dibbs_service_checkpoint",
+            },
+        ),
+    ]
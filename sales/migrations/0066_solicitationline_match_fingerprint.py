@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sales", "0065_service_checkpoint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="solicitationline",
+            name="match_fingerprint",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    No-op. This migration used to seed the purge_archived_blobs ScheduledTask;
+    core/migrations/0007_seed_purge_archived_blobs_task.py seeds it now, next to
+    the other task seeds. Kept so the numbering stays contiguous and databases
+    that applied it keep a consistent history.
+    """
+
+    dependencies = [
+        ("sales", "0066_solicitationline_match_fingerprint"),
+    ]
+
+    operations = []
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sales", "0067_seed_purge_archived_blobs_task"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="solicitation",
+            name="pdf_blob_key",
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+    ]
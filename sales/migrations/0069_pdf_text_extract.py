@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sales", "0068_solicitation_pdf_blob_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PdfTextExtract",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("content_sha256", models.CharField(max_length=64, unique=True)),
+                ("text", models.TextField(blank=True)),
+                ("page_count", models.PositiveIntegerField(default=0)),
+                ("extract_ms", models.PositiveIntegerField(default=0)),
+                ("extracted_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "PDF text extract",
+                "db_table": "dibbs_pdf_text_extract",
+            },
+        ),
+    ]
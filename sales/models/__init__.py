@@ -42,6 +42,8 @@ from sales.models.competitor_award_entity import CompetitorAwardEntity
 from sales.models.saved_filters import SavedFilter
 from sales.models.sol_analysis import SolAnalysis
 from sales.models.dibbs_notices import DibbsNotice
+from sales.models.checkpoints import ServiceCheckpoint
+from sales.models.pdf_text import PdfTextExtract
 
 __all__ = [
     'ImportBatch',
@@ -81,4 +83,6 @@ __all__ = [
     'SavedFilter',
     'SolAnalysis',
     'DibbsNotice',
+    'ServiceCheckpoint',
+    'PdfTextExtract',
 ]
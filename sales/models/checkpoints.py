@@ -0,0 +1,23 @@
+from django.db import models
+
+
+class ServiceCheckpoint(models.Model):
+    """
+    Named progress marker for incremental / resumable sales background jobs.
+
+    One row per job name (e.g. ``refresh_match_counts``). ``checkpoint_at`` is the
+    high-water timestamp the job last covered; ``cursor`` holds an optional
+    job-specific resume position (last processed id, etc.).
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    checkpoint_at = models.DateTimeField(null=True, blank=True)
+    cursor = models.TextField(blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "dibbs_service_checkpoint"
+        verbose_name = "Service checkpoint"
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,22 @@
+from django.db import models
+
+
+class PdfTextExtract(models.Model):
+    """
+    Text extracted once from a solicitation PDF, keyed by the SHA-256 of the
+    PDF bytes (same key as Solicitation.pdf_blob_key). Optional persisted tier
+    of sales.services.pdf_text — written only when PDF_TEXT_PERSIST is on.
+    """
+
+    content_sha256 = models.CharField(max_length=64, unique=True)
+    text = models.TextField(blank=True)
+    page_count = models.PositiveIntegerField(default=0)
+    extract_ms = models.PositiveIntegerField(default=0)
+    extracted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "dibbs_pdf_text_extract"
+        verbose_name = "PDF text extract"
+
+    def __str__(self):
+        return self.content_sha256
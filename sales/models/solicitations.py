@@ -90,7 +90,7 @@ class Solicitation(models.Model):
     solicitation_type = models.CharField(max_length=1, null=True, blank=True)  # F/I/P
     small_business_set_aside = models.CharField(max_length=1, null=True, blank=True)  # N/Y/H/R/L/A/E
     return_by_date = models.DateField(null=True, blank=True)
-    pdf_file_name = models.CharField(max_length=50, null=True, blank=True)
+    pdf_file_name = models.CharField(max_length=50, null=True, blank=True, db_index=True)
     buyer_code = models.CharField(max_length=5, null=True, blank=True)
     import_date = models.DateField(null=True, blank=True)
     import_batch = models.ForeignKey(
@@ -119,7 +119,10 @@ class Solicitation(models.Model):
         default='',
         help_text="Name or note from HUBZone partner who requested this solicitation be worked.",
     )
+    # Legacy inline PDF bytes; new PDFs go to the blob store (pdf_blob_key).
     pdf_blob = models.BinaryField(null=True, blank=True)
+    # SHA-256 of the PDF in sales.services.blob_store.
+    pdf_blob_key = models.CharField(max_length=64, null=True, blank=True, db_index=True)
     pdf_fetched_at = models.DateTimeField(null=True, blank=True)
 
     PDF_FETCH_STATUS_CHOICES = [
@@ -184,6 +187,11 @@ class Solicitation(models.Model):
         delta = (self.return_by_date - today).days
         return max(0, delta) if delta >= 0 else 0
 
+    @property
+    def has_pdf(self):
+        """True when a PDF is on file (blob store pointer or legacy pdf_blob)."""
+        return bool(self.pdf_blob_key) or bool(self.pdf_blob)
+
     @property
     def dibbs_pdf_url(self):
         if self.pdf_file_name and self.solicitation_number:
@@ -257,6 +265,8 @@ class SolicitationLine(models.Model):
     higher_level_quality_indicator = models.CharField(max_length=1, null=True, blank=True)
     # Original BQ row (121 columns) for export overlay; populated at import when BQ file present
     bq_raw_columns = models.JSONField(null=True, blank=True)
+    # SHA-256 of this line's match inputs at the last matching run (see services/matching.py)
+    match_fingerprint = models.CharField(max_length=64, null=True, blank=True)
 
     class Meta:
         db_table = 'dibbs_solicitation_line'
@@ -6,8 +6,10 @@ from decimal import Decimal, InvalidOperation
 
 from django.db import connection
 
+from core.cache import invalidate as cache_invalidate
 from sales.models import AwardImportBatch, DibbsAward, DibbsAwardStaging
 from sales.services.awards_file_parser import AwardFileParseResult, AwardRow
+from sales.services.competitor_stats import AWARDS_CACHE_NAMESPACE
 
 logger = logging.getLogger(__name__)
 
@@ -253,6 +255,7 @@ def import_aw_records(
     stage_id = uuid.uuid4()
     _stage_rows(rows, batch, stage_id, aw_file_date)
     _call_proc(stage_id)
+    cache_invalidate(AWARDS_CACHE_NAMESPACE)
     _warn_if_url_population_looks_like_drift(batch, stage_id, len(rows))
     match_new_mods_after_import(
         before_max_mod_id=before_max_mod_id,
@@ -305,6 +308,7 @@ def import_aw_file(
     stage_id = uuid.uuid4()
     _stage_rows(parse_result.rows, batch, stage_id, parse_result.award_date)
     _call_proc(stage_id)
+    cache_invalidate(AWARDS_CACHE_NAMESPACE)
     match_new_mods_after_import(
         before_max_mod_id=before_max_mod_id,
         active_cages=active_company_cage_codes(),
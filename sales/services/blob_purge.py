@@ -0,0 +1,121 @@
+"""
+Batched, resumable purge of stored PDFs on Archived solicitations.
+
+Runs as the `purge_archived_blobs` background task (core run_background_tasks),
+not inside the import transaction: nulling large varbinary values is LOB
+deallocation work on SQL Server, so it is done a bounded number of rows at a
+time with a pause between batches and a per-run time budget.
+
+Each batch selects only ids and blob-store keys (never the legacy blob), then
+issues one UPDATE ... WHERE id IN (...) AND status = 'Archived' clearing both
+pdf_blob and pdf_blob_key. Store files whose key is no longer referenced by any
+solicitation are then deleted (content is deduplicated, so a file shared with
+a live solicitation stays). The highest id handled
+is stored in ServiceCheckpoint (CHECKPOINT_NAME) after every batch, so a run
+cut short by the budget — or a crash — resumes where it stopped. When a pass
+reaches the end of the table the cursor resets to 0 so rows archived later
+(at any id) are picked up by the next pass.
+
+Tunables (settings, overridable by the environment variable of the same name):
+  BLOB_PURGE_BATCH_SIZE           rows per UPDATE (default 50)
+  BLOB_PURGE_PAUSE_SECONDS        sleep between batches (default 0.5)
+  BLOB_PURGE_TIME_BUDGET_SECONDS  stop starting new batches after this (default 240)
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = "purge_archived_blobs"
+
+
+def purge_archived_blobs(
+    batch_size: int | None = None,
+    pause_seconds: float | None = None,
+    time_budget_seconds: float | None = None,
+    max_batches: int | None = None,
+) -> dict:
+    """
+    Null pdf_blob on Archived solicitations in id-ordered batches, resuming
+    from the stored cursor. Arguments override the BLOB_PURGE_* settings.
+
+    Returns {"purged": rows cleared this run, "batches": UPDATEs issued,
+             "files_deleted": blob-store files removed,
+             "cursor": id to resume after (0 once a pass completes),
+             "complete": True when the pass reached the end}.
+    """
+    from sales.models import ServiceCheckpoint, Solicitation
+    from sales.services.blob_store import delete_unreferenced, has_pdf_q
+
+    if batch_size is None:
+        batch_size = settings.BLOB_PURGE_BATCH_SIZE
+    batch_size = max(int(batch_size), 1)
+    if pause_seconds is None:
+        pause_seconds = settings.BLOB_PURGE_PAUSE_SECONDS
+    if time_budget_seconds is None:
+        time_budget_seconds = settings.BLOB_PURGE_TIME_BUDGET_SECONDS
+
+    checkpoint, _ = ServiceCheckpoint.objects.get_or_create(name=CHECKPOINT_NAME)
+    try:
+        cursor = int(checkpoint.cursor or 0)
+    except ValueError:
+        cursor = 0
+
+    started = time.monotonic()
+    purged = 0
+    batches = 0
+    files_deleted = 0
+    complete = False
+
+    while True:
+        rows = list(
+            Solicitation.objects.filter(has_pdf_q(), status="Archived", pk__gt=cursor)
+            .order_by("pk")
+            .values_list("pk", "pdf_blob_key")[:batch_size]
+        )
+        if not rows:
+            complete = True
+            cursor = 0
+            break
+        ids = [pk for pk, _ in rows]
+
+        purged += Solicitation.objects.filter(pk__in=ids, status="Archived").update(
+            pdf_blob=None, pdf_blob_key=None
+        )
+        files_deleted += delete_unreferenced(key for _, key in rows)
+        batches += 1
+        cursor = ids[-1]
+        ServiceCheckpoint.objects.filter(pk=checkpoint.pk).update(
+            cursor=str(cursor), updated_at=timezone.now()
+        )
+
+        if len(ids) < batch_size:
+            complete = True
+            cursor = 0
+            break
+        if max_batches is not None and batches >= max_batches:
+            break
+        if time.monotonic() - started >= time_budget_seconds:
+            break
+        if pause_seconds:
+            time.sleep(pause_seconds)
+
+    update = {"cursor": str(cursor), "updated_at": timezone.now()}
+    if complete:
+        update["checkpoint_at"] = timezone.now()
+    ServiceCheckpoint.objects.filter(pk=checkpoint.pk).update(**update)
+
+    logger.info(
+        "purge_archived_blobs: purged=%d batches=%d files_deleted=%d cursor=%s complete=%s",
+        purged, batches, files_deleted, cursor, complete,
+    )
+    return {
+        "purged": purged,
+        "batches": batches,
+        "files_deleted": files_deleted,
+        "cursor": cursor,
+        "complete": complete,
+    }
@@ -0,0 +1,199 @@
+"""
+Content-addressed storage for solicitation PDFs.
+
+PDF bytes used to live in Solicitation.pdf_blob (varbinary(max)), so every
+row read that touched the column dragged megabytes through the DB driver and
+the buffer pool. The bytes now live in a blob store keyed by their SHA-256
+hex digest; the row keeps only that key in Solicitation.pdf_blob_key.
+Identical PDFs (re-issued or amended solicitations) are stored once.
+
+The backend is pluggable: settings.SOLICITATION_BLOB_STORE is a dotted path
+to a class exposing put/open/size/exists/delete (see LocalBlobStore),
+constructed with settings.SOLICITATION_BLOB_ROOT. The default keeps files on
+the local filesystem under MEDIA_ROOT/sol_pdfs, sharded by the first two
+byte pairs of the digest (ab/cd/abcd….pdf).
+
+Rows written before the store existed still carry pdf_blob and no key; the
+helpers below fall back to that column, and `migrate_pdf_blobs` moves them.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class LocalBlobStore:
+    """Blobs as files under ``root``; writes are atomic (temp file + rename)."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def path(self, key: str) -> Path:
+        key = key.lower()
+        return self.root / key[:2] / key[2:4] / f"{key}.pdf"
+
+    def put(self, data: bytes) -> str:
+        """Store ``data`` and return its key; existing content is not rewritten."""
+        data = bytes(data)
+        key = hashlib.sha256(data).hexdigest()
+        target = self.path(key)
+        if target.exists():
+            return key
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, target)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        return key
+
+    def open(self, key: str):
+        """Binary file object positioned at 0. Raises FileNotFoundError."""
+        return open(self.path(key), "rb")
+
+    def size(self, key: str) -> int:
+        return self.path(key).stat().st_size
+
+    def exists(self, key: str) -> bool:
+        return self.path(key).exists()
+
+    def delete(self, key: str) -> bool:
+        try:
+            self.path(key).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+
+def get_blob_store():
+    backend = import_string(
+        getattr(settings, "SOLICITATION_BLOB_STORE", "sales.services.blob_store.LocalBlobStore")
+    )
+    return backend(settings.SOLICITATION_BLOB_ROOT)
+
+
+def has_pdf_q() -> Q:
+    """Solicitations with a PDF in either the store or the legacy column."""
+    return Q(pdf_blob_key__isnull=False) | Q(pdf_blob__isnull=False)
+
+
+def no_pdf_q() -> Q:
+    return Q(pdf_blob_key__isnull=True, pdf_blob__isnull=True)
+
+
+def pdf_update_fields(body: bytes, store=None) -> dict:
+    """
+    Store ``body`` and return the column values for a queryset .update()
+    (pointer set, legacy blob cleared).
+    """
+    store = store or get_blob_store()
+    return {"pdf_blob_key": store.put(body), "pdf_blob": None}
+
+
+def store_solicitation_pdf(solicitation, body: bytes, store=None) -> str:
+    """Store ``body`` and point ``solicitation`` at it (in memory; caller saves)."""
+    fields = pdf_update_fields(body, store)
+    solicitation.pdf_blob_key = fields["pdf_blob_key"]
+    solicitation.pdf_blob = None
+    return solicitation.pdf_blob_key
+
+
+def load_pdf_bytes(key: str | None, legacy_blob=None, store=None) -> bytes | None:
+    """PDF bytes for a (pdf_blob_key, pdf_blob) pair; None when neither is usable."""
+    if key:
+        store = store or get_blob_store()
+        try:
+            with store.open(key) as f:
+                return f.read()
+        except FileNotFoundError:
+            logger.error("blob_store: missing blob %s", key)
+    if legacy_blob:
+        return bytes(legacy_blob)
+    return None
+
+
+def read_solicitation_pdf(solicitation, store=None) -> bytes | None:
+    key = solicitation.pdf_blob_key
+    if key:
+        body = load_pdf_bytes(key, store=store)
+        if body is not None:
+            return body
+    return load_pdf_bytes(None, solicitation.pdf_blob)
+
+
+def delete_unreferenced(keys, store=None) -> int:
+    """
+    Delete blobs among ``keys`` that no Solicitation points at any more.
+    Returns the number of files removed.
+    """
+    from sales.models import Solicitation
+
+    keys = {k for k in keys if k}
+    if not keys:
+        return 0
+    store = store or get_blob_store()
+    still_used = set(
+        Solicitation.objects.filter(pdf_blob_key__in=keys).values_list(
+            "pdf_blob_key", flat=True
+        )
+    )
+    return sum(1 for key in keys - still_used if store.delete(key))
+
+
+def migrate_legacy_blobs(batch_size: int = 50, limit: int | None = None, store=None) -> dict:
+    """
+    Move pdf_blob bytes into the store one row at a time (ids are read in
+    batches; each blob is loaded alone) and null the column. Moved rows drop
+    out of the filter, so an interrupted run simply resumes on the next call.
+
+    Returns {"moved", "bytes", "deduplicated"}; "deduplicated" counts rows
+    whose content was already in the store.
+    """
+    from sales.models import Solicitation
+
+    store = store or get_blob_store()
+    moved = total_bytes = deduplicated = 0
+    cursor = 0
+    while limit is None or moved < limit:
+        size = batch_size if limit is None else min(batch_size, limit - moved)
+        ids = list(
+            Solicitation.objects.filter(pdf_blob__isnull=False, pk__gt=cursor)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:size]
+        )
+        if not ids:
+            break
+        for pk in ids:
+            blob = (
+                Solicitation.objects.filter(pk=pk).values_list("pdf_blob", flat=True).first()
+            )
+            if not blob:
+                continue
+            data = bytes(blob)
+            key = hashlib.sha256(data).hexdigest()
+            if store.exists(key):
+                deduplicated += 1
+            else:
+                store.put(data)
+            Solicitation.objects.filter(pk=pk).update(pdf_blob_key=key, pdf_blob=None)
+            moved += 1
+            total_bytes += len(data)
+        cursor = ids[-1]
+    logger.info(
+        "migrate_legacy_blobs: moved=%d bytes=%d deduplicated=%d",
+        moved, total_bytes, deduplicated,
+    )
+    return {"moved": moved, "bytes": total_bytes, "deduplicated": deduplicated}
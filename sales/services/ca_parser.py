@@ -7,20 +7,218 @@ We look up Solicitation by pdf_file_name, parse procurement history,
 save to dibbs_nsn_procurement_history, and set pdf_data_pulled timestamp.
 
 Parse-and-discard: no PDF blobs are stored.
+
+Parallel mode (workers > 1): PDF text extraction and parsing fan out to a
+bounded process pool. Workers receive (zip path, member name, sol number) and
+return plain dicts — they never touch the database. The parent process keeps
+doing every DB write (save_procurement_history / save_sol_packaging /
+pdf_data_pulled) as results arrive, so there is exactly one DB connection.
 """
 
 import io
 import logging
+import os
+import shutil
+import tempfile
+import time
 import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import date
-from typing import Dict
+from typing import Dict, Iterable, Optional
 
+from django.conf import settings
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on in-flight member tasks per worker; keeps parent memory bounded
+# when a zip has thousands of members.
+CA_PARSE_INFLIGHT_PER_WORKER = 4
+
+# Solicitation lookup modes for parse_ca_zip().
+LOOKUP_SCOPED = "scoped"
+LOOKUP_FULL = "full"
+# Member names per pdf_file_name IN (...) probe. Each name is sent as-is and
+# upper-cased, so 500 names = at most 1000 params — under the SQL Server 2100 limit.
+PDF_NAME_CHUNK = 500
+
+_LOOKUP_FIELDS = ("pk", "solicitation_number", "pdf_file_name", "pdf_data_pulled")
+
+
+def _resolve_workers(workers: Optional[int]) -> int:
+    """Explicit argument wins, then settings.CA_PARSE_WORKERS (1 = serial)."""
+    if workers is None:
+        workers = settings.CA_PARSE_WORKERS
+    return max(1, int(workers))
+
+
+def _load_full_sol_lookup() -> Dict[str, Dict]:
+    """Every Solicitation with a pdf_file_name, keyed by upper-cased file name."""
+    from sales.models import Solicitation
+
+    return {
+        row["pdf_file_name"].upper(): row
+        for row in Solicitation.objects.filter(
+            pdf_file_name__isnull=False,
+        )
+        .exclude(pdf_file_name="")
+        .values(*_LOOKUP_FIELDS)
+    }
+
+
+def _load_scoped_sol_lookup(file_names: Iterable[str]) -> Dict[str, Dict]:
+    """
+    Resolve only the given PDF file names against Solicitation.pdf_file_name,
+    keyed by upper-cased file name.
+
+    The probe is a plain IN on the indexed pdf_file_name column. SQL Server's
+    case-insensitive collation makes that match case-insensitive on its own;
+    the upper-cased variant of each name covers case-sensitive SQLite, where
+    the IN importer already stores file names upper-case.
+    """
+    from sales.models import Solicitation
+
+    names = sorted({n for n in file_names if n})
+    lookup: Dict[str, Dict] = {}
+    for i in range(0, len(names), PDF_NAME_CHUNK):
+        chunk = names[i : i + PDF_NAME_CHUNK]
+        candidates = set(chunk) | {n.upper() for n in chunk}
+        for row in Solicitation.objects.filter(
+            pdf_file_name__in=candidates
+        ).values(*_LOOKUP_FIELDS):
+            lookup[row["pdf_file_name"].upper()] = row
+    return lookup
+
+
+def _parse_pdf_bytes(
+    pdf_bytes: bytes, sol_number: str, persist_text: Optional[bool] = None
+) -> Dict:
+    """
+    Run the procurement-history and packaging parsers over one PDF.
+
+    Returns a picklable dict: history (list of row dicts or None on parse
+    error), packaging (dict or None), error (str or None), parse_seconds.
+    ``persist_text`` is passed to the PDF text cache; workers pass False.
+    """
+    from sales.services.dibbs_pdf import (
+        parse_packaging_from_pdf,
+        parse_procurement_history,
+    )
+    from sales.services.pdf_text import pdf_text_key
+
+    out = {
+        "sol_number": sol_number,
+        "history": None,
+        "packaging": None,
+        "error": None,
+        "packaging_error": None,
+        "parse_seconds": 0.0,
+    }
+    started = time.perf_counter()
+    text_key = pdf_text_key(pdf_bytes)
+    try:
+        out["history"] = parse_procurement_history(
+            pdf_bytes, sol_number, text_key=text_key, persist_text=persist_text
+        )
+    except Exception as e:
+        out["error"] = f"parse error: {e}"
+    if out["error"] is None:
+        try:
+            out["packaging"] = parse_packaging_from_pdf(
+                pdf_bytes, sol_number, text_key=text_key, persist_text=persist_text
+            )
+        except Exception as e:
+            out["packaging_error"] = str(e)
+    out["parse_seconds"] = time.perf_counter() - started
+    return out
+
+
+# Per-process zip handle so a worker opens the archive once, not per member.
+_worker_zip: Optional[zipfile.ZipFile] = None
+_worker_zip_path: Optional[str] = None
+
+
+def _parse_member_worker(zip_path: str, member: str, sol_number: str) -> Dict:
+    """Process-pool entry point: read one member from zip_path and parse it."""
+    global _worker_zip, _worker_zip_path
+    if _worker_zip is None or _worker_zip_path != zip_path:
+        if _worker_zip is not None:
+            _worker_zip.close()
+        _worker_zip = zipfile.ZipFile(zip_path, "r")
+        _worker_zip_path = zip_path
+
+    started = time.perf_counter()
+    try:
+        pdf_bytes = _worker_zip.read(member)
+    except Exception as e:
+        return {
+            "sol_number": sol_number,
+            "history": None,
+            "packaging": None,
+            "error": f"read error: {e}",
+            "packaging_error": None,
+            "parse_seconds": 0.0,
+            "read_seconds": time.perf_counter() - started,
+        }
+    read_seconds = time.perf_counter() - started
+    # Workers share the parent's inherited DB connection: never query from here.
+    out = _parse_pdf_bytes(pdf_bytes, sol_number, persist_text=False)
+    out["read_seconds"] = read_seconds
+    return out
+
+
+def _persist_parsed(sol_row: Dict, parsed: Dict, now, result: Dict) -> None:
+    """
+    Parent-side DB writes for one parsed member. Mirrors the serial path:
+    history save failure skips pdf_data_pulled; packaging failure only logs.
+    """
+    from sales.models import Solicitation
+    from sales.services.dibbs_pdf import save_procurement_history, save_sol_packaging
+
+    sol_number = sol_row["solicitation_number"]
+    if parsed["error"]:
+        logger.warning("parse_ca_zip: %s for %s", parsed["error"], sol_number)
+        result["errors"] += 1
+        return
+
+    try:
+        saved = save_procurement_history(parsed["history"])
+        result["history_rows_saved"] += saved
+    except Exception as e:
+        logger.warning("parse_ca_zip: save error for %s: %s", sol_number, e)
+        result["errors"] += 1
+        return
+
+    if parsed["packaging_error"]:
+        logger.warning(
+            "parse_ca_zip: packaging save error for %s: %s",
+            sol_number,
+            parsed["packaging_error"],
+        )
+    elif parsed["packaging"] is not None:
+        try:
+            save_sol_packaging(sol_number, parsed["packaging"])
+        except Exception as e:
+            logger.warning(
+                "parse_ca_zip: packaging save error for %s: %s", sol_number, e
+            )
+
+    Solicitation.objects.filter(pk=sol_row["pk"]).update(pdf_data_pulled=now)
+    result["parsed"] += 1
+
+    logger.info(
+        "parse_ca_zip: %s — %d history rows saved",
+        sol_number,
+        saved,
+    )
 
-def parse_ca_zip(zip_bytes: bytes, import_date: date) -> Dict:
+
+def parse_ca_zip(
+    zip_bytes: bytes,
+    import_date: date,
+    workers: Optional[int] = None,
+    lookup: str = LOOKUP_SCOPED,
+) -> Dict:
     """
     Process a DIBBS CA zip file.
 
@@ -31,17 +229,21 @@ def parse_ca_zip(zip_bytes: bytes, import_date: date) -> Dict:
     - Sets pdf_data_pulled = now on Solicitation for each successfully parsed sol
     - Parse-and-discard: no pdf_blob is written
 
+    ``workers`` > 1 parses PDFs in a process pool of that size; ``None`` reads
+    CA_PARSE_WORKERS from the environment and defaults to serial.
+
+    ``lookup`` selects how Solicitation rows are resolved: LOOKUP_SCOPED (the
+    default) queries only the zip's member file names in parameter-safe
+    chunks; LOOKUP_FULL loads every Solicitation with a pdf_file_name.
+
     Returns dict with keys:
         total_pdfs, matched, skipped_already_pulled, no_match, parsed,
-        history_rows_saved, errors
+        history_rows_saved, errors, workers, timings
+    where timings holds lookup_seconds, read_seconds, parse_seconds (summed
+    across workers), save_seconds and wall_seconds.
     """
-    from sales.models import Solicitation
-    from sales.services.dibbs_pdf import (
-        parse_packaging_from_pdf,
-        parse_procurement_history,
-        save_procurement_history,
-        save_sol_packaging,
-    )
+    n_workers = _resolve_workers(workers)
+    wall_started = time.perf_counter()
 
     result = {
         "total_pdfs": 0,
@@ -51,27 +253,21 @@ def parse_ca_zip(zip_bytes: bytes, import_date: date) -> Dict:
         "parsed": 0,
         "history_rows_saved": 0,
         "errors": 0,
+        "workers": n_workers,
+        "timings": {
+            "lookup_seconds": 0.0,
+            "read_seconds": 0.0,
+            "parse_seconds": 0.0,
+            "save_seconds": 0.0,
+            "wall_seconds": 0.0,
+        },
     }
+    timings = result["timings"]
 
     if not zip_bytes:
         logger.warning("parse_ca_zip: empty zip bytes")
         return result
 
-    sol_lookup = {
-        row["pdf_file_name"].upper(): row
-        for row in Solicitation.objects.filter(
-            pdf_file_name__isnull=False,
-        )
-        .exclude(pdf_file_name="")
-        .values("pk", "solicitation_number", "pdf_file_name", "pdf_data_pulled")
-    }
-
-    logger.info(
-        "parse_ca_zip: loaded %d solicitation pdf_file_name lookups for %s",
-        len(sol_lookup),
-        import_date,
-    )
-
     now = timezone.now()
     try:
         zf_cm = zipfile.ZipFile(io.BytesIO(zip_bytes))
@@ -79,12 +275,30 @@ def parse_ca_zip(zip_bytes: bytes, import_date: date) -> Dict:
         logger.error("parse_ca_zip: bad zip file: %s", e)
         return result
 
+    # (member, sol_row) pairs that need parsing, in zip order.
+    work = []
     with zf_cm as zf:
         members = [m for m in zf.namelist() if m.upper().endswith(".PDF")]
         result["total_pdfs"] = len(members)
 
         logger.info("parse_ca_zip: found %d PDFs in zip", len(members))
 
+        stage_started = time.perf_counter()
+        if lookup == LOOKUP_FULL:
+            sol_lookup = _load_full_sol_lookup()
+        else:
+            sol_lookup = _load_scoped_sol_lookup(
+                {m.split("/")[-1] for m in members}
+            )
+        timings["lookup_seconds"] = time.perf_counter() - stage_started
+
+        logger.info(
+            "parse_ca_zip: loaded %d solicitation pdf_file_name lookups for %s (%s)",
+            len(sol_lookup),
+            import_date,
+            lookup,
+        )
+
         for member in members:
             filename_upper = member.split("/")[-1].upper()
 
@@ -104,62 +318,93 @@ def parse_ca_zip(zip_bytes: bytes, import_date: date) -> Dict:
                 )
                 continue
 
-            try:
-                pdf_bytes = zf.read(member)
-            except Exception as e:
-                logger.warning(
-                    "parse_ca_zip: could not read %s from zip: %s", member, e
-                )
-                result["errors"] += 1
-                continue
+            work.append((member, sol_row))
 
-            try:
-                rows = parse_procurement_history(
-                    pdf_bytes, sol_row["solicitation_number"]
-                )
-            except Exception as e:
-                logger.warning(
-                    "parse_ca_zip: parse error for %s: %s",
-                    sol_row["solicitation_number"],
-                    e,
-                )
-                result["errors"] += 1
-                continue
+        if n_workers == 1 or len(work) < 2:
+            for member, sol_row in work:
+                started = time.perf_counter()
+                try:
+                    pdf_bytes = zf.read(member)
+                except Exception as e:
+                    logger.warning(
+                        "parse_ca_zip: could not read %s from zip: %s", member, e
+                    )
+                    result["errors"] += 1
+                    continue
+                timings["read_seconds"] += time.perf_counter() - started
 
-            try:
-                saved = save_procurement_history(rows)
-                result["history_rows_saved"] += saved
-            except Exception as e:
-                logger.warning(
-                    "parse_ca_zip: save error for %s: %s",
-                    sol_row["solicitation_number"],
-                    e,
-                )
-                result["errors"] += 1
-                continue
+                parsed = _parse_pdf_bytes(pdf_bytes, sol_row["solicitation_number"])
+                timings["parse_seconds"] += parsed["parse_seconds"]
 
-            try:
-                pack = parse_packaging_from_pdf(
-                    pdf_bytes, sol_row["solicitation_number"]
-                )
-                save_sol_packaging(sol_row["solicitation_number"], pack)
-            except Exception as e:
-                logger.warning(
-                    "parse_ca_zip: packaging save error for %s: %s",
-                    sol_row["solicitation_number"],
-                    e,
-                )
+                started = time.perf_counter()
+                _persist_parsed(sol_row, parsed, now, result)
+                timings["save_seconds"] += time.perf_counter() - started
 
-            Solicitation.objects.filter(pk=sol_row["pk"]).update(
-                pdf_data_pulled=now
-            )
-            result["parsed"] += 1
+    if n_workers > 1 and len(work) >= 2:
+        _parse_work_in_pool(zip_bytes, work, n_workers, now, result)
+
+    timings["wall_seconds"] = time.perf_counter() - wall_started
+    logger.info("parse_ca_zip complete for %s: %s", import_date, result)
+    return result
+
+
+def _parse_work_in_pool(
+    zip_bytes: bytes, work: list, n_workers: int, now, result: Dict
+) -> None:
+    """
+    Fan (member, sol_row) pairs out to a process pool and persist results in
+    the parent as they complete. At most n_workers * CA_PARSE_INFLIGHT_PER_WORKER
+    futures are pending at once, so parsed results never pile up in memory.
+    """
+    timings = result["timings"]
+    tmp_dir = tempfile.mkdtemp(prefix="ca_parse_")
+    try:
+        # Workers need a path, not bytes: spill the zip once to a temp file.
+        zip_path = os.path.join(tmp_dir, "ca.zip")
+        with open(zip_path, "wb") as fh:
+            fh.write(zip_bytes)
 
-            logger.info(
-                "parse_ca_zip: %s — %d history rows saved",
+        max_inflight = n_workers * CA_PARSE_INFLIGHT_PER_WORKER
+        pending = {}
+        queue = iter(work)
+
+        def submit_next(pool) -> bool:
+            try:
+                member, sol_row = next(queue)
+            except StopIteration:
+                return False
+            fut = pool.submit(
+                _parse_member_worker,
+                zip_path,
+                member,
                 sol_row["solicitation_number"],
-                saved,
             )
+            pending[fut] = (member, sol_row)
+            return True
 
-    logger.info("parse_ca_zip complete for %s: %s", import_date, result)
-    return result
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            while len(pending) < max_inflight and submit_next(pool):
+                pass
+            while pending:
+                done = next(as_completed(list(pending)))
+                member, sol_row = pending.pop(done)
+                try:
+                    parsed = done.result()
+                except Exception as e:
+                    logger.warning(
+                        "parse_ca_zip: worker failed for %s: %s", member, e
+                    )
+                    result["errors"] += 1
+                    submit_next(pool)
+                    continue
+
+                timings["read_seconds"] += parsed.get("read_seconds", 0.0)
+                timings["parse_seconds"] += parsed["parse_seconds"]
+
+                started = time.perf_counter()
+                _persist_parsed(sol_row, parsed, now, result)
+                timings["save_seconds"] += time.perf_counter() - started
+
+                submit_next(pool)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -5,16 +5,18 @@ from calendar import monthrange
 from datetime import date, timedelta
 from decimal import Decimal
 
-from django.core.cache import cache
 from django.db.models import Count, Min, Q, Sum, Value
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 
+from core.cache import namespace
 from sales.models import DibbsAward
 
-_EARLIEST_AWARD_DATE_CACHE_KEY = "competitor_stats:earliest_award_date"
+# Shared namespace bumped by the award file imports (awards_file_importer).
+AWARDS_CACHE_NAMESPACE = "sales.awards"
+_EARLIEST_AWARD_DATE_CACHE_KEY = "earliest_award_date"
 _EARLIEST_AWARD_DATE_CACHE_TTL = 3600
-_SENTINEL = object()
+_awards_cache = namespace(AWARDS_CACHE_NAMESPACE, timeout=_EARLIEST_AWARD_DATE_CACHE_TTL)
 
 _EMPTY_STATS = {
     "week_count": 0,
@@ -174,13 +176,10 @@ def get_extraction_scope_award_counts(cage_codes):
 
 
 def get_earliest_award_date():
-    """Earliest non-faux aw_file_date in DibbsAward, cached for one hour."""
-    cached = cache.get(_EARLIEST_AWARD_DATE_CACHE_KEY, _SENTINEL)
-    if cached is not _SENTINEL:
-        return cached
-
-    earliest = DibbsAward.objects.filter(is_faux=False).aggregate(
-        min_date=Min("aw_file_date")
-    )["min_date"]
-    cache.set(_EARLIEST_AWARD_DATE_CACHE_KEY, earliest, _EARLIEST_AWARD_DATE_CACHE_TTL)
-    return earliest
+    """Earliest non-faux aw_file_date in DibbsAward, cached for one hour or until the next award import."""
+    return _awards_cache.get_or_set(
+        _EARLIEST_AWARD_DATE_CACHE_KEY,
+        lambda: DibbsAward.objects.filter(is_faux=False).aggregate(
+            min_date=Min("aw_file_date")
+        )["min_date"],
+    )
@@ -1,5 +1,5 @@
 """
-Fetches DIBBS solicitation PDFs via Playwright.
+Fetches DIBBS solicitation PDFs (plain requests first, Playwright fallback).
 
 Session bootstrap strategy (matches dibbs_fetch.py):
   Instead of cold-navigating dodwarning.aspx with Playwright (which F5 ASM
@@ -8,6 +8,9 @@ Session bootstrap strategy (matches dibbs_fetch.py):
     2. Inject the resulting cookies into the Playwright context.
   Playwright then goes straight to the PDF download URLs without ever touching
   the warning page, so F5 never sees a headless browser hitting it.
+  services/pdf_harvest.py first tries the same cookies on a pooled requests
+  session with several downloads in flight; only non-PDF responses reach
+  Playwright.
 
 PDF URL pattern:
     https://dibbs2.bsm.dla.mil/Downloads/RFQ/{last_char}/{sol_number}.PDF
@@ -28,7 +31,6 @@ Note on ERR_ABORTED:
 """
 
 import logging
-import os
 import re
 from datetime import date
 from decimal import Decimal, InvalidOperation
@@ -58,11 +60,11 @@ _BROWSER_UA = (
 AW_CHUNK = 100
 
 
-def _pdf_url(sol_number: str) -> str:
+def _pdf_url(sol_number: str, base_url: str = DIBBS2_MAIN) -> str:
     """Build the DIBBS PDF download URL for a solicitation number."""
     sol = sol_number.strip().upper()
     last_char = sol[-1]
-    return f"{DIBBS2_MAIN}/Downloads/RFQ/{last_char}/{sol}.PDF"
+    return f"{base_url}/Downloads/RFQ/{last_char}/{sol}.PDF"
 
 
 # ---------------------------------------------------------------------------
@@ -127,28 +129,21 @@ def _read_pdf_download(page, url: str, sol_number: str) -> Optional[bytes]:
     return body
 
 
-def extract_pdf_text(pdf_blob_bytes: bytes) -> str:
+def extract_pdf_text(
+    pdf_blob_bytes: bytes, key: Optional[str] = None, persist: Optional[bool] = None
+) -> str:
     """
     Extract raw text from a PDF blob using pypdf.
     Returns full concatenated text of all pages.
     Returns empty string if extraction fails or input is empty.
+    Served from the extract-once cache in sales.services.pdf_text, so the
+    procurement, packaging and analysis parsers share one pypdf pass per PDF.
+    ``key`` (the bytes' SHA-256, e.g. pdf_blob_key) and ``persist`` are passed
+    through to get_pdf_text.
     """
-    if not pdf_blob_bytes:
-        return ""
-    try:
-        import io
-
-        from pypdf import PdfReader
-
-        reader = PdfReader(io.BytesIO(pdf_blob_bytes))
-        pages = []
-        for page in reader.pages:
-            text = page.extract_text()
-            if text:
-                pages.append(text)
-        return "\n".join(pages)
-    except Exception:
-        return ""
+    from sales.services.pdf_text import get_pdf_text
+
+    return get_pdf_text(pdf_blob_bytes, key=key, persist=persist)
 
 
 SECTION_D_START_RES = [
@@ -216,11 +211,17 @@ def _packaging_code_blocks(raw: str) -> str:
     return "\n".join(parts).strip()
 
 
-def parse_packaging_data(pdf_bytes: bytes, sol_number: str = "") -> Dict[str, str]:
+def parse_packaging_data(
+    pdf_bytes: bytes,
+    sol_number: str = "",
+    text_key: Optional[str] = None,
+    persist_text: Optional[bool] = None,
+) -> Dict[str, str]:
     """
     Locate Section D or "Packaging and Preservation" in extracted PDF text; pull
     packaging / preservation / marking strings, MIL-style code blocks (RP001…),
-    and raw section text for SolPackaging upsert.
+    and raw section text for SolPackaging upsert. ``text_key`` / ``persist_text``
+    go to extract_pdf_text.
     """
     empty: Dict[str, str] = {
         "packaging_standard": "",
@@ -228,7 +229,7 @@ def parse_packaging_data(pdf_bytes: bytes, sol_number: str = "") -> Dict[str, st
         "marking_requirements": "",
         "raw_section_d": "",
     }
-    text = extract_pdf_text(pdf_bytes)
+    text = extract_pdf_text(pdf_bytes, key=text_key, persist=persist_text)
     if not text.strip():
         return empty
 
@@ -301,9 +302,16 @@ def parse_packaging_data(pdf_bytes: bytes, sol_number: str = "") -> Dict[str, st
     }
 
 
-def parse_packaging_from_pdf(pdf_bytes: bytes, sol_number: str) -> Dict[str, str]:
+def parse_packaging_from_pdf(
+    pdf_bytes: bytes,
+    sol_number: str,
+    text_key: Optional[str] = None,
+    persist_text: Optional[bool] = None,
+) -> Dict[str, str]:
     """Backward-compatible name; delegates to parse_packaging_data."""
-    return parse_packaging_data(pdf_bytes, sol_number)
+    return parse_packaging_data(
+        pdf_bytes, sol_number, text_key=text_key, persist_text=persist_text
+    )
 
 
 def save_sol_packaging(sol_number: str, data: Dict[str, Any]) -> bool:
@@ -350,79 +358,20 @@ def fetch_pdf_for_sol(sol_number: str) -> Optional[bytes]:
 
 def fetch_pdfs_for_sols(sol_numbers: list[str]) -> dict[str, Optional[bytes]]:
     """
-    Fetch PDFs for multiple solicitations in a single Playwright browser session.
+    Fetch PDFs for multiple solicitations.
 
     Bootstrap dibbs2 consent via requests first (avoids F5 ASM bot fingerprinting),
-    inject cookies into Playwright context, then download all PDFs without
-    ever navigating the warning page with Chromium.
+    then download concurrently on that session with adaptive backoff; anything
+    that does not come back as a PDF is retried in one Playwright context with
+    the same cookies. See services/pdf_harvest.py.
 
     Returns dict mapping sol_number -> bytes (or None if fetch failed for that sol).
     Catches per-PDF exceptions so one failure doesn't abort the batch.
     """
-    result: dict[str, Optional[bytes]] = {sol: None for sol in sol_numbers}
-    if not sol_numbers:
-        return result
-
-    try:
-        from playwright.sync_api import sync_playwright
-    except ImportError:
-        logger.exception("Playwright not installed")
-        return result
+    from sales.services.pdf_harvest import harvest_pdfs
 
-    # Bootstrap consent via requests — no Playwright cold-hit on the warning page
-    try:
-        dibbs2_cookies = _make_dibbs2_session()
-    except Exception as e:
-        logger.exception("fetch_pdfs_for_sols: dibbs2 consent bootstrap failed: %s", e)
-        return result
-
-    try:
-        with sync_playwright() as pw:
-            browser = pw.chromium.launch(
-                headless=True,
-                args=[
-                    "--no-sandbox",
-                    "--disable-dev-shm-usage",
-                    "--disable-blink-features=AutomationControlled",
-                    "--disable-infobars",
-                    "--window-size=1920,1080",
-                ],
-            )
-            context = browser.new_context(
-                accept_downloads=True,
-                user_agent=_BROWSER_UA,
-                viewport={"width": 1920, "height": 1080},
-                locale="en-US",
-            )
-
-            # Inject requests-obtained cookies — Playwright looks pre-authenticated
-            context.add_cookies(dibbs2_cookies)
-            logger.info(
-                "Injected %d dibbs2 cookie(s) into Playwright context",
-                len(dibbs2_cookies),
-            )
-
-            for sol_number in sol_numbers:
-                url = _pdf_url(sol_number)
-                page = context.new_page()
-                try:
-                    body = _read_pdf_download(page, url, sol_number)
-                    result[sol_number] = body
-                except Exception as e:
-                    logger.exception(
-                        "fetch_pdfs_for_sols: %s failed: %s", sol_number, e
-                    )
-                finally:
-                    try:
-                        page.close()
-                    except Exception:
-                        pass
-
-            browser.close()
-    except Exception as e:
-        logger.exception("fetch_pdfs_for_sols outer failure: %s", e)
-
-    return result
+    results, _metrics = harvest_pdfs(sol_numbers)
+    return results
 
 
 def _parse_procurement_header_line(line: str) -> Optional[Tuple[str, str]]:
@@ -496,9 +445,15 @@ def _match_procurement_row(line: str) -> Optional[re.Match]:
     return pat2.match(norm)
 
 
-def parse_procurement_history(pdf_bytes: bytes, sol_number: str) -> List[Dict]:
+def parse_procurement_history(
+    pdf_bytes: bytes,
+    sol_number: str,
+    text_key: Optional[str] = None,
+    persist_text: Optional[bool] = None,
+) -> List[Dict]:
     """
     Extract procurement history rows from a DIBBS solicitation PDF blob.
+    ``text_key`` / ``persist_text`` go to extract_pdf_text.
 
     Returns a list of dicts, each with keys:
         nsn, fsc, cage_code, contract_number, quantity,
@@ -515,7 +470,7 @@ def parse_procurement_history(pdf_bytes: bytes, sol_number: str) -> List[Dict]:
         re.IGNORECASE,
     )
 
-    full_text = extract_pdf_text(pdf_bytes)
+    full_text = extract_pdf_text(pdf_bytes, key=text_key, persist=persist_text)
     if not full_text.strip():
         return []
 
@@ -613,6 +568,8 @@ def save_procurement_history(rows: List[Dict]) -> int:
     - New rows: INSERT via raw executemany (%s) — avoids django-mssql-backend
       OUTPUT INSERTED.id on bulk paths.
     - Existing rows (nsn + contract_number): UPDATE last_seen_sol and extracted_at only.
+    - Sends sales.signals.procurement_history_saved (inside the transaction)
+      when rows were inserted.
 
     Returns count of rows inserted or updated.
     """
@@ -682,6 +639,18 @@ def save_procurement_history(rows: List[Dict]) -> int:
 
     count = 0
     with transaction.atomic():
+        # NSNs getting their first history rows (feeds the Observatory coverage
+        # counter). Read in the same transaction as the inserts so it reflects
+        # rows committed by parallel workers up to this point.
+        insert_nsns = sorted({p[0] for p in insert_params})
+        first_seen = set(insert_nsns)
+        for i in range(0, len(insert_nsns), AW_CHUNK):
+            first_seen.difference_update(
+                NsnProcurementHistory.objects.filter(nsn__in=insert_nsns[i : i + AW_CHUNK])
+                .values_list("nsn", flat=True)
+                .distinct()
+            )
+
         with connection.cursor() as cursor:
             for i in range(0, len(insert_params), AW_CHUNK):
                 batch = insert_params[i : i + AW_CHUNK]
@@ -693,28 +662,44 @@ def save_procurement_history(rows: List[Dict]) -> int:
                 if batch:
                     cursor.executemany(update_sql, batch)
                     count += len(batch)
+        if insert_params:
+            from sales.signals import procurement_history_saved
+
+            procurement_history_saved.send(
+                sender=NsnProcurementHistory,
+                inserted=len(insert_params),
+                first_seen_nsns=first_seen,
+            )
 
     return count
 
 
-def persist_pdf_procurement_extract(sol_number: str, pdf_bytes: Optional[bytes]) -> None:
+def persist_pdf_procurement_extract(
+    sol_number: str, pdf_bytes: Optional[bytes], blob_key: Optional[str] = None
+) -> None:
     """
     Parse procurement history and Section D from PDF bytes, save to DB, set
     Solicitation.pdf_data_pulled. Call only after any Playwright session has fully
     exited (Azure mssql + sync_playwright ORM boundary).
 
+    ``blob_key`` is the bytes' content-addressed pdf_blob_key when the caller
+    has it; otherwise the bytes are hashed once here for both parsers.
+
     Always sets pdf_data_pulled when pdf_bytes is non-empty, even if parsers find
     no rows or raise (record is marked processed).
     """
     if not pdf_bytes:
         return
 
+    from sales.services.pdf_text import pdf_text_key
+
     key = sol_number.strip().upper()
+    text_key = blob_key or pdf_text_key(pdf_bytes)
     now = timezone.now()
 
     try:
         try:
-            history_rows = parse_procurement_history(pdf_bytes, key)
+            history_rows = parse_procurement_history(pdf_bytes, key, text_key=text_key)
             saved = save_procurement_history(history_rows)
             logger.info(
                 "persist_pdf_procurement_extract(%s): parsed %d rows, saved %d",
@@ -730,7 +715,7 @@ def persist_pdf_procurement_extract(sol_number: str, pdf_bytes: Optional[bytes])
             )
 
         try:
-            pack = parse_packaging_from_pdf(pdf_bytes, key)
+            pack = parse_packaging_from_pdf(pdf_bytes, key, text_key=text_key)
             if save_sol_packaging(key, pack):
                 logger.info(
                     "persist_pdf_procurement_extract(%s): saved SolPackaging", key
@@ -747,54 +732,15 @@ def persist_pdf_procurement_extract(sol_number: str, pdf_bytes: Optional[bytes])
         )
 
 
-def parse_pdf_data_backlog(log=None) -> int:
+def parse_pdf_data_backlog(log=None, **options) -> int:
     """
     Phase 3 / factory: process solicitations with a stored PDF but no extract
     timestamp. No Playwright — safe to run only after all harvest sessions are closed.
-    """
-    from sales.models import Solicitation
 
-    qs = (
-        Solicitation.objects.filter(
-            pdf_blob__isnull=False,
-            pdf_data_pulled__isnull=True,
-        )
-        .order_by("solicitation_number")
-        .values_list("solicitation_number", "pdf_blob")
-    )
+    Streams one PDF at a time with a checkpoint, optional time budget and
+    optional worker processes — see sales.services.pdf_backlog.run_pdf_backlog
+    for ``options``. Returns the number of PDFs parsed.
+    """
+    from sales.services.pdf_backlog import run_pdf_backlog
 
-    n = 0
-    for sol_number, blob in list(qs):
-        if not blob:
-            continue
-        key = (sol_number or "").strip().upper()
-        pdf_blob_bytes = bytes(blob)
-        persist_pdf_procurement_extract(key, pdf_blob_bytes)
-        # Loop C LLM analysis hook — enabled via SOL_ANALYSIS_ENABLED=True env var
-        if os.environ.get("SOL_ANALYSIS_ENABLED", "False").lower() == "true":
-            try:
-                from sales.models.sol_analysis import SolAnalysis
-
-                sol = Solicitation.objects.get(solicitation_number=key)
-                if not SolAnalysis.objects.filter(solicitation=sol).exists():
-                    from sales.services.sol_analysis import (
-                        analyze_solicitation_pdf,
-                        save_analysis_result,
-                    )
-
-                    _result = analyze_solicitation_pdf(
-                        pdf_blob_bytes,
-                        sol.solicitation_number,
-                        "haiku45",
-                    )
-                    save_analysis_result(sol, _result, "haiku45")
-            except Exception as _e:
-                logger.error(
-                    "Loop C SolAnalysis failed for %s: %s",
-                    key,
-                    _e,
-                )
-        n += 1
-        if log:
-            log(f"  parse backlog: {key}")
-    return n
+    return run_pdf_backlog(log=log, **options)["parsed"]
@@ -18,6 +18,7 @@ from sales.models import (
     RFQSalutation,
 )
 from sales.models.email_templates import _SafeDict
+from sales.services.blob_store import read_solicitation_pdf
 
 logger = logging.getLogger(__name__)
 
@@ -551,10 +552,11 @@ def build_grouped_rfq_email(supplier, rfqs, sent_by, personalization_text=""):
     attachments = []
     for rfq in rfqs:
         sol = rfq.line.solicitation
-        if getattr(sol, "pdf_blob", None) and sol.pdf_blob:
+        content = read_solicitation_pdf(sol)
+        if content:
             attachments.append({
                 "filename": f"{sol.solicitation_number}.PDF",
-                "content": bytes(sol.pdf_blob),
+                "content": content,
                 "mimetype": "application/pdf",
             })
 
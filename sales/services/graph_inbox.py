@@ -1,7 +1,8 @@
 """
 Graph inbox reader for the GRAPH_MAIL_SENDER_RFQ mailbox.
 
-Uses Microsoft Graph API via MSAL client credentials (application permissions).
+Uses Microsoft Graph API via client credentials (application permissions); tokens
+and connections come from the shared core.graph_client.
 Requires Mail.Read or Mail.ReadWrite application permission with admin consent.
 
 GCC High endpoints only — never use .com equivalents.
@@ -17,15 +18,15 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
-import msal
 import requests
 from django.conf import settings
 from django.utils import timezone as tz
 from django.utils.dateparse import parse_datetime
 
+from core.graph_client import GraphAuthError, get_app_token, graph_request
+
 logger = logging.getLogger(__name__)
 
-AUTHORITY_BASE = 'https://login.microsoftonline.us'
 GRAPH_BASE = 'https://graph.microsoft.us/v1.0'
 GRAPH_SCOPE = ['https://graph.microsoft.us/.default']
 
@@ -54,36 +55,18 @@ class GraphEmailMessage:
 
 def _get_graph_token() -> Optional[str]:
     """
-    Acquire an MSAL client credentials token using the same settings as graph_mail.py.
+    Client credentials token using the same settings (and shared cache) as graph_mail.py.
     """
-    tenant_id = settings.GRAPH_MAIL_TENANT_ID
-    client_id = settings.GRAPH_MAIL_CLIENT_ID
-    client_secret = settings.GRAPH_MAIL_CLIENT_SECRET
-
-    if not all([tenant_id, client_id, client_secret]):
+    try:
+        return get_app_token(scope=GRAPH_SCOPE[0])
+    except (GraphAuthError, requests.RequestException) as exc:
         logger.error(
-            'graph_inbox: One or more GRAPH_MAIL_* settings are missing. '
-            'Check GRAPH_MAIL_TENANT_ID, GRAPH_MAIL_CLIENT_ID, GRAPH_MAIL_CLIENT_SECRET.'
+            'graph_inbox: Token acquisition failed: %s — %s',
+            getattr(exc, 'message', exc),
+            getattr(exc, 'details', '')[:500],
         )
         return None
 
-    authority = f'{AUTHORITY_BASE}/{tenant_id}'
-    app = msal.ConfidentialClientApplication(
-        client_id=client_id,
-        client_credential=client_secret,
-        authority=authority,
-    )
-    result = app.acquire_token_for_client(scopes=GRAPH_SCOPE)
-    if 'access_token' in result:
-        return result['access_token']
-
-    logger.error(
-        'graph_inbox: Token acquisition failed: %s — %s',
-        result.get('error'),
-        result.get('error_description'),
-    )
-    return None
-
 
 def _parse_graph_datetime(value: str) -> datetime:
     """Parse Graph's ISO 8601 datetime string to a timezone-aware datetime."""
@@ -126,7 +109,7 @@ def fetch_inbox_messages() -> tuple[list[GraphEmailMessage], Optional[str]]:
     )
 
     try:
-        resp = requests.get(url, headers=headers, timeout=15)
+        resp = graph_request('GET', url, headers=headers, timeout=15)
         resp.raise_for_status()
     except requests.RequestException as exc:
         logger.error('graph_inbox: fetch_inbox_messages failed: %s', exc)
@@ -169,7 +152,7 @@ def fetch_message_body(graph_message_id: str) -> tuple[str, Optional[str]]:
     url = f'{GRAPH_BASE}/users/{user_seg}/messages/{mid}?$select=body'
 
     try:
-        resp = requests.get(url, headers=headers, timeout=15)
+        resp = graph_request('GET', url, headers=headers, timeout=15)
         resp.raise_for_status()
     except requests.RequestException as exc:
         logger.error(
@@ -207,7 +190,7 @@ def mark_message_read(graph_message_id: str) -> Optional[str]:
     url = f'{GRAPH_BASE}/users/{user_seg}/messages/{mid}'
 
     try:
-        resp = requests.patch(url, headers=headers, json={'isRead': True}, timeout=10)
+        resp = graph_request('PATCH', url, headers=headers, json={'isRead': True}, timeout=10)
         resp.raise_for_status()
         return None
     except requests.RequestException as exc:
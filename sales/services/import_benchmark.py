@@ -0,0 +1,282 @@
+"""
+Synthetic DIBBS daily files and an import benchmark harness.
+
+write_synthetic_files() produces IN (fixed-width, 140 chars), BQ (121-column
+CSV) and AS (4-column CSV) files in the real layouts documented in
+sales/services/parser.py. run_import_benchmark() feeds them through
+importer.run_import() inside a transaction that is rolled back afterwards, and
+returns a JSON-serialisable report: per-stage wall time and query counts (from
+run_import's "stages"), tracemalloc peak per stage and overall, process peak
+RSS, and rows/sec — one run per requested size.
+
+The run is meant for a local SQLite database: on SQL Server it would hold one
+long write transaction (lifecycle sweep, ApprovedSource delete, DDL for the
+tier-1 stand-in) over live tables, so run_import_benchmark() refuses any other
+vendor unless allow_non_sqlite=True.
+
+Used by `python manage.py benchmark_dibbs_import`; reports from two commits can
+be diffed with its --compare option.
+"""
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+from django.db import connection, transaction
+
+_SCORED_TABLE = "dibbs_supplier_nsn_scored"
+_SET_ASIDES = "NNNNYYRRHLAE"
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _in_record(
+    sol_number: str,
+    nsn: str,
+    purchase_request: str = "7015798135",
+    return_by: str = "03/19/26",
+    quantity: int = 1,
+    unit_of_issue: str = "EA",
+    nomenclature: str = "BAG,DUFFEL",
+    buyer_code: str = "DMR01",
+    amsc: str = "Z",
+    item_type: str = "1",
+    set_aside: str = "N",
+    sb_percentage: int = 0,
+) -> str:
+    """One synthetic 140-character IN row (column map: parser.parse_in_file)."""
+    return (
+        sol_number.ljust(13)[:13]
+        + nsn.ljust(46)[:46]
+        + purchase_request.ljust(13)[:13]
+        + return_by.ljust(8)[:8]
+        + f"{sol_number}.PDF".ljust(19)[:19]
+        + f"{quantity:07d}"[:7]
+        + unit_of_issue.ljust(2)[:2]
+        + nomenclature.ljust(21)[:21]
+        + buyer_code.ljust(5)[:5]
+        + amsc[:1].ljust(1)
+        + item_type[:1].ljust(1)
+        + set_aside[:1].ljust(1)
+        + f"{sb_percentage:03d}"[:3]
+    )
+
+
+def _bq_record(
+    sol_number: str,
+    nsn: str,
+    line_number: str = "1",
+    required_delivery_days: int = 30,
+    solicitation_type: str = "F",
+    return_by: str = "03/19/2026",
+    quantity: int = 1,
+) -> str:
+    """One quoted 121-column BQ row with the DIBBS pre-filled columns set."""
+    cols = [""] * 121
+    cols[0], cols[1], cols[2], cols[3] = sol_number, solicitation_type, "N", "N"
+    cols[4] = return_by
+    cols[23], cols[24], cols[26] = "BI", line_number, "90"
+    cols[43], cols[45], cols[46] = f"{int(line_number or 1):04d}", "7015798135", nsn
+    cols[47], cols[48], cols[50] = "EA", str(quantity), str(required_delivery_days)
+    cols[104] = "D"
+    return ",".join(f'"{c}"' for c in cols)
+
+
+def _as_record(nsn: str, cage: str, part_number: str) -> str:
+    return f'"{nsn}","{cage}","{part_number}",""'
+
+
+def write_synthetic_files(
+    directory: str,
+    solicitations: int,
+    lines_per_sol: int = 2,
+    sources_per_nsn: int = 2,
+    import_date: date | None = None,
+    seed: int = 7,
+) -> dict:
+    """
+    Write IN/BQ/AS files for ``solicitations`` solicitations into ``directory``.
+    Returns {"in_path", "bq_path", "as_path", "in_rows", "bq_rows", "as_rows", "bytes"}.
+    """
+    rng = random.Random(seed)
+    import_date = import_date or date.today()
+    tag = import_date.strftime("%y%m%d")
+    paths = {
+        "in_path": os.path.join(directory, f"IN{tag}.TXT"),
+        "bq_path": os.path.join(directory, f"bq{tag}.txt"),
+        "as_path": os.path.join(directory, f"as{tag}.txt"),
+    }
+    counts = {"in_rows": 0, "bq_rows": 0, "as_rows": 0}
+    nsns_seen = set()
+
+    with open(paths["in_path"], "w", newline="\n") as in_f, open(
+        paths["bq_path"], "w", newline="\n"
+    ) as bq_f, open(paths["as_path"], "w", newline="\n") as as_f:
+        for i in range(solicitations):
+            sol_number = f"SPE{rng.choice('4578')}{chr(65 + i % 26)}{i:07d}"[:13]
+            set_aside = rng.choice(_SET_ASIDES)
+            for line in range(1, lines_per_sol + 1):
+                nsn = f"{rng.randint(1000, 9999)}01{rng.randint(0, 9999999):07d}"
+                in_f.write(
+                    _in_record(
+                        sol_number,
+                        nsn,
+                        quantity=rng.randint(1, 500),
+                        set_aside=set_aside,
+                        sb_percentage=100 if set_aside != "N" else 0,
+                    )
+                    + "\n"
+                )
+                bq_f.write(_bq_record(sol_number, nsn, str(line), rng.randint(10, 180)) + "\n")
+                counts["in_rows"] += 1
+                counts["bq_rows"] += 1
+                if nsn in nsns_seen:
+                    continue
+                nsns_seen.add(nsn)
+                for _ in range(sources_per_nsn):
+                    cage = f"{rng.randint(0, 9)}{rng.choice('ABCDEFGHJK')}{rng.randint(100, 999)}"
+                    as_f.write(_as_record(nsn, cage, f"PN-{rng.randint(1, 99999)}") + "\n")
+                    counts["as_rows"] += 1
+
+    counts["bytes"] = sum(os.path.getsize(p) for p in paths.values())
+    return {**paths, **counts}
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5, check=True,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _ensure_scored_table() -> None:
+    """Stand-in for the SSMS-managed tier-1 view where it does not exist (SQLite)."""
+    if _SCORED_TABLE in connection.introspection.table_names(include_views=True):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE {_SCORED_TABLE} (id INTEGER PRIMARY KEY, "
+            "supplier_id INTEGER, nsn VARCHAR(46), match_score DECIMAL(10, 2))"
+        )
+
+
+def _benchmark_one(files: dict, trace_memory: bool) -> dict:
+    from sales.services.importer import _peak_rss_mb, run_import
+
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    summary = None
+    try:
+        with transaction.atomic():
+            _ensure_scored_table()
+            with open(files["in_path"], "rb") as in_f, open(
+                files["bq_path"], "rb"
+            ) as bq_f, open(files["as_path"], "rb") as as_f:
+                summary = run_import(in_f, bq_f, as_f, imported_by="benchmark")
+            raise _Rollback
+    except _Rollback:
+        pass
+    finally:
+        total = time.perf_counter() - started
+        peak_traced = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        if trace_memory:
+            tracemalloc.stop()
+
+    rows = files["in_rows"] + files["bq_rows"] + files["as_rows"]
+    stages = summary["stages"]
+    return {
+        "in_rows": files["in_rows"],
+        "bq_rows": files["bq_rows"],
+        "as_rows": files["as_rows"],
+        "file_bytes": files["bytes"],
+        "total_seconds": round(total, 3),
+        "total_queries": sum(s["queries"] for s in stages.values()),
+        "rows_per_sec": round(rows / total, 1) if total > 0 else None,
+        "peak_traced_mb": round(peak_traced / (1024 * 1024), 1) if peak_traced else None,
+        "peak_rss_mb": _peak_rss_mb(),
+        "matches_found": summary["match_summary"].get("matches_found", 0),
+        "stages": stages,
+    }
+
+
+def run_import_benchmark(
+    sizes=(1000,),
+    lines_per_sol: int = 2,
+    sources_per_nsn: int = 2,
+    trace_memory: bool = True,
+    seed: int = 7,
+    allow_non_sqlite: bool = False,
+) -> dict:
+    """
+    Generate and import one synthetic file set per entry in ``sizes``
+    (solicitation counts); every run is rolled back. Returns the report dict.
+    tracemalloc inflates wall time — pass trace_memory=False for timing-only runs.
+    Raises RuntimeError on a non-SQLite database unless ``allow_non_sqlite``.
+    """
+    if connection.vendor != "sqlite" and not allow_non_sqlite:
+        raise RuntimeError(
+            f"The import benchmark runs against SQLite only (configured: {connection.vendor})."
+        )
+    runs = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix="dibbs_bench_") as tmp:
+            files = write_synthetic_files(
+                tmp, size, lines_per_sol=lines_per_sol,
+                sources_per_nsn=sources_per_nsn, seed=seed,
+            )
+            runs.append({"solicitations": size, **_benchmark_one(files, trace_memory)})
+    return {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": _git_commit(),
+        "database": connection.vendor,
+        "python": platform.python_version(),
+        "trace_memory": trace_memory,
+        "lines_per_sol": lines_per_sol,
+        "sources_per_nsn": sources_per_nsn,
+        "runs": runs,
+    }
+
+
+def compare_reports(baseline: dict, current: dict) -> list[dict]:
+    """
+    Per (size, stage) seconds/queries deltas between two reports; sizes present
+    in only one report are skipped. Stage "total" covers the whole run.
+    """
+    base_runs = {r["solicitations"]: r for r in baseline.get("runs", [])}
+    rows = []
+    for run in current.get("runs", []):
+        base = base_runs.get(run["solicitations"])
+        if not base:
+            continue
+        pairs = [("total", base["total_seconds"], run["total_seconds"],
+                  base["total_queries"], run["total_queries"])]
+        for name, stage in run["stages"].items():
+            old = base["stages"].get(name, {"seconds": 0.0, "queries": 0})
+            pairs.append((name, old["seconds"], stage["seconds"], old["queries"], stage["queries"]))
+        for name, old_s, new_s, old_q, new_q in pairs:
+            rows.append({
+                "solicitations": run["solicitations"],
+                "stage": name,
+                "seconds_before": old_s,
+                "seconds_after": new_s,
+                "seconds_change_pct": round((new_s - old_s) / old_s * 100, 1) if old_s else None,
+                "queries_before": old_q,
+                "queries_after": new_q,
+            })
+    return rows
+
+
+def load_report(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
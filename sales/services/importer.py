@@ -5,28 +5,42 @@ Bulk fetch → diff → bulk_create / bulk_update pattern keeps SQL Server
 round-trips low (~12 queries for a 2,500-line import).
 
 Public API (used by both the legacy run_import and the new AJAX step views):
-  parse_dibbs_files(in_file, bq_file, as_file)   → parsed dict
+  parse_dibbs_files(in_file, bq_file, as_file)     → parsed dict (all records in memory)
+  summarize_dibbs_files(in_file, bq_file, as_file) → parse summary only (streamed)
   create_import_batch(...)                         → ImportBatch
   upsert_solicitations(parsed, batch, import_date) → {created, updated}
   upsert_lines_and_sources(parsed, batch)          → {lines_created, ...}
+  stream_import(files..., batch, import_date)      → same upserts, windowed, bounded memory
   run_import(...)                                  → full summary dict (+ lifecycle counts)
 """
 import io
 import logging
 import re
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
 from datetime import date
 
-from django.db import transaction
+from django.db import connection, transaction
 from django.db.models import Q
 from django.utils import timezone
 
+from core.cache import invalidate as cache_invalidate
 from sales.models import (
     ImportBatch,
     Solicitation,
     SolicitationLine,
     ApprovedSource,
 )
-from sales.services.parser import parse_import_batch
+from sales.services.match_index import invalidate
+from sales.services.parser import (
+    BatchQuoteIndex,
+    iter_as_file,
+    iter_in_file,
+    parse_import_batch,
+    summarize_import_batch,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +54,9 @@ SOLICITATION_CHUNK = 200   # 200 × 9 fields = 1800 params — safe
 LINE_CHUNK         = 230   # 230 × 9 fields = 2070 params — safe
 AS_CHUNK           = 400   # 400 × 5 fields = 2000 params — safe
 
+# Streaming import: IN records are upserted this many solicitations at a time.
+STREAM_WINDOW_SOLS = SOLICITATION_CHUNK
+
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
@@ -91,8 +108,23 @@ def parse_dibbs_files(in_file, bq_file, as_file) -> dict:
     )
 
 
+def summarize_dibbs_files(in_file, bq_file, as_file) -> dict:
+    """
+    Streaming counterpart of parse_dibbs_files()['summary'] — counts records and
+    parse errors without keeping them (used by the AJAX parse step).
+    """
+    for f in (in_file, bq_file, as_file):
+        if hasattr(f, "seek"):
+            f.seek(0)
+    return summarize_import_batch(
+        _as_text(in_file),
+        _as_text(bq_file),
+        _as_text(as_file),
+    )
+
+
 def create_import_batch(
-    parsed: dict,
+    parsed: dict | None,
     in_name: str,
     bq_name: str,
     as_name: str,
@@ -103,14 +135,23 @@ def create_import_batch(
     Create and return an ImportBatch record.
     Clears any previous ApprovedSource rows for the same import_date first
     (makes the import idempotent on re-run).
+
+    ``parsed`` may be a full parse_dibbs_files() dict, {"summary": ...} from
+    summarize_dibbs_files(), or None (stream_import() fills in the count later).
     """
     deleted_as, _ = ApprovedSource.objects.filter(
         import_batch__import_date=import_date
     ).delete()
     if deleted_as:
         logger.info(f"Cleared {deleted_as} previous ApprovedSource rows for {import_date}")
-
-    sol_count = len({ps.solicitation_number for ps in parsed["solicitations"]})
+        invalidate("approved")
+
+    if not parsed:
+        sol_count = 0
+    elif "distinct_solicitation_count" in parsed.get("summary", {}):
+        sol_count = parsed["summary"]["distinct_solicitation_count"]
+    else:
+        sol_count = len({ps.solicitation_number for ps in parsed["solicitations"]})
     batch = ImportBatch.objects.create(
         import_date=import_date,
         in_file_name=in_name[:50] if in_name else None,
@@ -129,44 +170,54 @@ def upsert_solicitations(parsed: dict, batch: ImportBatch, import_date: date) ->
     Bulk-upsert Solicitation rows for this batch.
     Returns {created, updated}.
     """
-    solicitations = parsed["solicitations"]
-    batch_quotes  = parsed["batch_quotes"]
-
     # BQ lookup for solicitation_type
     sol_type_by_number: dict[str, str] = {}
-    for bq in batch_quotes:
+    for bq in parsed["batch_quotes"]:
         if bq.solicitation_number and bq.solicitation_number not in sol_type_by_number:
             sol_type_by_number[bq.solicitation_number] = bq.solicitation_type or ""
 
-    incoming_sol_numbers = {ps.solicitation_number for ps in solicitations}
+    return _upsert_solicitation_rows(
+        parsed["solicitations"], sol_type_by_number, batch, import_date
+    )
 
-    # One query: all existing solicitations for these numbers
-    existing_sols: dict[str, Solicitation] = {
-        s.solicitation_number: s
-        for s in Solicitation.objects.filter(solicitation_number__in=incoming_sol_numbers)
-    }
 
-    # Triage bucket (first occurrence per sol_number)
-    triage_by_sol: dict[str, str] = {}
-    for ps in solicitations:
-        if ps.solicitation_number not in triage_by_sol:
-            # assign_triage_bucket(ps)  # RETIRED — buckets deprecated, see Section 14.3 of spec
-            triage_by_sol[ps.solicitation_number] = "UNSET"
+def _upsert_solicitation_rows(
+    solicitations,
+    sol_type_by_number: dict,
+    batch: ImportBatch,
+    import_date: date,
+    seen: set | None = None,
+) -> dict:
+    """
+    Upsert the Solicitation rows for one list (or streaming window) of IN records.
+    Header fields come from the first record per solicitation number; numbers in
+    ``seen`` were handled by an earlier window and are skipped (``seen`` is
+    updated in place).
+    """
+    seen = set() if seen is None else seen
 
     # First ParsedSolicitation per sol_number
     first_ps: dict[str, object] = {}
     for ps in solicitations:
-        if ps.solicitation_number not in first_ps:
+        if ps.solicitation_number not in first_ps and ps.solicitation_number not in seen:
             first_ps[ps.solicitation_number] = ps
+    seen.update(first_ps)
+
+    # One query: all existing solicitations for these numbers
+    existing_sols: dict[str, Solicitation] = {
+        s.solicitation_number: s
+        for s in Solicitation.objects.filter(solicitation_number__in=list(first_ps))
+    }
+
+    # Triage bucket — assign_triage_bucket(ps) RETIRED, buckets deprecated
+    # (see Section 14.3 of spec); every new/unbucketed sol gets "UNSET".
+    triage_bucket = "UNSET"
 
-    sols_to_create: list[Solicitation] = []
     sols_to_update: list[Solicitation] = []
     new_sol_data:   dict[str, dict]    = {}
 
-    for sol_number in incoming_sol_numbers:
-        ps            = first_ps[sol_number]
-        triage_bucket = triage_by_sol[sol_number]
-        sol_type      = sol_type_by_number.get(sol_number, "") or None
+    for sol_number, ps in first_ps.items():
+        sol_type = sol_type_by_number.get(sol_number, "") or None
 
         if sol_number in existing_sols:
             sol = existing_sols[sol_number]
@@ -220,16 +271,36 @@ def upsert_lines_and_sources(parsed: dict, batch: ImportBatch) -> dict:
     Solicitations must already exist in the DB (call upsert_solicitations first).
     Returns {lines_created, lines_updated, as_loaded}.
     """
-    solicitations    = parsed["solicitations"]
-    approved_sources = parsed["approved_sources"]
-    batch_quotes     = parsed["batch_quotes"]
-
     # BQ lookup: (sol_number, stripped_nsn) → ParsedBatchQuote
     bq_by_sol_nsn: dict[tuple, object] = {}
-    for bq in batch_quotes:
+    for bq in parsed["batch_quotes"]:
         key = (bq.solicitation_number, bq.nsn_raw.replace("-", "").strip())
         bq_by_sol_nsn[key] = bq
 
+    def bq_for(sol_number, nsn_raw):
+        return bq_by_sol_nsn.get((sol_number, nsn_raw.replace("-", "").strip()))
+
+    with transaction.atomic():
+        lines_r  = _upsert_line_rows(parsed["solicitations"], bq_for)
+        as_count = _load_approved_sources(parsed["approved_sources"], batch)
+
+    logger.info(
+        f"Upserted lines: created={lines_r['created']} updated={lines_r['updated']} "
+        f"AS={as_count} batch={batch.id}"
+    )
+    return {
+        "lines_created": lines_r["created"],
+        "lines_updated": lines_r["updated"],
+        "as_loaded":     as_count,
+    }
+
+
+def _upsert_line_rows(solicitations, bq_for) -> dict:
+    """
+    Upsert SolicitationLine rows for one list (or streaming window) of IN records.
+    ``bq_for(sol_number, nsn_raw)`` returns the matching ParsedBatchQuote or None.
+    Returns {created, updated}.
+    """
     incoming_sol_numbers = {ps.solicitation_number for ps in solicitations}
 
     # Load all solicitation PKs (created in previous step)
@@ -256,9 +327,7 @@ def upsert_lines_and_sources(parsed: dict, batch: ImportBatch) -> dict:
             continue
 
         nsn_val = (ps.nsn_formatted or ps.nsn_raw or "")[:46]
-        bq      = bq_by_sol_nsn.get(
-            (ps.solicitation_number, ps.nsn_raw.replace("-", "").strip())
-        )
+        bq      = bq_for(ps.solicitation_number, ps.nsn_raw)
         key = (sol.pk, nsn_val)
 
         if key in existing_lines:
@@ -294,18 +363,6 @@ def upsert_lines_and_sources(parsed: dict, batch: ImportBatch) -> dict:
                 )
             )
 
-    # ApprovedSource objects
-    as_objs = [
-        ApprovedSource(
-            nsn          = src.nsn_raw[:46],
-            approved_cage= src.cage_code[:5],
-            part_number  = (src.part_number or "")[:50] or None,
-            company_name = (src.company_name or "")[:100] or None,
-            import_batch = batch,
-        )
-        for src in approved_sources
-    ]
-
     with transaction.atomic():
         line_update_fields = [
             "quantity", "nomenclature", "unit_of_issue",
@@ -316,23 +373,248 @@ def upsert_lines_and_sources(parsed: dict, batch: ImportBatch) -> dict:
             SolicitationLine.objects.bulk_create(chunk, ignore_conflicts=False)
         for chunk in _chunked(lines_to_update, LINE_CHUNK):
             SolicitationLine.objects.bulk_update(chunk, line_update_fields)
-        for chunk in _chunked(as_objs, AS_CHUNK):
-            ApprovedSource.objects.bulk_create(chunk)
 
+    return {"created": len(lines_to_create), "updated": len(lines_to_update)}
+
+
+def _load_approved_sources(approved_sources, batch: ImportBatch) -> int:
+    """
+    bulk_create ApprovedSource rows AS_CHUNK at a time from any iterable
+    (list or parser generator). Returns the number of rows written.
+    """
+    loaded = 0
+    window: list[ApprovedSource] = []
+
+    def flush():
+        nonlocal loaded
+        ApprovedSource.objects.bulk_create(window)
+        loaded += len(window)
+        window.clear()
+
+    with transaction.atomic():
+        for src in approved_sources:
+            window.append(
+                ApprovedSource(
+                    nsn          = src.nsn_raw[:46],
+                    approved_cage= src.cage_code[:5],
+                    part_number  = (src.part_number or "")[:50] or None,
+                    company_name = (src.company_name or "")[:100] or None,
+                    import_batch = batch,
+                )
+            )
+            if len(window) >= AS_CHUNK:
+                flush()
+        if window:
+            flush()
+        if loaded:
+            invalidate("approved")
+    return loaded
+
+
+# ── Streaming pipeline ────────────────────────────────────────────────────────
+
+def _peak_rss_mb() -> float | None:
+    """Process peak resident set size in MB (None where `resource` is unavailable)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class _StageClock:
+    """
+    Accumulates wall seconds and query counts per named import stage (plus
+    the tracemalloc peak when tracing is on — the benchmark harness enables
+    it; production imports do not). Stages must not nest.
+    """
+
+    def __init__(self):
+        self.stages: dict[str, dict] = {}
+        self._current = None
+
+    def _count_query(self, execute, sql, params, many, context):
+        if self._current is not None:
+            self._current["queries"] += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def stage(self, name: str):
+        entry = self.stages.setdefault(name, {"seconds": 0.0, "queries": 0})
+        self._current = entry
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(self._count_query):
+                yield
+        finally:
+            entry["seconds"] += time.perf_counter() - started
+            if tracing:
+                peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                entry["peak_mb"] = round(max(entry.get("peak_mb", 0.0), peak_mb), 1)
+            self._current = None
+
+    def timed_iter(self, name: str, iterable):
+        """
+        Yield from ``iterable``, charging the time spent producing items to
+        ``name`` (wall time only — meant for pure parsing, no queries).
+        """
+        entry = self.stages.setdefault(name, {"seconds": 0.0, "queries": 0})
+        it = iter(iterable)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+            finally:
+                entry["seconds"] += time.perf_counter() - started
+            yield item
+
+    def report(self) -> dict:
+        return {
+            name: {**entry, "seconds": round(entry["seconds"], 4)}
+            for name, entry in self.stages.items()
+        }
+
+
+def _iter_sol_windows(records, max_sols: int):
+    """
+    Group IN records into lists covering at most ``max_sols`` distinct
+    solicitation numbers (consecutive records; a window is closed only when
+    the next record would start a new solicitation).
+    """
+    window = []
+    sols = set()
+    for rec in records:
+        if rec.solicitation_number not in sols and len(sols) >= max_sols:
+            yield window
+            window, sols = [], set()
+        window.append(rec)
+        sols.add(rec.solicitation_number)
+    if window:
+        yield window
+
+
+def stream_import(
+    in_file,
+    bq_file,
+    as_file,
+    batch: ImportBatch,
+    import_date: date,
+    steps=("solicitations", "lines"),
+    clock: _StageClock | None = None,
+) -> dict:
+    """
+    Streaming upsert of one DIBBS file set with bounded memory.
+
+    The IN file is read record-by-record and processed in windows of
+    STREAM_WINDOW_SOLS solicitations; each window's BQ rows are fetched through
+    a BatchQuoteIndex (keyed offsets, not parsed rows) and AS rows are
+    bulk-inserted AS_CHUNK at a time. ``steps`` selects "solicitations" and/or
+    "lines" (lines includes approved sources) so the AJAX import steps can run
+    them separately.
+
+    Returns {
+        "solicitations": {created, updated}           (when that step ran),
+        "lines":         {lines_created, lines_updated, as_loaded}   (ditto),
+        "summary":       parse summary (same keys as parse_import_batch),
+        "perf":          {rows, seconds, rows_per_sec, peak_rss_mb},
+    }
+    When solicitations are upserted, batch.solicitation_count is set from the
+    distinct solicitation numbers seen. Stage time/queries (bq_index, parse_in,
+    solicitations, lines, approved_sources) accumulate on ``clock`` if given.
+    """
+    clock = clock or _StageClock()
+    started = time.perf_counter()
+    for f in (in_file, bq_file, as_file):
+        if hasattr(f, "seek"):
+            f.seek(0)
+
+    with clock.stage("bq_index"):
+        bq_index = BatchQuoteIndex(bq_file)
+    bq_for = bq_index.get
+
+    sol_r = {"created": 0, "updated": 0}
+    line_r = {"created": 0, "updated": 0}
+    seen: set[str] = set()
+    in_count = 0
+    error_sols: list[str] = []
+
+    in_records = clock.timed_iter("parse_in", iter_in_file(_as_text(in_file)))
+    for window in _iter_sol_windows(in_records, STREAM_WINDOW_SOLS):
+        in_count += len(window)
+        error_sols.extend(ps.solicitation_number for ps in window if ps.parse_errors)
+        if "solicitations" in steps:
+            with clock.stage("solicitations"):
+                r = _upsert_solicitation_rows(
+                    window, bq_index.solicitation_types, batch, import_date, seen
+                )
+            sol_r["created"] += r["created"]
+            sol_r["updated"] += r["updated"]
+        else:
+            seen.update(ps.solicitation_number for ps in window)
+        if "lines" in steps:
+            with clock.stage("lines"):
+                r = _upsert_line_rows(window, bq_for)
+            line_r["created"] += r["created"]
+            line_r["updated"] += r["updated"]
+
+    as_count = 0
+    if "lines" in steps:
+        with clock.stage("approved_sources"):
+            as_count = _load_approved_sources(iter_as_file(_as_text(as_file)), batch)
+
+    if "solicitations" in steps:
+        with clock.stage("solicitations"):
+            ImportBatch.objects.filter(pk=batch.pk).update(solicitation_count=len(seen))
+        batch.solicitation_count = len(seen)
+
+    error_sols += bq_index.error_sols
+    rows = in_count + bq_index.row_count + as_count
+    seconds = time.perf_counter() - started
+    result = {
+        "summary": {
+            "solicitation_count":          in_count,
+            "distinct_solicitation_count": len(seen),
+            "approved_source_count":       as_count,
+            "batch_quote_count":           bq_index.row_count,
+            "parse_error_count":           len(error_sols),
+            "solicitations_with_errors":   error_sols,
+        },
+        "perf": {
+            "rows":         rows,
+            "seconds":      round(seconds, 3),
+            "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else None,
+            "peak_rss_mb":  _peak_rss_mb(),
+        },
+    }
+    if "solicitations" in steps:
+        result["solicitations"] = sol_r
+    if "lines" in steps:
+        result["lines"] = {
+            "lines_created": line_r["created"],
+            "lines_updated": line_r["updated"],
+            "as_loaded":     as_count,
+        }
+    # Workbench prev/next id lists cached by any process are now stale.
+    cache_invalidate("sales.workbench_nav")
     logger.info(
-        f"Upserted lines: created={len(lines_to_create)} updated={len(lines_to_update)} "
-        f"AS={len(as_objs)} batch={batch.id}"
+        f"Streamed import batch={batch.id} steps={','.join(steps)}: "
+        f"{rows} rows in {seconds:.2f}s, peak RSS {result['perf']['peak_rss_mb']} MB"
     )
-    return {
-        "lines_created": len(lines_to_create),
-        "lines_updated": len(lines_to_update),
-        "as_loaded":     len(as_objs),
-    }
+    return result
 
 
 def _run_lifecycle_sweep() -> dict:
     """
     Pre-import lifecycle sweep. Runs before new solicitation rows are written.
+    Each transition is a single UPDATE whose affected-row count is the result
+    (no separate count() query).
 
     Pass 1 — New → Active:
         Solicitations with status='New' whose import batch date is before today
@@ -343,28 +625,24 @@ def _run_lifecycle_sweep() -> dict:
         or bucket is SKIP) → 'Archived'.
         NO_BID is never auto-archived (see queryset comment below).
 
-    Pass 3 — Archived blob purge:
-        Single UPDATE: null pdf_blob on all status='Archived' rows that still hold a blob.
+    Archived pdf_blob values are no longer nulled here — that is the batched
+    purge_archived_blobs background task (sales/services/blob_purge.py).
 
     Returns:
-        dict with keys new_to_active, expired_to_archived, blob_purged (counts).
+        dict with keys new_to_active, expired_to_archived (counts).
     """
     today = timezone.now().date()
 
     # --- Pass 1: New → Active ---
-    new_qs = Solicitation.objects.filter(
+    new_to_active_count = Solicitation.objects.filter(
         status="New",
         import_batch__import_date__lt=today,
-    )
-    new_to_active_count = new_qs.count()
-    if new_to_active_count:
-        # One UPDATE per pass — avoids SQLite lock contention from many bulk_update rounds.
-        new_qs.update(status="Active")
+    ).update(status="Active")
 
     # --- Pass 2: Expired → Archived ---
     # NO_BID is intentionally excluded — passed solicitations stay NO_BID permanently
     # so they remain visible in the Closed Solicitations view under the No-Bid tab.
-    expired_qs = Solicitation.objects.filter(
+    expired_to_archived_count = Solicitation.objects.filter(
         return_by_date__lt=today,
     ).exclude(
         status__in=PIPELINE_STATUSES,
@@ -372,29 +650,16 @@ def _run_lifecycle_sweep() -> dict:
         status="NO_BID",
     ).filter(
         Q(status__in=["New", "Active"]) | Q(bucket="SKIP")
-    )
-    expired_to_archived_count = expired_qs.count()
-    if expired_to_archived_count:
-        expired_qs.update(status="Archived")
+    ).update(status="Archived")
 
-    blob_purged = Solicitation.objects.filter(
-        status="Archived", pdf_blob__isnull=False
-    ).update(pdf_blob=None)
     logger.info(
-        "_run_lifecycle_sweep: nulled pdf_blob on %d archived solicitation(s).",
-        blob_purged,
-    )
-
-    logger.info(
-        "Lifecycle sweep: %s New->Active, %s Expired->Archived, %s blob(s) purged",
+        "Lifecycle sweep: %s New->Active, %s Expired->Archived",
         new_to_active_count,
         expired_to_archived_count,
-        blob_purged,
     )
     return {
         "new_to_active": new_to_active_count,
         "expired_to_archived": expired_to_archived_count,
-        "blob_purged": blob_purged,
     }
 
 
@@ -402,28 +667,35 @@ def _run_lifecycle_sweep() -> dict:
 
 def run_import(in_file, bq_file, as_file, imported_by: str) -> dict:
     """
-    Full single-shot import (used by the legacy synchronous upload view).
-    Calls the sub-functions in sequence; matching runs after upserts.
+    Full single-shot import (used by the legacy synchronous upload view and
+    auto_import_dibbs). Streams the files through stream_import() — memory is
+    bounded by the window size, not the file size — then runs matching.
+    The summary includes rows_per_sec and peak_rss_mb for the upsert phase,
+    and "stages": {stage: {seconds, queries}} for lifecycle_sweep,
+    create_batch, bq_index, parse_in, solicitations, lines, approved_sources
+    and matching.
     """
     in_name  = getattr(in_file,  "name", "") or ""
     bq_name  = getattr(bq_file,  "name", "") or ""
     as_name  = getattr(as_file,  "name", "") or ""
 
     import_date = _import_date_from_filename(in_name) or date.today()
+    clock = _StageClock()
 
-    with transaction.atomic():
+    with clock.stage("lifecycle_sweep"), transaction.atomic():
         lifecycle_counts = _run_lifecycle_sweep()
 
-    parsed = parse_dibbs_files(in_file, bq_file, as_file)
-    summary = parsed["summary"]
-
-    batch     = create_import_batch(parsed, in_name, bq_name, as_name, import_date, imported_by)
-    sol_r     = upsert_solicitations(parsed, batch, import_date)
-    lines_r   = upsert_lines_and_sources(parsed, batch)
+    with clock.stage("create_batch"):
+        batch = create_import_batch(None, in_name, bq_name, as_name, import_date, imported_by)
+    streamed = stream_import(in_file, bq_file, as_file, batch, import_date, clock=clock)
+    summary  = streamed["summary"]
+    sol_r    = streamed["solicitations"]
+    lines_r  = streamed["lines"]
 
     from sales.services.matching import run_matching_for_batch
     try:
-        match_summary = run_matching_for_batch(batch.id)
+        with clock.stage("matching"):
+            match_summary = run_matching_for_batch(batch.id)
     except Exception as exc:
         logger.error(f"Matching engine failed for batch {batch.id}: {exc}", exc_info=True)
         match_summary = {"lines_processed": 0, "matches_found": 0, "by_tier": {1: 0, 2: 0, 3: 0}, "error": str(exc)}
@@ -443,7 +715,9 @@ def run_import(in_file, bq_file, as_file, imported_by: str) -> dict:
         "match_summary":             match_summary,
         "new_to_active":             lifecycle_counts["new_to_active"],
         "expired_to_archived":       lifecycle_counts["expired_to_archived"],
-        "blob_purged":               lifecycle_counts["blob_purged"],
+        "rows_per_sec":              streamed["perf"]["rows_per_sec"],
+        "peak_rss_mb":               streamed["perf"]["peak_rss_mb"],
+        "stages":                    clock.report(),
     }
     logger.info(
         f"Import complete: batch={batch.id} sol_created={sol_r['created']} "
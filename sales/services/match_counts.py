@@ -0,0 +1,135 @@
+"""
+Set-based refresh of Solicitation.match_count from the
+dibbs_solicitation_match_counts view (see sales/sql/dibbs_solicitation_match_counts.sql).
+
+Full mode: one UPDATE over dibbs_solicitation joined to the view — rows absent
+from the view are zeroed, and only rows whose value actually changes are written.
+
+Incremental mode: the same UPDATE restricted (server-side, via subquery) to
+solicitations whose SupplierMatch rows were created since the last run, plus
+solicitations from import batches imported since the last run (covers lines
+that were re-matched down to zero matches). The high-water mark is stored in
+ServiceCheckpoint under CHECKPOINT_NAME. Matches that are deleted outright
+(a capability removal re-matched by rematch_open_lines) leave no row to find
+that way, so match_lines stamps DELETED_CHECKPOINT_NAME via note_matches_deleted()
+and an incremental run that sees a stamp since its checkpoint refreshes in full.
+
+SQL Server uses UPDATE ... FROM ... LEFT JOIN. SQLite (dev/tests) uses a
+correlated-subquery UPDATE — same semantics, no vendor-specific join syntax.
+"""
+import logging
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = "refresh_match_counts"
+DELETED_CHECKPOINT_NAME = "refresh_match_counts:deleted"
+
+_VIEW = "dibbs_solicitation_match_counts"
+
+# Solicitation ids touched since %s (used twice: SupplierMatch, ImportBatch).
+_CHANGED_IDS_SQL = """
+    SELECT l.solicitation_id
+    FROM dibbs_solicitation_line AS l
+    INNER JOIN dibbs_supplier_match AS m ON m.line_id = l.id
+    WHERE m.created_at >= %s
+    UNION
+    SELECT s2.id
+    FROM dibbs_solicitation AS s2
+    INNER JOIN tbl_ImportBatch AS b ON b.id = s2.import_batch_id
+    WHERE b.imported_at >= %s
+"""
+
+_MSSQL_UPDATE_SQL = f"""
+    UPDATE s
+    SET match_count = ISNULL(v.match_count, 0)
+    FROM dibbs_solicitation AS s
+    LEFT OUTER JOIN {_VIEW} AS v ON v.solicitation_id = s.id
+    WHERE s.match_count <> ISNULL(v.match_count, 0)
+"""
+
+_SQLITE_VALUE_SQL = f"""
+    COALESCE(
+        (SELECT v.match_count FROM {_VIEW} AS v
+         WHERE v.solicitation_id = dibbs_solicitation.id),
+        0
+    )
+"""
+
+_SQLITE_UPDATE_SQL = f"""
+    UPDATE dibbs_solicitation
+    SET match_count = {_SQLITE_VALUE_SQL}
+    WHERE match_count <> {_SQLITE_VALUE_SQL}
+"""
+
+
+def _update_sql(incremental: bool) -> str:
+    if connection.vendor == "microsoft":
+        sql = _MSSQL_UPDATE_SQL
+        id_col = "s.id"
+    else:
+        sql = _SQLITE_UPDATE_SQL
+        id_col = "dibbs_solicitation.id"
+    if incremental:
+        sql += f" AND {id_col} IN ({_CHANGED_IDS_SQL})"
+    return sql
+
+
+def note_matches_deleted() -> None:
+    """
+    Record that SupplierMatch rows were deleted without a replacement, so the
+    next incremental refresh_match_counts() falls back to a full refresh.
+    Call inside the deleting transaction: a rollback reverts the stamp too.
+    """
+    from sales.models import ServiceCheckpoint
+
+    ServiceCheckpoint.objects.update_or_create(
+        name=DELETED_CHECKPOINT_NAME, defaults={"checkpoint_at": timezone.now()}
+    )
+
+
+def _deleted_since(since) -> bool:
+    from sales.models import ServiceCheckpoint
+
+    return ServiceCheckpoint.objects.filter(
+        name=DELETED_CHECKPOINT_NAME, checkpoint_at__gte=since
+    ).exists()
+
+
+def refresh_match_counts(incremental: bool = False) -> dict:
+    """
+    Refresh Solicitation.match_count in one server-side statement.
+
+    incremental=True only considers solicitations changed since the stored
+    checkpoint; with no checkpoint yet, or when matches were deleted since it
+    (note_matches_deleted), it falls back to a full refresh.
+    The checkpoint is advanced to this run's start time after either mode,
+    so a nightly full run also seeds subsequent incremental runs.
+
+    Returns {"mode": "full" | "incremental", "updated": <rows changed>,
+             "since": <checkpoint used or None>}.
+    """
+    from sales.models import ServiceCheckpoint
+
+    started_at = timezone.now()
+    checkpoint, _ = ServiceCheckpoint.objects.get_or_create(name=CHECKPOINT_NAME)
+    since = checkpoint.checkpoint_at if incremental else None
+    if since is not None and _deleted_since(since):
+        since = None
+    mode = "incremental" if since is not None else "full"
+
+    params = [since, since] if since is not None else []
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(_update_sql(since is not None), params)
+            updated = max(cursor.rowcount or 0, 0)
+        ServiceCheckpoint.objects.filter(pk=checkpoint.pk).update(
+            checkpoint_at=started_at, updated_at=timezone.now()
+        )
+
+    logger.info(
+        "refresh_match_counts: mode=%s since=%s updated=%d", mode, since, updated
+    )
+    return {"mode": mode, "updated": updated, "since": since}
@@ -0,0 +1,308 @@
+"""
+Process-level in-memory index of supplier match tiers.
+
+Both the Review Workbench (get_live_workbench_matches) and import-time matching
+(run_matching_for_batch / match_lines) resolve tiers from this index when
+settings.MATCH_INDEX_ENABLED is on, instead of querying SupplierNSNScored,
+ApprovedSource, Supplier and SupplierFSC for every line.
+
+Segments (each built with one streamed query, versioned independently):
+  tier1      NSN → ((supplier_id, match_score), ...) from dibbs_supplier_nsn_scored
+  approved   NSN → (normalized CAGE, ...) from tbl_ApprovedSource
+  suppliers  normalized CAGE → (supplier_id, ...) and the active supplier id set
+  fsc        FSC → (supplier_id, ...) from dibbs_supplier_fsc
+
+Archived suppliers are filtered at lookup time via the suppliers segment, so an
+archive toggle only invalidates that (small) segment.
+
+Versioning: each segment's version is a ServiceCheckpoint row
+(``match_index:<segment>``, checkpoint_at = last change). Every process
+re-reads those four rows at most once per MATCH_INDEX_CHECK_SECONDS and rebuilds
+only the segments whose version moved (or that are older than
+MATCH_INDEX_MAX_AGE_SECONDS — tier 1 scores also come from contract history and
+age-decay, which no signal covers). invalidate() bumps a version; in the
+process that made the change, keyed edits (one NSN, one FSC) are patched in place
+instead of forcing a segment rebuild. Bulk writers that bypass model signals
+(the importer's ApprovedSource bulk_create / delete) call invalidate() directly.
+"""
+import logging
+import threading
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+SEGMENTS = ("tier1", "approved", "suppliers", "fsc")
+VERSION_PREFIX = "match_index:"
+# Segments that support patching a single key in place after an edit.
+_PATCHABLE = frozenset(["tier1", "fsc"])
+_STREAM_CHUNK = 5000
+
+
+def _normalize_cage(raw) -> str:
+    from sales.services.no_quote import normalize_cage_code
+
+    return normalize_cage_code(raw)
+
+
+def _read_versions() -> dict:
+    from sales.models import ServiceCheckpoint
+
+    names = [VERSION_PREFIX + seg for seg in SEGMENTS]
+    found = dict(
+        ServiceCheckpoint.objects.filter(name__in=names).values_list(
+            "name", "checkpoint_at"
+        )
+    )
+    return {seg: found.get(VERSION_PREFIX + seg) for seg in SEGMENTS}
+
+
+class MatchIndex:
+    """In-memory tier lookups. Build and refresh via get_match_index()."""
+
+    def __init__(self):
+        self.tier1 = {}
+        self.approved = {}
+        self.cage_suppliers = {}
+        self.active_suppliers = frozenset()
+        self.fsc = {}
+        self.versions = {seg: None for seg in SEGMENTS}
+        self.built = set()
+        # time.monotonic() readings; None / missing means "never", so a fresh
+        # index is built regardless of how small the monotonic clock still is.
+        self.built_at = {}
+        self.checked_at = None
+
+    # ── Segment loaders ─────────────────────────────────────────────────
+
+    def _load_tier1(self, nsns=None) -> dict:
+        from sales.models import SupplierNSNScored
+
+        qs = SupplierNSNScored.objects.all()
+        if nsns is not None:
+            qs = qs.filter(nsn__in=list(nsns))
+        grouped = {}
+        for nsn, sid, score in qs.values_list(
+            "nsn", "supplier_id", "match_score"
+        ).iterator(chunk_size=_STREAM_CHUNK):
+            grouped.setdefault(nsn, []).append((sid, score or Decimal("0")))
+        return {
+            nsn: tuple(sorted(rows, key=lambda r: r[1], reverse=True))
+            for nsn, rows in grouped.items()
+        }
+
+    def _load_approved(self) -> dict:
+        from sales.models import ApprovedSource
+
+        grouped = {}
+        for nsn, cage in ApprovedSource.objects.values_list(
+            "nsn", "approved_cage"
+        ).iterator(chunk_size=_STREAM_CHUNK):
+            cage = _normalize_cage(cage)
+            if cage:
+                grouped.setdefault(nsn, set()).add(cage)
+        return {nsn: tuple(sorted(cages)) for nsn, cages in grouped.items()}
+
+    def _load_suppliers(self):
+        from suppliers.models import Supplier
+
+        by_cage = {}
+        active = set()
+        for sid, cage, archived in Supplier.objects.values_list(
+            "id", "cage_code", "archived"
+        ).iterator(chunk_size=_STREAM_CHUNK):
+            if archived:
+                continue
+            active.add(sid)
+            cage = _normalize_cage(cage)
+            if cage:
+                by_cage.setdefault(cage, []).append(sid)
+        return {c: tuple(ids) for c, ids in by_cage.items()}, frozenset(active)
+
+    def _load_fsc(self, fscs=None) -> dict:
+        from sales.models import SupplierFSC
+
+        qs = SupplierFSC.objects.all()
+        if fscs is not None:
+            qs = qs.filter(fsc_code__in=list(fscs))
+        grouped = {}
+        for fsc, sid in qs.values_list("fsc_code", "supplier_id").distinct().iterator(
+            chunk_size=_STREAM_CHUNK
+        ):
+            grouped.setdefault(fsc, set()).add(sid)
+        return {fsc: tuple(sorted(ids)) for fsc, ids in grouped.items()}
+
+    def build_segment(self, segment: str) -> None:
+        if segment == "tier1":
+            self.tier1 = self._load_tier1()
+        elif segment == "approved":
+            self.approved = self._load_approved()
+        elif segment == "suppliers":
+            self.cage_suppliers, self.active_suppliers = self._load_suppliers()
+        elif segment == "fsc":
+            self.fsc = self._load_fsc()
+        self.built.add(segment)
+
+    def patch(self, segment: str, keys) -> None:
+        """Reload only ``keys`` of a patchable segment from the DB."""
+        keys = [k for k in keys if k]
+        if segment == "tier1":
+            fresh = self._load_tier1(keys)
+            for k in keys:
+                if k in fresh:
+                    self.tier1[k] = fresh[k]
+                else:
+                    self.tier1.pop(k, None)
+        elif segment == "fsc":
+            fresh = self._load_fsc(keys)
+            for k in keys:
+                if k in fresh:
+                    self.fsc[k] = fresh[k]
+                else:
+                    self.fsc.pop(k, None)
+
+    # ── Lookups (no DB) ─────────────────────────────────────────────────
+
+    def resolve(self, normalized_nsn: str, fsc: str) -> dict:
+        """
+        Raw tier candidates for one line, archived suppliers removed:
+        {"tier1": [(supplier_id, score)] score DESC, "approved_cages": (cage, ...),
+         "tier2": [supplier_id], "tier3": [supplier_id]}.
+        """
+        active = self.active_suppliers
+        tier1 = []
+        cages = ()
+        tier2 = []
+        if normalized_nsn:
+            tier1 = [r for r in self.tier1.get(normalized_nsn, ()) if r[0] in active]
+            cages = self.approved.get(normalized_nsn, ())
+            for cage in cages:
+                tier2.extend(self.cage_suppliers.get(cage, ()))
+        tier3 = []
+        if fsc:
+            tier3 = [sid for sid in self.fsc.get(fsc, ()) if sid in active]
+        return {"tier1": tier1, "approved_cages": cages, "tier2": tier2, "tier3": tier3}
+
+    def match_inputs(self, lines) -> dict:
+        """Same shape as matching._load_match_inputs(), resolved from memory."""
+        from sales.services.matching import _line_match_keys
+
+        inputs = {"tier1": {}, "approved_cages": {}, "tier2": {}, "tier3": {}}
+        for line in lines:
+            normalized_nsn, fsc = _line_match_keys(line)
+            if normalized_nsn in inputs["approved_cages"] and (
+                not fsc or fsc in inputs["tier3"]
+            ):
+                continue
+            res = self.resolve(normalized_nsn, fsc)
+            if normalized_nsn:
+                if res["tier1"]:
+                    inputs["tier1"][normalized_nsn] = [
+                        {"supplier_id": sid, "match_score": score}
+                        for sid, score in res["tier1"]
+                    ]
+                inputs["approved_cages"][normalized_nsn] = set(res["approved_cages"])
+                if res["tier2"]:
+                    inputs["tier2"][normalized_nsn] = res["tier2"]
+            if fsc and res["tier3"]:
+                inputs["tier3"][fsc] = res["tier3"]
+        return inputs
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def _refresh(index: MatchIndex, force: bool = False) -> None:
+    now = time.monotonic()
+    if (
+        not force
+        and index.checked_at is not None
+        and now - index.checked_at < settings.MATCH_INDEX_CHECK_SECONDS
+    ):
+        return
+    versions = _read_versions()
+    max_age = settings.MATCH_INDEX_MAX_AGE_SECONDS
+    for seg in SEGMENTS:
+        built_at = index.built_at.get(seg)
+        expired = built_at is None or now - built_at >= max_age
+        if seg not in index.built or versions[seg] != index.versions[seg] or expired:
+            started = time.perf_counter()
+            index.build_segment(seg)
+            index.versions[seg] = versions[seg]
+            index.built_at[seg] = now
+            logger.info(
+                "match_index: built %s in %.2fs", seg, time.perf_counter() - started
+            )
+    index.checked_at = now
+
+
+def get_match_index():
+    """
+    Return the process's MatchIndex, refreshed if its version check is due, or
+    None when disabled (MATCH_INDEX_ENABLED) or the build failed — callers then
+    fall back to live queries.
+    """
+    global _index
+    if not getattr(settings, "MATCH_INDEX_ENABLED", False):
+        return None
+    with _lock:
+        try:
+            if _index is None:
+                _index = MatchIndex()
+            _refresh(_index)
+            return _index
+        except Exception:
+            logger.exception("match_index: build failed — using live queries")
+            _index = None
+            return None
+
+
+def invalidate(segment: str, keys=()) -> None:
+    """
+    Record that ``segment`` changed (for ``keys`` when known). Bumps the shared
+    version so every process rebuilds it on its next check; this process
+    patches the keys in place when its copy was current. No-op when disabled.
+
+    Runs inside the caller's transaction: if that rolls back, the version row
+    reverts, no longer equals this process's copy, and the segment is rebuilt
+    on the next check.
+    """
+    from sales.models import ServiceCheckpoint
+
+    if not getattr(settings, "MATCH_INDEX_ENABLED", False):
+        return
+
+    name = VERSION_PREFIX + segment
+    new_version = timezone.now()
+    old_version = (
+        ServiceCheckpoint.objects.filter(name=name)
+        .values_list("checkpoint_at", flat=True)
+        .first()
+    )
+    ServiceCheckpoint.objects.update_or_create(
+        name=name, defaults={"checkpoint_at": new_version}
+    )
+
+    with _lock:
+        if _index is None:
+            return
+        current = segment in _index.built and _index.versions[segment] == old_version
+        if current and keys and segment in _PATCHABLE:
+            try:
+                _index.patch(segment, keys)
+                _index.versions[segment] = new_version
+                return
+            except Exception:
+                logger.exception("match_index: patch of %s failed", segment)
+        _index.checked_at = None
+
+
+def reset() -> None:
+    """Drop this process's index (next get_match_index() rebuilds everything)."""
+    global _index
+    with _lock:
+        _index = None
@@ -1,10 +1,21 @@
 """
 3-tier supplier matching engine.
 Tier 1 NSN scores are read from the dibbs_supplier_nsn_scored SQL view (SupplierNSNScored).
+
+Import-time matching is incremental: each SolicitationLine stores a fingerprint
+of its match inputs (match_fingerprint) and only lines whose fingerprint changed
+have their SupplierMatch rows diffed (inserts/deletes, not delete-all/recreate).
+Supplier capability edits call rematch_open_lines() for just the affected NSN/FSC.
 """
+import hashlib
 import logging
 from decimal import Decimal
 
+from django.db import transaction
+from django.db.models import Q
+
+from core.cache import invalidate as cache_invalidate
+from sales.services.match_counts import note_matches_deleted
 from sales.models import (
     SolicitationLine,
     SupplierMatch,
@@ -19,6 +30,14 @@ logger = logging.getLogger(__name__)
 
 # SQL Server: keep IN clause size safely under the 2100-parameter ceiling
 NSN_IN_CHUNK = 100
+# line_id IN (...) / pk IN (...) chunk for SupplierMatch diff reads and deletes
+MATCH_LINE_CHUNK = 500
+
+# Match methods written by the engine; MANUAL rows belong to RFQ workflows.
+ENGINE_MATCH_METHODS = frozenset(["DIRECT_NSN", "APPROVED_SOURCE", "FSC"])
+
+# Solicitation statuses whose lines are not re-matched on capability edits.
+CLOSED_SOLICITATION_STATUSES = frozenset(["NO_BID", "Archived", "WON", "LOST"])
 
 
 def _normalize_nsn(nsn: str) -> str:
@@ -132,191 +151,338 @@ def _deduplicate_matches(tier1: list[dict], tier2: list[dict], tier3: list[dict]
     return list(by_supplier.values())
 
 
-def run_matching_for_batch(batch_id: int) -> dict:
+def _load_match_inputs(lines) -> dict:
     """
-    Run all 3 matching tiers for every SolicitationLine in the given ImportBatch.
-    OPTIMIZED: Batch all queries upfront instead of N+1 per-line queries.
-    For a 2600-line import: ~4 queries instead of ~10,000.
+    Batch-load every tier input needed to match ``lines`` (~4 chunked queries
+    regardless of line count).
+
+    Returns {"tier1": nsn → [{supplier_id, match_score}],
+             "approved_cages": nsn → {normalized cage},
+             "tier2": nsn → [supplier_id],
+             "tier3": fsc → [supplier_id]}.
 
-    Clears existing SupplierMatch rows for those lines before re-matching
-    (safe to re-run on the same batch).
-    Returns summary: {lines_processed, matches_found, by_tier: {1: n, 2: n, 3: n}}
+    Served from the in-memory match index (no queries) when it is enabled.
     """
-    try:
-        batch = ImportBatch.objects.get(pk=batch_id)
-    except ImportBatch.DoesNotExist:
-        logger.warning(f"ImportBatch id={batch_id} not found")
-        return {
-            "lines_processed": 0,
-            "matches_found": 0,
-            "by_tier": {1: 0, 2: 0, 3: 0},
-        }
+    from sales.services.match_index import get_match_index
+    from sales.services.no_quote import normalize_cage_code
 
-    # Fetch all lines for this batch
-    lines = list(
-        SolicitationLine.objects.filter(
-            solicitation__import_batch=batch
-        ).select_related("solicitation")
-    )
-    if not lines:
-        return {
-            "lines_processed": 0,
-            "matches_found": 0,
-            "by_tier": {1: 0, 2: 0, 3: 0},
-        }
+    index = get_match_index()
+    if index is not None:
+        return index.match_inputs(lines)
+
+    nsn_keys = sorted({
+        _normalize_nsn(line.nsn)
+        for line in lines
+        if line.item_type_indicator != "2" and _normalize_nsn(line.nsn)
+    })
+    fsc_keys = sorted({
+        (line.fsc or "").strip()[:4] for line in lines if (line.fsc or "").strip()
+    })
+
+    # ── TIER 1: SupplierNSNScored for all NSNs ──────────────────────
+    tier1_matches = {}
+    for i in range(0, len(nsn_keys), NSN_IN_CHUNK):
+        chunk = nsn_keys[i : i + NSN_IN_CHUNK]
+        tier1_rows = SupplierNSNScored.objects.filter(
+            nsn__in=chunk
+        ).exclude(
+            supplier__archived=True
+        ).values("nsn", "supplier_id", "match_score")
+        for row in tier1_rows:
+            tier1_matches.setdefault(row["nsn"], []).append({
+                "supplier_id": row["supplier_id"],
+                "match_score": row["match_score"] or Decimal("0"),
+            })
+
+    # ── TIER 2: ApprovedSource CAGEs → Supplier ids ─────────────────
+    approved_cages = {}
+    for i in range(0, len(nsn_keys), NSN_IN_CHUNK):
+        chunk = nsn_keys[i : i + NSN_IN_CHUNK]
+        for nsn, cage in ApprovedSource.objects.filter(
+            nsn__in=chunk
+        ).values_list("nsn", "approved_cage").distinct():
+            cage = normalize_cage_code(cage)
+            if cage:
+                approved_cages.setdefault(nsn, set()).add(cage)
 
-    line_ids = [ln.id for ln in lines]
+    tier2_matches = {}
+    if approved_cages:
+        all_cages = sorted(set().union(*approved_cages.values()))
+        suppliers_by_cage = {}
+        for i in range(0, len(all_cages), NSN_IN_CHUNK):
+            chunk = all_cages[i : i + NSN_IN_CHUNK]
+            for sid, cage in Supplier.objects.filter(
+                cage_code__in=chunk, archived=False
+            ).values_list("id", "cage_code"):
+                suppliers_by_cage.setdefault(normalize_cage_code(cage), []).append(sid)
+        for nsn, cages in approved_cages.items():
+            supplier_ids = []
+            for cage in cages:
+                supplier_ids.extend(suppliers_by_cage.get(cage, []))
+            tier2_matches[nsn] = supplier_ids
+
+    # ── TIER 3: SupplierFSC for all FSCs ────────────────────────────
+    tier3_matches = {}
+    for i in range(0, len(fsc_keys), NSN_IN_CHUNK):
+        chunk = fsc_keys[i : i + NSN_IN_CHUNK]
+        for fsc, supplier_id in SupplierFSC.objects.filter(
+            fsc_code__in=chunk
+        ).exclude(
+            supplier__archived=True
+        ).values_list("fsc_code", "supplier_id").distinct():
+            tier3_matches.setdefault(fsc, []).append(supplier_id)
 
-    # Clear existing matches for these lines
-    SupplierMatch.objects.filter(line_id__in=line_ids).delete()
+    return {
+        "tier1": tier1_matches,
+        "approved_cages": approved_cages,
+        "tier2": tier2_matches,
+        "tier3": tier3_matches,
+    }
 
-    # ── BATCH TIER 1: Fetch all NSN matches upfront ──────────────
-    # Build set of unique NSNs (excluding part-number items)
-    nsn_to_lines = {}
-    for line in lines:
-        if line.item_type_indicator != "2":  # Skip part-number items
-            normalized = _normalize_nsn(line.nsn)
-            if normalized:
-                nsn_to_lines.setdefault(normalized, []).append(line.id)
-
-    # Chunked queries: SupplierNSNScored for all NSNs in this batch
-    tier1_matches = {}  # nsn → list of {supplier_id, match_score}
-    if nsn_to_lines:
-        nsn_keys = list(nsn_to_lines.keys())
-        for i in range(0, len(nsn_keys), NSN_IN_CHUNK):
-            chunk = nsn_keys[i : i + NSN_IN_CHUNK]
-            tier1_rows = SupplierNSNScored.objects.filter(
-                nsn__in=chunk
-            ).exclude(
-                supplier__archived=True
-            ).values("nsn", "supplier_id", "match_score")
-            for row in tier1_rows:
-                tier1_matches.setdefault(row["nsn"], []).append({
-                    "supplier_id": row["supplier_id"],
-                    "match_score": row["match_score"] or Decimal("0"),
-                })
-
-    # ── BATCH TIER 2: Fetch all ApprovedSource + Supplier matches ──
-    # Build set of unique NSNs again for approved source lookups
-    tier2_matches = {}  # nsn → list of supplier_ids
-    if nsn_to_lines:
-        approved_cages = {}
-        nsn_keys = list(nsn_to_lines.keys())
-        for i in range(0, len(nsn_keys), NSN_IN_CHUNK):
-            chunk = nsn_keys[i : i + NSN_IN_CHUNK]
-            for as_row in ApprovedSource.objects.filter(
-                nsn__in=chunk
-            ).values_list("nsn", "approved_cage").distinct():
-                nsn, cage = as_row
-                approved_cages.setdefault(nsn, set()).add(cage)
 
-        # Single query: all suppliers matching those cages
-        if approved_cages:
-            all_cages = set()
-            for cages in approved_cages.values():
-                all_cages.update(cages)
-            suppliers_by_cage = {}
-            for supplier in Supplier.objects.filter(
-                cage_code__in=all_cages, archived=False
-            ):
-                suppliers_by_cage.setdefault(supplier.cage_code, []).append(supplier.id)
-
-            # Build tier2_matches: nsn → supplier_ids
-            for nsn, cages in approved_cages.items():
-                supplier_ids = []
-                for cage in cages:
-                    supplier_ids.extend(suppliers_by_cage.get(cage, []))
-                tier2_matches[nsn] = supplier_ids
-
-    # ── BATCH TIER 3: Fetch all FSC matches upfront ────────────────
-    # Build set of unique FSCs
-    fsc_to_lines = {}
-    for line in lines:
-        fsc = (line.fsc or "").strip()[:4]
-        if fsc:
-            fsc_to_lines.setdefault(fsc, []).append(line.id)
-
-    # Single query: all SupplierFSC records for all FSCs
-    tier3_matches = {}  # fsc → list of supplier_ids
-    if fsc_to_lines:
-        fsc_keys = list(fsc_to_lines.keys())
-        for i in range(0, len(fsc_keys), NSN_IN_CHUNK):
-            chunk = fsc_keys[i : i + NSN_IN_CHUNK]
-            for row in SupplierFSC.objects.filter(
-                fsc_code__in=chunk
-            ).exclude(
-                supplier__archived=True
-            ).values_list("fsc_code", "supplier_id").distinct():
-                fsc, supplier_id = row
-                tier3_matches.setdefault(fsc, []).append(supplier_id)
-
-    # ── Now match each line using the batched data ──────────────────
-    by_tier = {1: 0, 2: 0, 3: 0}
-    total_matches = 0
-    to_create = []
+def _line_match_keys(line):
+    """(normalized NSN or "" for part-number items, 4-char FSC) for a line."""
+    is_part_number = line.item_type_indicator == "2"
+    normalized_nsn = "" if is_part_number else _normalize_nsn(line.nsn)
+    return normalized_nsn, (line.fsc or "").strip()[:4]
 
-    for line in lines:
-        is_part_number = line.item_type_indicator == "2"
-        normalized_nsn = _normalize_nsn(line.nsn)
-        fsc = (line.fsc or "").strip()[:4]
-
-        # Gather matches from our batched data (no DB queries!)
-        tier1 = []
-        if not is_part_number and normalized_nsn:
-            for match in tier1_matches.get(normalized_nsn, []):
-                tier1.append({
-                    "supplier_id": match["supplier_id"],
-                    "match_tier": 1,
-                    "match_method": "DIRECT_NSN",
-                    "match_score": match["match_score"],
-                })
-
-        tier2 = []
-        if not is_part_number and normalized_nsn:
-            for supplier_id in tier2_matches.get(normalized_nsn, []):
-                tier2.append({
-                    "supplier_id": supplier_id,
-                    "match_tier": 2,
-                    "match_method": "APPROVED_SOURCE",
-                    "match_score": Decimal("1.0"),
-                })
-
-        tier3 = []
-        if fsc:
-            for supplier_id in tier3_matches.get(fsc, []):
-                tier3.append({
-                    "supplier_id": supplier_id,
-                    "match_tier": 3,
-                    "match_method": "FSC",
-                    "match_score": Decimal("0.5"),
-                })
-
-        # Deduplicate and create SupplierMatch records
-        combined = _deduplicate_matches(tier1, tier2, tier3)
-        for m in combined:
-            by_tier[m["match_tier"]] += 1
-            to_create.append(
-                SupplierMatch(
-                    line_id=line.id,
-                    supplier_id=m["supplier_id"],
-                    match_tier=m["match_tier"],
-                    match_method=m["match_method"],
-                    match_score=m["match_score"],
-                    is_excluded=False,
-                )
-            )
-        total_matches += len(combined)
 
-    if to_create:
-        SupplierMatch.objects.bulk_create(to_create, batch_size=500)
+def _line_candidates(line, inputs: dict) -> list[dict]:
+    """Deduplicated tier 1–3 matches for one line from preloaded inputs (no DB)."""
+    normalized_nsn, fsc = _line_match_keys(line)
+
+    tier1 = []
+    tier2 = []
+    if normalized_nsn:
+        for match in inputs["tier1"].get(normalized_nsn, []):
+            tier1.append({
+                "supplier_id": match["supplier_id"],
+                "match_tier": 1,
+                "match_method": "DIRECT_NSN",
+                "match_score": match["match_score"],
+            })
+        for supplier_id in inputs["tier2"].get(normalized_nsn, []):
+            tier2.append({
+                "supplier_id": supplier_id,
+                "match_tier": 2,
+                "match_method": "APPROVED_SOURCE",
+                "match_score": Decimal("1.0"),
+            })
+
+    tier3 = []
+    if fsc:
+        for supplier_id in inputs["tier3"].get(fsc, []):
+            tier3.append({
+                "supplier_id": supplier_id,
+                "match_tier": 3,
+                "match_method": "FSC",
+                "match_score": Decimal("0.5"),
+            })
+
+    return _deduplicate_matches(tier1, tier2, tier3)
+
 
+def _line_fingerprint(line, inputs: dict) -> str:
+    """
+    SHA-256 over everything that decides a line's engine matches: normalized
+    NSN, FSC, the approved-source CAGE set, and the supplier capability
+    "versions" for those keys (tier-1 supplier/score pairs, tier-2 supplier
+    ids, tier-3 supplier ids). Any capability add/remove/re-score changes it.
+    """
+    normalized_nsn, fsc = _line_match_keys(line)
+    tier1 = sorted(
+        (m["supplier_id"], str(m["match_score"]))
+        for m in inputs["tier1"].get(normalized_nsn, [])
+    ) if normalized_nsn else []
+    cages = sorted(inputs["approved_cages"].get(normalized_nsn, ())) if normalized_nsn else []
+    tier2 = sorted(inputs["tier2"].get(normalized_nsn, [])) if normalized_nsn else []
+    tier3 = sorted(inputs["tier3"].get(fsc, [])) if fsc else []
+    payload = repr((normalized_nsn, fsc, cages, tier1, tier2, tier3))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _empty_match_summary() -> dict:
     return {
-        "lines_processed": len(lines),
-        "matches_found": total_matches,
-        "by_tier": by_tier,
+        "lines_processed": 0,
+        "lines_rematched": 0,
+        "matches_found": 0,
+        "matches_inserted": 0,
+        "matches_deleted": 0,
+        "by_tier": {1: 0, 2: 0, 3: 0},
     }
 
 
+def match_lines(lines, force: bool = False) -> dict:
+    """
+    Incrementally (re)match ``lines`` against tiers 1–3.
+
+    Each line's fingerprint (see _line_fingerprint) is compared with
+    SolicitationLine.match_fingerprint; only lines whose fingerprint changed
+    (or every line when force=True) have their engine-owned SupplierMatch rows
+    diffed. The diff inserts new (line, supplier) pairs, deletes pairs that no
+    longer match, and replaces rows whose tier/method/score changed (keeping
+    is_excluded). MANUAL rows are never touched, and a supplier with a MANUAL
+    row on a line is not given a second, engine row.
+
+    Returns summary: {lines_processed, lines_rematched, matches_found,
+    matches_inserted, matches_deleted, by_tier: {1: n, 2: n, 3: n}} where
+    matches_found / by_tier cover every processed line, changed or not.
+    """
+    summary = _empty_match_summary()
+    lines = list(lines)
+    if not lines:
+        return summary
+
+    inputs = _load_match_inputs(lines)
+
+    changed = {}  # line_id → (line, fingerprint, candidates)
+    for line in lines:
+        candidates = _line_candidates(line, inputs)
+        for m in candidates:
+            summary["by_tier"][m["match_tier"]] += 1
+        summary["matches_found"] += len(candidates)
+
+        fingerprint = _line_fingerprint(line, inputs)
+        if force or fingerprint != line.match_fingerprint:
+            changed[line.id] = (line, fingerprint, candidates)
+
+    summary["lines_processed"] = len(lines)
+    summary["lines_rematched"] = len(changed)
+    if not changed:
+        return summary
+
+    changed_ids = list(changed)
+    existing = {}  # line_id → {supplier_id: SupplierMatch}
+    for i in range(0, len(changed_ids), MATCH_LINE_CHUNK):
+        for sm in SupplierMatch.objects.filter(
+            line_id__in=changed_ids[i : i + MATCH_LINE_CHUNK]
+        ):
+            existing.setdefault(sm.line_id, {})[sm.supplier_id] = sm
+
+    to_delete = []
+    to_create = []
+    removed = False  # a pair deleted with no replacement row
+    for line_id, (line, _fp, candidates) in changed.items():
+        wanted = {m["supplier_id"]: m for m in candidates}
+        current = existing.get(line_id, {})
+        for supplier_id, sm in current.items():
+            if sm.match_method not in ENGINE_MATCH_METHODS:
+                continue
+            m = wanted.get(supplier_id)
+            if m is None:
+                to_delete.append(sm.pk)
+                removed = True
+            elif (
+                sm.match_tier != m["match_tier"]
+                or sm.match_method != m["match_method"]
+                or sm.match_score != m["match_score"]
+            ):
+                to_delete.append(sm.pk)
+                to_create.append(_supplier_match(line_id, m, sm.is_excluded))
+        for supplier_id, m in wanted.items():
+            if supplier_id not in current:
+                to_create.append(_supplier_match(line_id, m, False))
+
+    for line_id, (line, fingerprint, _c) in changed.items():
+        line.match_fingerprint = fingerprint
+
+    with transaction.atomic():
+        for i in range(0, len(to_delete), MATCH_LINE_CHUNK):
+            SupplierMatch.objects.filter(
+                pk__in=to_delete[i : i + MATCH_LINE_CHUNK]
+            ).delete()
+        if removed:
+            # No new SupplierMatch row marks these solicitations for the
+            # incremental match_count refresh; make it run in full instead.
+            note_matches_deleted()
+        if to_create:
+            SupplierMatch.objects.bulk_create(to_create, batch_size=500)
+        changed_lines = [entry[0] for entry in changed.values()]
+        for i in range(0, len(changed_lines), MATCH_LINE_CHUNK):
+            SolicitationLine.objects.bulk_update(
+                changed_lines[i : i + MATCH_LINE_CHUNK], ["match_fingerprint"]
+            )
+
+    if to_create or to_delete:
+        # match_count feeds the workbench list order and filters.
+        cache_invalidate("sales.workbench_nav")
+
+    summary["matches_inserted"] = len(to_create)
+    summary["matches_deleted"] = len(to_delete)
+    return summary
+
+
+def _supplier_match(line_id: int, m: dict, is_excluded: bool) -> SupplierMatch:
+    return SupplierMatch(
+        line_id=line_id,
+        supplier_id=m["supplier_id"],
+        match_tier=m["match_tier"],
+        match_method=m["match_method"],
+        match_score=m["match_score"],
+        is_excluded=is_excluded,
+    )
+
+
+def run_matching_for_batch(batch_id: int, force: bool = False) -> dict:
+    """
+    Run all 3 matching tiers for every SolicitationLine in the given ImportBatch.
+
+    Incremental: only lines whose match fingerprint changed are diffed and
+    written (see match_lines); force=True re-diffs every line. Safe to re-run
+    on the same batch — an unchanged batch costs the input queries and no writes.
+
+    Returns summary: {lines_processed, lines_rematched, matches_found,
+    matches_inserted, matches_deleted, by_tier: {1: n, 2: n, 3: n}}
+    """
+    try:
+        batch = ImportBatch.objects.get(pk=batch_id)
+    except ImportBatch.DoesNotExist:
+        logger.warning(f"ImportBatch id={batch_id} not found")
+        return _empty_match_summary()
+
+    lines = SolicitationLine.objects.filter(solicitation__import_batch=batch)
+    return match_lines(lines, force=force)
+
+
+def rematch_open_lines(nsns=(), fscs=()) -> dict:
+    """
+    Targeted re-match after a supplier capability edit (SupplierNSN / SupplierFSC
+    add or remove): re-runs match_lines over open-solicitation lines whose NSN
+    or FSC is affected, instead of a full batch rerun. Unchanged lines are
+    skipped by their fingerprint.
+    """
+    from sales.services.parser import _format_nsn
+
+    nsn_values = set()
+    for nsn in nsns:
+        normalized = _normalize_nsn(nsn)
+        if normalized:
+            nsn_values.update({normalized, _format_nsn(normalized)})
+    fsc_values = {f.strip().upper()[:4] for f in fscs if f and f.strip()}
+    if not nsn_values and not fsc_values:
+        return _empty_match_summary()
+
+    q = Q()
+    if nsn_values:
+        q |= Q(nsn__in=sorted(nsn_values))
+    if fsc_values:
+        q |= Q(fsc__in=sorted(fsc_values))
+    lines = SolicitationLine.objects.filter(q).exclude(
+        solicitation__status__in=CLOSED_SOLICITATION_STATUSES
+    )
+    summary = match_lines(lines)
+    logger.info(
+        "rematch_open_lines: nsns=%d fscs=%d lines=%d rematched=%d +%d/-%d",
+        len(nsn_values),
+        len(fsc_values),
+        summary["lines_processed"],
+        summary["lines_rematched"],
+        summary["matches_inserted"],
+        summary["matches_deleted"],
+    )
+    return summary
+
+
 def get_live_workbench_matches(line):
     """
     Returns live-queried supplier matches for a single SolicitationLine,
@@ -334,6 +500,7 @@ def get_live_workbench_matches(line):
     tier1 is ordered by match_score DESC.
     tier2 and tier3 are ordered by supplier name ASC.
     """
+    from sales.services.match_index import get_match_index
     from sales.services.no_quote import normalize_cage_code
 
     if not line:
@@ -342,6 +509,12 @@ def get_live_workbench_matches(line):
     is_part_number = getattr(line, "item_type_indicator", None) == "2"
     normalized_nsn = "" if is_part_number else _normalize_nsn(line.nsn)
 
+    index = get_match_index()
+    if index is not None:
+        return _workbench_matches_from_index(
+            index, normalized_nsn, (line.fsc or "").strip()
+        )
+
     tier1_list = []
     tier1_ids = set()
     if normalized_nsn:
@@ -405,3 +578,33 @@ def get_live_workbench_matches(line):
         "tier2": tier2_list,
         "tier3": tier3_list,
     }
+
+
+def _workbench_matches_from_index(index, normalized_nsn: str, fsc: str) -> dict:
+    """
+    get_live_workbench_matches() result built from the in-memory match index:
+    tier ids resolved without queries, then one Supplier query to hydrate them.
+    Tier 1 rows are unsaved SupplierNSNScored instances (.supplier, .match_score).
+    """
+    res = index.resolve(normalized_nsn, fsc)
+    all_ids = {sid for sid, _ in res["tier1"]} | set(res["tier2"]) | set(res["tier3"])
+    suppliers = Supplier.objects.in_bulk(list(all_ids)) if all_ids else {}
+
+    tier1_list = [
+        SupplierNSNScored(nsn=normalized_nsn, supplier=suppliers[sid], match_score=score)
+        for sid, score in res["tier1"]
+        if sid in suppliers
+    ]
+    tier1_ids = {row.supplier_id for row in tier1_list}
+
+    def by_name(ids, skip):
+        found = {sid: suppliers[sid] for sid in ids if sid in suppliers and sid not in skip}
+        return sorted(found.values(), key=lambda s: (s.name or "").lower())
+
+    tier2_list = by_name(res["tier2"], tier1_ids)
+    tier3_list = by_name(res["tier3"], tier1_ids | {s.id for s in tier2_list})
+    return {
+        "tier1": tier1_list,
+        "tier2": tier2_list,
+        "tier3": tier3_list,
+    }
@@ -18,15 +18,19 @@ Usage:
     with open('bq260308.txt') as f:
         batch_quotes = parse_bq_file(f)
 
-Each function returns a list of dicts ready to be passed to the import service.
-No database writes happen here — parsing is kept separate from persistence.
+Each function returns a list of dataclass records ready to be passed to the
+import service. The iter_*_file() generators yield the same records one at a
+time, and BatchQuoteIndex keeps only (solicitation, NSN) → file offset for the
+BQ file, so the streaming importer's memory scales with its window size rather
+than file size. No database writes happen here — parsing is kept separate from
+persistence.
 """
 
 import csv
 import logging
 from dataclasses import dataclass, field
 from datetime import date, datetime
-from typing import Optional
+from typing import Iterator, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -72,10 +76,10 @@ UNRESTRICTED_CODES = {'N'}
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# DATA CLASSES  (plain dicts also work; these aid IDE type checking)
+# DATA CLASSES  (slots: no per-instance __dict__ — thousands are created per import)
 # ─────────────────────────────────────────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class ParsedSolicitation:
     """One row from the IN file = one solicitation line."""
     solicitation_number:  str
@@ -100,7 +104,7 @@ class ParsedSolicitation:
     parse_errors:         list = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedApprovedSource:
     """One row from the AS file."""
     nsn_raw:     str    # raw 13-digit, no hyphens
@@ -109,7 +113,7 @@ class ParsedApprovedSource:
     company_name: str   # usually blank in DIBBS AS file
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedBatchQuote:
     """One row from the BQ file — DIBBS pre-filled fields only.
     Vendor-fill columns are left blank and populated later by the bid builder.
@@ -237,7 +241,12 @@ def parse_in_file(file_obj) -> list[ParsedSolicitation]:
         - Multiple lines may share a PDF filename (multi-line solicitations)
           but each line is a distinct solicitation record
     """
-    results = []
+    return list(iter_in_file(file_obj))
+
+
+def iter_in_file(file_obj) -> Iterator[ParsedSolicitation]:
+    """Generator form of parse_in_file() — yields one ParsedSolicitation per line."""
+    count = 0
     line_num = 0
 
     for raw_line in file_obj:
@@ -313,10 +322,10 @@ def parse_in_file(file_obj) -> list[ParsedSolicitation]:
             sb_percentage        = sb_percentage,
             parse_errors         = errors,
         )
-        results.append(sol)
+        count += 1
+        yield sol
 
-    logger.info(f"IN file: parsed {len(results)} solicitation lines from {line_num} raw lines")
-    return results
+    logger.info(f"IN file: parsed {count} solicitation lines from {line_num} raw lines")
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -347,7 +356,12 @@ def parse_as_file(file_obj) -> list[ParsedApprovedSource]:
         List of ParsedApprovedSource dataclasses.
         Rows with missing NSN or CAGE are skipped with a warning logged.
     """
-    results = []
+    return list(iter_as_file(file_obj))
+
+
+def iter_as_file(file_obj) -> Iterator[ParsedApprovedSource]:
+    """Generator form of parse_as_file()."""
+    count = 0
     reader = csv.reader(file_obj)
     row_num = 0
 
@@ -376,15 +390,15 @@ def parse_as_file(file_obj) -> list[ParsedApprovedSource]:
             logger.warning(f"AS row {row_num}: missing CAGE for NSN {nsn_raw}, skipping")
             continue
 
-        results.append(ParsedApprovedSource(
+        count += 1
+        yield ParsedApprovedSource(
             nsn_raw      = nsn_raw,
             cage_code    = cage_code,
             part_number  = part_number,
             company_name = company_name,
-        ))
+        )
 
-    logger.info(f"AS file: parsed {len(results)} approved source rows from {row_num} raw rows")
-    return results
+    logger.info(f"AS file: parsed {count} approved source rows from {row_num} raw rows")
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -445,75 +459,149 @@ def parse_bq_file(file_obj) -> list[ParsedBatchQuote]:
         - raw_columns is the full list — the export service writes these back
           to file, only replacing the vendor-fill columns
     """
-    results = []
-    reader = csv.reader(file_obj)
+    return list(iter_bq_file(file_obj))
+
+
+def iter_bq_file(file_obj) -> Iterator[ParsedBatchQuote]:
+    """Generator form of parse_bq_file()."""
+    count = 0
     row_num = 0
 
-    for row in reader:
+    for row in csv.reader(file_obj):
         row_num += 1
+        bq = _parse_bq_row(row, row_num)
+        if bq is not None:
+            count += 1
+            yield bq
+
+    logger.info(f"BQ file: parsed {count} batch quote rows from {row_num} raw rows")
 
-        # Skip blank rows
-        if not row or not any(cell.strip() for cell in row):
-            continue
 
-        if len(row) < 121:
+def _parse_bq_row(row: list, row_num: int, warn: bool = True) -> Optional[ParsedBatchQuote]:
+    """One BQ CSV row → ParsedBatchQuote, or None for blank / sol-less rows."""
+    # Skip blank rows
+    if not row or not any(cell.strip() for cell in row):
+        return None
+
+    if len(row) < 121:
+        if warn:
             logger.warning(
                 f"BQ row {row_num}: only {len(row)} columns (expected 121). "
                 f"Sol: {row[0] if row else '?'}. Padding with empty strings."
             )
-            row = row + [''] * (121 - len(row))
-
-        errors = []
+        row = row + [''] * (121 - len(row))
+
+    errors = []
+
+    solicitation_number   = row[0].strip()
+    solicitation_type     = row[1].strip()
+    return_by_raw         = row[4].strip()
+    default_bid_type      = row[23].strip()
+    line_number           = row[24].strip()
+    default_delivery_raw  = row[26].strip()
+    clin_sequence         = row[43].strip()
+    purchase_request      = row[45].strip()
+    nsn_raw               = row[46].strip()
+    unit_of_issue         = row[47].strip()
+    quantity_raw          = row[48].strip()
+    req_delivery_raw      = row[50].strip()
+    fob_point             = row[104].strip()
+
+    if not solicitation_number:
+        if warn:
+            logger.warning(f"BQ row {row_num}: missing solicitation number, skipping")
+        return None
 
-        solicitation_number   = row[0].strip()
-        solicitation_type     = row[1].strip()
-        return_by_raw         = row[4].strip()
-        default_bid_type      = row[23].strip()
-        line_number           = row[24].strip()
-        default_delivery_raw  = row[26].strip()
-        clin_sequence         = row[43].strip()
-        purchase_request      = row[45].strip()
-        nsn_raw               = row[46].strip()
-        unit_of_issue         = row[47].strip()
-        quantity_raw          = row[48].strip()
-        req_delivery_raw      = row[50].strip()
-        fob_point             = row[104].strip()
+    return_by_date        = _parse_bq_date(return_by_raw)
+    nsn_formatted         = _format_nsn(nsn_raw)
+    quantity              = _safe_int(quantity_raw, default=0)
+    default_delivery_days = _safe_int(default_delivery_raw) if default_delivery_raw else None
+    required_delivery_days = _safe_int(req_delivery_raw) if req_delivery_raw else None
+
+    if return_by_date is None and return_by_raw:
+        errors.append(f"Could not parse return_by date: {repr(return_by_raw)}")
+
+    return ParsedBatchQuote(
+        solicitation_number    = solicitation_number,
+        solicitation_type      = solicitation_type,
+        return_by_date         = return_by_date,
+        return_by_raw          = return_by_raw,
+        default_bid_type       = default_bid_type,
+        line_number            = line_number,
+        default_delivery_days  = default_delivery_days,
+        nsn_raw                = nsn_raw,
+        nsn_formatted          = nsn_formatted,
+        unit_of_issue          = unit_of_issue,
+        quantity               = quantity,
+        required_delivery_days = required_delivery_days,
+        purchase_request       = purchase_request,
+        clin_sequence          = clin_sequence,
+        fob_point              = fob_point,
+        raw_columns            = row,
+        parse_errors           = errors,
+    )
+
+
+class BatchQuoteIndex:
+    """
+    Keyed index over a BQ file for streaming imports.
 
-        if not solicitation_number:
-            logger.warning(f"BQ row {row_num}: missing solicitation number, skipping")
-            continue
+    One scan records, per (solicitation_number, hyphen-stripped NSN), the byte
+    (or text-cookie) offset of its row — last row wins, like the dict the list
+    importer builds — plus the first solicitation_type per solicitation and the
+    summary counts. get() seeks back and re-parses a single row on demand, so
+    the 121-column raw lists are never all in memory at once.
 
-        return_by_date        = _parse_bq_date(return_by_raw)
-        nsn_formatted         = _format_nsn(nsn_raw)
-        quantity              = _safe_int(quantity_raw, default=0)
-        default_delivery_days = _safe_int(default_delivery_raw) if default_delivery_raw else None
-        required_delivery_days = _safe_int(req_delivery_raw) if req_delivery_raw else None
+    file_obj must be seekable; binary handles are decoded as UTF-8 (replace).
+    """
 
-        if return_by_date is None and return_by_raw:
-            errors.append(f"Could not parse return_by date: {repr(return_by_raw)}")
+    __slots__ = ("_f", "_binary", "offsets", "solicitation_types", "row_count", "error_sols")
+
+    def __init__(self, file_obj):
+        self._f = file_obj
+        self._f.seek(0)
+        self._binary = isinstance(self._f.read(0), bytes)
+        self.offsets = {}
+        self.solicitation_types = {}
+        self.row_count = 0
+        self.error_sols = []
+        self._scan()
+
+    def _read_row(self):
+        raw = self._f.readline()
+        if not raw:
+            return None
+        if self._binary:
+            raw = raw.decode("utf-8", errors="replace")
+        return next(csv.reader([raw]), [])
+
+    def _scan(self) -> None:
+        row_num = 0
+        while True:
+            offset = self._f.tell()
+            row = self._read_row()
+            if row is None:
+                break
+            row_num += 1
+            bq = _parse_bq_row(row, row_num)
+            if bq is None:
+                continue
+            self.row_count += 1
+            if bq.parse_errors:
+                self.error_sols.append(bq.solicitation_number)
+            self.solicitation_types.setdefault(
+                bq.solicitation_number, bq.solicitation_type or ""
+            )
+            key = (bq.solicitation_number, bq.nsn_raw.replace("-", "").strip())
+            self.offsets[key] = offset
+        logger.info(f"BQ file: indexed {self.row_count} batch quote rows from {row_num} raw rows")
 
-        results.append(ParsedBatchQuote(
-            solicitation_number    = solicitation_number,
-            solicitation_type      = solicitation_type,
-            return_by_date         = return_by_date,
-            return_by_raw          = return_by_raw,
-            default_bid_type       = default_bid_type,
-            line_number            = line_number,
-            default_delivery_days  = default_delivery_days,
-            nsn_raw                = nsn_raw,
-            nsn_formatted          = nsn_formatted,
-            unit_of_issue          = unit_of_issue,
-            quantity               = quantity,
-            required_delivery_days = required_delivery_days,
-            purchase_request       = purchase_request,
-            clin_sequence          = clin_sequence,
-            fob_point              = fob_point,
-            raw_columns            = row,
-            parse_errors           = errors,
-        ))
-
-    logger.info(f"BQ file: parsed {len(results)} batch quote rows from {row_num} raw rows")
-    return results
+    def get(self, solicitation_number: str, nsn_raw: str) -> Optional[ParsedBatchQuote]:
+        offset = self.offsets.get((solicitation_number, nsn_raw.replace("-", "").strip()))
+        if offset is None:
+            return None
+        self._f.seek(offset)
+        return _parse_bq_row(self._read_row() or [], 0, warn=False)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -535,7 +623,8 @@ def parse_import_batch(in_file, bq_file, as_file) -> dict:
             'approved_sources': list[ParsedApprovedSource],
             'batch_quotes':     list[ParsedBatchQuote],
             'summary': {
-                'solicitation_count':    int,
+                'solicitation_count':    int,   # IN lines
+                'distinct_solicitation_count': int,
                 'approved_source_count': int,
                 'batch_quote_count':     int,
                 'parse_error_count':     int,
@@ -563,15 +652,48 @@ def parse_import_batch(in_file, bq_file, as_file) -> dict:
         'approved_sources': approved_sources,
         'batch_quotes':     batch_quotes,
         'summary': {
-            'solicitation_count':        len(solicitations),
-            'approved_source_count':     len(approved_sources),
-            'batch_quote_count':         len(batch_quotes),
-            'parse_error_count':         len(error_sols),
-            'solicitations_with_errors': error_sols,
+            'solicitation_count':          len(solicitations),
+            'distinct_solicitation_count': len({s.solicitation_number for s in solicitations}),
+            'approved_source_count':       len(approved_sources),
+            'batch_quote_count':           len(batch_quotes),
+            'parse_error_count':           len(error_sols),
+            'solicitations_with_errors':   error_sols,
         },
     }
 
 
+def summarize_import_batch(in_file, bq_file, as_file) -> dict:
+    """
+    Streaming equivalent of parse_import_batch()['summary'] — same keys, but
+    records are counted and discarded rather than collected.
+    """
+    in_count = 0
+    sol_numbers = set()
+    error_sols = []
+    for s in iter_in_file(in_file):
+        in_count += 1
+        sol_numbers.add(s.solicitation_number)
+        if s.parse_errors:
+            error_sols.append(s.solicitation_number)
+
+    bq_count = 0
+    for b in iter_bq_file(bq_file):
+        bq_count += 1
+        if b.parse_errors:
+            error_sols.append(b.solicitation_number)
+
+    as_count = sum(1 for _ in iter_as_file(as_file))
+
+    return {
+        'solicitation_count':          in_count,
+        'distinct_solicitation_count': len(sol_numbers),
+        'approved_source_count':       as_count,
+        'batch_quote_count':           bq_count,
+        'parse_error_count':           len(error_sols),
+        'solicitations_with_errors':   error_sols,
+    }
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # TRIAGE BUCKET ASSIGNMENT
 # ─────────────────────────────────────────────────────────────────────────────
@@ -0,0 +1,253 @@
+"""
+Streaming, resumable PDF parse backlog (Loop C of auto_import_dibbs /
+fetch_pending_pdfs).
+
+Solicitations with a stored PDF and no pdf_data_pulled are walked in primary
+key order: each batch reads only (pk, solicitation_number, pdf_blob_key), and
+PDF bytes are loaded one row at a time (blob store, or a single-row SELECT of
+the legacy pdf_blob column), so memory stays at one PDF regardless of how
+large the backlog grew after a missed night.
+
+Resuming is natural — processed rows get pdf_data_pulled and drop out of the
+filter — and a single-worker run also keeps its position in ServiceCheckpoint
+(CHECKPOINT_NAME) so rows that cannot be parsed are not retried first after a
+restart. A resumed pass wraps around once to the ids below its starting
+point, and the cursor resets once a pass is complete. A run stops starting
+new PDFs once its time budget is spent.
+
+With workers > 1 the backlog ids are split into that many contiguous,
+disjoint pk ranges, each parsed by its own process. Separate hosts or WebJobs
+can do the same with `parse_pdf_backlog --id-range LO:HI`.
+
+Tunables (settings, overridable by the environment variable of the same name):
+  PDF_BACKLOG_BATCH_SIZE           ids read per query (default 50)
+  PDF_BACKLOG_TIME_BUDGET_SECONDS  stop starting new PDFs after this; 0 = none (default 0)
+  PDF_BACKLOG_WORKERS              parallel processes (default 1)
+"""
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = "parse_pdf_data_backlog"
+
+
+def _backlog_qs():
+    from sales.models import Solicitation
+    from sales.services.blob_store import has_pdf_q
+
+    return Solicitation.objects.filter(has_pdf_q(), pdf_data_pulled__isnull=True)
+
+
+def _load_pdf(pk: int, blob_key, store) -> tuple[bytes | None, str | None]:
+    """(bytes, their SHA-256 when they came from the blob store, else None)."""
+    from sales.models import Solicitation
+    from sales.services.blob_store import load_pdf_bytes
+
+    if blob_key:
+        body = load_pdf_bytes(blob_key, store=store)
+        if body:
+            return body, blob_key
+    legacy = Solicitation.objects.filter(pk=pk).values_list("pdf_blob", flat=True).first()
+    return load_pdf_bytes(None, legacy), None
+
+
+def _analyze_if_enabled(sol_number: str, pdf_bytes: bytes, text_key: str | None = None) -> None:
+    """Loop C LLM analysis hook — enabled via SOL_ANALYSIS_ENABLED=True env var."""
+    if os.environ.get("SOL_ANALYSIS_ENABLED", "False").lower() != "true":
+        return
+    from sales.models import Solicitation
+
+    try:
+        from sales.models.sol_analysis import SolAnalysis
+
+        sol = Solicitation.objects.get(solicitation_number=sol_number)
+        if not SolAnalysis.objects.filter(solicitation=sol).exists():
+            from sales.services.sol_analysis import (
+                analyze_solicitation_pdf,
+                save_analysis_result,
+            )
+
+            result = analyze_solicitation_pdf(
+                pdf_bytes, sol.solicitation_number, "haiku45", text_key=text_key
+            )
+            save_analysis_result(sol, result, "haiku45")
+    except Exception as e:
+        logger.error("Loop C SolAnalysis failed for %s: %s", sol_number, e)
+
+
+def parse_backlog_range(
+    id_range: tuple[int, int] | None = None,
+    batch_size: int | None = None,
+    time_budget_seconds: float | None = None,
+    log=None,
+) -> dict:
+    """
+    Parse backlog rows (optionally only pk in [lo, hi]) one PDF at a time.
+
+    Returns {"parsed", "skipped" (no readable bytes), "batches", "cursor",
+             "complete", "seconds"}.
+    """
+    from sales.models import ServiceCheckpoint
+    from sales.services.blob_store import get_blob_store
+    from sales.services.dibbs_pdf import persist_pdf_procurement_extract
+
+    if batch_size is None:
+        batch_size = settings.PDF_BACKLOG_BATCH_SIZE
+    batch_size = max(int(batch_size), 1)
+    if time_budget_seconds is None:
+        time_budget_seconds = settings.PDF_BACKLOG_TIME_BUDGET_SECONDS
+
+    checkpoint = None
+    upper = None
+    if id_range is None:
+        checkpoint, _ = ServiceCheckpoint.objects.get_or_create(name=CHECKPOINT_NAME)
+        try:
+            cursor = int(checkpoint.cursor or 0)
+        except ValueError:
+            cursor = 0
+    else:
+        cursor, upper = id_range[0] - 1, id_range[1]
+    # A resumed pass wraps around once to cover ids below where it resumed.
+    wrap_at = cursor if checkpoint is not None and cursor > 0 else None
+
+    store = get_blob_store()
+    started = time.monotonic()
+    parsed = skipped = batches = 0
+    complete = False
+    out_of_time = False
+
+    while not out_of_time:
+        qs = _backlog_qs().filter(pk__gt=cursor)
+        if upper is not None:
+            qs = qs.filter(pk__lte=upper)
+        rows = list(
+            qs.order_by("pk").values_list("pk", "solicitation_number", "pdf_blob_key")[:batch_size]
+        )
+        if not rows:
+            if wrap_at is not None:
+                cursor, upper, wrap_at = 0, wrap_at, None
+                continue
+            complete = True
+            break
+        batches += 1
+        for pk, sol_number, blob_key in rows:
+            body, text_key = _load_pdf(pk, blob_key, store)
+            cursor = pk
+            if not body:
+                skipped += 1
+                continue
+            key = (sol_number or "").strip().upper()
+            persist_pdf_procurement_extract(key, body, blob_key=text_key)
+            _analyze_if_enabled(key, body, text_key)
+            del body
+            parsed += 1
+            if log:
+                log(f"  parse backlog: {key}")
+            if time_budget_seconds and time.monotonic() - started >= time_budget_seconds:
+                out_of_time = True
+                break
+        if checkpoint is not None:
+            ServiceCheckpoint.objects.filter(pk=checkpoint.pk).update(
+                cursor=str(cursor), updated_at=timezone.now()
+            )
+
+    if checkpoint is not None:
+        update = {"cursor": "0" if complete else str(cursor), "updated_at": timezone.now()}
+        if complete:
+            update["checkpoint_at"] = timezone.now()
+        ServiceCheckpoint.objects.filter(pk=checkpoint.pk).update(**update)
+
+    return {
+        "parsed": parsed,
+        "skipped": skipped,
+        "batches": batches,
+        "cursor": 0 if complete and checkpoint is not None else cursor,
+        "complete": complete,
+        "seconds": round(time.monotonic() - started, 3),
+    }
+
+
+def split_id_ranges(workers: int) -> list[tuple[int, int]]:
+    """
+    Split the current backlog into ``workers`` contiguous pk ranges holding
+    roughly equal row counts. Reads ids only.
+    """
+    ids = list(_backlog_qs().order_by("pk").values_list("pk", flat=True))
+    if not ids:
+        return []
+    workers = max(1, min(int(workers), len(ids)))
+    bounds = [len(ids) * k // workers for k in range(workers + 1)]
+    return [(ids[bounds[k]], ids[bounds[k + 1] - 1]) for k in range(workers)]
+
+
+def _range_worker(id_range, batch_size, time_budget_seconds) -> dict:
+    """Process-pool entry point: one worker per disjoint pk range."""
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+    from django.db import connections
+
+    try:
+        return parse_backlog_range(id_range, batch_size, time_budget_seconds)
+    finally:
+        connections.close_all()
+
+
+def run_pdf_backlog(
+    workers: int | None = None,
+    batch_size: int | None = None,
+    time_budget_seconds: float | None = None,
+    id_range: tuple[int, int] | None = None,
+    log=None,
+) -> dict:
+    """
+    Parse the backlog serially, over one explicit pk range, or with N worker
+    processes over disjoint ranges. Returns totals plus "workers" and, for
+    parallel runs, per-range results under "ranges".
+    """
+    if workers is None:
+        workers = settings.PDF_BACKLOG_WORKERS
+    workers = max(int(workers), 1)
+
+    from sales.services.pdf_text import stats as pdf_text_stats
+
+    if workers == 1 or id_range is not None:
+        result = parse_backlog_range(id_range, batch_size, time_budget_seconds, log=log)
+        result["workers"] = 1
+    else:
+        from django.db import connections
+
+        ranges = split_id_ranges(workers)
+        # Children open their own connections; never share the parent's.
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=len(ranges) or 1) as pool:
+            futures = [
+                pool.submit(_range_worker, r, batch_size, time_budget_seconds) for r in ranges
+            ]
+            parts = [f.result() for f in futures]
+        result = {
+            "parsed": sum(p["parsed"] for p in parts),
+            "skipped": sum(p["skipped"] for p in parts),
+            "batches": sum(p["batches"] for p in parts),
+            "complete": all(p["complete"] for p in parts),
+            "seconds": max((p["seconds"] for p in parts), default=0.0),
+            "workers": len(ranges),
+            "ranges": [{"range": list(r), **p} for r, p in zip(ranges, parts)],
+        }
+        if log:
+            log(f"  parse backlog: {result['parsed']} PDF(s) across {len(ranges)} worker(s)")
+
+    if result["parsed"]:
+        logger.info(
+            "parse_pdf_data_backlog: parsed=%d skipped=%d complete=%s; text cache %s",
+            result["parsed"], result["skipped"], result["complete"], pdf_text_stats(),
+        )
+    return result
@@ -0,0 +1,348 @@
+"""
+Concurrent DIBBS solicitation PDF harvester.
+
+fetch_pdfs_for_sols used to open one Playwright page per solicitation, one
+after another, so a harvest of a few hundred PDFs was bounded by per-page
+browser latency. harvest_pdfs() instead:
+
+1. Bootstraps dibbs2 consent once via requests (``_make_dibbs2_session``) and
+   downloads the PDF URLs directly on that pooled session from a thread pool
+   (PDF_HARVEST_CONCURRENCY requests in flight). A response counts only when
+   its body starts with ``%PDF``.
+2. Paces request starts through an AdaptiveLimiter shared by all workers:
+   429 / 503 / connection resets double the spacing between requests (and
+   honour Retry-After), each success shrinks it back toward the floor — so a
+   run settles just under whatever rate F5 tolerates that night.
+3. Hands solicitations whose response was not a PDF (an F5 challenge or the
+   consent page) to the original Playwright path, which reuses the same
+   cookies in one browser context. 404s are not retried in the browser.
+
+Every run returns metrics (fetched, bytes, retries, throttles, fallbacks,
+pdfs_per_second, ...) alongside the results, and logs them.
+
+Tunables (settings, overridable by the environment variable of the same name):
+  PDF_HARVEST_CONCURRENCY       requests in flight (default 4)
+  PDF_HARVEST_MIN_INTERVAL      floor between request starts, seconds (default 0.2)
+  PDF_HARVEST_MAX_INTERVAL      backoff ceiling, seconds (default 30)
+  PDF_HARVEST_MAX_RETRIES       retries per PDF after a throttle or reset (default 3)
+  PDF_HARVEST_FAST_PATH         False sends every PDF through Playwright (default True)
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# First backoff step when the floor is 0 (doubling 0 would never slow down).
+BACKOFF_START_SECONDS = 0.5
+# Never park a run longer than this on a single Retry-After.
+RETRY_AFTER_CAP_SECONDS = 300.0
+
+THROTTLE_STATUSES = {429, 503}
+# Connection-level failures treated like a throttle (back off, then retry).
+_TRANSIENT_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+def _retry_after_seconds(value) -> Optional[float]:
+    """Retry-After as seconds (delta-seconds or HTTP-date); None when absent/invalid."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        seconds = when.timestamp() - time.time()
+    return min(max(seconds, 0.0), RETRY_AFTER_CAP_SECONDS)
+
+
+class AdaptiveLimiter:
+    """
+    Shared pacing for harvest workers: request starts are spaced at least
+    ``interval`` apart. throttled() doubles the interval (up to max_interval)
+    and pauses everyone for Retry-After when given; succeeded() decays it by
+    10% toward min_interval.
+    """
+
+    def __init__(self, min_interval: float, max_interval: float):
+        self.min_interval = max(float(min_interval), 0.0)
+        self.max_interval = max(float(max_interval), self.min_interval)
+        self.interval = self.min_interval
+        self.throttles = 0
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_at)
+            self._next_at = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+    def throttled(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            self.throttles += 1
+            self.interval = min(
+                max(self.interval * 2, BACKOFF_START_SECONDS), self.max_interval
+            )
+            pause = self.interval if retry_after is None else retry_after
+            self._next_at = max(self._next_at, time.monotonic() + pause)
+
+    def succeeded(self) -> None:
+        with self._lock:
+            self.interval = max(self.interval * 0.9, self.min_interval)
+
+
+class _Throttled(Exception):
+    def __init__(self, retry_after=None):
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+
+class _Unfetchable(Exception):
+    """A request error that retrying will not fix."""
+
+
+def _pooled_session(session: requests.Session, concurrency: int) -> requests.Session:
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(concurrency, 1))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _playwright_cookies(session) -> list[dict]:
+    """Playwright cookie dicts: the PlaywrightSession list itself, else from the jar."""
+    if isinstance(session, list) and session:
+        return list(session)
+    return [
+        {
+            "name": c.name,
+            "value": c.value,
+            "domain": c.domain or ".dibbs2.bsm.dla.mil",
+            "path": c.path or "/",
+            "secure": c.secure,
+        }
+        for c in getattr(session, "cookies", [])
+    ]
+
+
+def _browser_fetch(sol_numbers: list[str], cookies: list[dict], base_url: str) -> dict:
+    """Sequential Playwright downloads in one context (the original fetch path)."""
+    from sales.services.dibbs_pdf import _BROWSER_UA, _pdf_url, _read_pdf_download
+
+    result: dict[str, Optional[bytes]] = {sol: None for sol in sol_numbers}
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        logger.exception("Playwright not installed")
+        return result
+
+    try:
+        with sync_playwright() as pw:
+            browser = pw.chromium.launch(
+                headless=True,
+                args=[
+                    "--no-sandbox",
+                    "--disable-dev-shm-usage",
+                    "--disable-blink-features=AutomationControlled",
+                    "--disable-infobars",
+                    "--window-size=1920,1080",
+                ],
+            )
+            context = browser.new_context(
+                accept_downloads=True,
+                user_agent=_BROWSER_UA,
+                viewport={"width": 1920, "height": 1080},
+                locale="en-US",
+            )
+
+            # Inject requests-obtained cookies — Playwright looks pre-authenticated
+            if cookies:
+                context.add_cookies(cookies)
+                logger.info("Injected %d dibbs2 cookie(s) into Playwright context", len(cookies))
+
+            for sol_number in sol_numbers:
+                page = context.new_page()
+                try:
+                    result[sol_number] = _read_pdf_download(
+                        page, _pdf_url(sol_number, base_url), sol_number
+                    )
+                except Exception as e:
+                    logger.exception("pdf_harvest: browser fetch %s failed: %s", sol_number, e)
+                finally:
+                    try:
+                        page.close()
+                    except Exception:
+                        pass
+
+            browser.close()
+    except Exception as e:
+        logger.exception("pdf_harvest: browser session failure: %s", e)
+
+    return result
+
+
+def harvest_pdfs(
+    sol_numbers: list[str],
+    concurrency: int | None = None,
+    session: requests.Session | None = None,
+    base_url: str | None = None,
+    browser_fallback: bool = True,
+    min_interval: float | None = None,
+    max_interval: float | None = None,
+    max_retries: int | None = None,
+) -> tuple[dict[str, Optional[bytes]], dict]:
+    """
+    Download PDFs for ``sol_numbers`` concurrently.
+
+    ``session`` defaults to a freshly consented dibbs2 session and ``base_url``
+    to DIBBS2_MAIN (tests point both at a local server). Returns
+    ``(results, metrics)`` where results maps sol_number -> bytes | None.
+    """
+    from sales.services.dibbs_pdf import DIBBS2_MAIN, DEFAULT_TIMEOUT, _make_dibbs2_session, _pdf_url
+
+    if concurrency is None:
+        concurrency = settings.PDF_HARVEST_CONCURRENCY
+    concurrency = max(int(concurrency), 1)
+    if min_interval is None:
+        min_interval = settings.PDF_HARVEST_MIN_INTERVAL
+    if max_interval is None:
+        max_interval = settings.PDF_HARVEST_MAX_INTERVAL
+    if max_retries is None:
+        max_retries = settings.PDF_HARVEST_MAX_RETRIES
+    base_url = (base_url or DIBBS2_MAIN).rstrip("/")
+
+    results: dict[str, Optional[bytes]] = {sol: None for sol in sol_numbers}
+    limiter = AdaptiveLimiter(min_interval, max_interval)
+    metrics = {
+        "requested": len(results),
+        "fetched": 0,
+        "failed": 0,
+        "bytes": 0,
+        "retries": 0,
+        "throttled": 0,
+        "fallback": 0,
+        "browser_fetched": 0,
+        "concurrency": concurrency,
+        "max_in_flight": 0,
+        "seconds": 0.0,
+        "pdfs_per_second": 0.0,
+        "final_interval": limiter.interval,
+    }
+    if not results:
+        return results, metrics
+
+    started = time.monotonic()
+    if session is None:
+        try:
+            session = _make_dibbs2_session()
+        except Exception as e:
+            logger.exception("pdf_harvest: dibbs2 consent bootstrap failed: %s", e)
+            metrics["failed"] = len(results)
+            return results, metrics
+
+    needs_browser: list[str] = list(results) if not settings.PDF_HARVEST_FAST_PATH else []
+    lock = threading.Lock()
+    in_flight = 0
+
+    def _get(sol_number: str):
+        nonlocal in_flight
+        limiter.wait()
+        with lock:
+            in_flight += 1
+            metrics["max_in_flight"] = max(metrics["max_in_flight"], in_flight)
+        try:
+            resp = session.get(_pdf_url(sol_number, base_url), timeout=DEFAULT_TIMEOUT)
+        except _TRANSIENT_ERRORS as e:
+            raise _Throttled() from e
+        except requests.RequestException as e:
+            # Redirect loops, bad URLs, ...: retrying will not help.
+            raise _Unfetchable(str(e)) from e
+        finally:
+            with lock:
+                in_flight -= 1
+        if resp.status_code in THROTTLE_STATUSES:
+            raise _Throttled(_retry_after_seconds(resp.headers.get("Retry-After")))
+        return resp
+
+    def _fetch(sol_number: str) -> None:
+        # One solicitation's failure must never escape pool.map and abort the batch.
+        try:
+            _fetch_one(sol_number)
+        except _Unfetchable as e:
+            logger.warning("pdf_harvest: %s not fetchable: %s", sol_number, e)
+        except Exception as e:
+            logger.exception("pdf_harvest: fetch %s failed: %s", sol_number, e)
+
+    def _fetch_one(sol_number: str) -> None:
+        for attempt in range(max_retries + 1):
+            try:
+                resp = _get(sol_number)
+            except _Throttled as t:
+                limiter.throttled(t.retry_after)
+                if attempt < max_retries:
+                    with lock:
+                        metrics["retries"] += 1
+                    continue
+                logger.warning("pdf_harvest: %s still throttled after %d retries", sol_number, attempt)
+                return
+            limiter.succeeded()
+            body = resp.content
+            if resp.status_code == 200 and body.startswith(b"%PDF"):
+                results[sol_number] = body
+                with lock:
+                    metrics["bytes"] += len(body)
+                return
+            if resp.status_code != 404:
+                # Challenge / consent HTML — let the browser try with the same cookies.
+                with lock:
+                    needs_browser.append(sol_number)
+            else:
+                logger.info("pdf_harvest: no PDF for %s (404)", sol_number)
+            return
+
+    if not needs_browser:
+        _pooled_session(session, concurrency)
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(_fetch, results))
+
+    if needs_browser and browser_fallback:
+        metrics["fallback"] = len(needs_browser)
+        browser_results = _browser_fetch(needs_browser, _playwright_cookies(session), base_url)
+        for sol_number, body in browser_results.items():
+            if body:
+                results[sol_number] = body
+                metrics["bytes"] += len(body)
+                metrics["browser_fetched"] += 1
+
+    metrics["fetched"] = sum(1 for body in results.values() if body)
+    metrics["failed"] = len(results) - metrics["fetched"]
+    metrics["throttled"] = limiter.throttles
+    metrics["final_interval"] = round(limiter.interval, 3)
+    metrics["seconds"] = round(time.monotonic() - started, 3)
+    metrics["pdfs_per_second"] = (
+        round(metrics["fetched"] / metrics["seconds"], 2) if metrics["seconds"] else 0.0
+    )
+    logger.info(
+        "pdf_harvest: %d/%d PDF(s), %d bytes in %.1fs (%.2f/s); retries=%d throttled=%d "
+        "fallback=%d concurrency=%d interval=%.2fs",
+        metrics["fetched"], metrics["requested"], metrics["bytes"], metrics["seconds"],
+        metrics["pdfs_per_second"], metrics["retries"], metrics["throttled"],
+        metrics["fallback"], concurrency, metrics["final_interval"],
+    )
+    return results, metrics
@@ -0,0 +1,151 @@
+"""
+Extract-once text layer for solicitation PDFs.
+
+parse_procurement_history, parse_packaging_data and analyze_solicitation_pdf
+all need the full text of the same PDF; each used to run pypdf over the bytes
+on its own, so persist_pdf_procurement_extract / parse_pdf_data_backlog parsed
+every document two or three times. get_pdf_text() keys the extracted text by
+the SHA-256 of the bytes (the blob-store key) and serves repeats from:
+
+1. an in-process LRU (settings.PDF_TEXT_CACHE_SIZE entries, default 64);
+2. optionally the dibbs_pdf_text_extract table (PdfTextExtract) when
+   settings.PDF_TEXT_PERSIST is on, so other workers and later runs reuse it.
+   parse_ca_zip's process-pool workers pass persist=False: they must not use
+   the DB connection inherited from the parent.
+
+Only a miss in both runs pypdf. stats() exposes hit/miss counters and the
+total extraction time for the current process.
+"""
+import hashlib
+import io
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+_lock = threading.Lock()
+_cache: "OrderedDict[str, str]" = OrderedDict()
+_stats = {"hits": 0, "persisted_hits": 0, "misses": 0, "extract_seconds": 0.0}
+
+
+def _extract(pdf_bytes: bytes) -> tuple[str, int]:
+    """(full text, page count) via pypdf; ("", 0) when the PDF cannot be read."""
+    try:
+        from pypdf import PdfReader
+
+        reader = PdfReader(io.BytesIO(pdf_bytes))
+        pages = []
+        for page in reader.pages:
+            text = page.extract_text()
+            if text:
+                pages.append(text)
+        return "\n".join(pages), len(reader.pages)
+    except Exception:
+        return "", 0
+
+
+def _remember(key: str, text: str) -> None:
+    size = settings.PDF_TEXT_CACHE_SIZE
+    if size <= 0:
+        return
+    with _lock:
+        _cache[key] = text
+        _cache.move_to_end(key)
+        while len(_cache) > size:
+            _cache.popitem(last=False)
+
+
+def _load_persisted(key: str):
+    from sales.models import PdfTextExtract
+
+    try:
+        return (
+            PdfTextExtract.objects.filter(content_sha256=key)
+            .values_list("text", flat=True)
+            .first()
+        )
+    except Exception as e:
+        logger.warning("pdf_text: persisted lookup failed for %s: %s", key, e)
+        return None
+
+
+def _persist(key: str, text: str, page_count: int, seconds: float) -> None:
+    from sales.models import PdfTextExtract
+
+    try:
+        PdfTextExtract.objects.get_or_create(
+            content_sha256=key,
+            defaults={
+                "text": text,
+                "page_count": page_count,
+                "extract_ms": int(seconds * 1000),
+            },
+        )
+    except Exception as e:
+        logger.warning("pdf_text: could not persist text for %s: %s", key, e)
+
+
+def pdf_text_key(pdf_bytes: bytes) -> str:
+    """Cache key for ``pdf_bytes``: the same SHA-256 hex the blob store uses."""
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+def get_pdf_text(pdf_bytes: bytes, key: str | None = None, persist: bool | None = None) -> str:
+    """
+    Full text of ``pdf_bytes`` (pages joined by newlines); "" when empty or
+    unreadable. ``key`` may pass a known SHA-256 of the bytes (e.g. the
+    solicitation's pdf_blob_key) to skip hashing. ``persist`` overrides
+    settings.PDF_TEXT_PERSIST; process-pool workers pass False because they
+    must not touch the database.
+    """
+    if not pdf_bytes:
+        return ""
+    pdf_bytes = bytes(pdf_bytes)
+    key = key or pdf_text_key(pdf_bytes)
+
+    with _lock:
+        text = _cache.get(key)
+        if text is not None:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return text
+
+    if persist is None:
+        persist = getattr(settings, "PDF_TEXT_PERSIST", False)
+    if persist:
+        text = _load_persisted(key)
+        if text is not None:
+            with _lock:
+                _stats["persisted_hits"] += 1
+            _remember(key, text)
+            return text
+
+    started = time.perf_counter()
+    text, page_count = _extract(pdf_bytes)
+    elapsed = time.perf_counter() - started
+    with _lock:
+        _stats["misses"] += 1
+        _stats["extract_seconds"] += elapsed
+    logger.debug("pdf_text: extracted %s (%d pages) in %.3fs", key, page_count, elapsed)
+    _remember(key, text)
+    if persist:
+        _persist(key, text, page_count, elapsed)
+    return text
+
+
+def stats() -> dict:
+    """Process-wide counters: hits, persisted_hits, misses, extract_seconds, cached."""
+    with _lock:
+        return {**_stats, "extract_seconds": round(_stats["extract_seconds"], 3), "cached": len(_cache)}
+
+
+def clear() -> None:
+    """Drop cached text and reset counters (tests, long-running workers)."""
+    with _lock:
+        _cache.clear()
+        _stats.update(hits=0, persisted_hits=0, misses=0, extract_seconds=0.0)
@@ -109,12 +109,15 @@ def _extract_sections_ab(pdf_text: str) -> str:
     return extracted
 
 
-def analyze_solicitation_pdf(pdf_blob_bytes: bytes, solicitation_number: str, model_key: str) -> dict:
+def analyze_solicitation_pdf(
+    pdf_blob_bytes: bytes, solicitation_number: str, model_key: str, text_key: str | None = None
+) -> dict:
     """
     Extract bid-critical requirements from a DIBBS solicitation PDF
     using the specified Claude model.
 
     model_key must be one of: haiku35, haiku45, sonnet45, opus45
+    text_key is the bytes' SHA-256 (pdf_blob_key) when known, to skip hashing.
 
     Returns a dict of extracted fields plus _usage and _model_key metadata.
     Raises ValueError on bad input, Exception on API failure.
@@ -124,7 +127,7 @@ def analyze_solicitation_pdf(pdf_blob_bytes: bytes, solicitation_number: str, mo
             f"Unknown model_key '{model_key}'. Must be one of: {list(MODELS.keys())}"
         )
 
-    pdf_text = extract_pdf_text(pdf_blob_bytes)
+    pdf_text = extract_pdf_text(pdf_blob_bytes, key=text_key)
     if not pdf_text:
         raise ValueError("No text could be extracted from the PDF blob.")
 
@@ -0,0 +1,131 @@
+"""
+Review Workbench prev/next navigation over a filtered, sorted solicitation list.
+
+The workbench used to evaluate the whole list_qs queryset into a Python list
+of solicitation numbers on every page view just to find its neighbours and the
+"X of Y" counter. This module answers the same question in two ways:
+
+* Cache — the ordered primary keys of a list are cached per canonical filter
+  hash for settings.WORKBENCH_NAV_CACHE_SECONDS (lists up to
+  WORKBENCH_NAV_CACHE_MAX_IDS rows) in the shared ``sales.workbench_nav`` cache namespace, which DIBBS
+  imports and match writes invalidate. A hit costs one query (the neighbours'
+  solicitation numbers).
+* Keyset — for lists too large to cache, or when the current row is not in
+  the cached list (its status changed since), prev/next are read with two
+  LIMIT 1 queries seeded by the current row's sort key and the position with
+  one COUNT. A "pk" tiebreaker is appended to the queryset's ORDER BY so the
+  order is total; NULLs are treated as the lowest value (SQL Server / SQLite).
+
+The cached list is therefore a little stale for at most the TTL; prev/next
+still only ever point at real solicitations.
+"""
+import hashlib
+import logging
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.db.models.expressions import OrderBy
+
+from core.cache import namespace
+
+logger = logging.getLogger(__name__)
+
+CACHE_NAMESPACE = "sales.workbench_nav"
+
+
+_cache = namespace(CACHE_NAMESPACE)
+
+
+def filter_cache_key(canonical_params: dict) -> str:
+    """Cache key for a canonical (sorted, non-empty) list filter dict."""
+    raw = "&".join(f"{k}={v}" for k, v in sorted(canonical_params.items()))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _ordering(qs) -> list[tuple[str, bool]]:
+    """The queryset's ORDER BY as (field, descending) pairs ending in pk."""
+    out = []
+    for item in qs.query.order_by:
+        if isinstance(item, str):
+            out.append((item.lstrip("-"), item.startswith("-")))
+        elif isinstance(item, OrderBy) and isinstance(item.expression, F):
+            out.append((item.expression.name, item.descending))
+        else:
+            raise ValueError(f"unsupported ordering for keyset navigation: {item!r}")
+    if not out or out[-1][0] not in ("pk", "id"):
+        out.append(("pk", False))
+    return out
+
+
+def _order_by(ordering) -> list[str]:
+    return [f"-{name}" if desc else name for name, desc in ordering]
+
+
+def _after(ordering, values: dict) -> Q:
+    """
+    Rows strictly after ``values`` in ``ordering`` (lexicographic keyset).
+    NULL is treated as the lowest value, as SQL Server and SQLite sort it.
+    """
+    (name, desc), rest = ordering[0], ordering[1:]
+    value = values[name]
+    if value is None:
+        strictly = Q(pk__in=[]) if desc else Q(**{f"{name}__isnull": False})
+        same = Q(**{f"{name}__isnull": True})
+    elif desc:
+        strictly = Q(**{f"{name}__lt": value}) | Q(**{f"{name}__isnull": True})
+        same = Q(**{name: value})
+    else:
+        strictly = Q(**{f"{name}__gt": value})
+        same = Q(**{name: value})
+    if not rest:
+        return strictly
+    return strictly | (same & _after(rest, values))
+
+
+def keyset_neighbors(qs, pk):
+    """
+    (prev_pk, next_pk, position, total) of ``pk`` within ``qs`` using keyset
+    queries; None when ``pk`` is not in ``qs``.
+    """
+    ordering = _ordering(qs)
+    values = qs.filter(pk=pk).values(*[name for name, _ in ordering]).first()
+    if values is None:
+        return None
+    backward = [(name, not desc) for name, desc in ordering]
+    next_pk = (
+        qs.filter(_after(ordering, values))
+        .order_by(*_order_by(ordering))
+        .values_list("pk", flat=True)
+        .first()
+    )
+    before = qs.filter(_after(backward, values))
+    prev_pk = before.order_by(*_order_by(backward)).values_list("pk", flat=True).first()
+    return prev_pk, next_pk, before.count() + 1, qs.count()
+
+
+def list_neighbors(qs, pk, cache_key: str):
+    """
+    (prev_pk, next_pk, position, total) of ``pk`` in ``qs``, or None when
+    ``pk`` is not in the list. Served from the cached ordered id list when it
+    contains ``pk``; on a miss the list is loaded (ids only) and cached when
+    it has at most WORKBENCH_NAV_CACHE_MAX_IDS rows; larger lists and rows
+    missing from a cached list fall back to keyset queries.
+    """
+    ttl = settings.WORKBENCH_NAV_CACHE_SECONDS
+    ids = _cache.get(cache_key) if ttl > 0 else None
+    if ids is None and ttl > 0 and qs.count() <= settings.WORKBENCH_NAV_CACHE_MAX_IDS:
+        ids = list(qs.order_by(*_order_by(_ordering(qs))).values_list("pk", flat=True))
+        _cache.set(cache_key, ids, timeout=ttl)
+    if ids is not None:
+        try:
+            idx = ids.index(pk)
+        except ValueError:
+            pass
+        else:
+            return (
+                ids[idx - 1] if idx > 0 else None,
+                ids[idx + 1] if idx + 1 < len(ids) else None,
+                idx + 1,
+                len(ids),
+            )
+    return keyset_neighbors(qs, pk)
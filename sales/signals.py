@@ -0,0 +1,77 @@
+"""
+Invalidate the in-memory match index (sales/services/match_index.py) when the
+rows it mirrors change through the ORM. ApprovedSource is only written in bulk
+(importer, batch delete) — those paths call invalidate("approved") directly; a
+receiver here would also disable Django's fast queryset delete for that table.
+
+Supplier saves invalidate the suppliers segment only when the row is created
+or its CAGE code / archived flag changes, compared with a snapshot taken when
+the row is loaded (post_init) or, for hand-built instances, read in pre_save.
+
+procurement_history_saved is sent by dibbs_pdf.save_procurement_history,
+whose raw executemany bypasses model signals, with ``inserted`` (new row
+count) and ``first_seen_nsns`` (NSNs that had no history before the save).
+"""
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from sales.models import SupplierFSC, SupplierNSN
+from sales.services.match_index import invalidate
+from suppliers.models import Supplier
+
+procurement_history_saved = Signal()
+
+
+@receiver(post_save, sender=SupplierNSN)
+@receiver(post_delete, sender=SupplierNSN)
+def supplier_nsn_changed(sender, instance, **kwargs):
+    from sales.services.matching import normalize_nsn
+
+    invalidate("tier1", [normalize_nsn(instance.nsn)])
+
+
+@receiver(post_save, sender=SupplierFSC)
+@receiver(post_delete, sender=SupplierFSC)
+def supplier_fsc_changed(sender, instance, **kwargs):
+    invalidate("fsc", [instance.fsc_code])
+
+
+# Supplier fields the suppliers segment reads; other edits leave it alone.
+_SUPPLIER_MATCH_FIELDS = ("cage_code", "archived")
+_SNAPSHOT_ATTR = "_match_index_snapshot"
+
+
+def _supplier_match_values(instance, fields=_SUPPLIER_MATCH_FIELDS):
+    """{field: value} for the loaded (not deferred) match fields."""
+    return {f: instance.__dict__[f] for f in fields if f in instance.__dict__}
+
+
+@receiver(post_init, sender=Supplier)
+def snapshot_supplier(sender, instance, **kwargs):
+    instance.__dict__[_SNAPSHOT_ATTR] = _supplier_match_values(instance)
+
+
+@receiver(pre_save, sender=Supplier)
+def supplier_saving(sender, instance, **kwargs):
+    if instance.pk is None:
+        return
+    snapshot = instance.__dict__.get(_SNAPSHOT_ATTR) or {}
+    if instance._state.adding or set(_supplier_match_values(instance)) - set(snapshot):
+        # Built by hand, or a deferred field was assigned: compare with the stored row.
+        row = sender._base_manager.filter(pk=instance.pk).values(*_SUPPLIER_MATCH_FIELDS).first()
+        instance.__dict__[_SNAPSHOT_ATTR] = row
+
+
+@receiver(post_save, sender=Supplier)
+def supplier_saved(sender, instance, created=False, update_fields=None, **kwargs):
+    fields = [f for f in _SUPPLIER_MATCH_FIELDS if update_fields is None or f in update_fields]
+    saved = _supplier_match_values(instance, fields)
+    old = instance.__dict__.get(_SNAPSHOT_ATTR)
+    instance.__dict__[_SNAPSHOT_ATTR] = {**(old or {}), **saved}
+    if created or old is None or any(f in old and old[f] != value for f, value in saved.items()):
+        invalidate("suppliers")
+
+
+@receiver(post_delete, sender=Supplier)
+def supplier_deleted(sender, instance, **kwargs):
+    invalidate("suppliers")
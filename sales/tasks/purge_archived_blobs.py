@@ -0,0 +1,17 @@
+import logging
+
+from sales.services.blob_purge import purge_archived_blobs
+
+logger = logging.getLogger(__name__)
+
+
+def run():
+    """Drop stored PDFs of Archived solicitations in throttled, resumable batches."""
+    result = purge_archived_blobs()
+    logger.info(
+        "purge_archived_blobs: finished. purged=%d batches=%d files_deleted=%d complete=%s",
+        result["purged"],
+        result["batches"],
+        result["files_deleted"],
+        result["complete"],
+    )
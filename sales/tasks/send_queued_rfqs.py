@@ -10,6 +10,7 @@ from django.utils import timezone
 
 from mailer.services.graph_mail import send_mail_via_graph
 from sales.models import SupplierContactLog, SupplierRFQ
+from sales.services.blob_store import read_solicitation_pdf
 from sales.services.email import (
     _default_cage,
     compose_grouped_rfq_email_message,
@@ -93,11 +94,12 @@ def send_queued_rfqs():
         attachments = []
         for rfq in rfqs:
             sol = rfq.line.solicitation
-            if getattr(sol, "pdf_blob", None) and sol.pdf_blob:
+            content = read_solicitation_pdf(sol)
+            if content:
                 attachments.append(
                     {
                         "filename": f"{sol.solicitation_number}.PDF",
-                        "content": bytes(sol.pdf_blob),
+                        "content": content,
                         "mimetype": "application/pdf",
                     }
                 )
@@ -0,0 +1,151 @@
+"""Tests for the content-addressed solicitation PDF store and its streaming view."""
+
+import hashlib
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase, override_settings
+
+from sales.models import Solicitation
+from sales.services.blob_purge import purge_archived_blobs
+from sales.services.blob_store import (
+    get_blob_store,
+    migrate_legacy_blobs,
+    read_solicitation_pdf,
+)
+from sales.views.solicitations import solicitation_pdf_view
+
+PDF = b"%PDF-1.4\n" + bytes(range(256)) * 40
+
+
+class BlobStoreTestCase(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="sol_pdfs_")
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        override = override_settings(SOLICITATION_BLOB_ROOT=self.root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.store = get_blob_store()
+
+
+class LocalBlobStoreTests(BlobStoreTestCase):
+    def test_put_is_content_addressed_and_deduplicated(self):
+        key = self.store.put(PDF)
+
+        self.assertEqual(key, hashlib.sha256(PDF).hexdigest())
+        self.assertEqual(self.store.put(PDF), key)
+        self.assertEqual(self.store.path(key).parent.parent.name, key[:2])
+        self.assertEqual(self.store.size(key), len(PDF))
+        with self.store.open(key) as f:
+            self.assertEqual(f.read(), PDF)
+        self.assertTrue(self.store.delete(key))
+        self.assertFalse(self.store.exists(key))
+
+    def test_migrate_legacy_blobs_moves_and_dedups(self):
+        for i in range(3):
+            Solicitation.objects.create(solicitation_number=f"SPE7L726Q05{i:02d}", pdf_blob=PDF)
+        Solicitation.objects.create(solicitation_number="SPE7L726Q0599", pdf_blob=b"%PDF-other")
+
+        first = migrate_legacy_blobs(batch_size=2, limit=2)
+        rest = migrate_legacy_blobs(batch_size=2)
+
+        self.assertEqual(first["moved"], 2)
+        self.assertEqual(first["deduplicated"], 1)
+        self.assertEqual(rest["moved"], 2)
+        self.assertFalse(Solicitation.objects.filter(pdf_blob__isnull=False).exists())
+        sol = Solicitation.objects.get(solicitation_number="SPE7L726Q0501")
+        self.assertEqual(sol.pdf_blob_key, hashlib.sha256(PDF).hexdigest())
+        self.assertEqual(read_solicitation_pdf(sol), PDF)
+
+    def test_purge_keeps_blobs_still_referenced(self):
+        key = self.store.put(PDF)
+        other = self.store.put(b"%PDF-archived-only")
+        Solicitation.objects.create(
+            solicitation_number="SPE7L726Q0600", status="Archived", pdf_blob_key=key
+        )
+        Solicitation.objects.create(
+            solicitation_number="SPE7L726Q0601", status="Archived", pdf_blob_key=other
+        )
+        live = Solicitation.objects.create(
+            solicitation_number="SPE7L726Q0602", status="Active", pdf_blob_key=key
+        )
+
+        result = purge_archived_blobs(batch_size=10, pause_seconds=0)
+
+        self.assertEqual(result["purged"], 2)
+        self.assertEqual(result["files_deleted"], 1)
+        self.assertTrue(self.store.exists(key))
+        self.assertFalse(self.store.exists(other))
+        live.refresh_from_db()
+        self.assertTrue(live.has_pdf)
+
+
+class SolicitationPdfViewTests(BlobStoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = get_user_model().objects.create_user("pdfviewer", password="pw")
+        self.factory = RequestFactory()
+
+    def _get(self, sol_number, **headers):
+        request = self.factory.get(f"/sales/solicitations/{sol_number}/pdf/", headers=headers)
+        request.user = self.user
+        return solicitation_pdf_view(request, sol_number)
+
+    def test_streams_with_etag_and_revalidates(self):
+        key = self.store.put(PDF)
+        Solicitation.objects.create(solicitation_number="SPE7L726Q0700", pdf_blob_key=key)
+
+        resp = self._get("SPE7L726Q0700")
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        self.assertEqual(b"".join(resp.streaming_content), PDF)
+        self.assertEqual(resp["ETag"], f'"{key}"')
+        self.assertEqual(resp["Accept-Ranges"], "bytes")
+        self.assertEqual(resp["Content-Length"], str(len(PDF)))
+
+        resp = self._get("SPE7L726Q0700", if_none_match=f'"{key}"')
+        self.assertEqual(resp.status_code, 304)
+
+    def test_range_requests(self):
+        key = self.store.put(PDF)
+        Solicitation.objects.create(solicitation_number="SPE7L726Q0701", pdf_blob_key=key)
+
+        resp = self._get("SPE7L726Q0701", range="bytes=100-199")
+        self.assertEqual(resp.status_code, 206)
+        self.assertEqual(resp["Content-Range"], f"bytes 100-199/{len(PDF)}")
+        self.assertEqual(b"".join(resp.streaming_content), PDF[100:200])
+
+        resp = self._get("SPE7L726Q0701", range="bytes=-10")
+        self.assertEqual(b"".join(resp.streaming_content), PDF[-10:])
+
+        resp = self._get("SPE7L726Q0701", range=f"bytes={len(PDF)}-")
+        self.assertEqual(resp.status_code, 416)
+        self.assertEqual(resp["Content-Range"], f"bytes */{len(PDF)}")
+
+        # A stale If-Range validator falls back to the full body.
+        resp = self._get("SPE7L726Q0701", range="bytes=0-9", if_range='"stale"')
+        self.assertEqual(resp.status_code, 200)
+
+    def test_legacy_blob_is_moved_on_first_view(self):
+        sol = Solicitation.objects.create(solicitation_number="SPE7L726Q0702", pdf_blob=PDF)
+
+        resp = self._get("SPE7L726Q0702")
+
+        self.assertEqual(b"".join(resp.streaming_content), PDF)
+        sol.refresh_from_db()
+        self.assertIsNone(sol.pdf_blob)
+        self.assertEqual(sol.pdf_blob_key, hashlib.sha256(PDF).hexdigest())
+
+    def test_fetched_pdf_is_stored(self):
+        Solicitation.objects.create(solicitation_number="SPE7L726Q0703")
+
+        with patch("sales.services.dibbs_pdf.fetch_pdf_for_sol", return_value=PDF):
+            resp = self._get("SPE7L726Q0703")
+
+        self.assertEqual(resp["X-SBZ-PDF-Fresh"], "1")
+        sol = Solicitation.objects.get(solicitation_number="SPE7L726Q0703")
+        self.assertEqual(sol.pdf_fetch_status, "DONE")
+        self.assertTrue(self.store.exists(sol.pdf_blob_key))
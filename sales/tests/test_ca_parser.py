@@ -0,0 +1,115 @@
+"""Tests for CA zip procurement-history parsing (serial and process-pool modes)."""
+
+import io
+import zipfile
+from datetime import date
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from reportlab.pdfgen import canvas
+
+from sales.models import NsnProcurementHistory, Solicitation
+from sales.services.ca_parser import (
+    LOOKUP_FULL,
+    _load_scoped_sol_lookup,
+    parse_ca_zip,
+)
+
+
+def _history_pdf(nsn: str, rows: list[str]) -> bytes:
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf)
+    y = 800
+    for line in [f"Procurement History for NSN: {nsn}", *rows]:
+        c.drawString(40, y, line)
+        y -= 14
+    c.save()
+    return buf.getvalue()
+
+
+def _zip(members: dict[str, bytes]) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for name, body in members.items():
+            zf.writestr(name, body)
+    return buf.getvalue()
+
+
+class ParseCaZipTests(TestCase):
+    def setUp(self):
+        self.members = {}
+        for i in range(4):
+            sol = f"SPE7L726Q11{i:02d}"
+            Solicitation.objects.create(
+                solicitation_number=sol, pdf_file_name=f"{sol}.PDF"
+            )
+            self.members[f"{sol}.PDF"] = _history_pdf(
+                f"59350112995{i:02d}",
+                [f"1ABC{i} SPE7L7-20-C-00{i:02d} 10 1.50 20240115 N"],
+            )
+        self.members["UNKNOWN.PDF"] = _history_pdf("5935011299599", [])
+
+    def _assert_all_parsed(self, result):
+        self.assertEqual(result["total_pdfs"], 5)
+        self.assertEqual(result["matched"], 4)
+        self.assertEqual(result["no_match"], 1)
+        self.assertEqual(result["parsed"], 4)
+        self.assertEqual(result["errors"], 0)
+        self.assertEqual(result["history_rows_saved"], 4)
+        self.assertEqual(NsnProcurementHistory.objects.count(), 4)
+        self.assertFalse(
+            Solicitation.objects.filter(pdf_data_pulled__isnull=True).exists()
+        )
+        for key in (
+            "lookup_seconds",
+            "read_seconds",
+            "parse_seconds",
+            "save_seconds",
+            "wall_seconds",
+        ):
+            self.assertIn(key, result["timings"])
+
+    def test_serial_mode(self):
+        result = parse_ca_zip(_zip(self.members), date(2026, 1, 2), workers=1)
+        self.assertEqual(result["workers"], 1)
+        self._assert_all_parsed(result)
+
+    def test_process_pool_matches_serial(self):
+        result = parse_ca_zip(_zip(self.members), date(2026, 1, 2), workers=2)
+        self.assertEqual(result["workers"], 2)
+        self._assert_all_parsed(result)
+
+    def test_already_pulled_sols_are_skipped(self):
+        parse_ca_zip(_zip(self.members), date(2026, 1, 2), workers=1)
+        result = parse_ca_zip(_zip(self.members), date(2026, 1, 2), workers=2)
+        self.assertEqual(result["skipped_already_pulled"], 4)
+        self.assertEqual(result["parsed"], 0)
+
+    def test_worker_count_defaults_to_setting(self):
+        with override_settings(CA_PARSE_WORKERS=0):
+            result = parse_ca_zip(b"", date(2026, 1, 2))
+        self.assertEqual(result["workers"], 1)
+
+    def test_full_lookup_mode_matches_scoped(self):
+        result = parse_ca_zip(
+            _zip(self.members), date(2026, 1, 2), workers=1, lookup=LOOKUP_FULL
+        )
+        self._assert_all_parsed(result)
+
+    def test_scoped_lookup_only_returns_requested_names(self):
+        Solicitation.objects.create(
+            solicitation_number="SPE7L726Q9999", pdf_file_name="SPE7L726Q9999.PDF"
+        )
+        lookup = _load_scoped_sol_lookup(
+            ["spe7l726q1100.pdf", "SPE7L726Q1101.PDF", "NOPE.PDF"]
+        )
+        self.assertEqual(
+            set(lookup), {"SPE7L726Q1100.PDF", "SPE7L726Q1101.PDF"}
+        )
+
+    def test_scoped_lookup_chunks_large_name_sets(self):
+        names = [f"X{i:05d}.PDF" for i in range(1200)] + ["SPE7L726Q1103.PDF"]
+        with patch("sales.services.ca_parser.PDF_NAME_CHUNK", 500):
+            with self.assertNumQueries(3):
+                lookup = _load_scoped_sol_lookup(names)
+        self.assertEqual(set(lookup), {"SPE7L726Q1103.PDF"})
@@ -0,0 +1,93 @@
+"""Tests for the import lifecycle sweep and the batched archived-blob purge."""
+
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.management.commands.run_background_tasks import TASK_FUNCTIONS
+from sales.models import ImportBatch, ServiceCheckpoint, Solicitation
+from sales.services.blob_purge import CHECKPOINT_NAME, purge_archived_blobs
+from sales.services.importer import _run_lifecycle_sweep
+
+
+class LifecycleSweepTests(TestCase):
+    def setUp(self):
+        today = timezone.now().date()
+        old_batch = ImportBatch.objects.create(
+            import_date=today - timedelta(days=2), imported_at=timezone.now()
+        )
+        self.stale_new = Solicitation.objects.create(
+            solicitation_number="SPE7L726Q0001", status="New", import_batch=old_batch,
+            return_by_date=today + timedelta(days=5),
+        )
+        self.expired = Solicitation.objects.create(
+            solicitation_number="SPE7L726Q0002", status="Active",
+            return_by_date=today - timedelta(days=1), pdf_blob=b"%PDF-1.4",
+        )
+        self.no_bid = Solicitation.objects.create(
+            solicitation_number="SPE7L726Q0003", status="NO_BID",
+            return_by_date=today - timedelta(days=1),
+        )
+
+    def test_each_transition_is_one_update_without_count(self):
+        with CaptureQueriesContext(connection) as ctx:
+            result = _run_lifecycle_sweep()
+
+        statements = [q["sql"].split()[0].upper() for q in ctx.captured_queries]
+        self.assertEqual(statements, ["UPDATE", "UPDATE"])
+        self.assertEqual(result, {"new_to_active": 1, "expired_to_archived": 1})
+        self.assertEqual(
+            dict(Solicitation.objects.values_list("solicitation_number", "status")),
+            {"SPE7L726Q0001": "Active", "SPE7L726Q0002": "Archived", "SPE7L726Q0003": "NO_BID"},
+        )
+        # Blob purge is no longer part of the sweep.
+        self.expired.refresh_from_db()
+        self.assertIsNotNone(self.expired.pdf_blob)
+
+
+class PurgeArchivedBlobsTests(TestCase):
+    def setUp(self):
+        self.archived = [
+            Solicitation.objects.create(
+                solicitation_number=f"SPE7L726Q01{i:02d}", status="Archived", pdf_blob=b"x" * 10
+            )
+            for i in range(5)
+        ]
+        self.active = Solicitation.objects.create(
+            solicitation_number="SPE7L726Q0200", status="Active", pdf_blob=b"keep"
+        )
+
+    def _remaining(self):
+        return Solicitation.objects.filter(status="Archived", pdf_blob__isnull=False).count()
+
+    def test_resumes_from_checkpoint_in_bounded_batches(self):
+        first = purge_archived_blobs(batch_size=2, pause_seconds=0, max_batches=1)
+
+        self.assertEqual(first["purged"], 2)
+        self.assertFalse(first["complete"])
+        self.assertEqual(first["cursor"], self.archived[1].pk)
+        self.assertEqual(
+            ServiceCheckpoint.objects.get(name=CHECKPOINT_NAME).cursor, str(self.archived[1].pk)
+        )
+        self.assertEqual(self._remaining(), 3)
+
+        second = purge_archived_blobs(batch_size=2, pause_seconds=0)
+
+        self.assertEqual(second["purged"], 3)
+        self.assertEqual(second["batches"], 2)
+        self.assertTrue(second["complete"])
+        self.assertEqual(second["cursor"], 0)
+        self.assertEqual(self._remaining(), 0)
+        self.active.refresh_from_db()
+        self.assertEqual(bytes(self.active.pdf_blob), b"keep")
+
+    def test_time_budget_stops_after_first_batch(self):
+        result = purge_archived_blobs(batch_size=1, pause_seconds=0, time_budget_seconds=0)
+        self.assertEqual(result["batches"], 1)
+        self.assertFalse(result["complete"])
+
+    def test_registered_as_background_task(self):
+        self.assertIn("purge_archived_blobs", TASK_FUNCTIONS)
@@ -0,0 +1,134 @@
+"""Tests for the set-based Solicitation.match_count refresh."""
+
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from sales.models import (
+    ImportBatch,
+    ServiceCheckpoint,
+    Solicitation,
+    SolicitationLine,
+    SupplierMatch,
+)
+from sales.services.match_counts import (
+    CHECKPOINT_NAME,
+    note_matches_deleted,
+    refresh_match_counts,
+)
+from suppliers.models import Supplier
+
+
+class RefreshMatchCountsTests(TestCase):
+    """The SSMS-managed view is replaced by a plain table of the same name."""
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE dibbs_solicitation_match_counts "
+                "(solicitation_id INTEGER PRIMARY KEY, match_count INTEGER)"
+            )
+        self.sols = [
+            Solicitation.objects.create(solicitation_number=f"SPE7L726Q00{i}")
+            for i in range(3)
+        ]
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE dibbs_solicitation_match_counts")
+
+    def _set_view(self, counts):
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM dibbs_solicitation_match_counts")
+            for sol, mc in counts.items():
+                cursor.execute(
+                    "INSERT INTO dibbs_solicitation_match_counts VALUES (%s, %s)",
+                    [sol.pk, mc],
+                )
+
+    def _counts(self):
+        return dict(Solicitation.objects.values_list("solicitation_number", "match_count"))
+
+    def test_full_refresh_sets_and_zeroes_in_one_statement(self):
+        Solicitation.objects.filter(pk=self.sols[2].pk).update(match_count=9)
+        self._set_view({self.sols[0]: 4, self.sols[1]: 1})
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = refresh_match_counts()
+
+        sol_statements = [
+            q["sql"].split()[:2]
+            for q in ctx.captured_queries
+            if "dibbs_solicitation" in q["sql"]
+        ]
+        self.assertEqual(sol_statements, [["UPDATE", "dibbs_solicitation"]])
+
+        self.assertEqual(result["mode"], "full")
+        self.assertEqual(result["updated"], 3)
+        self.assertEqual(
+            self._counts(),
+            {"SPE7L726Q000": 4, "SPE7L726Q001": 1, "SPE7L726Q002": 0},
+        )
+        # Second run writes nothing — values already match the view.
+        self.assertEqual(refresh_match_counts()["updated"], 0)
+
+    def test_incremental_only_touches_changed_solicitations(self):
+        refresh_match_counts()
+        checkpoint = ServiceCheckpoint.objects.get(name=CHECKPOINT_NAME)
+        ServiceCheckpoint.objects.filter(pk=checkpoint.pk).update(
+            checkpoint_at=timezone.now() - timedelta(minutes=5)
+        )
+
+        supplier = Supplier.objects.create(name="Acme", cage_code="1ABC2")
+        line = SolicitationLine.objects.create(
+            solicitation=self.sols[0], nsn="5935-01-129-9512"
+        )
+        SupplierMatch.objects.create(
+            line=line, supplier=supplier, match_tier=3, match_method="FSC"
+        )
+        self._set_view({self.sols[0]: 2, self.sols[1]: 7})
+
+        result = refresh_match_counts(incremental=True)
+
+        self.assertEqual(result["mode"], "incremental")
+        self.assertEqual(result["updated"], 1)
+        self.assertEqual(
+            self._counts(),
+            {"SPE7L726Q000": 2, "SPE7L726Q001": 0, "SPE7L726Q002": 0},
+        )
+
+    def test_incremental_includes_newly_imported_batches(self):
+        refresh_match_counts()
+        batch = ImportBatch.objects.create(
+            import_date=date(2026, 1, 2), imported_at=timezone.now()
+        )
+        Solicitation.objects.filter(pk=self.sols[1].pk).update(import_batch=batch)
+        self._set_view({self.sols[1]: 3})
+
+        result = refresh_match_counts(incremental=True)
+
+        self.assertEqual(result["updated"], 1)
+        self.assertEqual(self._counts()["SPE7L726Q001"], 3)
+
+    def test_incremental_falls_back_to_full_after_match_deletions(self):
+        self._set_view({self.sols[0]: 4, self.sols[2]: 1})
+        refresh_match_counts()
+        self._set_view({self.sols[2]: 1})  # sols[0] lost its only matches
+        note_matches_deleted()
+
+        result = refresh_match_counts(incremental=True)
+
+        self.assertEqual(result["mode"], "full")
+        self.assertEqual(self._counts()["SPE7L726Q000"], 0)
+        self.assertEqual(refresh_match_counts(incremental=True)["mode"], "incremental")
+
+    def test_command_output_reports_updated_count(self):
+        self._set_view({self.sols[0]: 5})
+        out = StringIO()
+        call_command("refresh_match_counts", stdout=out)
+        self.assertIn("Refreshed match_count on 1 solicitations (full).", out.getvalue())
@@ -0,0 +1,211 @@
+"""Tests for the incremental (fingerprint-diff) matching engine and match index."""
+
+from datetime import date
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from sales.models import (
+    ApprovedSource,
+    ImportBatch,
+    ServiceCheckpoint,
+    Solicitation,
+    SolicitationLine,
+    SupplierFSC,
+    SupplierMatch,
+)
+from sales.services import match_index
+from sales.services.match_counts import DELETED_CHECKPOINT_NAME
+from sales.services.matching import (
+    get_live_workbench_matches,
+    rematch_open_lines,
+    run_matching_for_batch,
+)
+from suppliers.models import Supplier
+
+
+class IncrementalMatchingTests(TestCase):
+    """The SSMS-managed dibbs_supplier_nsn_scored view is stood in by a table."""
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE dibbs_supplier_nsn_scored (id INTEGER PRIMARY KEY, "
+                "supplier_id INTEGER, nsn VARCHAR(46), match_score DECIMAL(10, 2))"
+            )
+        self.batch = ImportBatch.objects.create(
+            import_date=date(2026, 1, 2), imported_at=timezone.now()
+        )
+        self.sol = Solicitation.objects.create(
+            solicitation_number="SPE7L726Q0001", import_batch=self.batch
+        )
+        self.line = SolicitationLine.objects.create(
+            solicitation=self.sol, nsn="5935-01-129-9512", fsc="5935"
+        )
+        self.direct = Supplier.objects.create(name="Direct", cage_code="1AAA1")
+        self.approved = Supplier.objects.create(name="Approved", cage_code="2BBB2")
+        self.fsc = Supplier.objects.create(name="Fsc", cage_code="3CCC3")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO dibbs_supplier_nsn_scored VALUES (1, %s, %s, 9.5)",
+                [self.direct.pk, "5935011299512"],
+            )
+        ApprovedSource.objects.create(nsn="5935011299512", approved_cage="2BBB2")
+        SupplierFSC.objects.create(supplier=self.fsc, fsc_code="5935")
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE dibbs_supplier_nsn_scored")
+
+    def _methods(self):
+        return dict(
+            SupplierMatch.objects.filter(line=self.line).values_list(
+                "supplier__name", "match_method"
+            )
+        )
+
+    def test_first_run_writes_all_tiers(self):
+        summary = run_matching_for_batch(self.batch.id)
+
+        self.assertEqual(summary["lines_rematched"], 1)
+        self.assertEqual(summary["matches_inserted"], 3)
+        self.assertEqual(summary["by_tier"], {1: 1, 2: 1, 3: 1})
+        self.assertEqual(
+            self._methods(),
+            {"Direct": "DIRECT_NSN", "Approved": "APPROVED_SOURCE", "Fsc": "FSC"},
+        )
+        self.line.refresh_from_db()
+        self.assertEqual(len(self.line.match_fingerprint), 64)
+
+    def test_unchanged_batch_is_not_rewritten(self):
+        run_matching_for_batch(self.batch.id)
+        first_ids = set(SupplierMatch.objects.values_list("pk", flat=True))
+
+        summary = run_matching_for_batch(self.batch.id)
+
+        self.assertEqual(summary["lines_rematched"], 0)
+        self.assertEqual(summary["matches_found"], 3)
+        self.assertEqual(set(SupplierMatch.objects.values_list("pk", flat=True)), first_ids)
+
+    def test_capability_edit_diffs_only_affected_pairs(self):
+        run_matching_for_batch(self.batch.id)
+        SupplierMatch.objects.filter(supplier=self.fsc).update(is_excluded=True)
+        kept = SupplierMatch.objects.get(supplier=self.approved).pk
+
+        newcomer = Supplier.objects.create(name="Newcomer", cage_code="4DDD4")
+        SupplierFSC.objects.create(supplier=newcomer, fsc_code="5935")
+        summary = rematch_open_lines(fscs=["5935"])
+
+        self.assertEqual(summary["matches_inserted"], 1)
+        self.assertEqual(summary["matches_deleted"], 0)
+        self.assertTrue(SupplierMatch.objects.filter(pk=kept).exists())
+        self.assertTrue(SupplierMatch.objects.get(supplier=self.fsc).is_excluded)
+        self.assertEqual(self._methods()["Newcomer"], "FSC")
+
+    def test_removed_capability_deletes_match_but_keeps_manual_rows(self):
+        run_matching_for_batch(self.batch.id)
+        manual = Supplier.objects.create(name="Manual", cage_code="5EEE5")
+        SupplierMatch.objects.create(
+            line=self.line, supplier=manual, match_tier=4, match_method="MANUAL"
+        )
+
+        SupplierFSC.objects.filter(supplier=self.fsc).delete()
+        summary = rematch_open_lines(fscs=["5935"])
+
+        self.assertEqual(summary["matches_deleted"], 1)
+        self.assertNotIn("Fsc", self._methods())
+        self.assertEqual(self._methods()["Manual"], "MANUAL")
+        # Nothing new to find incrementally: the next match_count refresh runs in full.
+        self.assertTrue(
+            ServiceCheckpoint.objects.filter(name=DELETED_CHECKPOINT_NAME).exists()
+        )
+
+    def test_closed_solicitations_are_not_rematched(self):
+        run_matching_for_batch(self.batch.id)
+        Solicitation.objects.filter(pk=self.sol.pk).update(status="NO_BID")
+        SupplierFSC.objects.filter(supplier=self.fsc).delete()
+
+        summary = rematch_open_lines(fscs=["5935"])
+
+        self.assertEqual(summary["lines_processed"], 0)
+        self.assertIn("Fsc", self._methods())
+
+
+@override_settings(MATCH_INDEX_ENABLED=True, MATCH_INDEX_CHECK_SECONDS=3600)
+class MatchIndexTests(IncrementalMatchingTests):
+    """Same fixtures, tiers resolved from the in-memory match index."""
+
+    def setUp(self):
+        super().setUp()
+        match_index.reset()
+
+    def tearDown(self):
+        match_index.reset()
+        super().tearDown()
+
+    def _tier_names(self, result):
+        return (
+            [row.supplier.name for row in result["tier1"]],
+            [s.name for s in result["tier2"]],
+            [s.name for s in result["tier3"]],
+        )
+
+    def test_workbench_matches_agree_with_live_queries(self):
+        with override_settings(MATCH_INDEX_ENABLED=False):
+            live = get_live_workbench_matches(self.line)
+        match_index.get_match_index()
+
+        with self.assertNumQueries(1):
+            indexed = get_live_workbench_matches(self.line)
+
+        self.assertEqual(self._tier_names(indexed), self._tier_names(live))
+        self.assertEqual(indexed["tier1"][0].match_score, live["tier1"][0].match_score)
+
+    def test_fingerprint_matches_live_path(self):
+        with override_settings(MATCH_INDEX_ENABLED=False):
+            run_matching_for_batch(self.batch.id)
+        summary = run_matching_for_batch(self.batch.id)
+        self.assertEqual(summary["lines_rematched"], 0)
+
+    def test_signal_patches_fsc_segment_in_place(self):
+        match_index.get_match_index()
+        newcomer = Supplier.objects.create(name="Newcomer", cage_code="4DDD4")
+        SupplierFSC.objects.create(supplier=newcomer, fsc_code="5935")
+        self.fsc.archived = True
+        self.fsc.save()
+
+        result = get_live_workbench_matches(self.line)
+
+        self.assertEqual(self._tier_names(result)[2], ["Newcomer"])
+        self.assertTrue(
+            ServiceCheckpoint.objects.filter(name="match_index:fsc").exists()
+        )
+
+    def test_supplier_save_invalidates_only_when_match_fields_change(self):
+        version = ServiceCheckpoint.objects.filter(name=match_index.VERSION_PREFIX + "suppliers")
+        version.delete()
+        supplier = Supplier.objects.get(pk=self.direct.pk)
+
+        supplier.name = "Direct Renamed"
+        supplier.save()
+        Supplier.objects.only("name").get(pk=self.fsc.pk).save()
+        self.assertFalse(version.exists())
+
+        supplier.archived = True
+        supplier.save()
+        self.assertTrue(version.exists())
+
+        version.delete()
+        Supplier(pk=self.approved.pk, name="Approved", cage_code="2BBB9").save()
+        self.assertTrue(version.exists())
+
+    def test_index_builds_on_low_uptime_host(self):
+        # A fresh container's monotonic clock can be below the check interval.
+        with mock.patch("sales.services.match_index.time.monotonic", return_value=5.0):
+            index = match_index.get_match_index()
+            summary = run_matching_for_batch(self.batch.id)
+
+        self.assertEqual(index.built, set(match_index.SEGMENTS))
+        self.assertEqual(summary["matches_inserted"], 3)
@@ -0,0 +1,95 @@
+"""Tests for the streaming, resumable PDF parse backlog."""
+
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from sales.models import ServiceCheckpoint, Solicitation
+from sales.services.blob_store import get_blob_store
+from sales.services.dibbs_pdf import parse_pdf_data_backlog
+from sales.services.pdf_backlog import CHECKPOINT_NAME, parse_backlog_range, split_id_ranges
+
+
+def _mark_pulled(sol_number, body, blob_key=None):
+    Solicitation.objects.filter(solicitation_number=sol_number).update(
+        pdf_data_pulled=timezone.now()
+    )
+
+
+class PdfBacklogTests(TestCase):
+    def setUp(self):
+        root = tempfile.mkdtemp(prefix="sol_pdfs_")
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        override = override_settings(SOLICITATION_BLOB_ROOT=root)
+        override.enable()
+        self.addCleanup(override.disable)
+        store = get_blob_store()
+        self.sols = [
+            Solicitation.objects.create(
+                solicitation_number=f"SPE7L726Q10{i:02d}",
+                pdf_blob_key=store.put(f"%PDF-{i}".encode()),
+            )
+            for i in range(5)
+        ]
+        self.legacy = Solicitation.objects.create(
+            solicitation_number="SPE7L726Q1099", pdf_blob=b"%PDF-legacy"
+        )
+        Solicitation.objects.create(solicitation_number="SPE7L726Q1098")  # no PDF
+        patcher = patch(
+            "sales.services.dibbs_pdf.persist_pdf_procurement_extract", side_effect=_mark_pulled
+        )
+        self.persist = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_streams_every_pdf_reading_blobs_one_row_at_a_time(self):
+        with CaptureQueriesContext(connection) as ctx:
+            n = parse_pdf_data_backlog()
+
+        self.assertEqual(n, 6)
+        self.assertEqual(
+            sorted(call.args[1] for call in self.persist.call_args_list),
+            sorted([f"%PDF-{i}".encode() for i in range(5)] + [b"%PDF-legacy"]),
+        )
+        blob_selects = [
+            q["sql"] for q in ctx.captured_queries
+            if '."pdf_blob" ' in q["sql"].split(" FROM ")[0] + " "
+        ]
+        self.assertEqual(len(blob_selects), 1)
+        self.assertIn("LIMIT 1", blob_selects[0])
+        self.assertEqual(ServiceCheckpoint.objects.get(name=CHECKPOINT_NAME).cursor, "0")
+
+    def test_time_budget_checkpoints_and_next_run_wraps_around(self):
+        first = parse_backlog_range(batch_size=2, time_budget_seconds=1e-9)
+
+        self.assertEqual(first["parsed"], 1)
+        self.assertFalse(first["complete"])
+        self.assertEqual(
+            ServiceCheckpoint.objects.get(name=CHECKPOINT_NAME).cursor, str(self.sols[0].pk)
+        )
+
+        # A PDF arriving below the resume point is still picked up by the wrap.
+        Solicitation.objects.filter(pk=self.sols[0].pk).update(pdf_data_pulled=None)
+        second = parse_backlog_range(batch_size=2, time_budget_seconds=0)
+
+        self.assertTrue(second["complete"])
+        self.assertEqual(second["parsed"], 6)
+        self.assertFalse(
+            Solicitation.objects.filter(pdf_blob_key__isnull=False, pdf_data_pulled__isnull=True).exists()
+        )
+
+    def test_id_ranges_are_disjoint_and_cover_the_backlog(self):
+        ranges = split_id_ranges(4)
+
+        self.assertEqual(len(ranges), 4)
+        for (_, hi), (lo, _) in zip(ranges, ranges[1:]):
+            self.assertLess(hi, lo)
+
+        lo, hi = ranges[0]
+        result = parse_backlog_range(id_range=(lo, hi), time_budget_seconds=0)
+        self.assertEqual(result["parsed"], len([s for s in self.sols if lo <= s.pk <= hi]))
+        self.assertFalse(ServiceCheckpoint.objects.filter(name=CHECKPOINT_NAME).exists())
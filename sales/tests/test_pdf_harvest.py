@@ -0,0 +1,146 @@
+"""Tests for the concurrent DIBBS PDF harvester against a local stand-in server."""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import requests
+from django.test import SimpleTestCase
+
+from sales.services import pdf_harvest
+from sales.services.pdf_harvest import AdaptiveLimiter, _retry_after_seconds, harvest_pdfs
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    """Serves /Downloads/RFQ/<c>/<SOL>.PDF the way dibbs2 does, with scripted misbehaviour."""
+
+    server_version = "dibbs2-standin"
+
+    def do_GET(self):
+        srv = self.server
+        sol = self.path.rsplit("/", 1)[-1].removesuffix(".PDF")
+        with srv.lock:
+            srv.hits[sol] = srv.hits.get(sol, 0) + 1
+            srv.in_flight += 1
+            srv.max_in_flight = max(srv.max_in_flight, srv.in_flight)
+            hit = srv.hits[sol]
+        try:
+            time.sleep(srv.latency)
+            if sol.endswith("THROTTLE") and hit == 1:
+                self._send(429, b"slow down", "text/plain", {"Retry-After": "0"})
+            elif sol.endswith("LOOP"):
+                self._send(302, b"", "text/html", {"Location": self.path})
+            elif sol.endswith("MISSING"):
+                self._send(404, b"not found", "text/html")
+            elif sol.endswith("CHALLENGE"):
+                self._send(200, b"<html>Request Rejected</html>", "text/html")
+            else:
+                self._send(200, b"%PDF-1.4 " + sol.encode(), "application/pdf")
+        finally:
+            with srv.lock:
+                srv.in_flight -= 1
+
+    def _send(self, status, body, ctype, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class PdfHarvestTests(SimpleTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StandIn)
+        self.server.lock = threading.Lock()
+        self.server.hits = {}
+        self.server.in_flight = 0
+        self.server.max_in_flight = 0
+        self.server.latency = 0.05
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def _harvest(self, sols, **kwargs):
+        kwargs.setdefault("concurrency", 4)
+        kwargs.setdefault("min_interval", 0)
+        kwargs.setdefault("max_interval", 0.05)
+        return harvest_pdfs(sols, session=requests.Session(), base_url=self.base_url, **kwargs)
+
+    def test_downloads_concurrently_and_reports_throughput(self):
+        sols = [f"SPE7L726Q{n:04d}" for n in range(12)]
+
+        results, metrics = self._harvest(sols)
+
+        self.assertEqual(results, {s: b"%PDF-1.4 " + s.encode() for s in sols})
+        self.assertEqual(metrics["fetched"], 12)
+        self.assertEqual(metrics["failed"], 0)
+        self.assertEqual(metrics["bytes"], sum(len(b) for b in results.values()))
+        self.assertGreater(self.server.max_in_flight, 1)
+        self.assertLessEqual(self.server.max_in_flight, 4)
+        self.assertGreater(metrics["pdfs_per_second"], 0)
+
+    def test_throttle_backs_off_and_retries(self):
+        results, metrics = self._harvest(["SPE7L726QTHROTTLE", "SPE7L726Q0001"])
+
+        self.assertTrue(results["SPE7L726QTHROTTLE"].startswith(b"%PDF"))
+        self.assertEqual(self.server.hits["SPE7L726QTHROTTLE"], 2)
+        self.assertEqual(metrics["retries"], 1)
+        self.assertEqual(metrics["throttled"], 1)
+
+    def test_non_pdf_goes_to_browser_and_404_does_not(self):
+        with patch.object(
+            pdf_harvest, "_browser_fetch", return_value={"SPE7L726QCHALLENGE": b"%PDF-browser"}
+        ) as browser:
+            results, metrics = self._harvest(
+                ["SPE7L726QCHALLENGE", "SPE7L726QMISSING", "SPE7L726Q0002"]
+            )
+
+        browser.assert_called_once()
+        self.assertEqual(browser.call_args.args[0], ["SPE7L726QCHALLENGE"])
+        self.assertEqual(results["SPE7L726QCHALLENGE"], b"%PDF-browser")
+        self.assertIsNone(results["SPE7L726QMISSING"])
+        self.assertEqual(metrics["fallback"], 1)
+        self.assertEqual(metrics["browser_fetched"], 1)
+        self.assertEqual(metrics["fetched"], 2)
+
+    def test_one_failing_solicitation_does_not_abort_the_batch(self):
+        real_get = requests.Session.get
+
+        def flaky_get(session, url, **kwargs):
+            if url.endswith("SPE7L726QBROKEN.PDF"):
+                raise RuntimeError("boom")
+            return real_get(session, url, **kwargs)
+
+        with patch.object(requests.Session, "get", flaky_get):
+            results, metrics = self._harvest(
+                ["SPE7L726QLOOP", "SPE7L726QBROKEN", "SPE7L726Q0003"]
+            )
+
+        self.assertIsNone(results["SPE7L726QLOOP"])
+        self.assertIsNone(results["SPE7L726QBROKEN"])
+        self.assertTrue(results["SPE7L726Q0003"].startswith(b"%PDF"))
+        self.assertEqual(metrics["failed"], 2)
+        self.assertEqual(metrics["retries"], 0)
+
+    def test_limiter_doubles_on_throttle_and_decays_on_success(self):
+        limiter = AdaptiveLimiter(0.1, 1.0)
+        limiter.throttled(retry_after=0)
+        limiter.throttled(retry_after=0)
+        self.assertEqual(limiter.interval, 1.0)
+        for _ in range(50):
+            limiter.succeeded()
+        self.assertEqual(limiter.interval, 0.1)
+
+    def test_retry_after_parsing(self):
+        self.assertEqual(_retry_after_seconds("7"), 7.0)
+        self.assertEqual(_retry_after_seconds("99999"), pdf_harvest.RETRY_AFTER_CAP_SECONDS)
+        self.assertEqual(_retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(_retry_after_seconds("soon"))
+        self.assertIsNone(_retry_after_seconds(None))
@@ -0,0 +1,108 @@
+"""Tests for the extract-once PDF text cache."""
+
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from reportlab.pdfgen import canvas
+
+from sales.models import PdfTextExtract, Solicitation
+from sales.services import ca_parser, pdf_text
+from sales.services.dibbs_pdf import persist_pdf_procurement_extract
+
+
+def _pdf(lines: list[str]) -> bytes:
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf)
+    y = 800
+    for line in lines:
+        c.drawString(40, y, line)
+        y -= 14
+    c.save()
+    return buf.getvalue()
+
+
+class PdfTextCacheTests(TestCase):
+    def setUp(self):
+        pdf_text.clear()
+        self.addCleanup(pdf_text.clear)
+        self.body = _pdf([
+            "Procurement History for NSN: 5935011299512",
+            "Section D - Packaging and Marking",
+            "Packaging Standard: MIL-STD-2073",
+        ])
+
+    def test_persist_extract_runs_pypdf_once(self):
+        Solicitation.objects.create(solicitation_number="SPE7L726Q0900")
+
+        with patch.object(pdf_text, "_extract", wraps=pdf_text._extract) as extract:
+            persist_pdf_procurement_extract("SPE7L726Q0900", self.body)
+            persist_pdf_procurement_extract("SPE7L726Q0900", self.body)
+
+        self.assertEqual(extract.call_count, 1)
+        stats = pdf_text.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertGreaterEqual(stats["hits"], 3)
+        self.assertGreaterEqual(stats["extract_seconds"], 0)
+        self.assertIn("MIL-STD-2073", pdf_text.get_pdf_text(self.body))
+
+    def test_unreadable_pdf_is_cached_as_empty(self):
+        self.assertEqual(pdf_text.get_pdf_text(b"not a pdf"), "")
+        self.assertEqual(pdf_text.get_pdf_text(b"not a pdf"), "")
+        self.assertEqual(pdf_text.stats()["misses"], 1)
+
+    def test_lru_evicts_oldest(self):
+        with override_settings(PDF_TEXT_CACHE_SIZE=2), patch.object(
+            pdf_text, "_extract", return_value=("", 0)
+        ):
+            for body in (b"a", b"b", b"c"):
+                pdf_text.get_pdf_text(body)
+            pdf_text.get_pdf_text(b"a")
+        self.assertEqual(pdf_text.stats()["misses"], 4)
+        self.assertEqual(pdf_text.stats()["cached"], 2)
+
+    @override_settings(PDF_TEXT_PERSIST=True)
+    def test_persisted_tier_survives_process_cache(self):
+        text = pdf_text.get_pdf_text(self.body)
+        self.assertEqual(PdfTextExtract.objects.count(), 1)
+
+        pdf_text.clear()
+        with patch.object(pdf_text, "_extract") as extract:
+            self.assertEqual(pdf_text.get_pdf_text(self.body), text)
+
+        extract.assert_not_called()
+        self.assertEqual(pdf_text.stats()["persisted_hits"], 1)
+
+    @override_settings(PDF_TEXT_PERSIST=True)
+    def test_explicit_persist_false_and_known_key_skip_db_and_hashing(self):
+        key = pdf_text.pdf_text_key(self.body)
+
+        with self.assertNumQueries(0), patch.object(pdf_text, "pdf_text_key") as hasher:
+            pdf_text.get_pdf_text(self.body, key=key, persist=False)
+            pdf_text.get_pdf_text(self.body, key=key, persist=False)
+
+        hasher.assert_not_called()
+        self.assertEqual(pdf_text.stats()["misses"], 1)
+        self.assertFalse(PdfTextExtract.objects.exists())
+
+    @override_settings(PDF_TEXT_PERSIST=True)
+    def test_ca_zip_worker_never_touches_the_db(self):
+        tmp = tempfile.mkdtemp(prefix="ca_zip_")
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        path = os.path.join(tmp, "ca.zip")
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("SPE7L726Q0901.PDF", self.body)
+        self.addCleanup(setattr, ca_parser, "_worker_zip", None)
+
+        with self.assertNumQueries(0):
+            out = ca_parser._parse_member_worker(path, "SPE7L726Q0901.PDF", "SPE7L726Q0901")
+        ca_parser._worker_zip.close()
+
+        self.assertIsNone(out["error"])
+        self.assertIn("MIL-STD-2073", out["packaging"]["packaging_standard"])
+        self.assertEqual(pdf_text.stats()["misses"], 1)
+        self.assertFalse(PdfTextExtract.objects.exists())
@@ -0,0 +1,67 @@
+"""Tests for cached / keyset Review Workbench prev-next navigation."""
+
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from sales.models import Solicitation, SolicitationLine
+from sales.services.workbench_nav import keyset_neighbors, list_neighbors
+from sales.views.solicitations import _build_list_queryset, _workbench_nav_from_list_qs
+
+
+class WorkbenchNavTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        base = date(2026, 11, 1)
+        dates = [base, None, base + timedelta(days=3), base, None, base + timedelta(days=1)]
+        statuses = ["New", "Active", "Active", "RESEARCH", "New", "Active"]
+        for i, (due, status) in enumerate(zip(dates, statuses)):
+            sol = Solicitation.objects.create(
+                solicitation_number=f"SPE7L726Q08{i:02d}",
+                return_by_date=due,
+                status=status,
+                match_count=i % 3,
+            )
+            SolicitationLine.objects.create(
+                solicitation=sol, nsn=f"59350112995{(i * 7) % 10}", line_number="0001"
+            )
+
+    def _expected(self, qs, pk):
+        ids = list(qs.values_list("pk", flat=True))
+        idx = ids.index(pk)
+        return (
+            ids[idx - 1] if idx else None,
+            ids[idx + 1] if idx + 1 < len(ids) else None,
+            idx + 1,
+            len(ids),
+        )
+
+    def test_keyset_matches_list_order_for_every_sort(self):
+        for sort in ("", "return_by_date", "-return_by_date", "status", "-match_count", "nsn"):
+            qs = _build_list_queryset({"sort": sort})
+            for pk in qs.values_list("pk", flat=True):
+                with self.subTest(sort=sort, pk=pk):
+                    self.assertEqual(keyset_neighbors(qs, pk), self._expected(qs, pk))
+
+    def test_row_outside_list_has_no_neighbors(self):
+        qs = _build_list_queryset({"status": "New"})
+        other = Solicitation.objects.get(solicitation_number="SPE7L726Q0801")
+        self.assertIsNone(keyset_neighbors(qs, other.pk))
+        self.assertIsNone(list_neighbors(qs, other.pk, "test-nav"))
+
+    def test_cached_list_serves_navigation_in_one_query(self):
+        sol = Solicitation.objects.get(solicitation_number="SPE7L726Q0802")
+        list_qs = "sort=-return_by_date&page=3"
+
+        first = _workbench_nav_from_list_qs(sol, list_qs)
+        with CaptureQueriesContext(connection) as ctx:
+            second = _workbench_nav_from_list_qs(sol, "page=1&sort=-return_by_date")
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(first[2:], (1, 6))
+        self.assertIsNone(first[0])
@@ -38,9 +38,8 @@ from sales.services.importer import (
     _import_date_from_filename,
     _run_lifecycle_sweep,
     create_import_batch,
-    parse_dibbs_files,
-    upsert_lines_and_sources,
-    upsert_solicitations,
+    stream_import,
+    summarize_dibbs_files,
 )
 
 logger = logging.getLogger(__name__)
@@ -307,9 +306,10 @@ def _open_files(job):
             f"Missing: {', '.join(missing)}"
         )
 
+    # BQ is opened binary: stream_import's BatchQuoteIndex seeks by byte offset.
     return (
         open(job.in_file_path, "r", encoding="utf-8", errors="replace"),
-        open(job.bq_file_path, "r", encoding="utf-8", errors="replace"),
+        open(job.bq_file_path, "rb"),
         open(job.as_file_path, "r", encoding="utf-8", errors="replace"),
     )
 
@@ -364,7 +364,6 @@ def import_step_parse(request, job_id):
             "parse_errors": cached.get("parse_errors", 0),
             "new_to_active": cached.get("new_to_active", 0),
             "expired_to_archived": cached.get("expired_to_archived", 0),
-            "blob_purged": cached.get("blob_purged", 0),
         })
 
     if job.status == ImportJob.STATUS_ERROR:
@@ -379,18 +378,17 @@ def import_step_parse(request, job_id):
 
             in_f, bq_f, as_f = _open_files(job)
             try:
-                parsed = parse_dibbs_files(in_f, bq_f, as_f)
+                summary = summarize_dibbs_files(in_f, bq_f, as_f)
             finally:
                 in_f.close(); bq_f.close(); as_f.close()
 
-            summary     = parsed["summary"]
             import_date = _import_date_from_filename(job.in_file_name)
             from datetime import date
             if not import_date:
                 import_date = date.today()
 
             batch = create_import_batch(
-                parsed,
+                {"summary": summary},
                 job.in_file_name or "",
                 job.bq_file_name or "",
                 job.as_file_name or "",
@@ -408,7 +406,6 @@ def import_step_parse(request, job_id):
                 "parse_errors": summary["parse_error_count"],
                 "new_to_active": lifecycle_counts["new_to_active"],
                 "expired_to_archived": lifecycle_counts["expired_to_archived"],
-                "blob_purged": lifecycle_counts["blob_purged"],
             })
 
         return JsonResponse({
@@ -420,7 +417,6 @@ def import_step_parse(request, job_id):
             "parse_errors": summary["parse_error_count"],
             "new_to_active": lifecycle_counts["new_to_active"],
             "expired_to_archived": lifecycle_counts["expired_to_archived"],
-            "blob_purged": lifecycle_counts["blob_purged"],
         })
 
     except Exception as exc:
@@ -459,11 +455,12 @@ def import_step_solicitations(request, job_id):
 
         in_f, bq_f, as_f = _open_files(job)
         try:
-            parsed = parse_dibbs_files(in_f, bq_f, as_f)
+            result = stream_import(
+                in_f, bq_f, as_f, batch, job.import_date, steps=("solicitations",)
+            )["solicitations"]
         finally:
             in_f.close(); bq_f.close(); as_f.close()
 
-        result = upsert_solicitations(parsed, batch, job.import_date)
         _save_step(job, ImportJob.STATUS_SOLS, {
             "sols_created": result["created"],
             "sols_updated": result["updated"],
@@ -512,11 +509,12 @@ def import_step_lines(request, job_id):
 
         in_f, bq_f, as_f = _open_files(job)
         try:
-            parsed = parse_dibbs_files(in_f, bq_f, as_f)
+            result = stream_import(
+                in_f, bq_f, as_f, batch, job.import_date, steps=("lines",)
+            )["lines"]
         finally:
             in_f.close(); bq_f.close(); as_f.close()
 
-        result = upsert_lines_and_sources(parsed, batch)
         _save_step(job, ImportJob.STATUS_LINES, {
             "lines_created": result["lines_created"],
             "lines_updated": result["lines_updated"],
@@ -630,6 +628,7 @@ def import_batch_delete(request, batch_id):
     """
     from django.db import transaction
     from sales.models import Solicitation, SolicitationLine, ApprovedSource
+    from sales.services.match_index import invalidate
 
     try:
         batch = ImportBatch.objects.get(pk=batch_id)
@@ -643,6 +642,8 @@ def import_batch_delete(request, batch_id):
         sol_ids  = list(new_sols.values_list("id", flat=True))
 
         as_deleted, _  = ApprovedSource.objects.filter(import_batch=batch).delete()
+        if as_deleted:
+            invalidate("approved")
         ln_deleted, _  = SolicitationLine.objects.filter(solicitation_id__in=sol_ids).delete()
         sol_deleted, _ = new_sols.delete()
         batch.delete()
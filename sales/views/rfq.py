@@ -57,8 +57,8 @@ logger = logging.getLogger(__name__)
 
 
 def _mark_solicitation_pdf_fetch_pending_if_needed(solicitation: Solicitation) -> None:
-    """When a sol is queued for RFQ, flag background PDF fetch if no blob yet."""
-    if not solicitation.pdf_blob:
+    """When a sol is queued for RFQ, flag background PDF fetch if no PDF yet."""
+    if not solicitation.has_pdf:
         solicitation.pdf_fetch_status = "PENDING"
         solicitation.save(update_fields=["pdf_fetch_status"])
 
@@ -1546,7 +1546,7 @@ def _rfq_queue_template_context():
         if sol.pk not in g["_sol_ids"]:
             g["_sol_ids"].add(sol.pk)
             g["sols"].append(sol)
-        if not getattr(sol, "pdf_blob", None) or not sol.pdf_blob:
+        if not sol.has_pdf:
             g["has_missing_pdfs"] = True
 
     grouped_queue = []
@@ -1786,9 +1786,10 @@ def rfq_preview_email(request, cage_code):
 def rfq_queue_fetch_pdfs(request):
     """
     POST: supplier_ids[] (list of int).
-    Fetch PDFs for QUEUED rfqs of those suppliers where pdf_blob is missing.
+    Fetch PDFs for QUEUED rfqs of those suppliers with no PDF on file.
     Return JSON { fetched: N, failed: M }.
     """
+    from sales.services.blob_store import pdf_update_fields
     from sales.services.dibbs_pdf import fetch_pdfs_for_sols, persist_pdf_procurement_extract
 
     raw_ids = request.POST.getlist("supplier_ids[]") or request.POST.getlist("supplier_ids")
@@ -1807,7 +1808,7 @@ def rfq_queue_fetch_pdfs(request):
     sol_numbers = []
     for rfq in queued:
         sol = rfq.line.solicitation
-        if not getattr(sol, "pdf_blob", None) or not sol.pdf_blob:
+        if not sol.has_pdf:
             sol_numbers.append(sol.solicitation_number)
     sol_numbers = list(dict.fromkeys(sol_numbers))
 
@@ -1821,12 +1822,13 @@ def rfq_queue_fetch_pdfs(request):
     for sol_number, body in results.items():
         if body and len(body) > 0:
             key = (sol_number or "").strip().upper()
+            fields = pdf_update_fields(body)
             Solicitation.objects.filter(solicitation_number=sol_number).update(
-                pdf_blob=body,
+                **fields,
                 pdf_fetched_at=now,
                 pdf_fetch_status="DONE",
             )
-            persist_pdf_procurement_extract(key, body)
+            persist_pdf_procurement_extract(key, body, blob_key=fields["pdf_blob_key"])
             fetched += 1
         else:
             failed += 1
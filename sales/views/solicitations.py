@@ -22,7 +22,7 @@ from django.db.models import (
     Value,
 )
 from django.db.models.functions import Replace
-from django.http import HttpResponse, JsonResponse
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
 from django.urls import reverse
 from django.contrib import messages
@@ -509,7 +509,8 @@ def _apply_list_sort(qs, sort_param):
     else:
         order_field = sort_field
 
-    order_by = ('-' + order_field,) if sort_desc else (order_field,)
+    # pk tiebreaker: a total order keeps list pages and workbench prev/next aligned.
+    order_by = ('-' + order_field, 'pk') if sort_desc else (order_field, 'pk')
     return qs.order_by(*order_by)
 
 
@@ -525,22 +526,43 @@ def _build_list_queryset(params):
     return qs
 
 
-def _workbench_nav_from_list_qs(solicitation, list_qs_raw):
-    """Prev/next sol numbers and 1-based index using list_qs + _build_list_queryset."""
-    if not (list_qs_raw or '').strip():
-        return None, None, None, None
+def _list_nav_neighbors(solicitation, list_qs_raw):
+    """
+    (prev_pk, next_pk, index, total) of solicitation in the list_qs list order,
+    via sales.services.workbench_nav (cached id list / keyset); None if absent.
+    """
+    from sales.services.workbench_nav import filter_cache_key, list_neighbors
+
+    enc = (list_qs_raw or '').strip()
+    if not enc:
+        return None
     try:
-        list_params = dict(
-            urllib.parse.parse_qsl(list_qs_raw, keep_blank_values=True)
+        list_params = _normalize_filter_params_dict(
+            dict(urllib.parse.parse_qsl(enc, keep_blank_values=True))
         )
         nav_qs = _build_list_queryset(list_params)
-        sol_numbers = list(nav_qs.values_list('solicitation_number', flat=True))
-        idx = sol_numbers.index(solicitation.solicitation_number)
-        prev_sol = sol_numbers[idx - 1] if idx > 0 else None
-        next_sol = sol_numbers[idx + 1] if idx < len(sol_numbers) - 1 else None
-        return prev_sol, next_sol, idx + 1, len(sol_numbers)
-    except (ValueError, Exception):
+        return list_neighbors(nav_qs, solicitation.pk, filter_cache_key(list_params))
+    except Exception:
+        return None
+
+
+def _sol_numbers_by_pk(pks):
+    pks = [pk for pk in pks if pk is not None]
+    if not pks:
+        return {}
+    return dict(
+        Solicitation.objects.filter(pk__in=pks).values_list('pk', 'solicitation_number')
+    )
+
+
+def _workbench_nav_from_list_qs(solicitation, list_qs_raw):
+    """Prev/next sol numbers and 1-based index in list_qs order (see _list_nav_neighbors)."""
+    nav = _list_nav_neighbors(solicitation, list_qs_raw)
+    if nav is None:
         return None, None, None, None
+    prev_pk, next_pk, num, total = nav
+    numbers = _sol_numbers_by_pk([prev_pk, next_pk])
+    return numbers.get(prev_pk), numbers.get(next_pk), num, total
 
 
 def _workbench_record_counter(solicitation, list_qs_raw, request):
@@ -570,22 +592,15 @@ def _workbench_record_counter(solicitation, list_qs_raw, request):
 
 def _capture_workbench_list_nav_snapshot(list_qs_raw, sol):
     """
-    Snapshot (sol_numbers, idx) from list_qs filters before a PASS mutates status to NO_BID.
-    After PASS, _build_list_queryset() often omits the current row, so post-save index fails.
+    Next sol number in list_qs order, captured before a PASS mutates status to NO_BID.
+    After PASS, _build_list_queryset() often omits the current row, so post-save lookup fails.
+    Returns None when list_qs is absent or sol is not in the list; "" at the end of the list.
     """
-    enc = (list_qs_raw or "").strip()
-    if not enc:
-        return None
-    try:
-        list_params = dict(
-            urllib.parse.parse_qsl(enc, keep_blank_values=True)
-        )
-        nav_qs = _build_list_queryset(list_params)
-        sol_numbers = list(nav_qs.values_list("solicitation_number", flat=True))
-        idx = sol_numbers.index(sol.solicitation_number)
-        return (sol_numbers, idx)
-    except (ValueError, Exception):
+    nav = _list_nav_neighbors(sol, list_qs_raw)
+    if nav is None:
         return None
+    next_pk = nav[1]
+    return _sol_numbers_by_pk([next_pk]).get(next_pk, "")
 
 
 def _redirect_after_workbench_action(
@@ -599,36 +614,19 @@ def _redirect_after_workbench_action(
     """
     After research / pass / next: next item in list_qs order (skip current), else session queue.
     queue_kind_before_mutate: _infer_queue_kind(sol) before any status-changing save.
-    list_nav_snapshot: optional (sol_numbers, idx) from _capture_workbench_list_nav_snapshot
+    list_nav_snapshot: optional next sol number from _capture_workbench_list_nav_snapshot
     for PASS — same navigation intent as RESEARCH when list_qs is present.
     """
     enc = (list_qs_raw or "").strip()
     if enc:
-        sol_numbers = None
-        idx = None
-        if list_nav_snapshot is not None:
-            sol_numbers, idx = list_nav_snapshot
-        else:
-            try:
-                list_params = dict(
-                    urllib.parse.parse_qsl(enc, keep_blank_values=True)
-                )
-                nav_qs = _build_list_queryset(list_params)
-                sol_numbers = list(nav_qs.values_list("solicitation_number", flat=True))
-                idx = sol_numbers.index(sol.solicitation_number)
-            except (ValueError, Exception):
-                pass
-        if sol_numbers is not None and idx is not None:
-            for j in range(idx + 1, len(sol_numbers)):
-                sn = sol_numbers[j]
-                cand = Solicitation.objects.filter(solicitation_number=sn).first()
-                if not cand:
-                    continue
-                q = urllib.parse.urlencode({"list_qs": enc})
-                return redirect(
-                    f"{reverse('sales:solicitation_detail', args=[sn])}?{q}"
-                )
-        q = urllib.parse.urlencode({"list_qs": enc})
+        next_sn = list_nav_snapshot
+        if next_sn is None:
+            next_sn = _workbench_nav_from_list_qs(sol, enc)[1]
+        if next_sn:
+            q = urllib.parse.urlencode({"list_qs": enc})
+            return redirect(
+                f"{reverse('sales:solicitation_detail', args=[next_sn])}?{q}"
+            )
         messages.success(request, "End of list for current filters.")
         return redirect(f"{reverse('sales:solicitation_list')}?{enc}")
 
@@ -992,7 +990,7 @@ def _workbench_procurement_packaging_context(solicitation, line):
         "procurement_history": procurement_history,
         "packaging": packaging,
         "sol_number": solicitation.solicitation_number,
-        "has_pdf_blob": bool(solicitation.pdf_blob),
+        "has_pdf_blob": solicitation.has_pdf,
     }
 
 
@@ -1059,18 +1057,20 @@ def solicitation_history_packaging_partial(request, sol_number):
 def solicitation_reparse(request, sol_number):
     """
     Re-run PDF text extraction for procurement history (Section A/B) and
-    packaging (Section D) using the stored pdf_blob.
+    packaging (Section D) using the stored PDF.
     """
+    from sales.services.blob_store import read_solicitation_pdf
     from sales.services.dibbs_pdf import (
         parse_packaging_data,
         parse_procurement_history,
         save_procurement_history,
         save_sol_packaging,
     )
+    from sales.services.pdf_text import pdf_text_key
 
     sol = get_object_or_404(Solicitation, solicitation_number=sol_number)
-    blob = sol.pdf_blob
-    if not blob:
+    body = read_solicitation_pdf(sol)
+    if not body:
         return JsonResponse(
             {
                 "ok": False,
@@ -1082,11 +1082,11 @@ def solicitation_reparse(request, sol_number):
             status=400,
         )
 
-    body = bytes(blob)
     key = sol.solicitation_number.strip().upper()
-    rows = parse_procurement_history(body, key)
+    text_key = pdf_text_key(body)
+    rows = parse_procurement_history(body, key, text_key=text_key)
     hist_saved = save_procurement_history(rows)
-    pack = parse_packaging_data(body, key)
+    pack = parse_packaging_data(body, key, text_key=text_key)
     pack_saved = save_sol_packaging(key, pack)
 
     now = timezone.now()
@@ -1118,7 +1118,7 @@ def sol_analyze(request, sol_number):
 
     sol = get_object_or_404(Solicitation, solicitation_number=sol_number)
 
-    if not sol.pdf_blob:
+    if not sol.has_pdf:
         return JsonResponse(
             {
                 "error": (
@@ -1135,9 +1135,10 @@ def sol_analyze(request, sol_number):
         return JsonResponse({"error": "Invalid request body."}, status=400)
 
     try:
+        from ..services.blob_store import read_solicitation_pdf
         from ..services.sol_analysis import analyze_solicitation_pdf, save_analysis_result
 
-        result = analyze_solicitation_pdf(bytes(sol.pdf_blob), sol_number, model_key)
+        result = analyze_solicitation_pdf(read_solicitation_pdf(sol), sol_number, model_key)
         try:
             save_analysis_result(sol, result, model_key)
         except Exception as e:
@@ -1153,20 +1154,114 @@ def sol_analyze(request, sol_number):
         return JsonResponse({"error": f"Analysis failed: {str(e)}"}, status=500)
 
 
+def _parse_byte_range(header: str, size: int):
+    """
+    (start, end) inclusive for a single ``bytes=`` Range header, or None when
+    absent, malformed or multi-range (those get the full body). Raises
+    ValueError when the range cannot be satisfied.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, sep, last = header[6:].strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if first == "":
+            length = int(last)
+            if length <= 0:
+                raise ValueError("empty suffix range")
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        if first.isdigit() or last.isdigit():
+            raise
+        return None
+    if start >= size or end < start:
+        raise ValueError("range not satisfiable")
+    return start, min(end, size - 1)
+
+
+def _read_range(f, remaining: int):
+    try:
+        while remaining > 0:
+            chunk = f.read(min(64 * 1024, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+
+def _blob_pdf_response(request, key: str, filename: str):
+    """
+    Stream a stored PDF with ETag (the content hash) and single-range support.
+    Returns None when the blob is missing from the store.
+    """
+    from sales.services.blob_store import get_blob_store
+
+    store = get_blob_store()
+    try:
+        size = store.size(key)
+    except FileNotFoundError:
+        return None
+
+    etag = f'"{key}"'
+    if etag in [t.strip() for t in request.headers.get("If-None-Match", "").split(",")]:
+        resp = HttpResponse(status=304)
+        resp["ETag"] = etag
+        return resp
+
+    try:
+        byte_range = _parse_byte_range(request.headers.get("Range", ""), size)
+    except ValueError:
+        resp = HttpResponse(status=416)
+        resp["Content-Range"] = f"bytes */{size}"
+        return resp
+    if_range = request.headers.get("If-Range")
+    if byte_range and if_range and if_range.strip() != etag:
+        byte_range = None
+
+    f = store.open(key)
+    if byte_range is None:
+        resp = FileResponse(f, content_type="application/pdf")
+        resp["Content-Length"] = str(size)
+    else:
+        start, end = byte_range
+        f.seek(start)
+        resp = StreamingHttpResponse(
+            _read_range(f, end - start + 1), status=206, content_type="application/pdf"
+        )
+        resp["Content-Range"] = f"bytes {start}-{end}/{size}"
+        resp["Content-Length"] = str(end - start + 1)
+    resp["ETag"] = etag
+    resp["Accept-Ranges"] = "bytes"
+    resp["Cache-Control"] = "private, no-cache"
+    resp["Content-Disposition"] = f'inline; filename="{filename}"'
+    return resp
+
+
 @login_required
 def solicitation_pdf_view(request, sol_number):
+    from sales.services.blob_store import store_solicitation_pdf
     from sales.services.dibbs_pdf import fetch_pdf_for_sol
 
+    solicitation = get_object_or_404(
+        Solicitation.objects.defer("pdf_blob"), solicitation_number=sol_number
+    )
+    filename = solicitation.pdf_file_name or f"{solicitation.solicitation_number}.pdf"
 
-    solicitation = get_object_or_404(Solicitation, solicitation_number=sol_number)
+    if not solicitation.pdf_blob_key and solicitation.pdf_blob:
+        # Not yet moved by migrate_pdf_blobs: move it now, then stream from the store.
+        store_solicitation_pdf(solicitation, solicitation.pdf_blob)
+        solicitation.save(update_fields=["pdf_blob_key", "pdf_blob"])
 
-    if solicitation.pdf_blob:
-        payload = bytes(solicitation.pdf_blob)
-        resp = HttpResponse(payload, content_type="application/pdf")
-        filename = solicitation.pdf_file_name or f"{solicitation.solicitation_number}.pdf"
-        resp["Content-Disposition"] = f'inline; filename="{filename}"'
-        resp["X-SBZ-PDF-From-Cache"] = "1"
-        return resp
+    if solicitation.pdf_blob_key:
+        resp = _blob_pdf_response(request, solicitation.pdf_blob_key, filename)
+        if resp is not None:
+            resp["X-SBZ-PDF-From-Cache"] = "1"
+            return resp
 
     solicitation.pdf_fetch_status = "FETCHING"
     solicitation.save(update_fields=["pdf_fetch_status"])
@@ -1175,20 +1270,23 @@ def solicitation_pdf_view(request, sol_number):
     now = timezone.now()
 
     if body:
-        solicitation.pdf_blob = body
+        store_solicitation_pdf(solicitation, body)
         solicitation.pdf_fetched_at = now
         solicitation.pdf_fetch_status = "DONE"
         solicitation.pdf_data_pulled = now
         solicitation.save(
             update_fields=[
+                "pdf_blob_key",
                 "pdf_blob",
                 "pdf_fetched_at",
                 "pdf_fetch_status",
                 "pdf_data_pulled",
             ]
         )
-        resp = HttpResponse(body, content_type="application/pdf")
-        resp["Content-Disposition"] = f'inline; filename="{sol_number}.pdf"'
+        resp = _blob_pdf_response(request, solicitation.pdf_blob_key, f"{sol_number}.pdf")
+        if resp is None:
+            resp = HttpResponse(body, content_type="application/pdf")
+            resp["Content-Disposition"] = f'inline; filename="{sol_number}.pdf"'
         resp["X-SBZ-PDF-Fresh"] = "1"
         return resp
 
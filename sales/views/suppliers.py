@@ -1,6 +1,7 @@
 """
 Supplier-related views: list, detail, add/remove NSN and FSC capabilities.
 """
+import logging
 import re
 from io import StringIO
 
@@ -23,8 +24,19 @@ from sales.models import (
     SupplierQuote,
     NoQuoteCAGE,
 )
+from sales.services.matching import rematch_open_lines
 from sales.services.no_quote import normalize_cage_code
 
+logger = logging.getLogger(__name__)
+
+
+def _rematch_after_capability_edit(nsns=(), fscs=()):
+    """Targeted re-match of open lines for edited capabilities; never fails the request."""
+    try:
+        rematch_open_lines(nsns=nsns, fscs=fscs)
+    except Exception:
+        logger.exception("Targeted re-match failed for nsns=%s fscs=%s", nsns, fscs)
+
 
 @login_required
 def supplier_list(request):
@@ -103,6 +115,7 @@ def supplier_add_nsn(request, supplier_id):
         created_count = 0
         duplicate_count = 0
         valid_count = 0
+        created_values = []
 
         for raw_line in lines:
             line = raw_line.strip()
@@ -120,6 +133,7 @@ def supplier_add_nsn(request, supplier_id):
             )
             if created:
                 created_count += 1
+                created_values.append(normalized)
             else:
                 duplicate_count += 1
 
@@ -127,6 +141,9 @@ def supplier_add_nsn(request, supplier_id):
             messages.error(request, "No valid NSNs to add. Enter one 13-digit NSN per line.")
             return _supplier_capabilities_redirect(supplier.pk)
 
+        if created_values:
+            _rematch_after_capability_edit(nsns=created_values)
+
         if created_count:
             messages.success(
                 request,
@@ -167,6 +184,7 @@ def supplier_add_fsc(request, supplier_id):
         created_count = 0
         duplicate_count = 0
         valid_count = 0
+        created_values = []
 
         for raw_line in lines:
             line = raw_line.strip()
@@ -184,6 +202,7 @@ def supplier_add_fsc(request, supplier_id):
             )
             if created:
                 created_count += 1
+                created_values.append(value)
             else:
                 duplicate_count += 1
 
@@ -194,6 +213,9 @@ def supplier_add_fsc(request, supplier_id):
             )
             return _supplier_capabilities_redirect(supplier.pk)
 
+        if created_values:
+            _rematch_after_capability_edit(fscs=created_values)
+
         if created_count:
             messages.success(
                 request,
@@ -228,7 +250,11 @@ def supplier_remove_nsn(request, supplier_id):
     supplier = get_object_or_404(Supplier, pk=supplier_id)
     nsn_id = request.POST.get("nsn_id")
     if nsn_id:
-        SupplierNSN.objects.filter(supplier=supplier, pk=nsn_id).delete()
+        qs = SupplierNSN.objects.filter(supplier=supplier, pk=nsn_id)
+        nsns = list(qs.values_list("nsn", flat=True))
+        qs.delete()
+        if nsns:
+            _rematch_after_capability_edit(nsns=nsns)
         messages.success(request, "NSN capability removed.")
     return _supplier_capabilities_redirect(supplier.pk)
 
@@ -240,7 +266,11 @@ def supplier_remove_fsc(request, supplier_id):
     supplier = get_object_or_404(Supplier, pk=supplier_id)
     fsc_id = request.POST.get("fsc_id")
     if fsc_id:
-        SupplierFSC.objects.filter(supplier=supplier, pk=fsc_id).delete()
+        qs = SupplierFSC.objects.filter(supplier=supplier, pk=fsc_id)
+        fscs = list(qs.values_list("fsc_code", flat=True))
+        qs.delete()
+        if fscs:
+            _rematch_after_capability_edit(fscs=fscs)
         messages.success(request, "FSC capability removed.")
     return _supplier_capabilities_redirect(supplier.pk)
 
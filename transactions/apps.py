@@ -7,4 +7,6 @@ class TransactionsConfig(AppConfig):
     verbose_name = "Field change transactions"
 
     def ready(self):
-        import transactions.signals  # noqa: F401
+        from transactions.signals import install_snapshot_hooks
+
+        install_snapshot_hooks()
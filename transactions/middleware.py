@@ -27,5 +27,3 @@ class TransactionUserMiddleware:
             return self.get_response(request)
         finally:
             set_current_user(None)
-            from .signals import clear_old_state
-            clear_old_state()
@@ -1,17 +1,34 @@
 """
-Record field changes as Transaction rows for Contract and Clin (tracked fields only).
-Uses pre_save to capture old values and post_save to create Transaction records.
+Record field changes as Transaction rows for the models in TRACKED.
+
+Old values come from a snapshot of the tracked fields taken when the row is
+loaded (install_snapshot_hooks wraps from_db / refresh_from_db on every
+tracked model), so a save no longer re-SELECTs the row first. pre_save only
+queries for tracked fields the snapshot lacks (instances built by hand or
+loaded with .only()). post_save diffs against the snapshot, refreshes it, and
+queues the Transaction rows on the write's transaction
+(core.commit_hooks.on_commit_batch): the saves in an atomic block are written
+by one bulk_create on commit, less any made in a savepoint that rolled back.
+Outside atomic they are written straight away.
+
+Code paths that use QuerySet.bulk_update() on tracked fields call
+bulk_update_with_audit() instead, which records the same rows.
 """
-import contextvars
+import logging
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import router, transaction
 from django.db.models.signals import pre_save, post_save
 from django.dispatch import receiver
-from django.contrib.contenttypes.models import ContentType
 
 from contracts.models import ClinSplit, ClinShipment, Clin, Contract, ContractLevelCharge
+from core.commit_hooks import on_commit_batch
 from suppliers.models import Supplier
 from .models import Transaction
 from .middleware import get_current_user
 
+logger = logging.getLogger(__name__)
+
 # Fields we track: (model_class, field_name)
 TRACKED = [
     (Contract, "contract_number"),
@@ -70,24 +87,15 @@ TRACKED = [
     (Supplier, "website_url"),
 ]
 
-# Request-scoped store of "old" instance state before save (keyed by model class + pk)
-_old_state_var = contextvars.ContextVar("transactions_old_state", default=None)
+# {model_class: {field_name: attname}}, built from TRACKED
+TRACKED_FIELDS = {}
+for _model, _name in TRACKED:
+    TRACKED_FIELDS.setdefault(_model, {})[_name] = _model._meta.get_field(_name).attname
 
+_SNAPSHOT_ATTR = "_audit_snapshot"
 
-def _get_old_state():
-    d = _old_state_var.get()
-    if d is None:
-        d = {}
-        _old_state_var.set(d)
-    return d
-
-
-def clear_old_state():
-    """Call from middleware at end of request so state doesn't leak between requests."""
-    try:
-        _old_state_var.set(None)
-    except LookupError:
-        pass
+# MSSQL caps a statement at 2100 parameters.
+_PK_CHUNK = 1000
 
 
 def _serialize(value):
@@ -100,158 +108,161 @@ def _serialize(value):
     return str(value)
 
 
-@receiver(pre_save)
-def store_old_state(sender, instance, **kwargs):
-    if not instance.pk:
+def _tracked(model):
+    return TRACKED_FIELDS.get(model._meta.concrete_model)
+
+
+def _wanted(fields, update_fields):
+    """Tracked field names a save touches (all of them unless update_fields narrows it)."""
+    if update_fields is None:
+        return list(fields)
+    return [name for name, attname in fields.items() if name in update_fields or attname in update_fields]
+
+
+def _snapshot(instance, names=None):
+    """Copy the loaded values of tracked fields ``names`` (default: all) into the snapshot."""
+    fields = _tracked(type(instance))
+    if not fields:
         return
-    old_state = _get_old_state()
-    key = (sender, instance.pk)
-    if sender is Contract:
-        try:
-            row = Contract.objects.filter(pk=instance.pk).values(
-                "contract_number", "po_number", "tab_num", "buyer_id",
-                "due_date", "award_date", "sales_class_id", "solicitation_type",
-                "plan_gross",
-            ).first()
-            if row is not None:
-                old_state[key] = {
-                    "contract_number": _serialize(row.get("contract_number")),
-                    "po_number": _serialize(row.get("po_number")),
-                    "tab_num": _serialize(row.get("tab_num")),
-                    "buyer": _serialize(row.get("buyer_id")),
-                    "due_date": _serialize(row.get("due_date")),
-                    "award_date": _serialize(row.get("award_date")),
-                    "sales_class": _serialize(row.get("sales_class_id")),
-                    "solicitation_type": _serialize(row.get("solicitation_type")),
-                    "plan_gross": _serialize(row.get("plan_gross")),
-                }
-        except Exception:
-            pass
-    elif sender is Clin:
-        try:
-            row = Clin.objects.filter(pk=instance.pk).values(
-                "item_type", "clin_po_num", "supplier_id", "nsn_id", "ia", "fob",
-                "special_payment_terms_id", "supplier_due_date", "due_date",
-                "order_qty", "ship_qty", "ship_date", "item_value", "quote_value",
-                "unit_price", "price_per_unit", "uom",
-            ).first()
-            if row is not None:
-                old_state[key] = {
-                    "item_type": _serialize(row.get("item_type")),
-                    "clin_po_num": _serialize(row.get("clin_po_num")),
-                    "supplier": _serialize(row.get("supplier_id")),
-                    "nsn": _serialize(row.get("nsn_id")),
-                    "ia": _serialize(row.get("ia")),
-                    "fob": _serialize(row.get("fob")),
-                    "special_payment_terms": _serialize(row.get("special_payment_terms_id")),
-                    "supplier_due_date": _serialize(row.get("supplier_due_date")),
-                    "due_date": _serialize(row.get("due_date")),
-                    "order_qty": _serialize(row.get("order_qty")),
-                    "ship_qty": _serialize(row.get("ship_qty")),
-                    "ship_date": _serialize(row.get("ship_date")),
-                    "item_value": _serialize(row.get("item_value")),
-                    "quote_value": _serialize(row.get("quote_value")),
-                    "unit_price": _serialize(row.get("unit_price")),
-                    "price_per_unit": _serialize(row.get("price_per_unit")),
-                    "uom": _serialize(row.get("uom")),
-                }
-        except Exception:
-            pass
-    elif sender is ClinShipment:
-        try:
-            row = ClinShipment.objects.filter(pk=instance.pk).values("pod_date").first()
-            if row is not None:
-                old_state[key] = {
-                    "pod_date": _serialize(row.get("pod_date")),
-                }
-        except Exception:
-            pass
-    elif sender is ClinSplit:
-        try:
-            row = ClinSplit.objects.filter(pk=instance.pk).values("split_paid").first()
-            if row is not None:
-                old_state[key] = {
-                    "split_paid": _serialize(row.get("split_paid")),
-                }
-        except Exception:
-            pass
-    elif sender is ContractLevelCharge:
-        try:
-            row = ContractLevelCharge.objects.filter(pk=instance.pk).values(
-                "label", "action_type", "supplier_id", "estimated_amount",
-                "billed_paid_amount", "payment_date", "invoice_number"
-            ).first()
-            if row is not None:
-                old_state[key] = {
-                    "label": _serialize(row.get("label")),
-                    "action_type": _serialize(row.get("action_type")),
-                    "supplier": _serialize(row.get("supplier_id")),
-                    "estimated_amount": _serialize(row.get("estimated_amount")),
-                    "billed_paid_amount": _serialize(row.get("billed_paid_amount")),
-                    "payment_date": _serialize(row.get("payment_date")),
-                    "invoice_number": _serialize(row.get("invoice_number")),
-                }
-        except Exception:
-            pass
-    elif sender is Supplier:
-        try:
-            row = Supplier.objects.filter(pk=instance.pk).values(
-                "name", "cage_code", "dodaac", "allows_gsi", "probation", "conditional", "archived",
-                "iso", "ppi", "special_terms_id", "supplier_type_id", "prime", "is_packhouse",
-                "business_phone", "primary_phone", "business_email", "primary_email", "website_url",
-            ).first()
-            if row is not None:
-                old_state[key] = {
-                    "name": _serialize(row.get("name")),
-                    "cage_code": _serialize(row.get("cage_code")),
-                    "dodaac": _serialize(row.get("dodaac")),
-                    "allows_gsi": _serialize(row.get("allows_gsi")),
-                    "probation": _serialize(row.get("probation")),
-                    "conditional": _serialize(row.get("conditional")),
-                    "archived": _serialize(row.get("archived")),
-                    "iso": _serialize(row.get("iso")),
-                    "ppi": _serialize(row.get("ppi")),
-                    "special_terms": _serialize(row.get("special_terms_id")),
-                    "supplier_type": _serialize(row.get("supplier_type_id")),
-                    "prime": _serialize(row.get("prime")),
-                    "is_packhouse": _serialize(row.get("is_packhouse")),
-                    "business_phone": _serialize(row.get("business_phone")),
-                    "primary_phone": _serialize(row.get("primary_phone")),
-                    "business_email": _serialize(row.get("business_email")),
-                    "primary_email": _serialize(row.get("primary_email")),
-                    "website_url": _serialize(row.get("website_url")),
-                }
-        except Exception:
-            pass
+    snapshot = instance.__dict__.setdefault(_SNAPSHOT_ATTR, {})
+    for name in fields if names is None else names:
+        attname = fields[name]
+        if attname in instance.__dict__:  # deferred fields are absent
+            snapshot[name] = _serialize(instance.__dict__[attname])
 
 
-@receiver(post_save)
-def record_transactions(sender, instance, **kwargs):
-    old_state = _get_old_state()
-    key = (sender, instance.pk)
-    old = old_state.pop(key, None)
-    if not old:
+def install_snapshot_hooks():
+    """Snapshot tracked fields whenever a tracked model is loaded or refreshed."""
+    for model, fields in TRACKED_FIELDS.items():
+        if "_audit_from_db" in model.__dict__:
+            continue
+        original_from_db = model.from_db.__func__
+        original_refresh = model.refresh_from_db
+
+        def from_db(cls, db, field_names, values, _original=original_from_db):
+            instance = _original(cls, db, field_names, values)
+            _snapshot(instance)
+            return instance
+
+        def refresh_from_db(self, using=None, fields=None, _original=original_refresh, _tracked_fields=fields):
+            _original(self, using=using, fields=fields)
+            if fields is None:
+                _snapshot(self)
+            else:
+                _snapshot(self, [n for n, a in _tracked_fields.items() if n in fields or a in fields])
+
+        model.from_db = classmethod(from_db)
+        model.refresh_from_db = refresh_from_db
+        model._audit_from_db = True
+
+
+def _fill_snapshots(model, instances, names):
+    """One SELECT (per chunk) for tracked fields the instances' snapshots lack."""
+    fields = TRACKED_FIELDS[model]
+    missing = {}
+    for instance in instances:
+        snapshot = instance.__dict__.get(_SNAPSHOT_ATTR) or {}
+        lacking = [n for n in names if n not in snapshot]
+        if lacking:
+            missing[instance.pk] = (instance, lacking)
+    if not missing:
         return
-    user = get_current_user()
+    needed = sorted({n for _, lacking in missing.values() for n in lacking})
+    pks = list(missing)
     try:
-        ct = ContentType.objects.get_for_model(sender)
+        for i in range(0, len(pks), _PK_CHUNK):
+            rows = model._base_manager.filter(pk__in=pks[i:i + _PK_CHUNK]).values(
+                "pk", *[fields[n] for n in needed]
+            )
+            for row in rows:
+                instance, lacking = missing[row["pk"]]
+                snapshot = instance.__dict__.setdefault(_SNAPSHOT_ATTR, {})
+                for name in lacking:
+                    snapshot[name] = _serialize(row[fields[name]])
     except Exception:
-        return
+        logger.exception("transactions: could not load old values for %s", model.__name__)
 
-    for model_class, field_name in TRACKED:
-        if model_class is not sender:
-            continue
-        if field_name not in old:
+
+def _diff(instance, names, user):
+    """Unsaved Transaction rows for tracked fields that differ from the snapshot."""
+    snapshot = instance.__dict__.get(_SNAPSHOT_ATTR) or {}
+    fields = _tracked(type(instance))
+    ct = None
+    rows = []
+    for name in names:
+        if name not in snapshot:
             continue
-        old_val = old[field_name]
-        new_val = _serialize(getattr(instance, field_name, None))
+        old_val = snapshot[name]
+        new_val = _serialize(getattr(instance, fields[name], None))
         if old_val == new_val:
             continue
-        Transaction.objects.create(
+        if ct is None:
+            ct = ContentType.objects.get_for_model(type(instance))
+        rows.append(Transaction(
             content_type=ct,
             object_id=instance.pk,
-            field_name=field_name,
+            field_name=name,
             old_value=old_val,
             new_value=new_val,
             user=user,
-        )
+        ))
+    return rows
+
+
+def _write_audit_rows(items):
+    """on_commit_batch flush: one bulk_create for a transaction's ``(using, rows)`` items."""
+    using = items[0][0]
+    rows = [row for _, batch in items for row in batch]
+    try:
+        Transaction.objects.using(using).bulk_create(rows, batch_size=500)
+    except Exception:
+        logger.exception("transactions: could not write %d audit rows", len(rows))
+
+
+def _queue(rows, using):
+    on_commit_batch(_write_audit_rows, (using, rows), using=using)
+
+
+@receiver(pre_save)
+def store_old_state(sender, instance, update_fields=None, **kwargs):
+    fields = TRACKED_FIELDS.get(sender)
+    if not fields or not instance.pk:
+        return
+    _fill_snapshots(sender, [instance], _wanted(fields, update_fields))
+
+
+@receiver(post_save)
+def record_transactions(sender, instance, created=False, update_fields=None, using=None, **kwargs):
+    fields = TRACKED_FIELDS.get(sender)
+    if not fields:
+        return
+    names = _wanted(fields, update_fields)
+    rows = [] if created else _diff(instance, names, get_current_user())
+    _snapshot(instance, names)
+    if rows:
+        _queue(rows, using or router.db_for_write(sender))
+
+
+def bulk_update_with_audit(objs, fields, batch_size=None):
+    """
+    QuerySet.bulk_update(objs, fields) that records Transaction rows for
+    tracked fields, as save() would. Returns the number of rows updated.
+    """
+    objs = list(objs)
+    if not objs:
+        return 0
+    model = objs[0]._meta.concrete_model
+    tracked = TRACKED_FIELDS.get(model, {})
+    names = [name for name in fields if name in tracked]
+    using = router.db_for_write(model)
+    _fill_snapshots(model, objs, names)
+    user = get_current_user()
+    with transaction.atomic(using=using, savepoint=False):
+        updated = model._base_manager.using(using).bulk_update(objs, fields, batch_size=batch_size)
+        rows = []
+        for obj in objs:
+            rows.extend(_diff(obj, names, user))
+            _snapshot(obj, names)
+        if rows:
+            _queue(rows, using)
+    return updated
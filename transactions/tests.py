@@ -0,0 +1,127 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from contracts.models import Clin, Company, Contract
+from contracts.services.clin_po_sync import sync_po_number
+from transactions.middleware import set_current_user
+from transactions.models import Transaction
+from transactions.signals import bulk_update_with_audit
+
+
+def _selects(ctx, table):
+    return [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT") and table in q["sql"]]
+
+
+def _inserts(ctx):
+    return [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("INSERT") and "transactions_transaction" in q["sql"]]
+
+
+class AuditCaptureTests(TestCase):
+    def setUp(self):
+        self.company = Company.objects.create(name="Audit Co", slug="audit-co", is_active=True)
+        self.contract = Contract.objects.create(company=self.company, contract_number="SPE4A6-26-P-0100")
+        for n in range(1, 4):
+            Clin.objects.create(
+                company=self.company,
+                contract=self.contract,
+                item_number=f"000{n}",
+                clin_po_num="PO-1",
+                unit_price=Decimal("10.00"),
+            )
+        self.user = User.objects.create_user(username="auditor", password="pw")
+        set_current_user(self.user)
+        self.addCleanup(set_current_user, None)
+
+    def test_save_diffs_against_loaded_state_without_select(self):
+        clin = Clin.objects.filter(contract=self.contract).first()
+        clin.clin_po_num = "PO-2"
+        clin.unit_price = Decimal("12.00")
+
+        with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks(execute=True):
+            clin.save()
+
+        self.assertEqual(_selects(ctx, "contracts_clin"), [])
+        self.assertEqual(len(_inserts(ctx)), 1)
+        rows = {t.field_name: t for t in Transaction.objects.filter(object_id=clin.pk)}
+        self.assertEqual(set(rows), {"clin_po_num", "unit_price"})
+        self.assertEqual((rows["clin_po_num"].old_value, rows["clin_po_num"].new_value), ("PO-1", "PO-2"))
+        self.assertEqual(rows["unit_price"].user, self.user)
+
+        # The snapshot follows the save: saving again records nothing.
+        with self.captureOnCommitCallbacks(execute=True):
+            clin.save()
+        self.assertEqual(Transaction.objects.filter(object_id=clin.pk).count(), 2)
+
+    def test_atomic_block_writes_one_insert(self):
+        clins = list(Clin.objects.filter(contract=self.contract))
+
+        with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                for clin in clins:
+                    clin.clin_po_num = "PO-3"
+                    clin.save(update_fields=["clin_po_num"])
+                self.assertEqual(Transaction.objects.count(), 0)
+
+        self.assertEqual(len(_inserts(ctx)), 1)
+        self.assertEqual(Transaction.objects.filter(field_name="clin_po_num").count(), 3)
+
+    def test_rolled_back_savepoint_drops_its_rows(self):
+        first, second = list(Clin.objects.filter(contract=self.contract))[:2]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                first.clin_po_num = "PO-4"
+                first.save()
+                try:
+                    with transaction.atomic():
+                        second.clin_po_num = "PO-4"
+                        second.save()
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+
+        self.assertEqual(list(Transaction.objects.values_list("object_id", flat=True)), [first.pk])
+
+    def test_unsnapshotted_instance_falls_back_to_select(self):
+        clin = Clin.objects.filter(contract=self.contract).first()
+        stale = Clin(pk=clin.pk, company=self.company, contract=self.contract, item_number="0001", clin_po_num="PO-5")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            stale.save(update_fields=["clin_po_num"])
+
+        row = Transaction.objects.get()
+        self.assertEqual((row.field_name, row.old_value, row.new_value), ("clin_po_num", "PO-1", "PO-5"))
+
+    def test_bulk_update_with_audit(self):
+        clins = list(Clin.objects.filter(contract=self.contract))
+        for clin in clins:
+            clin.clin_po_num = "PO-6"
+        clins[0].clin_po_num = "PO-1"  # unchanged
+
+        with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks(execute=True):
+            updated = bulk_update_with_audit(clins, ["clin_po_num"])
+
+        self.assertEqual(updated, 3)
+        self.assertEqual(_selects(ctx, "contracts_clin"), [])
+        self.assertEqual(len(_inserts(ctx)), 1)
+        self.assertEqual(
+            sorted(Transaction.objects.values_list("object_id", flat=True)),
+            sorted(c.pk for c in clins[1:]),
+        )
+        self.assertEqual(Clin.objects.filter(clin_po_num="PO-6").count(), 2)
+
+    def test_po_sync_propagates_with_one_update(self):
+        self.contract.po_number = "PO-7"
+        self.contract.save(update_fields=["po_number"])
+
+        with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks(execute=True):
+            result = sync_po_number(self.contract, "PO-7", self.user)
+
+        self.assertEqual(len(result["clins"]), 3)
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE") and "contracts_clin" in q["sql"]]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(Transaction.objects.filter(field_name="clin_po_num", new_value="PO-7").count(), 3)
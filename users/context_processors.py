@@ -1,36 +1,23 @@
-import time
-
+from core.page_chrome import get_page_chrome, lazy_count, lazy_value
 from users.user_settings import UserSettings
-from .models import SystemMessage, UserCompanyMembership
-from contracts.models import Company
-from suppliers.openrouter_config import get_openrouter_model_info
 
 def user_preferences(request):
     """
     Add user preferences to the context
     """
-    model_info = get_openrouter_model_info()
-    model_default = model_info["effective_model"]
-    fallback_default = model_info["fallback_model"]
+    chrome = get_page_chrome(request)
+    model_default = lazy_value(lambda: chrome.ai_model_info()["effective_model"])
+    fallback_default = lazy_value(lambda: chrome.ai_model_info()["fallback_model"])
     if not request.user.is_authenticated:
         return {
             'user_preferences': {},
-            'cache_version': str(int(time.time())),
             'ai_model_default': model_default,
             'ai_fallback_default': fallback_default,
         }
 
-    preferences = UserSettings.get_all_settings(request.user)
-
-    # Add a cache version for CSS files
-    cache_version = str(int(time.time()))  # Use current timestamp
-    
-    # Store in session for consistency across requests
-    request.session['cache_version'] = cache_version
-    
+    # cache_version comes from STATZWeb.context_processors.cache_version_context (per deploy).
     return {
-        'user_preferences': preferences,
-        'cache_version': cache_version,
+        'user_preferences': lazy_value(lambda: UserSettings.get_all_settings(request.user)),
         'ai_model_default': model_default,
         'ai_fallback_default': fallback_default,
     }
@@ -38,9 +25,9 @@ def user_preferences(request):
 def unread_messages(request):
     """Add unread messages count to the context."""
     if request.user.is_authenticated:
-        count = SystemMessage.get_unread_count(request.user)
-        return {'unread_messages_count': count}
-    return {'unread_messages_count': 0} 
+        chrome = get_page_chrome(request)
+        return {'unread_messages_count': lazy_count(chrome.unread_messages_count)}
+    return {'unread_messages_count': 0}
 
 def active_company(request):
     """
@@ -54,14 +41,10 @@ def active_company(request):
     company = getattr(request, 'active_company', None)
 
     # Available companies for selector
-    if request.user.is_superuser:
-        companies = list(Company.objects.filter(is_active=True).order_by('name'))
-    else:
-        companies = [m.company for m in UserCompanyMembership.objects.filter(user=request.user).select_related('company').order_by('company__name')]
-
+    chrome = get_page_chrome(request)
     return {
         'active_company': company,
-        'available_companies': companies,
+        'available_companies': lazy_value(chrome.available_companies),
     }
 
 
@@ -1,16 +1,27 @@
 from django.utils.deprecation import MiddlewareMixin
-from django.contrib.auth import get_user_model
-from contracts.models import Company
-from users.models import UserCompanyMembership
+from users.user_cache import get_company, get_default_company, get_user_snapshot
 from users.user_settings import UserSettings
 
 
+def _remember(request, company_id):
+    # Assigning marks the session modified (a session write); skip when unchanged.
+    if request.session.get("active_company_id") != company_id:
+        request.session["active_company_id"] = company_id
+
+
+def _persist(user, company):
+    UserSettings.save_setting(user, "current_company_id", company.id, setting_type="integer", description="User's currently selected company")
+
+
 class ActiveCompanyMiddleware(MiddlewareMixin):
     """
     Attaches request.active_company for authenticated users based on:
     1) Session-stored company id (if valid and allowed), else
     2) User's default membership (or first membership), else
     3) Global default company (Company.get_default_company)
+
+    Settings, memberships and Company rows come from users.user_cache, so a
+    user whose selection is already persisted costs no queries here.
     """
 
     def process_request(self, request):
@@ -20,6 +31,15 @@ class ActiveCompanyMiddleware(MiddlewareMixin):
         if not user or not user.is_authenticated:
             return
 
+        memberships = get_user_snapshot(user)["memberships"]
+        member_ids = {company_id for company_id, _ in memberships}
+
+        def allowed(candidate):
+            if user.is_superuser or candidate.id in member_ids:
+                return True
+            # Users without memberships end on the global default anyway.
+            return not memberships and candidate.id == get_default_company().id
+
         company = None
 
         # 1) Prefer persisted user setting as the canonical source
@@ -31,13 +51,10 @@ class ActiveCompanyMiddleware(MiddlewareMixin):
                 setting_company_id = setting_val
 
             if setting_company_id:
-                try:
-                    candidate = Company.objects.get(pk=setting_company_id, is_active=True)
-                    if user.is_superuser or UserCompanyMembership.objects.filter(user=user, company=candidate).exists():
-                        company = candidate
-                        request.session["active_company_id"] = candidate.id
-                except Company.DoesNotExist:
-                    pass
+                candidate = get_company(setting_company_id)
+                if candidate and candidate.is_active and allowed(candidate):
+                    company = candidate
+                    _remember(request, candidate.id)
         except Exception:
             # Ignore settings errors; fall back as usual
             pass
@@ -46,40 +63,31 @@ class ActiveCompanyMiddleware(MiddlewareMixin):
         if not company:
             company_id = request.session.get("active_company_id")
             if company_id:
-                try:
-                    company = Company.objects.get(pk=company_id, is_active=True)
-                except Company.DoesNotExist:
+                company = get_company(company_id)
+                if company and not company.is_active:
                     company = None
 
                 # Enforce membership unless superuser
-                if company and not user.is_superuser:
-                    if not UserCompanyMembership.objects.filter(user=user, company=company).exists():
-                        company = None
+                if company and not allowed(company):
+                    company = None
 
                 if not company:
                     # Clean invalid session value
                     request.session.pop("active_company_id", None)
                 else:
                     # Sync setting to match a valid session value
-                    UserSettings.save_setting(user, "current_company_id", company.id, setting_type="integer", description="User's currently selected company")
+                    _persist(user, company)
 
         # Fallbacks: default membership -> any membership -> default company
         if not company:
-            default_membership = UserCompanyMembership.objects.filter(user=user, is_default=True).select_related("company").first()
-            if default_membership:
-                company = default_membership.company
-                request.session["active_company_id"] = company.id
-                # Persist selection for future sessions
-                UserSettings.save_setting(user, "current_company_id", company.id, setting_type="integer", description="User's currently selected company")
-            else:
-                any_membership = UserCompanyMembership.objects.filter(user=user).select_related("company").first()
-                if any_membership:
-                    company = any_membership.company
-                    request.session["active_company_id"] = company.id
-                    UserSettings.save_setting(user, "current_company_id", company.id, setting_type="integer", description="User's currently selected company")
-                else:
-                    company = Company.get_default_company()
-                    request.session["active_company_id"] = company.id
-                    UserSettings.save_setting(user, "current_company_id", company.id, setting_type="integer", description="User's currently selected company")
+            default_id = next((cid for cid, is_default in memberships if is_default), None)
+            if default_id is None and memberships:
+                default_id = memberships[0][0]
+            company = get_company(default_id) if default_id is not None else None
+            if company is None:
+                company = get_default_company()
+            _remember(request, company.id)
+            # Persist selection for future sessions
+            _persist(user, company)
 
         request.active_company = company
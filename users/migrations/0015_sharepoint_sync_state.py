@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "users",
+            "0014_rename_users_relea_publish_0ab0ec_idx_users_relea_publish_2d1cf3_idx_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SharePointSyncState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("resource", models.CharField(max_length=255, unique=True)),
+                ("delta_link", models.TextField(blank=True, default="")),
+                ("full_synced_at", models.DateTimeField(blank=True, null=True)),
+                ("synced_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "SharePoint Sync State",
+                "verbose_name_plural": "SharePoint Sync States",
+            },
+        ),
+    ]
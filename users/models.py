@@ -277,6 +277,25 @@ class WorkCalendarEvent(models.Model):
         return self.title
 
 
+class SharePointSyncState(models.Model):
+    """
+    Graph delta link for an incremental SharePoint list sync (one row per
+    site/list). An empty delta_link means the next sync enumerates the whole list.
+    """
+    resource = models.CharField(max_length=255, unique=True)
+    delta_link = models.TextField(blank=True, default='')
+    full_synced_at = models.DateTimeField(null=True, blank=True)
+    synced_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'SharePoint Sync State'
+        verbose_name_plural = 'SharePoint Sync States'
+
+    def __str__(self):
+        return self.resource
+
+
 class EventAttachment(models.Model):
     """File or link attached to a calendar event (e.g., flyer images or signup sheets)."""
 
@@ -638,14 +657,19 @@ class UserSettingState(models.Model):
 
     def get_value(self):
         """Convert the stored value to the appropriate type"""
-        if self.setting.setting_type == 'boolean':
-            return self.value.lower() == 'true'
-        elif self.setting.setting_type == 'integer':
-            return int(self.value) if self.value else 0
-        elif self.setting.setting_type == 'json':
+        return self.coerce_value(self.setting.setting_type, self.value)
+
+    @staticmethod
+    def coerce_value(setting_type, value):
+        """get_value() for a raw (setting_type, value) pair, e.g. from users.user_cache."""
+        if setting_type == 'boolean':
+            return value.lower() == 'true'
+        elif setting_type == 'integer':
+            return int(value) if value else 0
+        elif setting_type == 'json':
             import json
-            return json.loads(self.value) if self.value else {}
-        return self.value
+            return json.loads(value) if value else {}
+        return value
 
     def set_value(self, value):
         """Convert the value to string before saving"""
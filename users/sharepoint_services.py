@@ -11,7 +11,6 @@ from typing import Any, Dict, List, Optional
 from urllib.parse import quote
 from zoneinfo import ZoneInfo
 
-import requests
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import connection, transaction
@@ -20,11 +19,11 @@ from django.db.utils import Error as DjangoDbError
 from django.utils import dateparse
 from django.utils import timezone
 
+from core.graph_client import GraphAuthError, get_app_token, graph_request
 from users.models import WorkCalendarEvent
 
 logger = logging.getLogger("users.sharepoint_services")
 
-GRAPH_TOKEN_URL_TEMPLATE = "https://login.microsoftonline.us/{tenant_id}/oauth2/v2.0/token"
 GRAPH_BASE = "https://graph.microsoft.us/v1.0"
 GRAPH_SCOPE = "https://graph.microsoft.us/.default"
 
@@ -44,33 +43,19 @@ CHUNK_DB_ERRORS: tuple = (
 def get_graph_service_token() -> str:
     """
     Acquire an app-only access token using client credentials (GRAPH_MAIL_* settings).
+    Cached by core.graph_client until shortly before it expires.
     """
-    tenant_id = (getattr(settings, "GRAPH_MAIL_TENANT_ID", None) or "").strip()
-    client_id = (getattr(settings, "GRAPH_MAIL_CLIENT_ID", None) or "").strip()
-    client_secret = (getattr(settings, "GRAPH_MAIL_CLIENT_SECRET", None) or "").strip()
-    if not tenant_id or not client_id or not client_secret:
-        raise RuntimeError(
-            "Graph mail credentials are not configured (GRAPH_MAIL_TENANT_ID, "
-            "GRAPH_MAIL_CLIENT_ID, GRAPH_MAIL_CLIENT_SECRET)."
-        )
-
-    url = GRAPH_TOKEN_URL_TEMPLATE.format(tenant_id=tenant_id)
-    body = {
-        "grant_type": "client_credentials",
-        "client_id": client_id,
-        "client_secret": client_secret,
-        "scope": GRAPH_SCOPE,
-    }
-    resp = requests.post(url, data=body, timeout=60)
-    if resp.status_code != 200:
+    try:
+        return get_app_token(scope=GRAPH_SCOPE)
+    except GraphAuthError as exc:
+        if exc.status_code is None:
+            raise RuntimeError(
+                "Graph mail credentials are not configured (GRAPH_MAIL_TENANT_ID, "
+                "GRAPH_MAIL_CLIENT_ID, GRAPH_MAIL_CLIENT_SECRET)."
+            ) from exc
         raise RuntimeError(
-            f"Graph token request failed with HTTP {resp.status_code}: {resp.text}"
-        )
-    data = resp.json()
-    token = data.get("access_token")
-    if not token:
-        raise RuntimeError(f"Graph token response missing access_token: {resp.text}")
-    return str(token)
+            f"Graph token request failed with HTTP {exc.status_code}: {exc.details}"
+        ) from exc
 
 
 def _parse_graph_datetime(value: Any) -> Optional[datetime]:
@@ -219,7 +204,7 @@ def _fetch_all_list_items(token: str, site_id: str, list_id: str) -> List[Dict[s
     items: List[Dict[str, Any]] = []
     next_url: Optional[str] = url
     while next_url:
-        resp = requests.get(next_url, headers=headers, timeout=120)
+        resp = graph_request("GET", next_url, headers=headers, timeout=120)
         if resp.status_code != 200:
             raise RuntimeError(
                 f"Graph list items request failed with HTTP {resp.status_code}: {resp.text}"
@@ -276,7 +261,7 @@ def _get_writable_list_columns(
         f"{GRAPH_BASE}/sites/{enc_site}/lists/{enc_list}/columns"
         f"?$select=name,readOnly,hidden"
     )
-    resp = requests.get(url, headers={"Authorization": f"Bearer {token}"}, timeout=60)
+    resp = graph_request("GET", url, headers={"Authorization": f"Bearer {token}"}, timeout=60)
     if resp.status_code != 200:
         raise RuntimeError(
             f"Graph list columns request failed with HTTP {resp.status_code}: {resp.text}"
@@ -368,7 +353,7 @@ def _get_sp_item_last_modified(
     enc_site = quote(site_id, safe="")
     enc_list = quote(list_id, safe="")
     url = f"{GRAPH_BASE}/sites/{enc_site}/lists/{enc_list}/items/{quote(str(sp_id), safe='')}"
-    resp = requests.get(url, headers={"Authorization": f"Bearer {token}"}, timeout=60)
+    resp = graph_request("GET", url, headers={"Authorization": f"Bearer {token}"}, timeout=60)
     if resp.status_code != 200:
         logger.warning(
             "Could not re-read SharePoint item %s for lastModifiedDateTime: HTTP %s",
@@ -427,7 +412,7 @@ def push_event_to_sharepoint(event, target: Optional[tuple] = None) -> Optional[
             f"{GRAPH_BASE}/sites/{enc_site}/lists/{enc_list}"
             f"/items/{quote(sp_id, safe='')}/fields"
         )
-        resp = requests.patch(url, headers=headers, json=fields, timeout=60)
+        resp = graph_request("PATCH", url, headers=headers, json=fields, timeout=60)
         if resp.status_code == 404:
             # Item was deleted in SharePoint — fall through and recreate it.
             logger.warning(
@@ -444,7 +429,7 @@ def push_event_to_sharepoint(event, target: Optional[tuple] = None) -> Optional[
 
     if not sp_id:
         url = f"{GRAPH_BASE}/sites/{enc_site}/lists/{enc_list}/items"
-        resp = requests.post(url, headers=headers, json={"fields": fields}, timeout=60)
+        resp = graph_request("POST", url, headers=headers, json={"fields": fields}, timeout=60)
         if resp.status_code not in (200, 201):
             raise RuntimeError(
                 f"SharePoint item creation failed for event {event.pk} "
@@ -486,7 +471,7 @@ def delete_event_from_sharepoint(sharepoint_id: str) -> bool:
     enc_site = quote(site_id, safe="")
     enc_list = quote(list_id, safe="")
     url = f"{GRAPH_BASE}/sites/{enc_site}/lists/{enc_list}/items/{quote(sp_id, safe='')}"
-    resp = requests.delete(url, headers={"Authorization": f"Bearer {token}"}, timeout=60)
+    resp = graph_request("DELETE", url, headers={"Authorization": f"Bearer {token}"}, timeout=60)
     if resp.status_code in (200, 204, 404):
         logger.info("Deleted SharePoint item %s (HTTP %s).", sp_id, resp.status_code)
         return True
@@ -533,12 +518,232 @@ def schedule_event_delete(sharepoint_id: str) -> None:
     transaction.on_commit(_run)
 
 
-def sync_sharepoint_calendar() -> Dict[str, int]:
+class DeltaResyncRequired(Exception):
+    """Graph rejected a saved delta link (HTTP 410); the list must be re-enumerated."""
+
+
+class _DeltaUnavailable(Exception):
+    """The list does not support the delta query; page the whole list instead."""
+
+
+_DELTA_UNSUPPORTED_STATUSES = (400, 404, 501)
+
+
+def _calendar_delta_resource(site_id: str, list_id: str) -> str:
+    return f"calendar:{site_id}:{list_id}"
+
+
+def _delta_start_url(site_id: str, list_id: str) -> str:
+    enc_site = quote(site_id, safe="")
+    enc_list = quote(list_id, safe="")
+    return f"{GRAPH_BASE}/sites/{enc_site}/lists/{enc_list}/items/delta?expand=fields&$top=500"
+
+
+def _fetch_delta_items(token: str, url: str, *, initial: bool) -> tuple:
+    """
+    Follow a delta query from ``url`` through every @odata.nextLink page.
+
+    Returns (items, delta_link). Deleted items come back as
+    ``{"id": ..., "deleted": {...}}``. Raises DeltaResyncRequired on HTTP 410.
+    """
+    headers = {"Authorization": f"Bearer {token}"}
+    items: List[Dict[str, Any]] = []
+    delta_link = ""
+    next_url: Optional[str] = url
+    first = True
+    while next_url:
+        resp = graph_request("GET", next_url, headers=headers, timeout=120, metric="GET list delta")
+        if resp.status_code == 410:
+            raise DeltaResyncRequired(resp.text)
+        if first and initial and resp.status_code in _DELTA_UNSUPPORTED_STATUSES:
+            raise _DeltaUnavailable(f"HTTP {resp.status_code}: {resp.text}")
+        if resp.status_code != 200:
+            raise RuntimeError(
+                f"Graph list delta request failed with HTTP {resp.status_code}: {resp.text}"
+            )
+        first = False
+        payload = resp.json()
+        items.extend(payload.get("value") or [])
+        next_url = payload.get("@odata.nextLink")
+        delta_link = payload.get("@odata.deltaLink") or delta_link
+    return items, delta_link
+
+
+def _event_values_from_item(sp_id_str: str, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Parse one list item into WorkCalendarEvent values; None (logged) when unusable."""
+    fields = item.get("fields") or {}
+    try:
+        lm_raw = item.get("lastModifiedDateTime")
+        sp_lm = _parse_graph_datetime(lm_raw)
+        if sp_lm is None and lm_raw:
+            logger.warning(
+                "Could not parse lastModifiedDateTime for item id=%s (%r); using None.",
+                sp_id_str,
+                lm_raw,
+            )
+
+        start_raw = _event_start_field(fields)
+        end_raw = _event_end_field(fields)
+        start_corrected = _correct_sharepoint_datetime(start_raw)
+        end_corrected = _correct_sharepoint_datetime(end_raw)
+        if start_corrected is None or end_corrected is None:
+            logger.warning(
+                "Skipping SharePoint item id=%s: missing or unparsable start/end "
+                "(start=%r end=%r).",
+                sp_id_str,
+                start_raw,
+                end_raw,
+            )
+            return None
+
+        is_all_day = False
+        if start_corrected.time() == datetime.min.time():
+            if start_corrected == end_corrected:
+                is_all_day = True
+                end_corrected = end_corrected + timedelta(hours=24)
+            elif (
+                end_corrected.time() == datetime.min.time()
+                and end_corrected > start_corrected
+            ):
+                is_all_day = True
+        if not is_all_day and end_corrected <= start_corrected:
+            end_corrected = start_corrected + timedelta(hours=24)
+
+        utc_tz = ZoneInfo("UTC")
+        return {
+            "sharepoint_last_modified": sp_lm,
+            "start_at": start_corrected.astimezone(utc_tz),
+            "end_at": end_corrected.astimezone(utc_tz),
+            "title": _event_title(fields),
+            "kind": _map_category_to_kind(fields.get("Category")),
+            "all_day": is_all_day,
+        }
+    except ValueError as ex:
+        logger.warning(
+            "Parse error for SharePoint item id=%s: %s",
+            sp_id_str,
+            ex,
+        )
+        return None
+
+
+_SYNC_UPDATE_FIELDS = [
+    "title", "kind", "start_at", "end_at", "organizer", "source_identifier",
+    "sharepoint_id", "sharepoint_last_modified", "updated_at",
+]
+
+
+def _apply_calendar_chunk(
+    chunk: List[Dict[str, Any]], owner, has_all_day_field: bool, counts: Dict[str, int]
+) -> None:
+    """
+    Upsert one chunk of list items: one SELECT for the existing rows, then
+    bulk_create / bulk_update, plus deletes for delta tombstones.
+    """
+    parsed: Dict[str, Dict[str, Any]] = {}
+    deleted: List[str] = []
+    for item in chunk:
+        sp_id = item.get("id")
+        if sp_id is None:
+            logger.warning("Skipping list item with no id: %s", item)
+            counts["errors"] += 1
+            continue
+        sp_id_str = str(sp_id).strip()
+        if item.get("deleted"):
+            deleted.append(sp_id_str)
+            parsed.pop(sp_id_str, None)
+            continue
+        values = _event_values_from_item(sp_id_str, item)
+        if values is None:
+            counts["errors"] += 1
+            continue
+        parsed[sp_id_str] = values
+
+    existing = {
+        ev.sharepoint_id: ev
+        for ev in WorkCalendarEvent.objects.filter(sharepoint_id__in=list(parsed))
+    } if parsed else {}
+    now = timezone.now()
+    to_create: List[WorkCalendarEvent] = []
+    to_update: List[WorkCalendarEvent] = []
+    for sp_id_str, values in parsed.items():
+        all_day = values.pop("all_day")
+        try:
+            ev = existing.get(sp_id_str)
+            if ev:
+                stored_lm = ev.sharepoint_last_modified
+                sp_lm = values["sharepoint_last_modified"]
+                if sp_lm is not None and stored_lm is not None and sp_lm <= stored_lm:
+                    counts["skipped"] += 1
+                    continue
+                for name, value in values.items():
+                    setattr(ev, name, value)
+                if has_all_day_field:
+                    ev.all_day = all_day
+                # Only SharePoint-origin rows get their ownership rewritten. A
+                # portal-created event that we pushed up is mirrored in
+                # SharePoint, not owned by it — reassigning organizer here would
+                # strip the creator's edit/delete rights in portal_event_update/delete.
+                if ev.source_system == "sharepoint":
+                    ev.organizer = owner
+                    ev.source_identifier = sp_id_str
+                ev.updated_at = now
+                ev.full_clean(validate_unique=False, validate_constraints=False)
+                to_update.append(ev)
+            else:
+                ev = WorkCalendarEvent(
+                    description="",
+                    organizer=owner,
+                    priority="normal",
+                    is_private=False,
+                    source_system="sharepoint",
+                    source_identifier=sp_id_str,
+                    sharepoint_id=sp_id_str,
+                    **values,
+                    **({"all_day": all_day} if has_all_day_field else {}),
+                )
+                ev.full_clean(validate_unique=False, validate_constraints=False)
+                to_create.append(ev)
+        except Exception as ex:
+            counts["errors"] += 1
+            logger.warning("Error processing SharePoint item id=%s: %s", sp_id_str, ex)
+
+    update_fields = _SYNC_UPDATE_FIELDS + (["all_day"] if has_all_day_field else [])
+    with transaction.atomic():
+        if to_create:
+            WorkCalendarEvent.objects.bulk_create(to_create, batch_size=CHUNK_SIZE)
+        if to_update:
+            WorkCalendarEvent.objects.bulk_update(to_update, update_fields, batch_size=CHUNK_SIZE)
+        if deleted:
+            # SharePoint-origin rows go away with their item; portal events that
+            # were only mirrored there just lose the link.
+            _, per_model = WorkCalendarEvent.objects.filter(
+                sharepoint_id__in=deleted, source_system="sharepoint"
+            ).delete()
+            WorkCalendarEvent.objects.filter(sharepoint_id__in=deleted).update(
+                sharepoint_id=None, sharepoint_last_modified=None, updated_at=now
+            )
+            # Events only: the delete total also counts cascaded rows.
+            counts["deleted"] += per_model.get(WorkCalendarEvent._meta.label, 0)
+    counts["created"] += len(to_create)
+    counts["updated"] += len(to_update)
+
+
+def sync_sharepoint_calendar(full: bool = False) -> Dict[str, Any]:
     """
     Pull SharePoint calendar list items and upsert WorkCalendarEvent rows.
 
-    Returns counts: fetched, created, updated, skipped, errors.
+    With SHAREPOINT_CALENDAR_DELTA_ENABLED (default) only items changed or
+    deleted since the delta link saved in SharePointSyncState are fetched; the
+    first run, ``full=True``, or an expired link (HTTP 410) re-enumerates the
+    whole list through the same delta query and saves a fresh link. Lists
+    without delta support fall back to paging every item.
+
+    Returns counts: fetched, created, updated, skipped, deleted, errors, plus
+    mode ("delta", "full" or "list").
     """
+    from users.models import SharePointSyncState
+
     calendar_site_id = (
         getattr(settings, "SHAREPOINT_CALENDAR_SITE_ID", None) or ""
     ).strip()
@@ -549,13 +754,6 @@ def sync_sharepoint_calendar() -> Dict[str, int]:
             "set in settings before running calendar sync."
         )
 
-    token = get_graph_service_token()
-    logger.info("Acquired Graph service token successfully.")
-
-    items = _fetch_all_list_items(token, calendar_site_id, list_id)
-    fetched = len(items)
-    logger.info("Fetched %s SharePoint list items (all pages).", fetched)
-
     sync_email = (getattr(settings, "SHAREPOINT_SYNC_USER_EMAIL", None) or "").strip()
     if not sync_email:
         raise RuntimeError("SHAREPOINT_SYNC_USER_EMAIL is not configured.")
@@ -566,7 +764,39 @@ def sync_sharepoint_calendar() -> Dict[str, int]:
             f"No Django user found with email {sync_email!r} (SHAREPOINT_SYNC_USER_EMAIL)."
         ) from exc
 
-    created = updated = skipped = errors = 0
+    token = get_graph_service_token()
+    logger.info("Acquired Graph service token successfully.")
+
+    state = None
+    delta_link = ""
+    if getattr(settings, "SHAREPOINT_CALENDAR_DELTA_ENABLED", True):
+        state, _ = SharePointSyncState.objects.get_or_create(
+            resource=_calendar_delta_resource(calendar_site_id, list_id)
+        )
+        saved_link = "" if full else state.delta_link
+        try:
+            if saved_link:
+                try:
+                    items, delta_link = _fetch_delta_items(token, saved_link, initial=False)
+                    mode = "delta"
+                except DeltaResyncRequired:
+                    logger.warning("SharePoint delta link expired; running a full resync.")
+                    saved_link = ""
+            if not saved_link:
+                items, delta_link = _fetch_delta_items(
+                    token, _delta_start_url(calendar_site_id, list_id), initial=True
+                )
+                mode = "full"
+        except _DeltaUnavailable as exc:
+            logger.warning("SharePoint list delta query unavailable (%s); paging the full list.", exc)
+            state = None
+    if state is None:
+        items = _fetch_all_list_items(token, calendar_site_id, list_id)
+        mode = "list"
+    fetched = len(items)
+    logger.info("Fetched %s SharePoint list item(s) (%s).", fetched, mode)
+
+    counts = {"created": 0, "updated": 0, "skipped": 0, "deleted": 0, "errors": 0}
     has_all_day_field = any(
         getattr(field, "name", None) == "all_day"
         for field in WorkCalendarEvent._meta.get_fields()
@@ -574,149 +804,16 @@ def sync_sharepoint_calendar() -> Dict[str, int]:
     # NOTE: If WorkCalendarEvent lacks `all_day`, add that model field + migration
     # to persist SharePoint all-day semantics for UI time-label suppression.
 
-    chunks = [items[i : i + CHUNK_SIZE] for i in range(0, len(items), CHUNK_SIZE)]
-
-    for chunk_index, chunk in enumerate(chunks):
-        chunk_lo = chunk_index * CHUNK_SIZE
+    db_failed = False
+    for chunk_lo in range(0, fetched, CHUNK_SIZE):
+        chunk = items[chunk_lo : chunk_lo + CHUNK_SIZE]
         chunk_hi = chunk_lo + len(chunk) - 1
         _ensure_db_connection()
         try:
-            with transaction.atomic():
-                for item in chunk:
-                    sp_id = item.get("id")
-                    if sp_id is None:
-                        logger.warning("Skipping list item with no id: %s", item)
-                        errors += 1
-                        continue
-                    sp_id_str = str(sp_id).strip()
-                    fields = item.get("fields") or {}
-
-                    try:
-                        lm_raw = item.get("lastModifiedDateTime")
-                        sp_lm = _parse_graph_datetime(lm_raw)
-                        if sp_lm is None and lm_raw:
-                            logger.warning(
-                                "Could not parse lastModifiedDateTime for item id=%s (%r); using None.",
-                                sp_id_str,
-                                lm_raw,
-                            )
-
-                        start_raw = _event_start_field(fields)
-                        end_raw = _event_end_field(fields)
-                        start_corrected = _correct_sharepoint_datetime(start_raw)
-                        end_corrected = _correct_sharepoint_datetime(end_raw)
-                        if start_corrected is None or end_corrected is None:
-                            logger.warning(
-                                "Skipping SharePoint item id=%s: missing or unparsable start/end "
-                                "(start=%r end=%r).",
-                                sp_id_str,
-                                start_raw,
-                                end_raw,
-                            )
-                            errors += 1
-                            continue
-
-                        is_all_day = False
-                        if start_corrected.time() == datetime.min.time():
-                            if start_corrected == end_corrected:
-                                is_all_day = True
-                                end_corrected = end_corrected + timedelta(hours=24)
-                            elif (
-                                end_corrected.time() == datetime.min.time()
-                                and end_corrected > start_corrected
-                            ):
-                                is_all_day = True
-                        if not is_all_day and end_corrected <= start_corrected:
-                            end_corrected = start_corrected + timedelta(hours=24)
-
-                        utc_tz = ZoneInfo("UTC")
-                        start_at = start_corrected.astimezone(utc_tz)
-                        end_at = end_corrected.astimezone(utc_tz)
-
-                        title = _event_title(fields)
-                        kind = _map_category_to_kind(fields.get("Category"))
-                    except ValueError as ex:
-                        errors += 1
-                        logger.warning(
-                            "Parse error for SharePoint item id=%s: %s",
-                            sp_id_str,
-                            ex,
-                        )
-                        continue
-
-                    try:
-                        existing = WorkCalendarEvent.objects.filter(
-                            sharepoint_id=sp_id_str
-                        ).first()
-                        if existing:
-                            stored_lm = existing.sharepoint_last_modified
-                            if (
-                                sp_lm is not None
-                                and stored_lm is not None
-                                and sp_lm <= stored_lm
-                            ):
-                                skipped += 1
-                                continue
-
-                            existing.title = title
-                            existing.kind = kind
-                            existing.start_at = start_at
-                            existing.end_at = end_at
-                            if has_all_day_field:
-                                existing.all_day = is_all_day
-                            # Only SharePoint-origin rows get their ownership
-                            # rewritten. A portal-created event that we pushed up
-                            # is mirrored in SharePoint, not owned by it —
-                            # reassigning organizer here would strip the creator's
-                            # edit/delete rights in portal_event_update/delete.
-                            if existing.source_system == "sharepoint":
-                                existing.organizer = owner
-                                existing.source_identifier = sp_id_str
-                            existing.sharepoint_id = sp_id_str
-                            existing.sharepoint_last_modified = sp_lm
-                            existing.full_clean()
-                            existing.save()
-                            updated += 1
-                            logger.info(
-                                "Updated WorkCalendarEvent id=%s sharepoint_id=%s",
-                                existing.pk,
-                                sp_id_str,
-                            )
-                        else:
-                            ev = WorkCalendarEvent(
-                                title=title,
-                                description="",
-                                kind=kind,
-                                start_at=start_at,
-                                end_at=end_at,
-                                organizer=owner,
-                                priority="normal",
-                                is_private=False,
-                                source_system="sharepoint",
-                                source_identifier=sp_id_str,
-                                sharepoint_id=sp_id_str,
-                                sharepoint_last_modified=sp_lm,
-                                **({"all_day": is_all_day} if has_all_day_field else {}),
-                            )
-                            ev.full_clean()
-                            ev.save()
-                            created += 1
-                            logger.info(
-                                "Created WorkCalendarEvent id=%s sharepoint_id=%s",
-                                ev.pk,
-                                sp_id_str,
-                            )
-                    except CHUNK_DB_ERRORS:
-                        raise
-                    except Exception as ex:
-                        errors += 1
-                        logger.exception(
-                            "Error processing SharePoint item id=%s: %s",
-                            sp_id_str,
-                            ex,
-                        )
+            _apply_calendar_chunk(chunk, owner, has_all_day_field, counts)
         except CHUNK_DB_ERRORS as ex:
-            errors += len(chunk)
+            db_failed = True
+            counts["errors"] += len(chunk)
             logger.warning(
                 "Database error while processing SharePoint calendar chunk "
                 "items[%s:%s] (indices): %s",
@@ -726,22 +823,21 @@ def sync_sharepoint_calendar() -> Dict[str, int]:
             )
         else:
             logger.info(
-                "Chunk complete: processed %s items, running totals: "
-                "created=%s updated=%s skipped=%s errors=%s",
+                "Chunk complete: processed %s items, running totals: %s",
                 len(chunk),
-                created,
-                updated,
-                skipped,
-                errors,
+                counts,
             )
 
-    stats = {
-        "fetched": fetched,
-        "created": created,
-        "updated": updated,
-        "skipped": skipped,
-        "errors": errors,
-    }
+    # Advance the delta link only when every chunk was written, so a failed
+    # chunk's items are fetched again next run.
+    if state is not None and delta_link and not db_failed:
+        now = timezone.now()
+        update = {"delta_link": delta_link, "synced_at": now}
+        if mode == "full":
+            update["full_synced_at"] = now
+        SharePointSyncState.objects.filter(pk=state.pk).update(**update)
+
+    stats = {"fetched": fetched, **counts, "mode": mode}
     logger.info("SharePoint calendar sync finished: %s", stats)
     return stats
 
@@ -873,7 +969,7 @@ def _check_path_exists(token: str, drive_id: str, item_path: str) -> Optional[Di
     enc_path = quote(item_path, safe="/")
     url = f"{GRAPH_BASE}/drives/{enc_drive}/root:/{enc_path}"
     headers = {"Authorization": f"Bearer {token}"}
-    resp = requests.get(url, headers=headers, timeout=60)
+    resp = graph_request("GET", url, headers=headers, timeout=60)
     if resp.status_code == 200:
         return resp.json()
     if resp.status_code == 404:
@@ -904,7 +1000,7 @@ def _create_folder(token: str, drive_id: str, parent_path: str, folder_name: str
         "folder": {},
         "@microsoft.graph.conflictBehavior": "fail",
     }
-    resp = requests.post(url, headers=headers, json=body, timeout=60)
+    resp = graph_request("POST", url, headers=headers, json=body, timeout=60)
     if resp.status_code not in (200, 201):
         raise RuntimeError(
             f"Graph folder creation failed (parent={parent_path!r}, name={folder_name!r}) "
@@ -1000,7 +1096,7 @@ def upload_award_pdf_to_sharepoint(pdf_file, queue_contract) -> bool:
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/octet-stream",
     }
-    resp = requests.put(url, headers=headers, data=file_bytes, timeout=120)
+    resp = graph_request("PUT", url, headers=headers, data=file_bytes, timeout=120)
     if resp.status_code not in (200, 201):
         raise RuntimeError(
             f"Graph file upload failed (path={file_path!r}) "
@@ -1086,7 +1182,7 @@ def download_award_pdf_bytes(queue_contract) -> bytes:
     enc_path = quote(file_path, safe="/")
     url = f"{GRAPH_BASE}/drives/{enc_drive}/root:/{enc_path}:/content"
     headers = {"Authorization": f"Bearer {token}"}
-    resp = requests.get(url, headers=headers, timeout=120, allow_redirects=True)
+    resp = graph_request("GET", url, headers=headers, timeout=120, allow_redirects=True)
     if resp.status_code == 404:
         raise RuntimeError(
             f"Award PDF not found in SharePoint at path: {file_path}"
@@ -1,8 +1,10 @@
 # users/signals.py
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import AppPermission, AppRegistry, UserSetting, UserSettingState
+from contracts.models import Company
+from .models import AppPermission, AppRegistry, UserCompanyMembership, UserSetting, UserSettingState
+from .user_cache import invalidate_all_users, invalidate_companies, invalidate_user
 from django.apps import apps
 import logging
 
@@ -50,4 +52,26 @@ def create_user_settings(sender, instance, created, **kwargs):
                 user=instance,
                 setting=setting,
                 value=setting.default_value
-            )
\ No newline at end of file
+            )
+
+
+# Cached per-user state (users/user_cache.py) — bump versions on every ORM write.
+@receiver(post_save, sender=UserSettingState)
+@receiver(post_delete, sender=UserSettingState)
+@receiver(post_save, sender=UserCompanyMembership)
+@receiver(post_delete, sender=UserCompanyMembership)
+def user_state_changed(sender, instance, **kwargs):
+    invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=UserSetting)
+@receiver(post_delete, sender=UserSetting)
+def setting_definition_changed(sender, instance, **kwargs):
+    # setting_type is part of every user's snapshot.
+    invalidate_all_users()
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def company_changed(sender, instance, **kwargs):
+    invalidate_companies()
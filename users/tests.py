@@ -1,3 +1,287 @@
-from django.test import TestCase
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from contracts.models import Company
+from core import graph_client
+from users.middleware import ActiveCompanyMiddleware
+from users.models import EventReminder, SharePointSyncState, UserCompanyMembership, WorkCalendarEvent
+from users.sharepoint_services import sync_sharepoint_calendar
+from users.user_settings import UserSettings
+
+
+class FakeGraphList:
+    """
+    In-memory SharePoint list behind a local HTTP server that speaks the
+    Graph list-item endpoints sync_sharepoint_calendar uses: paged
+    ``items`` and ``items/delta`` (tokens are change versions, tombstones
+    for deletes, HTTP 410 once a token has been expired).
+    """
+
+    PAGE_SIZE = 2
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.items = {}
+        self.changes = {}
+        self.version = 0
+        self.expired_before = 0
+        self.delta_supported = True
+        self.requests = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def put(self, item_id, title, start, end, category="Meeting"):
+        with self.lock:
+            self.version += 1
+            self.items[item_id] = {
+                "id": item_id,
+                "lastModifiedDateTime": f"2026-10-01T00:00:{self.version:02d}Z",
+                "fields": {"Title": title, "EventDate": start, "EndDate": end, "Category": category},
+            }
+            self.changes[item_id] = self.version
+
+    def delete(self, item_id):
+        with self.lock:
+            self.version += 1
+            self.items.pop(item_id, None)
+            self.changes[item_id] = self.version
+
+    def expire_tokens(self):
+        with self.lock:
+            self.expired_before = self.version + 1
+
+    def _page(self, rows, path, params, final_link):
+        skip = int(params.get("skip", ["0"])[0])
+        body = {"value": rows[skip : skip + self.PAGE_SIZE]}
+        if skip + self.PAGE_SIZE < len(rows):
+            query = {k: v[0] for k, v in params.items()}
+            query["skip"] = str(skip + self.PAGE_SIZE)
+            body["@odata.nextLink"] = self.base + path + "?" + "&".join(f"{k}={v}" for k, v in query.items())
+        elif final_link:
+            body["@odata.deltaLink"] = final_link
+        return body
+
+    def handle(self, path, params):
+        with self.lock:
+            self.requests.append((path, {k: v[0] for k, v in params.items()}))
+            if path.endswith("/items/delta"):
+                if not self.delta_supported:
+                    return 400, {"error": {"code": "invalidRequest"}}
+                token = params.get("token", [None])[0]
+                if token is not None and int(token) < self.expired_before:
+                    return 410, {"error": {"code": "resyncRequired"}}
+                if token is None:
+                    rows = [self.items[i] for i in sorted(self.items)]
+                else:
+                    rows = [
+                        self.items.get(i) or {"id": i, "deleted": {"state": "deleted"}}
+                        for i, v in sorted(self.changes.items())
+                        if v > int(token)
+                    ]
+                return 200, self._page(rows, path, params, f"{self.base}{path}?token={self.version}")
+            if path.endswith("/items"):
+                rows = [self.items[i] for i in sorted(self.items)]
+                return 200, self._page(rows, path, params, None)
+        return 404, {}
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlsplit(self.path)
+                status, body = fake.handle(url.path, parse_qs(url.query))
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+@override_settings(
+    SHAREPOINT_CALENDAR_SITE_ID="site-1",
+    SHAREPOINT_CALENDAR_LIST_ID="list-1",
+    SHAREPOINT_SYNC_USER_EMAIL="calendar-sync@example.com",
+    SHAREPOINT_SOURCE_TIMEZONE="UTC",
+    TIME_ZONE="UTC",
+    SHAREPOINT_CALENDAR_DELTA_ENABLED=True,
+)
+class SharePointCalendarDeltaSyncTests(TestCase):
+    def setUp(self):
+        self.owner = get_user_model().objects.create_user(
+            username="calendar-sync", email="calendar-sync@example.com", password="x"
+        )
+        self.graph = FakeGraphList()
+        self.addCleanup(self.graph.stop)
+        for patcher in (
+            patch("users.sharepoint_services.GRAPH_BASE", self.graph.base),
+            patch("users.sharepoint_services.get_graph_service_token", return_value="token"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        graph_client.clear()
+        self.addCleanup(graph_client.clear)
+        for n in range(1, 6):
+            self.graph.put(str(n), f"Event {n}", f"2026-11-0{n}T15:00:00Z", f"2026-11-0{n}T16:00:00Z")
+
+    def _titles(self):
+        return dict(WorkCalendarEvent.objects.values_list("sharepoint_id", "title"))
+
+    def test_first_sync_enumerates_with_bulk_writes_and_saves_delta_link(self):
+        with CaptureQueriesContext(connection) as ctx:
+            stats = sync_sharepoint_calendar()
+
+        self.assertEqual(stats["mode"], "full")
+        self.assertEqual((stats["fetched"], stats["created"], stats["errors"]), (5, 5, 0))
+        self.assertEqual(self._titles(), {str(n): f"Event {n}" for n in range(1, 6)})
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "users_workcalendarevent"')]
+        self.assertEqual(len(inserts), 1)
+        state = SharePointSyncState.objects.get()
+        self.assertTrue(state.delta_link.endswith("token=5"))
+        self.assertIsNotNone(state.full_synced_at)
+
+    def test_second_sync_fetches_only_changes_and_applies_deletes(self):
+        sync_sharepoint_calendar()
+        WorkCalendarEvent.objects.filter(sharepoint_id="2").update(source_system="portal")
+        # Cascaded rows are not counted as deleted events.
+        EventReminder.objects.create(event=WorkCalendarEvent.objects.get(sharepoint_id="3"))
+        self.graph.put("1", "Event 1 moved", "2026-11-01T17:00:00Z", "2026-11-01T18:00:00Z")
+        self.graph.delete("2")
+        self.graph.delete("3")
+        self.graph.put("6", "Event 6", "2026-11-06T15:00:00Z", "2026-11-06T16:00:00Z")
+        self.graph.requests.clear()
+
+        stats = sync_sharepoint_calendar()
+
+        self.assertEqual(stats["mode"], "delta")
+        self.assertEqual(stats["fetched"], 4)
+        self.assertEqual((stats["created"], stats["updated"], stats["deleted"]), (1, 1, 1))
+        self.assertTrue(all(params.get("token") == "5" for _, params in self.graph.requests))
+        titles = self._titles()
+        self.assertEqual(titles["1"], "Event 1 moved")
+        self.assertNotIn("3", titles)
+        self.assertIn("6", titles)
+        # A portal event mirrored to SharePoint is unlinked, not deleted.
+        portal = WorkCalendarEvent.objects.get(title="Event 2")
+        self.assertIsNone(portal.sharepoint_id)
+
+        again = sync_sharepoint_calendar()
+        self.assertEqual((again["mode"], again["fetched"]), ("delta", 0))
+
+    def test_expired_delta_link_falls_back_to_full_resync(self):
+        sync_sharepoint_calendar()
+        self.graph.put("4", "Event 4 renamed", "2026-11-04T15:00:00Z", "2026-11-04T16:00:00Z")
+        self.graph.expire_tokens()
+
+        stats = sync_sharepoint_calendar()
+
+        self.assertEqual(stats["mode"], "full")
+        self.assertEqual((stats["fetched"], stats["updated"], stats["skipped"]), (5, 1, 4))
+        self.assertEqual(self._titles()["4"], "Event 4 renamed")
+        self.assertTrue(SharePointSyncState.objects.get().delta_link.endswith("token=6"))
+
+    def test_list_without_delta_support_pages_every_item(self):
+        self.graph.delta_supported = False
+
+        stats = sync_sharepoint_calendar()
+
+        self.assertEqual((stats["mode"], stats["created"]), ("list", 5))
+        self.assertFalse(SharePointSyncState.objects.exclude(delta_link="").exists())
+
+
+class ActiveCompanyCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = get_user_model().objects.create_user(username="buyer", password="x")
+        self.company = Company.objects.create(name="Acme Supply", slug="acme-supply")
+        self.other = Company.objects.create(name="Other Co", slug="other-co")
+        UserCompanyMembership.objects.create(user=self.user, company=self.company, is_default=True)
+        UserCompanyMembership.objects.create(user=self.user, company=self.other)
+        self.session = SessionStore()
+        self.session.create()
+
+    def _request(self):
+        # A fresh User instance per request, as AuthenticationMiddleware provides.
+        request = RequestFactory().get("/contracts/")
+        request.user = get_user_model().objects.get(pk=self.user.pk)
+        request.session = self.session
+        with self.captureOnCommitCallbacks(execute=True):
+            ActiveCompanyMiddleware(lambda r: None).process_request(request)
+        return request
+
+    def _commit(self, write, *args, **kwargs):
+        """Run a write and the cache invalidation it queues for commit."""
+        with self.captureOnCommitCallbacks(execute=True):
+            return write(*args, **kwargs)
+
+    def test_steady_state_resolves_company_without_queries(self):
+        self.assertEqual(self._request().active_company, self.company)
+        self._request()  # reloads the snapshot the first request's writes retired
+        self.session.save()
+
+        request = RequestFactory().get("/contracts/")
+        request.user = get_user_model().objects.get(pk=self.user.pk)
+        request.session = SessionStore(session_key=self.session.session_key)
+        request.session.get("active_company_id")  # loaded by AuthenticationMiddleware in a real request
+        with CaptureQueriesContext(connection) as ctx:
+            ActiveCompanyMiddleware(lambda r: None).process_request(request)
+            UserSettings.get_setting(request.user, "current_company_id")
+            UserSettings.get_all_settings(request.user)
+
+        self.assertEqual(request.active_company, self.company)
+        self.assertEqual(ctx.captured_queries, [])
+        self.assertFalse(request.session.modified)
+
+    def test_save_setting_invalidates_cached_snapshot(self):
+        self._request()
+        self._commit(UserSettings.save_setting, self.user, "current_company_id", self.other.id, setting_type="integer")
+
+        self.assertEqual(self._request().active_company, self.other)
+        self.assertEqual(str(UserSettings.get_setting(self.user, "current_company_id")), str(self.other.id))
+
+    def test_removed_membership_and_inactive_company_are_not_served_from_cache(self):
+        self._request()
+        self._commit(UserSettings.save_setting, self.user, "current_company_id", self.other.id, setting_type="integer")
+        self.assertEqual(self._request().active_company, self.other)
+
+        self._commit(UserCompanyMembership.objects.filter(user=self.user, company=self.other).delete)
+        self.assertEqual(self._request().active_company, self.company)
+
+        self.company.is_active = False
+        self._commit(self.company.save)
+        self.assertEqual(self._request().active_company, self.company)  # default membership fallback
+
+    def test_typical_page_reads_no_settings_tables_once_warm(self):
+        self.client.force_login(self.user)
+        url = reverse("contracts:contracts_dashboard")
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        settings_queries = [q["sql"] for q in ctx.captured_queries if "users_usersetting" in q["sql"]]
+        self.assertEqual(settings_queries, [])
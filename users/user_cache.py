@@ -0,0 +1,121 @@
+"""
+Cached per-user state for the request path.
+
+ActiveCompanyMiddleware and UserSettings.get_setting used to hit
+UserSetting / UserSettingState (two get_or_create calls), Company and
+UserCompanyMembership on every request, AJAX polling included. This module
+serves them from the shared cache (core.cache):
+
+- get_user_snapshot(user): the user's settings ({name: (type, raw value)},
+  one query) and company memberships ([(company_id, is_default)], one
+  query), stored as ``(version, snapshot)`` next to a per-user version
+  counter and read with a single get_many. invalidate_user() bumps the
+  counter (users/signals.py calls it on UserSettingState and
+  UserCompanyMembership writes, which covers UserSettings.save_setting), so
+  a snapshot loaded before a write can never be served after it.
+- get_company(pk) / get_default_company() / get_active_companies():
+  pickled Company rows, dropped when any Company is saved or deleted.
+
+Within a request the snapshot is memoized on the user object; a
+process-local generation counter keeps that memo honest when the same
+request writes a setting.
+"""
+import threading
+
+from django.db import transaction
+
+from core.cache import invalidate as invalidate_namespace
+from core.cache import namespace
+
+USER_STATE_CACHE_SECONDS = 3600
+USER_STATE_NAMESPACE = "users.state"
+COMPANY_NAMESPACE = "contracts.company"
+
+_user_cache = namespace(USER_STATE_NAMESPACE, timeout=USER_STATE_CACHE_SECONDS)
+_company_cache = namespace(COMPANY_NAMESPACE, timeout=USER_STATE_CACHE_SECONDS)
+
+_MEMO_ATTR = "_cached_user_state"
+_lock = threading.Lock()
+_generation = {"all": 0}
+
+
+def _local_generation(user_id):
+    with _lock:
+        return (_generation["all"], _generation.get(user_id, 0))
+
+
+def _load_snapshot(user_id):
+    from users.models import UserCompanyMembership, UserSettingState
+
+    settings = {
+        name: (setting_type, value)
+        for name, setting_type, value in UserSettingState.objects.filter(
+            user_id=user_id
+        ).values_list("setting__name", "setting__setting_type", "value")
+    }
+    memberships = list(
+        UserCompanyMembership.objects.filter(user_id=user_id)
+        .order_by("pk")
+        .values_list("company_id", "is_default")
+    )
+    return {"settings": settings, "memberships": memberships}
+
+
+def get_user_snapshot(user):
+    """{"settings": {name: (setting_type, value)}, "memberships": [(company_id, is_default)]}."""
+    generation = _local_generation(user.pk)
+    memo = user.__dict__.get(_MEMO_ATTR)
+    if memo is not None and memo[0] == generation:
+        return memo[1]
+
+    _, snapshot = _user_cache.get_or_set_versioned(
+        f"snapshot:{user.pk}", f"version:{user.pk}", lambda: _load_snapshot(user.pk)
+    )
+    user.__dict__[_MEMO_ATTR] = (generation, snapshot)
+    return snapshot
+
+
+def invalidate_user(user_id):
+    """
+    Retire user_id's cached snapshot once the write commits (immediately in
+    autocommit). The shared counter is not touched inside the transaction: with
+    the DatabaseCache backend that would lock its row until commit, so inside
+    an explicit atomic block the writer itself may read the pre-write snapshot
+    until it commits. This process's generation moves now, dropping the
+    snapshot memoized on the user object.
+    """
+    with _lock:
+        _generation[user_id] = _generation.get(user_id, 0) + 1
+    transaction.on_commit(lambda: _user_cache.bump_version(f"version:{user_id}"))
+
+
+def invalidate_all_users():
+    with _lock:
+        _generation["all"] += 1
+    invalidate_namespace(USER_STATE_NAMESPACE)
+
+
+def get_company(pk):
+    """Company ``pk`` (active or not) or None."""
+    from contracts.models import Company
+
+    return _company_cache.get_or_set(str(pk), lambda: Company.objects.filter(pk=pk).first())
+
+
+def get_default_company():
+    from contracts.models import Company
+
+    return _company_cache.get_or_set("default", Company.get_default_company)
+
+
+def get_active_companies():
+    """Active companies ordered by name (the superuser company selector)."""
+    from contracts.models import Company
+
+    return _company_cache.get_or_set(
+        "active", lambda: list(Company.objects.filter(is_active=True).order_by("name"))
+    )
+
+
+def invalidate_companies():
+    invalidate_namespace(COMPANY_NAMESPACE)
@@ -4,6 +4,10 @@ class UserSettings:
     """
     A class to manage user settings using UserSetting and UserSettingState models.
     
+    Reads are served from a per-user cached snapshot (users.user_cache) that
+    UserSettingState / membership writes invalidate by version; a missing
+    setting still falls through to get_or_create.
+
     Usage:
         # Get a setting value
         value = UserSettings.get_setting(user, "setting_name")
@@ -18,6 +22,15 @@ class UserSettings:
         UserSettings.save_multiple_settings(user, {"setting1": "value1", "setting2": "value2"})
     """
     
+    @classmethod
+    def _cached_settings(cls, user: Any) -> Dict[str, tuple]:
+        """The user's {name: (setting_type, raw value)} from users.user_cache ({} for unsaved users)."""
+        if getattr(user, 'pk', None) is None:
+            return {}
+        from .user_cache import get_user_snapshot
+
+        return get_user_snapshot(user)['settings']
+
     @classmethod
     def _get_or_create_setting(cls, name: str, setting_type: str = 'string', 
                              default_value: Any = '', description: str = '', 
@@ -92,6 +105,12 @@ class UserSettings:
             The setting value
         """
         try:
+            # Import here to avoid circular imports
+            from .models import UserSettingState
+
+            cached = cls._cached_settings(user).get(name)
+            if cached is not None:
+                return UserSettingState.coerce_value(*cached)
             setting = cls._get_or_create_setting(name)
             state = cls._get_or_create_setting_state(user, setting)
             return state.get_value()
@@ -118,6 +137,9 @@ class UserSettings:
             bool: True if successful, False otherwise
         """
         try:
+            cached = cls._cached_settings(user).get(name)
+            if cached is not None and cached[1] == str(value):
+                return True
             setting = cls._get_or_create_setting(
                 name, 
                 setting_type=setting_type,
@@ -220,9 +242,11 @@ class UserSettings:
         try:
             # Import here to avoid circular imports
             from .models import UserSettingState
-            
-            states = UserSettingState.objects.filter(user=user).select_related('setting')
-            return {state.setting.name: state.get_value() for state in states}
+
+            return {
+                name: UserSettingState.coerce_value(setting_type, value)
+                for name, (setting_type, value) in cls._cached_settings(user).items()
+            }
         except Exception as e:
             print(f"Error getting all settings: {str(e)}")
             return {} 
\ No newline at end of file